@@ -46,6 +46,8 @@ class AITrainingPipeline:
             self.data_dir = Path(data_dir)
             
         self.training_db = self._init_training_database()
+        self._vector_index = None
+        self._embedder = None
     
     def _init_training_database(self) -> str:
         """Initialize training data database"""
@@ -213,6 +215,133 @@ class AITrainingPipeline:
         conn.commit()
         conn.close()
     
+    @property
+    def vector_index(self):
+        """Memory-mapped vector index stored next to the training database"""
+        if self._vector_index is None:
+            from ai_platform.core.vector_index import VectorIndex
+            self._vector_index = VectorIndex(self.training_db)
+        return self._vector_index
+
+    @property
+    def embedder(self):
+        """Shared chunk embedder (multilingual MiniLM)"""
+        if self._embedder is None:
+            from ai_platform.core.vector_index import ChunkEmbedder
+            self._embedder = ChunkEmbedder()
+        return self._embedder
+
+    def embed_document_chunks(
+        self,
+        document_id: str,
+        chunks: List[Dict[str, Any]]
+    ) -> List[DocumentEmbedding]:
+        """
+        Embed document chunks in batches and store them in the database and vector index
+
+        Args:
+            document_id: Source document identifier
+            chunks: Chunk dicts with 'chunk_id' (or 'id'), 'content' and optional
+                'chunk_type' / 'semantic_tags'
+
+        Returns:
+            List of document embeddings
+        """
+        if not chunks:
+            return []
+
+        texts = [chunk.get('content', chunk.get('text', '')) for chunk in chunks]
+        vectors = self.embedder.embed(texts)
+
+        embeddings = []
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
+            embeddings.append(DocumentEmbedding(
+                chunk_id=str(chunk.get('chunk_id', chunk.get('id', f"{document_id}_{i}"))),
+                document_id=document_id,
+                text=texts[i],
+                embedding=vector.tolist(),
+                chunk_type=chunk.get('chunk_type', chunk.get('type', 'content')),
+                semantic_tags=chunk.get('semantic_tags', [])
+            ))
+
+        self._save_document_embeddings(embeddings, vectors)
+        self.vector_index.add([e.chunk_id for e in embeddings], vectors)
+
+        return embeddings
+
+    def _save_document_embeddings(self, embeddings: List[DocumentEmbedding], vectors):
+        """Save embeddings to database as raw float32 bytes"""
+        conn = sqlite3.connect(self.training_db)
+        created_at = datetime.now().isoformat()
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO document_embeddings
+            (chunk_id, document_id, text, embedding, chunk_type, semantic_tags, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                emb.chunk_id,
+                emb.document_id,
+                emb.text,
+                vector.astype('float32').tobytes(),
+                emb.chunk_type,
+                json.dumps(emb.semantic_tags),
+                created_at
+            )
+            for emb, vector in zip(embeddings, vectors)
+        ])
+
+        conn.commit()
+        conn.close()
+
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        approximate: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Semantic search over embedded chunks
+
+        Args:
+            query: Natural language query
+            top_k: Number of results
+            approximate: Use the IVF index if it has been built
+
+        Returns:
+            Matching chunks with similarity scores
+        """
+        query_vector = self.embedder.embed([query])[0]
+        hits = self.vector_index.search(query_vector, top_k=top_k, approximate=approximate)
+        if not hits:
+            return []
+
+        conn = sqlite3.connect(self.training_db)
+        placeholders = ','.join(['?'] * len(hits))
+        cursor = conn.execute(f"""
+            SELECT chunk_id, document_id, text, chunk_type, semantic_tags
+            FROM document_embeddings
+            WHERE chunk_id IN ({placeholders})
+        """, [chunk_id for chunk_id, _ in hits])
+        rows = {row[0]: row for row in cursor.fetchall()}
+        conn.close()
+
+        results = []
+        for chunk_id, score in hits:
+            row = rows.get(chunk_id)
+            if row is None:
+                continue
+            results.append({
+                'chunk_id': chunk_id,
+                'document_id': row[1],
+                'text': row[2],
+                'chunk_type': row[3],
+                'semantic_tags': json.loads(row[4]) if row[4] else [],
+                'score': score
+            })
+
+        return results
+
     def create_training_dataset(
         self, 
         task_type: str,
@@ -355,6 +484,9 @@ class AITrainingPipeline:
         # Total examples
         cursor = conn.execute("SELECT COUNT(*) FROM training_examples")
         stats['total_examples'] = cursor.fetchone()[0]
+
+        cursor = conn.execute("SELECT COUNT(*) FROM document_embeddings")
+        stats['total_embeddings'] = cursor.fetchone()[0]
         
         conn.close()
         return stats
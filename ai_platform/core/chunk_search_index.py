@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Persistent BM25 Search Index for Processed Document Chunks
+SQLite-backed inverted index over *_chunks.json files with lazy body loading
+"""
+
+import json
+import math
+import sqlite3
+from collections import Counter
+from heapq import nlargest
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from ai_platform.core.text_normalization import TOKEN_PATTERN, fold_text, tokenize
+
+# Header terms count double, mirroring the old substring relevance score
+HEADER_WEIGHT = 2.0
+
+
+class ChunkSearchIndex:
+    """BM25 inverted index persisted next to the processed chunk files"""
+
+    INDEX_FILENAME = "chunk_search_index.db"
+
+    def __init__(self, processed_docs_dir: str, k1: float = 1.2, b: float = 0.75):
+        self.processed_docs_dir = Path(processed_docs_dir)
+        self.k1 = k1
+        self.b = b
+        self.db_path = self.processed_docs_dir / self.INDEX_FILENAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self._init_schema()
+        self.total_chunks = 0
+        self.avg_length = 0.0
+
+    def _init_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS indexed_files (
+                doc_name TEXT PRIMARY KEY,
+                mtime REAL,
+                size INTEGER
+            );
+
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                doc_name TEXT,
+                chunk_index INTEGER,
+                header TEXT,
+                content TEXT,
+                content_folded TEXT,
+                section_number TEXT,
+                metadata JSON,
+                length INTEGER
+            );
+
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT,
+                chunk_id INTEGER,
+                tf REAL,
+                doc_length INTEGER,
+                PRIMARY KEY (term, chunk_id)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc_name, chunk_index);
+            CREATE INDEX IF NOT EXISTS idx_chunks_section ON chunks(section_number);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with *_chunks.json files on disk
+
+        Only new or modified files (by mtime/size) are re-indexed.
+        """
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+
+        on_disk = {}
+        for chunk_file in self.processed_docs_dir.glob("*_chunks.json"):
+            stat = chunk_file.stat()
+            on_disk[chunk_file.stem.replace("_chunks", "")] = (chunk_file, stat.st_mtime, stat.st_size)
+
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT doc_name, mtime, size FROM indexed_files")
+        }
+
+        with self.conn:
+            for doc_name in set(known) - set(on_disk):
+                self._remove_document(doc_name)
+                stats['removed'] += 1
+
+            for doc_name, (chunk_file, mtime, size) in on_disk.items():
+                if known.get(doc_name) == (mtime, size):
+                    stats['unchanged'] += 1
+                    continue
+                self._remove_document(doc_name)
+                self._index_document(doc_name, chunk_file)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO indexed_files (doc_name, mtime, size) VALUES (?, ?, ?)",
+                    (doc_name, mtime, size)
+                )
+                stats['indexed'] += 1
+
+        self._load_stats()
+        return stats
+
+    def _remove_document(self, doc_name: str):
+        self.conn.execute("""
+            DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE doc_name = ?)
+        """, (doc_name,))
+        self.conn.execute("DELETE FROM chunks WHERE doc_name = ?", (doc_name,))
+        self.conn.execute("DELETE FROM indexed_files WHERE doc_name = ?", (doc_name,))
+
+    def _index_document(self, doc_name: str, chunk_file: Path):
+        with open(chunk_file, 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+
+        for i, chunk in enumerate(chunks):
+            content = chunk.get('content', '')
+            header = chunk.get('header', '')
+            metadata = chunk.get('metadata', {})
+            content_folded = fold_text(content)
+
+            content_terms = Counter(TOKEN_PATTERN.findall(content_folded))
+            header_terms = Counter(tokenize(header))
+            length = sum(content_terms.values()) + sum(header_terms.values())
+
+            section_number = metadata.get('section_number')
+            cursor = self.conn.execute("""
+                INSERT INTO chunks
+                (doc_name, chunk_index, header, content, content_folded, section_number, metadata, length)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                doc_name, i, header, content, content_folded,
+                str(section_number) if section_number is not None else None,
+                json.dumps(metadata, ensure_ascii=False), length
+            ))
+            chunk_id = cursor.lastrowid
+
+            weights = Counter()
+            for term, count in content_terms.items():
+                weights[term] += count
+            for term, count in header_terms.items():
+                weights[term] += count * HEADER_WEIGHT
+
+            self.conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf, doc_length) VALUES (?, ?, ?, ?)",
+                [(term, chunk_id, tf, length) for term, tf in weights.items()]
+            )
+
+    def _load_stats(self):
+        row = self.conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+        self.total_chunks = row[0] or 0
+        self.avg_length = row[1] or 0.0
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def document_names(self) -> Dict[str, int]:
+        """Indexed documents with their chunk counts"""
+        return dict(self.conn.execute(
+            "SELECT doc_name, COUNT(*) FROM chunks GROUP BY doc_name ORDER BY doc_name"
+        ).fetchall())
+
+    def search(self, query: str, limit: int = 5,
+               doc_name: Optional[str] = None) -> List[Tuple[int, float]]:
+        """
+        BM25 search; only posting lists of the query terms are read
+
+        Returns:
+            List of (chunk_id, score) sorted by descending score
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.total_chunks:
+            return []
+
+        allowed = None
+        if doc_name is not None:
+            allowed = {
+                row[0] for row in
+                self.conn.execute("SELECT id FROM chunks WHERE doc_name = ?", (doc_name,))
+            }
+
+        scores: Dict[int, float] = {}
+        avg_length = self.avg_length or 1.0
+        for term in terms:
+            postings = self.conn.execute(
+                "SELECT chunk_id, tf, doc_length FROM postings WHERE term = ?", (term,)
+            ).fetchall()
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (self.total_chunks - df + 0.5) / (df + 0.5))
+            for chunk_id, tf, doc_length in postings:
+                if allowed is not None and chunk_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * doc_length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def get_chunks(self, chunk_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Lazily load chunk bodies for the given ids"""
+        if not chunk_ids:
+            return {}
+        placeholders = ','.join(['?'] * len(chunk_ids))
+        rows = self.conn.execute(f"""
+            SELECT id, doc_name, chunk_index, header, content, content_folded, metadata
+            FROM chunks WHERE id IN ({placeholders})
+        """, list(chunk_ids)).fetchall()
+        return {row[0]: self._row_to_chunk(row) for row in rows}
+
+    def get_chunk(self, doc_name: str, chunk_index: int) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("""
+            SELECT id, doc_name, chunk_index, header, content, content_folded, metadata
+            FROM chunks WHERE doc_name = ? AND chunk_index = ?
+        """, (doc_name, chunk_index)).fetchone()
+        return self._row_to_chunk(row) if row else None
+
+    def get_section_chunks(self, section_number: str,
+                           doc_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = """
+            SELECT id, doc_name, chunk_index, header, content, content_folded, metadata
+            FROM chunks WHERE section_number = ?
+        """
+        params: List[Any] = [str(section_number)]
+        if doc_name:
+            query += " AND doc_name = ?"
+            params.append(doc_name)
+        query += " ORDER BY doc_name, chunk_index"
+        return [self._row_to_chunk(row) for row in self.conn.execute(query, params)]
+
+    def get_leading_chunks(self, doc_name: str, count: int) -> List[Dict[str, Any]]:
+        """Header and metadata of the first chunks of a document (no bodies)"""
+        rows = self.conn.execute("""
+            SELECT header, metadata FROM chunks
+            WHERE doc_name = ? AND chunk_index < ?
+            ORDER BY chunk_index
+        """, (doc_name, count)).fetchall()
+        return [{'header': row[0], 'metadata': json.loads(row[1]) if row[1] else {}} for row in rows]
+
+    @staticmethod
+    def _row_to_chunk(row) -> Dict[str, Any]:
+        return {
+            'document': row[1],
+            'chunk_index': row[2],
+            'header': row[3],
+            'content': row[4],
+            'content_folded': row[5],
+            'metadata': json.loads(row[6]) if row[6] else {}
+        }
@@ -4,139 +4,131 @@ Claude-Friendly Interface for Large Document Chunks
 Allows intelligent querying of processed document chunks
 """
 
-import json
 import re
+import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ai_platform.core.chunk_search_index import ChunkSearchIndex
+from ai_platform.core.text_normalization import fold_text, tokenize
+from ai_platform.core.company_index import CompanyIndex
+
 class ClaudeChunkInterface:
     def __init__(self, processed_docs_dir: str = "processed_docs"):
         self.processed_docs_dir = Path(processed_docs_dir)
-        self.loaded_documents = {}
-        self.company_indexes = {}
+        self.loaded_documents = {}  # doc_name -> chunk count
+        self.company_index = None
+        self.search_index = None
         self._load_all_documents()
     
     def _load_all_documents(self):
-        """Load all processed documents into memory for fast querying"""
+        """Open the persistent search index, re-indexing only new or changed chunk files"""
         
         if not self.processed_docs_dir.exists():
             print(f"❌ Processed docs directory {self.processed_docs_dir} not found")
             return
         
-        # Find all chunk files
-        chunk_files = list(self.processed_docs_dir.glob("*_chunks.json"))
+        self.search_index = ChunkSearchIndex(str(self.processed_docs_dir))
+        stats = self.search_index.refresh()
+        if stats['indexed'] or stats['removed']:
+            print(f"🗂️  Search index updated: {stats['indexed']} indexed, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
         
-        for chunk_file in chunk_files:
-            doc_name = chunk_file.stem.replace("_chunks", "")
-            
-            # Load chunks
-            with open(chunk_file, 'r', encoding='utf-8') as f:
-                chunks = json.load(f)
-            
-            # Load company index
-            company_index_file = self.processed_docs_dir / f"{doc_name}_company_index.json"
-            if company_index_file.exists():
-                with open(company_index_file, 'r', encoding='utf-8') as f:
-                    company_index = json.load(f)
-            else:
-                company_index = {}
-            
-            self.loaded_documents[doc_name] = chunks
-            self.company_indexes[doc_name] = company_index
-            
-            print(f"📄 Loaded {doc_name}: {len(chunks)} chunks")
+        self.company_index = CompanyIndex(str(self.processed_docs_dir))
+        stats = self.company_index.refresh()
+        if stats['indexed'] or stats['removed']:
+            print(f"🏢 Company index updated: {stats['indexed']} indexed, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+        
+        self.loaded_documents = self.search_index.document_names()
+        
+        for doc_name, chunk_count in self.loaded_documents.items():
+            print(f"📄 Loaded {doc_name}: {chunk_count} chunks")
     
     def search_by_keyword(self, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Search for chunks containing specific keywords"""
+        """Search for chunks containing specific keywords (BM25 ranked)"""
+        
+        if self.search_index is None:
+            return []
+        
+        hits = self.search_index.search(keyword, limit)
+        chunks = self.search_index.get_chunks([chunk_id for chunk_id, _ in hits])
         
         results = []
-        keyword_lower = keyword.lower()
+        for chunk_id, score in hits:
+            chunk = chunks[chunk_id]
+            results.append({
+                'document': chunk['document'],
+                'chunk_index': chunk['chunk_index'],
+                'relevance_score': score,
+                'header': chunk['header'],
+                'preview': self._get_content_preview(chunk, keyword, 200),
+                'metadata': chunk['metadata']
+            })
         
-        for doc_name, chunks in self.loaded_documents.items():
-            for i, chunk in enumerate(chunks):
-                content = chunk.get('content', '').lower()
-                header = chunk.get('header', '').lower()
-                
-                if keyword_lower in content or keyword_lower in header:
-                    results.append({
-                        'document': doc_name,
-                        'chunk_index': i,
-                        'relevance_score': self._calculate_relevance(chunk, keyword_lower),
-                        'header': chunk.get('header', ''),
-                        'preview': self._get_content_preview(chunk, keyword, 200),
-                        'metadata': chunk.get('metadata', {})
-                    })
-        
-        # Sort by relevance and limit results
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return results[:limit]
+        return results
     
-    def search_by_company(self, company: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Find chunks related to specific company"""
+    def search_by_company(self, company: str, limit: int = 5,
+                          start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Find chunks related to specific company (optionally citing a date in an ISO range)"""
+        
+        if self.search_index is None:
+            return []
         
         results = []
         
-        for doc_name, company_index in self.company_indexes.items():
-            # Direct company match
-            if company in company_index:
-                chunk_indices = company_index[company][:limit]
-                chunks = self.loaded_documents[doc_name]
-                
-                for chunk_idx in chunk_indices:
-                    if chunk_idx < len(chunks):
-                        chunk = chunks[chunk_idx]
-                        results.append({
-                            'document': doc_name,
-                            'chunk_index': chunk_idx,
-                            'header': chunk.get('header', ''),
-                            'preview': self._get_content_preview(chunk, company, 200),
-                            'metadata': chunk.get('metadata', {}),
-                            'match_type': 'direct_index'
-                        })
-            
-            # Fuzzy company matching in chunk content
-            else:
-                chunks = self.loaded_documents[doc_name]
-                for i, chunk in enumerate(chunks):
-                    content = chunk.get('content', '').lower()
-                    if company.lower() in content:
-                        results.append({
-                            'document': doc_name,
-                            'chunk_index': i,
-                            'header': chunk.get('header', ''),
-                            'preview': self._get_content_preview(chunk, company, 200),
-                            'metadata': chunk.get('metadata', {}),
-                            'match_type': 'content_search'
-                        })
+        # Company index lookup (name or name prefix, any document)
+        for mention in self.company_index.find_mentions(company, start_date=start_date,
+                                                        end_date=end_date, limit=limit):
+            chunk = self.search_index.get_chunk(mention['document'], mention['chunk_index'])
+            if chunk is not None:
+                results.append({
+                    'document': mention['document'],
+                    'chunk_index': mention['chunk_index'],
+                    'header': chunk['header'],
+                    'preview': self._get_content_preview(chunk, company, 200),
+                    'metadata': chunk['metadata'],
+                    'match_type': 'direct_index'
+                })
+        
+        # Fall back to the inverted index for unindexed names
+        if not results and not (start_date or end_date):
+            hits = self.search_index.search(company, limit)
+            chunks = self.search_index.get_chunks([chunk_id for chunk_id, _ in hits])
+            for chunk_id, _ in hits:
+                chunk = chunks[chunk_id]
+                results.append({
+                    'document': chunk['document'],
+                    'chunk_index': chunk['chunk_index'],
+                    'header': chunk['header'],
+                    'preview': self._get_content_preview(chunk, company, 200),
+                    'metadata': chunk['metadata'],
+                    'match_type': 'content_search'
+                })
         
         return results[:limit]
     
     def get_section_by_number(self, section_number: str, doc_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all chunks from a specific numbered section (e.g., "1.", "2.")"""
         
-        results = []
-        target_docs = [doc_name] if doc_name else self.loaded_documents.keys()
-        
-        for doc in target_docs:
-            if doc not in self.loaded_documents:
-                continue
-                
-            chunks = self.loaded_documents[doc]
-            for i, chunk in enumerate(chunks):
-                metadata = chunk.get('metadata', {})
-                chunk_section = metadata.get('section_number')
-                
-                if chunk_section == section_number:
-                    results.append({
-                        'document': doc,
-                        'chunk_index': i,
-                        'header': chunk.get('header', ''),
-                        'content': chunk.get('content', ''),
-                        'metadata': metadata
-                    })
+        if self.search_index is None:
+            return []
         
-        return results
+        return [
+            {
+                'document': chunk['document'],
+                'chunk_index': chunk['chunk_index'],
+                'header': chunk['header'],
+                'content': chunk['content'],
+                'metadata': chunk['metadata']
+            }
+            for chunk in self.search_index.get_section_chunks(section_number, doc_name)
+        ]
     
     def get_document_overview(self, doc_name: Optional[str] = None) -> Dict[str, Any]:
         """Get overview of document structure and content"""
@@ -148,12 +140,12 @@ class ClaudeChunkInterface:
         
         overview = {}
         
-        for doc, chunks in docs_to_analyze.items():
+        for doc, chunk_count in docs_to_analyze.items():
             # Get section headers
             section_headers = []
             companies = set()
             
-            for chunk in chunks[:20]:  # First 20 chunks for overview
+            for chunk in self.search_index.get_leading_chunks(doc, 20):  # First 20 chunks for overview
                 header = chunk.get('header', '')
                 if header and len(header) < 100:  # Reasonable header length
                     section_headers.append(header)
@@ -165,10 +157,10 @@ class ClaudeChunkInterface:
                 companies.update(chunk_companies)
             
             overview[doc] = {
-                'total_chunks': len(chunks),
+                'total_chunks': chunk_count,
                 'main_sections': section_headers[:10],  # Top 10 sections
                 'companies_found': list(companies)[:10],  # Top 10 companies
-                'indexed_companies': list(self.company_indexes.get(doc, {}).keys())
+                'indexed_companies': self.company_index.document_entities(doc)
             }
         
         return overview
@@ -179,30 +171,15 @@ class ClaudeChunkInterface:
         if doc_name not in self.loaded_documents:
             return None
         
-        chunks = self.loaded_documents[doc_name]
-        if chunk_index >= len(chunks):
+        chunk = self.search_index.get_chunk(doc_name, chunk_index)
+        if chunk is None:
             return None
         
-        return chunks[chunk_index]
-    
-    def _calculate_relevance(self, chunk: Dict[str, Any], keyword: str) -> float:
-        """Calculate relevance score for keyword match"""
-        
-        content = chunk.get('content', '').lower()
-        header = chunk.get('header', '').lower()
-        
-        # Count keyword occurrences
-        content_matches = content.count(keyword)
-        header_matches = header.count(keyword) * 2  # Header matches worth more
-        
-        # Bonus for being in section header
-        header_bonus = 10 if keyword in header else 0
-        
-        # Penalty for very long chunks (less focused)
-        length_penalty = len(content) / 1000
-        
-        score = content_matches + header_matches + header_bonus - length_penalty
-        return max(0, score)
+        return {
+            'header': chunk['header'],
+            'content': chunk['content'],
+            'metadata': chunk['metadata']
+        }
     
     def _get_content_preview(self, chunk: Dict[str, Any], highlight_term: str, max_chars: int) -> str:
         """Get preview of chunk content with highlighted term"""
@@ -211,11 +188,14 @@ class ClaudeChunkInterface:
         if not content:
             return ""
         
-        # Find first occurrence of highlight term
-        content_lower = content.lower()
-        highlight_lower = highlight_term.lower()
+        # Find first occurrence of highlight term in the pre-folded content
+        content_folded = chunk.get('content_folded') or fold_text(content)
+        start_pos = content_folded.find(fold_text(highlight_term))
+        if start_pos == -1:
+            # Fall back to the first query token
+            tokens = tokenize(highlight_term)
+            start_pos = content_folded.find(tokens[0]) if tokens else -1
         
-        start_pos = content_lower.find(highlight_lower)
         if start_pos == -1:
             # Term not found, return beginning
             start_pos = 0
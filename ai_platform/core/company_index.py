@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Persistent Company Index for Processed Document Chunks
+SQLite inverted index from companies/plants to the chunks and pages that
+mention them, updated incrementally and queryable by name prefix and date range
+"""
+
+import json
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from ai_platform.core.text_normalization import fold_text
+from ai_platform.knowledge_graph.extractors.gazetteer import (
+    LEGAL_SUFFIX_PATTERN, Gazetteer, GazetteerEntry, load_default_gazetteer, normalize_for_id
+)
+
+# Same date pattern as LargeDocumentProcessor
+DATE_PATTERN = re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}-\d{2}-\d{2})')
+
+# Gazetteer categories indexed as entities
+ENTITY_CATEGORIES = ("companies", "power_plants")
+
+# Upper bound for prefix range scans on folded names
+PREFIX_END = '\U0010ffff'
+
+
+def parse_date(text: str) -> Optional[str]:
+    """ISO date of a dd/mm/yyyy, dd-mm-yy or yyyy-mm-dd string"""
+    parts = re.split(r'[-/]', text.strip())
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+    try:
+        if len(parts[0]) == 4:
+            year, month, day = (int(p) for p in parts)
+        else:
+            day, month, year = (int(p) for p in parts)
+            if year < 100:
+                year += 2000
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+class CompanyIndex:
+    """Company/plant -> chunk inverted index persisted next to the processed chunk files"""
+
+    INDEX_FILENAME = "company_index.db"
+
+    def __init__(self, processed_docs_dir: str, gazetteer: Optional[Gazetteer] = None):
+        self.processed_docs_dir = Path(processed_docs_dir)
+        self.db_path = self.processed_docs_dir / self.INDEX_FILENAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self._gazetteer = gazetteer
+        self._init_schema()
+
+    @property
+    def gazetteer(self) -> Gazetteer:
+        if self._gazetteer is None:
+            self._gazetteer = load_default_gazetteer()
+        return self._gazetteer
+
+    def _init_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS indexed_files (
+                doc_name TEXT PRIMARY KEY,
+                mtime REAL,
+                size INTEGER
+            );
+
+            CREATE TABLE IF NOT EXISTS entities (
+                id INTEGER PRIMARY KEY,
+                canonical_id TEXT UNIQUE,
+                name TEXT,
+                category TEXT
+            );
+
+            -- Canonical names and every surface form seen, folded for prefix scans
+            CREATE TABLE IF NOT EXISTS entity_names (
+                name_folded TEXT,
+                entity_id INTEGER,
+                PRIMARY KEY (name_folded, entity_id)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS mentions (
+                entity_id INTEGER,
+                doc_name TEXT,
+                chunk_index INTEGER,
+                start_page INTEGER,
+                end_page INTEGER,
+                first_offset INTEGER,
+                mention_count INTEGER,
+                PRIMARY KEY (entity_id, doc_name, chunk_index)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS chunk_dates (
+                doc_name TEXT,
+                chunk_index INTEGER,
+                date TEXT,
+                PRIMARY KEY (doc_name, chunk_index, date)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_mentions_doc ON mentions(doc_name, chunk_index);
+            CREATE INDEX IF NOT EXISTS idx_chunk_dates_date ON chunk_dates(date);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with *_chunks.json files on disk
+
+        Only new or modified files (by mtime/size) are re-indexed.
+        """
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+
+        on_disk = {}
+        for chunk_file in self.processed_docs_dir.glob("*_chunks.json"):
+            stat = chunk_file.stat()
+            on_disk[chunk_file.stem.replace("_chunks", "")] = (chunk_file, stat.st_mtime, stat.st_size)
+
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT doc_name, mtime, size FROM indexed_files")
+        }
+
+        with self.conn:
+            for doc_name in set(known) - set(on_disk):
+                self.remove_document(doc_name)
+                stats['removed'] += 1
+
+            for doc_name, (chunk_file, mtime, size) in on_disk.items():
+                if known.get(doc_name) == (mtime, size):
+                    stats['unchanged'] += 1
+                    continue
+                with open(chunk_file, 'r', encoding='utf-8') as f:
+                    chunks = json.load(f)
+                self.remove_document(doc_name)
+                for chunk_index, chunk in enumerate(chunks):
+                    self.add_chunk(doc_name, chunk_index, chunk)
+                self.mark_indexed(doc_name, chunk_file)
+                stats['indexed'] += 1
+
+        return stats
+
+    def mark_indexed(self, doc_name: str, chunk_file: Path):
+        """Record the chunk file state so refresh() skips it until it changes"""
+        stat = Path(chunk_file).stat()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO indexed_files (doc_name, mtime, size) VALUES (?, ?, ?)",
+            (doc_name, stat.st_mtime, stat.st_size)
+        )
+
+    def remove_document(self, doc_name: str):
+        self.conn.execute("DELETE FROM mentions WHERE doc_name = ?", (doc_name,))
+        self.conn.execute("DELETE FROM chunk_dates WHERE doc_name = ?", (doc_name,))
+        self.conn.execute("DELETE FROM indexed_files WHERE doc_name = ?", (doc_name,))
+
+    def add_chunk(self, doc_name: str, chunk_index: int, chunk: Dict[str, Any]):
+        """Index the companies, plants and dates of one chunk"""
+        content = chunk.get('content', '')
+        metadata = chunk.get('metadata', {})
+        extracted_data = metadata.get('extracted_data', {})
+        start_page = metadata.get('start_page')
+        end_page = metadata.get('end_page', start_page)
+
+        # entity_id -> [first offset, count]
+        found: Dict[int, List[int]] = {}
+
+        for match in self.gazetteer.find(content, ENTITY_CATEGORIES):
+            entry = match.entry
+            entity_id = self._entity_id(entry.canonical_id, entry.name, entry.category, match.surface)
+            if entity_id in found:
+                found[entity_id][1] += 1
+            else:
+                found[entity_id] = [match.start, 1]
+
+        # Companies the processor already extracted with its regexes, under
+        # the gazetteer entity when they name one ("Colbún S.A." -> Colbún)
+        for name in extracted_data.get('companies', []):
+            name = ' '.join(name.split())
+            if len(name) < 2:
+                continue
+            entry = self.resolve_name(name)
+            if entry is not None:
+                entity_id = self._entity_id(entry.canonical_id, entry.name, entry.category, name)
+            else:
+                entity_id = self._entity_id(f"cen:company:{normalize_for_id(name)}", name, "companies", name)
+            if entity_id not in found:
+                offset = fold_text(content).find(fold_text(name))
+                found[entity_id] = [offset, 1]
+
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO mentions
+            (entity_id, doc_name, chunk_index, start_page, end_page, first_offset, mention_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (entity_id, doc_name, chunk_index, start_page, end_page, offset, count)
+            for entity_id, (offset, count) in found.items()
+        ])
+
+        raw_dates = extracted_data.get('dates') or DATE_PATTERN.findall(content)
+        dates = {parse_date(raw) for raw in raw_dates}
+        dates.discard(None)
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO chunk_dates (doc_name, chunk_index, date) VALUES (?, ?, ?)",
+            [(doc_name, chunk_index, iso) for iso in dates]
+        )
+
+    def resolve_name(self, name: str) -> Optional[GazetteerEntry]:
+        """Gazetteer entry a whole name refers to, ignoring a trailing legal form (S.A., SpA, Ltda.)"""
+        for candidate in (name, LEGAL_SUFFIX_PATTERN.sub('', name)):
+            candidate = candidate.strip()
+            matches = self.gazetteer.find(candidate, ENTITY_CATEGORIES)
+            if len(matches) == 1 and matches[0].start == 0 and matches[0].end == len(candidate):
+                return matches[0].entry
+        return None
+
+    def _entity_id(self, canonical_id: str, name: str, category: str, surface: str) -> int:
+        row = self.conn.execute("SELECT id FROM entities WHERE canonical_id = ?", (canonical_id,)).fetchone()
+        if row:
+            entity_id = row[0]
+        else:
+            entity_id = self.conn.execute(
+                "INSERT INTO entities (canonical_id, name, category) VALUES (?, ?, ?)",
+                (canonical_id, name, category)
+            ).lastrowid
+            self.conn.execute(
+                "INSERT OR IGNORE INTO entity_names (name_folded, entity_id) VALUES (?, ?)",
+                (fold_text(name).strip(), entity_id)
+            )
+        self.conn.execute(
+            "INSERT OR IGNORE INTO entity_names (name_folded, entity_id) VALUES (?, ?)",
+            (fold_text(surface).strip(), entity_id)
+        )
+        return entity_id
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _matching_entities(self, name: str, prefix: bool = True) -> List[int]:
+        folded = fold_text(name).strip()
+        if not folded:
+            return []
+        if prefix:
+            rows = self.conn.execute(
+                "SELECT DISTINCT entity_id FROM entity_names WHERE name_folded >= ? AND name_folded < ?",
+                (folded, folded + PREFIX_END)
+            )
+        else:
+            rows = self.conn.execute(
+                "SELECT entity_id FROM entity_names WHERE name_folded = ?", (folded,)
+            )
+        return [row[0] for row in rows]
+
+    def search_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Entities whose name (or a seen surface form) starts with prefix, most mentioned first"""
+        entity_ids = self._matching_entities(prefix)
+        if not entity_ids:
+            return []
+        placeholders = ','.join(['?'] * len(entity_ids))
+        rows = self.conn.execute(f"""
+            SELECT e.canonical_id, e.name, e.category,
+                   COUNT(m.chunk_index), COUNT(DISTINCT m.doc_name), COALESCE(SUM(m.mention_count), 0)
+            FROM entities e LEFT JOIN mentions m ON m.entity_id = e.id
+            WHERE e.id IN ({placeholders})
+            GROUP BY e.id
+            ORDER BY COALESCE(SUM(m.mention_count), 0) DESC, e.name
+            LIMIT ?
+        """, (*entity_ids, limit)).fetchall()
+        return [
+            {
+                'canonical_id': row[0],
+                'name': row[1],
+                'category': row[2],
+                'chunks': row[3],
+                'documents': row[4],
+                'mentions': row[5]
+            }
+            for row in rows
+        ]
+
+    def find_mentions(self, name: str, prefix: bool = True,
+                      start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      doc_name: Optional[str] = None, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        Chunks that mention a company or plant
+
+        Args:
+            name: Name, alias or name prefix (accent/case-insensitive)
+            prefix: Match names starting with `name`
+            start_date, end_date: ISO dates; keep chunks citing a date in range
+            doc_name: Restrict to one document
+
+        Returns:
+            One mention per chunk, ordered by document and chunk, with page
+            range and offset; when several matching entities share a chunk
+            the most mentioned one is reported
+        """
+        entity_ids = self._matching_entities(name, prefix)
+        if not entity_ids:
+            return []
+
+        # Bare columns of a MAX() aggregate come from the row holding the maximum
+        query = f"""
+            SELECT e.canonical_id, e.name, m.doc_name, m.chunk_index,
+                   m.start_page, m.end_page, m.first_offset, MAX(m.mention_count)
+            FROM mentions m JOIN entities e ON e.id = m.entity_id
+            WHERE m.entity_id IN ({','.join(['?'] * len(entity_ids))})
+        """
+        params: List[Any] = list(entity_ids)
+        if doc_name:
+            query += " AND m.doc_name = ?"
+            params.append(doc_name)
+        if start_date or end_date:
+            query += """ AND EXISTS (
+                SELECT 1 FROM chunk_dates d
+                WHERE d.doc_name = m.doc_name AND d.chunk_index = m.chunk_index
+                  AND d.date >= ? AND d.date <= ?
+            )"""
+            params.extend([start_date or '0000-00-00', end_date or '9999-99-99'])
+        query += " GROUP BY m.doc_name, m.chunk_index ORDER BY m.doc_name, m.chunk_index"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            {
+                'canonical_id': row[0],
+                'name': row[1],
+                'document': row[2],
+                'chunk_index': row[3],
+                'start_page': row[4],
+                'end_page': row[5],
+                'offset': row[6],
+                'mention_count': row[7]
+            }
+            for row in self.conn.execute(query, params)
+        ]
+
+    def document_entities(self, doc_name: str, category: Optional[str] = None) -> List[str]:
+        """Names of the entities mentioned in a document, most mentioned first"""
+        query = """
+            SELECT e.name FROM mentions m JOIN entities e ON e.id = m.entity_id
+            WHERE m.doc_name = ?
+        """
+        params: List[Any] = [doc_name]
+        if category:
+            query += " AND e.category = ?"
+            params.append(category)
+        query += " GROUP BY e.id ORDER BY SUM(m.mention_count) DESC, e.name"
+        return [row[0] for row in self.conn.execute(query, params)]
+
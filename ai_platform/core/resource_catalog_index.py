@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Persistent Resource Catalogue Index
+SQLite catalogue of the JSON extraction files under domains/, with their
+domain, document type, size, mtime and top-level keys, kept up to date
+incrementally so discovery queries never walk the tree
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from ai_platform.core.text_normalization import fold_text, tokenize
+
+# Directory names never indexed
+SKIP_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv"}
+
+# Path components that give a file its document type
+DOCUMENT_TYPE_DIRS = {
+    "extractions": "extractions",
+    "raw_extractions": "extractions",
+    "outputs": "extractions",
+    "source": "source_documents",
+    "sources": "source_documents",
+    "schemas": "schemas",
+}
+
+# Files larger than this are catalogued without parsing their keys
+MAX_PARSE_BYTES = 64 * 1024 * 1024
+
+# Upper bound for prefix range scans on folded terms
+PREFIX_END = '\U0010ffff'
+
+# Parsed resource files by path, with the (mtime, size) they were read at
+_resources: Dict[str, Tuple[Tuple[float, int], Any]] = {}
+
+
+def document_type_of(relative_parts: Tuple[str, ...]) -> str:
+    """Document type of a file from the innermost typed directory on its path"""
+    for part in reversed(relative_parts[:-1]):
+        document_type = DOCUMENT_TYPE_DIRS.get(part)
+        if document_type:
+            return document_type
+    return "other"
+
+
+def describe_json(file_path: Path, size: int) -> Dict[str, Any]:
+    """Root type, top-level keys and item count of a JSON file"""
+    if size > MAX_PARSE_BYTES:
+        return {"root_type": None, "keys": [], "items": None, "error": "too_large"}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return {"root_type": None, "keys": [], "items": None, "error": type(e).__name__}
+
+    if isinstance(data, dict):
+        return {"root_type": "object", "keys": list(data.keys()), "items": len(data), "error": None}
+    if isinstance(data, list):
+        return {"root_type": "array", "keys": [], "items": len(data), "error": None}
+    return {"root_type": type(data).__name__, "keys": [], "items": None, "error": None}
+
+
+def load_resource(resource_path: Path) -> Any:
+    """
+    Parsed JSON of a resource file (e.g. platform_resource_catalog.json),
+    re-read only when its mtime/size change
+
+    Independent of the catalogue, so it never triggers a scan of domains/.
+    Each call returns its own copy; callers may modify it freely.
+    """
+    stat = resource_path.stat()
+    signature = (stat.st_mtime, stat.st_size)
+    cached = _resources.get(str(resource_path))
+    if cached is None or cached[0] != signature:
+        with open(resource_path, 'r', encoding='utf-8') as f:
+            cached = (signature, json.load(f))
+        _resources[str(resource_path)] = cached
+    return copy.deepcopy(cached[1])
+
+
+class DirectoryWatcher:
+    """
+    inotify watches on a directory tree (Linux, with inotify_simple installed)
+
+    Only reports which directories saw changes; the index rescans those.
+    """
+
+    def __init__(self):
+        from inotify_simple import INotify, flags
+        self.flags = flags
+        self.inotify = INotify()
+        self.mask = (flags.CREATE | flags.DELETE | flags.CLOSE_WRITE | flags.MODIFY |
+                     flags.MOVED_FROM | flags.MOVED_TO | flags.DELETE_SELF | flags.ATTRIB)
+        self.directories: Dict[int, Path] = {}
+        self.watched: Set[Path] = set()
+
+    def watch(self, directory: Path):
+        self.directories[self.inotify.add_watch(str(directory), self.mask)] = directory
+        self.watched.add(directory)
+
+    def changes(self) -> Optional[Set[Path]]:
+        """Directories with pending events, or None if the queue overflowed"""
+        changed = set()
+        for event in self.inotify.read(timeout=0):
+            if event.mask & self.flags.Q_OVERFLOW:
+                return None
+            directory = self.directories.get(event.wd)
+            if directory is None:
+                continue
+            if event.mask & self.flags.IGNORED:
+                # The directory itself is gone (or unmounted)
+                del self.directories[event.wd]
+                self.watched.discard(directory)
+            elif event.mask & self.flags.ISDIR and event.mask & self.flags.MOVED_FROM:
+                # Watches follow a moved directory, so theirs would report the old paths
+                self.unwatch(directory / event.name)
+            changed.add(directory)
+        return changed
+
+    def unwatch(self, directory: Path):
+        """Drop the watches on a directory and everything below it"""
+        for wd, path in list(self.directories.items()):
+            if path == directory or directory in path.parents:
+                try:
+                    self.inotify.rm_watch(wd)
+                except OSError:
+                    pass
+                del self.directories[wd]
+                self.watched.discard(path)
+
+    def close(self):
+        self.inotify.close()
+
+
+class ResourceCatalogIndex:
+    """Catalogue of domain JSON files persisted in platform_data/database/"""
+
+    INDEX_FILENAME = "resource_catalog_index.db"
+
+    def __init__(self, project_root: str, db_path: Optional[str] = None,
+                 max_age: float = 60.0, use_inotify: bool = True):
+        """
+        Args:
+            project_root: Repository root; files are catalogued from project_root/domains
+            db_path: Index location (default platform_data/database/resource_catalog_index.db)
+            max_age: Without inotify, seconds a stat scan stays fresh before the next one
+            use_inotify: Watch the tree for changes when inotify_simple is available
+        """
+        self.project_root = Path(project_root)
+        self.domains_dir = self.project_root / "domains"
+        if db_path is None:
+            db_path = self.project_root / "platform_data" / "database" / self.INDEX_FILENAME
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+        self.use_inotify = use_inotify
+        self.watcher: Optional[DirectoryWatcher] = None
+        self.last_scan = 0.0
+
+    def _init_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                domain TEXT,
+                document_type TEXT,
+                name TEXT,
+                size INTEGER,
+                mtime REAL,
+                root_type TEXT,
+                top_level_keys JSON,
+                item_count INTEGER,
+                parse_error TEXT
+            );
+
+            -- Folded tokens of each file's path and top-level keys
+            CREATE TABLE IF NOT EXISTS file_terms (
+                term TEXT,
+                path TEXT,
+                PRIMARY KEY (term, path)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_files_domain ON files(domain, document_type, path);
+            CREATE INDEX IF NOT EXISTS idx_files_type ON files(document_type, path);
+            CREATE INDEX IF NOT EXISTS idx_file_terms_path ON file_terms(path);
+        """)
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the catalogue up to date with the JSON files under domains/
+
+        The first call (and force=True) stats every file; only new or
+        modified files (by mtime/size) are parsed. After that, with inotify
+        only the directories that reported events are rescanned; without it
+        the stat scan is repeated once max_age has passed.
+        """
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'scanned_dirs': 0}
+
+        if self.watcher is not None and not force:
+            changed = self.watcher.changes()
+            if changed is not None:
+                for directory in sorted(changed):
+                    self._scan(directory, stats, recursive=False)
+                return stats
+            # Events were lost: fall back to a full scan with fresh watches
+            self.watcher.close()
+            self.watcher = None
+            force = True
+
+        if not force and time.time() - self.last_scan < self.max_age:
+            return stats
+
+        if self.use_inotify and self.watcher is None:
+            try:
+                self.watcher = DirectoryWatcher()
+            except (ImportError, OSError):
+                self.use_inotify = False
+
+        self._scan(self.domains_dir, stats, recursive=True)
+        self.last_scan = time.time()
+        return stats
+
+    def _scan(self, directory: Path, stats: Dict[str, int], recursive: bool):
+        """
+        Reconcile the catalogue with one directory
+
+        recursive=False (an inotify event) covers the files directly in the
+        directory plus any subdirectory not watched yet, i.e. new ones;
+        removed subdirectories report their own events.
+        """
+        prefix = self._relative(directory)
+        on_disk: Dict[str, Tuple[Path, float, int]] = {}
+        children: Set[str] = set()
+        # Catalogued paths the scan is authoritative for: everything under a
+        # recursively scanned directory, only direct files otherwise
+        subtrees = [prefix] if recursive else []
+        direct = [] if recursive else [prefix]
+
+        if directory.is_dir():
+            pending = [(directory, recursive)]
+            while pending:
+                current, deep = pending.pop()
+                stats['scanned_dirs'] += 1
+                self._watch(current)
+                try:
+                    entries = list(os.scandir(current))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in SKIP_DIRS:
+                            continue
+                        child = Path(entry.path)
+                        if current == directory:
+                            children.add(entry.name)
+                        if deep:
+                            pending.append((child, True))
+                        elif not self._is_watched(child):
+                            pending.append((child, True))
+                            subtrees.append(self._relative(child))
+                    elif entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        on_disk[self._relative(Path(entry.path))] = (Path(entry.path), stat.st_mtime, stat.st_size)
+        else:
+            subtrees, direct = [prefix], []
+
+        known: Dict[str, Tuple[float, int]] = {}
+        for scope in subtrees + direct:
+            for row in self.conn.execute(
+                "SELECT path, mtime, size FROM files WHERE path >= ? AND path < ?",
+                self._prefix_range(scope)
+            ):
+                rest = row['path'][len(scope) + 1 if scope else 0:]
+                # Under a non-recursive scan, subdirectories that still exist stand as they are
+                if scope in direct and "/" in rest and rest.split("/", 1)[0] in children:
+                    continue
+                known[row['path']] = (row['mtime'], row['size'])
+
+        with self.conn:
+            for path in set(known) - set(on_disk):
+                self._remove_file(path)
+                stats['removed'] += 1
+
+            for path, (file_path, mtime, size) in on_disk.items():
+                if known.get(path) == (mtime, size):
+                    stats['unchanged'] += 1
+                    continue
+                self._remove_file(path)
+                self._index_file(path, file_path, mtime, size)
+                stats['indexed'] += 1
+
+    def _watch(self, directory: Path):
+        if self.watcher is None or self._is_watched(directory):
+            return
+        try:
+            self.watcher.watch(directory)
+        except OSError:
+            # Out of inotify watches: polling keeps the catalogue correct
+            self.watcher.close()
+            self.watcher = None
+            self.use_inotify = False
+
+    def _is_watched(self, directory: Path) -> bool:
+        return self.watcher is not None and directory in self.watcher.watched
+
+    def _relative(self, path: Path) -> str:
+        relative = path.relative_to(self.project_root).as_posix()
+        return "" if relative == "." else relative
+
+    @staticmethod
+    def _prefix_range(prefix: str) -> Tuple[str, str]:
+        if not prefix:
+            return "", PREFIX_END
+        return prefix + "/", prefix + "/" + PREFIX_END
+
+    def _remove_file(self, path: str):
+        self.conn.execute("DELETE FROM file_terms WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _index_file(self, path: str, file_path: Path, mtime: float, size: int):
+        parts = tuple(path.split("/"))
+        domain = parts[1] if len(parts) > 2 else ""
+        description = describe_json(file_path, size)
+
+        self.conn.execute("""
+            INSERT INTO files
+            (path, domain, document_type, name, size, mtime, root_type, top_level_keys, item_count, parse_error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            path, domain, document_type_of(parts), parts[-1], size, mtime,
+            description["root_type"], json.dumps(description["keys"], ensure_ascii=False),
+            description["items"], description["error"]
+        ))
+
+        terms = set(tokenize(" ".join(parts[1:]).replace("_", " ")))
+        for key in description["keys"]:
+            terms.update(tokenize(str(key).replace("_", " ")))
+            terms.add(fold_text(str(key)))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO file_terms (term, path) VALUES (?, ?)",
+            [(term, path) for term in terms if term]
+        )
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _filters(self, domains: Optional[List[str]], document_type: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if domains:
+            clauses.append(f"domain IN ({','.join(['?'] * len(domains))})")
+            params.extend(domains)
+        if document_type and document_type != "all":
+            clauses.append("document_type = ?")
+            params.append(document_type)
+        return (" AND ".join(clauses) or "1"), params
+
+    def search(self, query: str = "", domains: Optional[List[str]] = None,
+               document_type: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Catalogued files matching every query term as a prefix of a path
+        component or top-level key, in path order
+        """
+        where, params = self._filters(domains, document_type)
+        for term in set(tokenize(query.replace("_", " "))):
+            where += " AND path IN (SELECT path FROM file_terms WHERE term >= ? AND term < ?)"
+            params.extend([term, term + PREFIX_END])
+        rows = self.conn.execute(
+            f"SELECT * FROM files WHERE {where} ORDER BY path LIMIT ?", params + [limit]
+        )
+        return [self._row_to_file(row) for row in rows]
+
+    def domain_summary(self, domains: Optional[List[str]] = None,
+                       document_type: Optional[str] = None, samples: int = 5) -> List[Dict[str, Any]]:
+        """Per-domain file counts, total size and the first few files"""
+        where, params = self._filters(domains, document_type)
+        summary = []
+        for row in self.conn.execute(f"""
+            SELECT domain, COUNT(*) AS files, SUM(size) AS total_size, MAX(mtime) AS last_modified
+            FROM files WHERE {where} GROUP BY domain ORDER BY domain
+        """, params).fetchall():
+            domain_where, domain_params = self._filters([row['domain']], document_type)
+            sample_files = [
+                sample[0] for sample in self.conn.execute(
+                    f"SELECT path FROM files WHERE {domain_where} ORDER BY path LIMIT ?",
+                    domain_params + [samples]
+                )
+            ]
+            summary.append({
+                "domain": row['domain'],
+                "files": row['files'],
+                "total_size": row['total_size'],
+                "last_modified": row['last_modified'],
+                "sample_files": sample_files
+            })
+        return summary
+
+    def get_file(self, path: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+        return self._row_to_file(row) if row else None
+
+    @staticmethod
+    def _row_to_file(row: sqlite3.Row) -> Dict[str, Any]:
+        result = dict(row)
+        result['top_level_keys'] = json.loads(result['top_level_keys'] or '[]')
+        return result
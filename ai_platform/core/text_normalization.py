@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Text Normalisation for Search and Matching
+Accent/case folding that keeps string length (so offsets map back to the
+original text) and word tokenisation, shared by the chunk, company and
+resource indexes and the gazetteer
+"""
+
+import re
+import unicodedata
+from typing import List
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _fold_char(char: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', char.lower())
+    base = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    if len(base) == 1:
+        return base
+    # Keep one output char per input char so offsets map back to the original text
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip accents without changing string length"""
+    if text.isascii():
+        return text.lower()
+    return ''.join(_fold_char(c) for c in text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-folded word tokens"""
+    return TOKEN_PATTERN.findall(fold_text(text))
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Vector Similarity Index for Document Embeddings
+Memory-mapped embedding matrix with exact and IVF/PQ approximate top-k search
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+
+class ChunkEmbedder:
+    """Batched chunk embedding with the multilingual MiniLM model"""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+
+    @property
+    def model(self):
+        """Load the sentence-transformers model on first use"""
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers is required for embeddings. "
+                    "Install with: pip install sentence-transformers"
+                )
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts in batches, returning L2-normalised float32 rows"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so that dot product equals cosine similarity"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, sorted descending"""
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if scores.size > k:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(scores.size)
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+
+def _kmeans(data: np.ndarray, n_clusters: int, iterations: int,
+            rng: np.random.Generator, spherical: bool = True) -> np.ndarray:
+    """Plain Lloyd k-means; spherical mode keeps centroids on the unit sphere"""
+    n_clusters = min(n_clusters, len(data))
+    centroids = data[rng.choice(len(data), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        if spherical:
+            assign = np.argmax(data @ centroids.T, axis=1)
+        else:
+            dists = (
+                (data ** 2).sum(1, keepdims=True)
+                - 2 * data @ centroids.T
+                + (centroids ** 2).sum(1)
+            )
+            assign = np.argmin(dists, axis=1)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=n_clusters).astype(np.float32)
+
+        empty = counts == 0
+        counts[empty] = 1.0
+        new_centroids = sums / counts[:, None]
+        # Re-seed empty clusters from random points
+        if empty.any():
+            new_centroids[empty] = data[rng.choice(len(data), int(empty.sum()))]
+        centroids = _normalize_rows(new_centroids) if spherical else new_centroids
+
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    """
+    Contiguous embedding matrix persisted as a memory-mapped .npy file
+
+    Files written next to the training database:
+        <stem>_vectors.npy      (capacity x dim) matrix, rows [0, count) are live
+        <stem>_vectors_ids.json id map and metadata
+        <stem>_vectors_ivf.npz  optional IVF centroids / PQ codes
+    """
+
+    BLOCK_SIZE = 65536
+    PQ_CENTROIDS = 256
+
+    def __init__(self, db_path: str, dtype: str = 'float32'):
+        db_path = Path(db_path)
+        base = db_path.parent / f"{db_path.stem}_vectors"
+        self.matrix_path = base.with_suffix('.npy')
+        self.ids_path = Path(f"{base}_ids.json")
+        self.ivf_path = Path(f"{base}_ivf.npz")
+
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported dtype: {dtype} (use float32 or float16)")
+
+        self.dim = 0
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self._matrix = None
+        self._ivf: Optional[Dict[str, np.ndarray]] = None
+        self._ivf_lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load id map and open the matrix read/write if it exists"""
+        if not self.ids_path.exists() or not self.matrix_path.exists():
+            return
+
+        with open(self.ids_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self.dim = meta['dim']
+        self.dtype = np.dtype(meta['dtype'])
+        self.ids = meta['ids']
+        self.id_to_row = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+        self._matrix = np.lib.format.open_memmap(str(self.matrix_path), mode='r+')
+
+        if self.ivf_path.exists():
+            with np.load(self.ivf_path) as data:
+                self._ivf = {key: data[key] for key in data.files}
+
+    def _save_ids(self):
+        tmp_path = self.ids_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dim': self.dim,
+                'dtype': self.dtype.name,
+                'count': len(self.ids),
+                'ids': self.ids
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.ids_path)
+
+    def _save_ivf(self):
+        tmp_path = self.ivf_path.with_name(self.ivf_path.stem + '_tmp.npz')
+        np.savez(tmp_path, **self._ivf)
+        os.replace(tmp_path, self.ivf_path)
+
+    def _ensure_capacity(self, needed: int):
+        """Grow the memmap geometrically so appends are amortised O(1)"""
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(needed, capacity * 2, 1024)
+        tmp_path = self.matrix_path.with_name(self.matrix_path.stem + '_tmp.npy')
+        grown = np.lib.format.open_memmap(
+            str(tmp_path), mode='w+', dtype=self.dtype, shape=(new_capacity, self.dim)
+        )
+        count = len(self.ids)
+        for start in range(0, count, self.BLOCK_SIZE):
+            end = min(start + self.BLOCK_SIZE, count)
+            grown[start:end] = self._matrix[start:end]
+        grown.flush()
+        del grown
+
+        self._matrix = None
+        os.replace(tmp_path, self.matrix_path)
+        self._matrix = np.lib.format.open_memmap(str(self.matrix_path), mode='r+')
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Live rows of the embedding matrix (memory-mapped view)"""
+        if self._matrix is None:
+            return np.zeros((0, self.dim), dtype=self.dtype)
+        return self._matrix[:len(self.ids)]
+
+    def add(self, chunk_ids: Sequence[str], embeddings: np.ndarray) -> int:
+        """
+        Append or overwrite embeddings for the given chunk ids
+
+        Returns:
+            Number of newly appended rows
+        """
+        embeddings = _normalize_rows(embeddings)
+        if len(chunk_ids) != len(embeddings):
+            raise ValueError("chunk_ids and embeddings must have the same length")
+        if not len(chunk_ids):
+            return 0
+
+        if self.dim == 0:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"Embedding dim {embeddings.shape[1]} != index dim {self.dim}")
+
+        # Later duplicates in the same batch win, like INSERT OR REPLACE
+        latest = {chunk_id: i for i, chunk_id in enumerate(chunk_ids)}
+        rows, sources, new_ids = [], [], []
+        next_row = len(self.ids)
+        for chunk_id, i in latest.items():
+            row = self.id_to_row.get(chunk_id)
+            if row is None:
+                row = next_row
+                next_row += 1
+                new_ids.append(chunk_id)
+            rows.append(row)
+            sources.append(i)
+
+        self._ensure_capacity(next_row)
+        rows = np.asarray(rows)
+        order = np.argsort(rows)
+        self._matrix[rows[order]] = embeddings[np.asarray(sources)[order]].astype(self.dtype)
+        self._matrix.flush()
+
+        for chunk_id in new_ids:
+            self.id_to_row[chunk_id] = len(self.ids)
+            self.ids.append(chunk_id)
+        self._save_ids()
+
+        if self._ivf is not None:
+            self._update_ivf(rows, embeddings[np.asarray(sources)])
+
+        return len(new_ids)
+
+    def sync_from_database(self, db_path: str, batch_size: int = 5000) -> int:
+        """Append rows from document_embeddings that are not yet indexed"""
+        import sqlite3
+
+        conn = sqlite3.connect(db_path)
+        added = 0
+        try:
+            cursor = conn.execute(
+                "SELECT chunk_id, embedding FROM document_embeddings WHERE embedding IS NOT NULL"
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                pending = [(cid, blob) for cid, blob in rows if cid not in self.id_to_row]
+                if not pending:
+                    continue
+                vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in pending])
+                added += self.add([cid for cid, _ in pending], vectors)
+        finally:
+            conn.close()
+        return added
+
+    # ------------------------------------------------------------------
+    # Exact search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        approximate: bool = False,
+        n_probe: int = 8,
+        rerank: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k cosine similarity search
+
+        Args:
+            query: Query embedding (1-D)
+            top_k: Number of results
+            approximate: Use the IVF index when it has been built
+            n_probe: IVF lists scanned per query
+            rerank: PQ candidates kept per result for exact re-scoring
+
+        Returns:
+            List of (chunk_id, score) sorted by descending score
+        """
+        if not self.ids:
+            return []
+        q = _normalize_rows(query)[0]
+
+        if approximate and self._ivf is not None:
+            rows, scores = self._search_ivf(q, top_k, n_probe, rerank)
+        else:
+            rows, scores = self._search_exact(q, top_k)
+
+        return [(self.ids[row], float(score)) for row, score in zip(rows, scores)]
+
+    def _search_exact(self, q: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Blocked matmul over the memmap, merging per-block top-k"""
+        matrix = self.vectors
+        best_rows, best_scores = [], []
+
+        for start in range(0, len(matrix), self.BLOCK_SIZE):
+            block = np.asarray(matrix[start:start + self.BLOCK_SIZE], dtype=np.float32)
+            scores = block @ q
+            idx = _top_k(scores, top_k)
+            best_rows.append(idx + start)
+            best_scores.append(scores[idx])
+
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        order = _top_k(scores, top_k)
+        return rows[order], scores[order]
+
+    def _score_rows(self, q: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Exact scores for a sorted subset of rows"""
+        return np.asarray(self._matrix[rows], dtype=np.float32) @ q
+
+    # ------------------------------------------------------------------
+    # Approximate search (IVF + optional product quantisation)
+    # ------------------------------------------------------------------
+
+    def build_ivf(
+        self,
+        n_lists: Optional[int] = None,
+        pq_subvectors: int = 0,
+        iterations: int = 10,
+        sample_size: int = 100000,
+        seed: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Train an inverted-file index (and optionally PQ codes) for large corpora
+
+        Args:
+            n_lists: Number of coarse clusters (default: sqrt(N))
+            pq_subvectors: Split vectors into this many sub-spaces and store
+                one uint8 code per sub-space; 0 disables PQ
+            iterations: k-means iterations
+            sample_size: Training sample size
+            seed: Random seed
+        """
+        count = len(self.ids)
+        if count == 0:
+            raise ValueError("Cannot build IVF on an empty index")
+        if pq_subvectors and self.dim % pq_subvectors:
+            raise ValueError(f"dim {self.dim} not divisible by pq_subvectors {pq_subvectors}")
+
+        rng = np.random.default_rng(seed)
+        n_lists = n_lists or max(1, int(np.sqrt(count)))
+        sample_rows = np.sort(rng.choice(count, min(sample_size, count), replace=False))
+        sample = np.asarray(self._matrix[sample_rows], dtype=np.float32)
+
+        ivf = {'centroids': _kmeans(sample, n_lists, iterations, rng)}
+
+        if pq_subvectors:
+            sub_dim = self.dim // pq_subvectors
+            codebooks = np.stack([
+                _kmeans(sample[:, m * sub_dim:(m + 1) * sub_dim], self.PQ_CENTROIDS,
+                        iterations, rng, spherical=False)
+                for m in range(pq_subvectors)
+            ])
+            ivf['codebooks'] = codebooks
+
+        self._ivf = ivf
+        self._ivf['assignments'] = np.zeros(0, dtype=np.int32)
+        if pq_subvectors:
+            self._ivf['codes'] = np.zeros((0, pq_subvectors), dtype=np.uint8)
+
+        for start in range(0, count, self.BLOCK_SIZE):
+            end = min(start + self.BLOCK_SIZE, count)
+            block = np.asarray(self._matrix[start:end], dtype=np.float32)
+            self._update_ivf(np.arange(start, end), block, save=False)
+        self._save_ivf()
+
+        return {
+            'vectors': count,
+            'lists': len(ivf['centroids']),
+            'pq_subvectors': pq_subvectors
+        }
+
+    def _encode_pq(self, vectors: np.ndarray) -> np.ndarray:
+        codebooks = self._ivf['codebooks']
+        n_sub, _, sub_dim = codebooks.shape
+        codes = np.empty((len(vectors), n_sub), dtype=np.uint8)
+        for m in range(n_sub):
+            sub = vectors[:, m * sub_dim:(m + 1) * sub_dim]
+            book = codebooks[m]
+            dists = (sub ** 2).sum(1, keepdims=True) - 2 * sub @ book.T + (book ** 2).sum(1)
+            codes[:, m] = np.argmin(dists, axis=1)
+        return codes
+
+    def _update_ivf(self, rows: np.ndarray, vectors: np.ndarray, save: bool = True):
+        """Assign appended/overwritten rows to their nearest coarse list"""
+        assignments = self._ivf['assignments']
+        needed = int(rows.max()) + 1
+        if needed > len(assignments):
+            assignments = np.concatenate(
+                [assignments, np.zeros(needed - len(assignments), dtype=np.int32)]
+            )
+        assignments[rows] = np.argmax(vectors @ self._ivf['centroids'].T, axis=1)
+        self._ivf['assignments'] = assignments
+
+        if 'codebooks' in self._ivf:
+            codes = self._ivf['codes']
+            if needed > len(codes):
+                codes = np.concatenate(
+                    [codes, np.zeros((needed - len(codes), codes.shape[1]), dtype=np.uint8)]
+                )
+            codes[rows] = self._encode_pq(vectors)
+            self._ivf['codes'] = codes
+
+        self._ivf_lists = None
+        if save:
+            self._save_ivf()
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows grouped by list (order) and list start offsets"""
+        if self._ivf_lists is None:
+            assignments = self._ivf['assignments']
+            order = np.argsort(assignments, kind='stable')
+            offsets = np.searchsorted(
+                assignments[order], np.arange(len(self._ivf['centroids']) + 1)
+            )
+            self._ivf_lists = (order, offsets)
+        return self._ivf_lists
+
+    def _search_ivf(self, q: np.ndarray, top_k: int, n_probe: int,
+                    rerank: int) -> Tuple[np.ndarray, np.ndarray]:
+        order, offsets = self._inverted_lists()
+        probe = _top_k(self._ivf['centroids'] @ q, n_probe)
+        candidates = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe])
+        if candidates.size == 0:
+            return candidates, np.zeros(0, dtype=np.float32)
+
+        if 'codebooks' in self._ivf:
+            # Asymmetric distance: score PQ codes via a lookup table, then re-rank exactly
+            codebooks = self._ivf['codebooks']
+            n_sub, _, sub_dim = codebooks.shape
+            lut = np.einsum('mkd,md->mk', codebooks, q.reshape(n_sub, sub_dim))
+            approx = lut[np.arange(n_sub), self._ivf['codes'][candidates]].sum(axis=1)
+            candidates = candidates[_top_k(approx, top_k * rerank)]
+
+        candidates = np.sort(candidates)
+        scores = self._score_rows(q, candidates)
+        idx = _top_k(scores, top_k)
+        return candidates[idx], scores[idx]
@@ -6,15 +6,24 @@ Extracts power plants, companies, locations from documents
 
 import re
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterable
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ai_platform.knowledge_graph.extractors.gazetteer import load_default_gazetteer, normalize_for_id
 
 class EntityExtractor:
     """Automatically extract entities from document text"""
 
-    def __init__(self):
+    def __init__(self, db_path: Optional[Path] = None):
         self.schemas_dir = Path(__file__).parent.parent / "schemas"
         self.vocabularies = self._load_vocabularies()
+        # Known names (vocabularies + companies table), matched in one pass
+        self.gazetteer = load_default_gazetteer(db_path)
 
     def _load_vocabularies(self) -> Dict:
         """Load domain vocabularies for entity recognition"""
@@ -26,28 +35,99 @@ class EntityExtractor:
 
     def extract_entities(self, document_text: str, domain: str) -> Dict[str, List[Dict]]:
         """Extract all entities from document text"""
+        return self.extract_entities_streaming([document_text], domain)
+
+    def extract_entities_streaming(self, pages: Iterable[str], domain: str) -> Dict[str, List[Dict]]:
+        """
+        Extract entities page by page, merging mentions as they arrive
+
+        Only the entity map is kept between pages, so memory is bounded by the
+        number of distinct entities and time is linear in the text length.
+
+        Args:
+            pages: Page texts in document order (any iterable, e.g. a generator)
+            domain: Document domain
+
+        Returns:
+            Same structure as extract_entities
+        """
+        accumulator = EntityAccumulator(self)
+        for page_number, page_text in enumerate(pages, 1):
+            for entity_type, entity_list in self._extract_page_entities(page_text).items():
+                for entity in entity_list:
+                    accumulator.add(entity_type, entity, page_number)
+        return accumulator.results()
+
+    def _extract_page_entities(self, text: str) -> Dict[str, List[Dict]]:
+        """Known and pattern entities of a single text, deduplicated by name"""
+        known_entities = self._extract_known_entities(text)
+
         entities = {
-            "power_plants": self._extract_power_plants(document_text),
-            "companies": self._extract_companies(document_text),
-            "locations": self._extract_locations(document_text),
-            "regulations": self._extract_regulations(document_text),
-            "equipment": self._extract_equipment(document_text)
+            "power_plants": self._extract_power_plants(text),
+            "companies": self._extract_companies(text),
+            "locations": self._extract_locations(text),
+            "regulations": self._extract_regulations(text),
+            "equipment": self._extract_equipment(text)
         }
 
-        # Add confidence scores and normalize IDs
         for entity_type, entity_list in entities.items():
             for entity in entity_list:
                 entity["@id"] = self._generate_entity_id(entity["name"], entity_type)
                 entity["@type"] = self._get_entity_type(entity["name"], entity_type)
-                if "confidence" not in entity:
-                    entity["confidence"] = self._calculate_confidence(entity["name"], document_text)
+
+        # Gazetteer hits carry canonical IDs; pattern hits that contain a
+        # known name of the same category are dropped in their favour
+        for entity_type, known_list in known_entities.items():
+            entities[entity_type] = known_list + [
+                e for e in entities.get(entity_type, [])
+                if not self.gazetteer.find(e["name"], categories=[entity_type])
+            ]
 
         return entities
 
+    def _match_patterns(self, text: str, patterns: List[str], min_length: int) -> List[Dict]:
+        """Run extraction patterns, keeping the first match per name and counting repeats"""
+        found: Dict[str, Dict] = {}
+        for pattern in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                name = match.group(1).strip()
+                if len(name) <= min_length:
+                    continue
+                entity = found.get(name)
+                if entity is None:
+                    found[name] = {
+                        "name": name,
+                        "raw_context": match.group(0),
+                        "position": match.start(),
+                        "mentions": 1
+                    }
+                else:
+                    entity["mentions"] += 1
+        return list(found.values())
+
+    def _extract_known_entities(self, text: str) -> Dict[str, List[Dict]]:
+        """Resolve every known entity mention with a single gazetteer pass"""
+        found: Dict[str, Dict[str, Dict]] = {}
+        for match in self.gazetteer.find(text):
+            entry = match.entry
+            by_id = found.setdefault(entry.category, {})
+            if entry.canonical_id in by_id:
+                by_id[entry.canonical_id]["mentions"] += 1
+                continue
+            by_id[entry.canonical_id] = {
+                "@id": entry.canonical_id,
+                "@type": entry.entity_type,
+                "name": entry.name,
+                "raw_context": match.surface,
+                "position": match.start,
+                "mentions": 1,
+                "source": "gazetteer"
+            }
+
+        return {category: list(by_id.values()) for category, by_id in found.items()}
+
     def _extract_power_plants(self, text: str) -> List[Dict]:
         """Extract power plant names from text"""
-        plants = []
-
         # Common Chilean power plant patterns
         plant_patterns = [
             r'(?:Planta|Central|Parque)\s+(?:Solar|Eólica|Hidroeléctrica|Térmica)?\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+\d*)',
@@ -56,23 +136,10 @@ class EntityExtractor:
             r'([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+)\s+\d+\s*MW',
         ]
 
-        for pattern in plant_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                plant_name = match.group(1).strip()
-                if len(plant_name) > 3 and plant_name not in [p["name"] for p in plants]:
-                    plants.append({
-                        "name": plant_name,
-                        "raw_context": match.group(0),
-                        "position": match.start()
-                    })
-
-        return plants
+        return self._match_patterns(text, plant_patterns, min_length=3)
 
     def _extract_companies(self, text: str) -> List[Dict]:
         """Extract company names from text"""
-        companies = []
-
         # Chilean company patterns
         company_patterns = [
             r'([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+)\s+(?:S\.A\.|Ltda\.|SpA)',
@@ -80,23 +147,10 @@ class EntityExtractor:
             r'([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+)\s+(?:Energía|Eléctrica|Power)',
         ]
 
-        for pattern in company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                company_name = match.group(1).strip()
-                if len(company_name) > 3 and company_name not in [c["name"] for c in companies]:
-                    companies.append({
-                        "name": company_name,
-                        "raw_context": match.group(0),
-                        "position": match.start()
-                    })
-
-        return companies
+        return self._match_patterns(text, company_patterns, min_length=3)
 
     def _extract_locations(self, text: str) -> List[Dict]:
         """Extract location names from text"""
-        locations = []
-
         # Chilean location patterns
         location_patterns = [
             r'Región\s+(?:de\s+)?([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+)',
@@ -105,23 +159,10 @@ class EntityExtractor:
             r'([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)\s+\d+\s*kV',  # Substations
         ]
 
-        for pattern in location_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                location_name = match.group(1).strip()
-                if len(location_name) > 3 and location_name not in [l["name"] for l in locations]:
-                    locations.append({
-                        "name": location_name,
-                        "raw_context": match.group(0),
-                        "position": match.start()
-                    })
-
-        return locations
+        return self._match_patterns(text, location_patterns, min_length=3)
 
     def _extract_regulations(self, text: str) -> List[Dict]:
         """Extract regulation references from text"""
-        regulations = []
-
         # Chilean regulation patterns
         regulation_patterns = [
             r'(?:Ley|Decreto|Resolución|Norma)\s+(?:N°\s*)?(\d+[\-/]\d+)',
@@ -130,23 +171,10 @@ class EntityExtractor:
             r'Procedimiento\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+)',
         ]
 
-        for pattern in regulation_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                reg_name = match.group(1).strip()
-                if len(reg_name) > 2 and reg_name not in [r["name"] for r in regulations]:
-                    regulations.append({
-                        "name": reg_name,
-                        "raw_context": match.group(0),
-                        "position": match.start()
-                    })
-
-        return regulations
+        return self._match_patterns(text, regulation_patterns, min_length=2)
 
     def _extract_equipment(self, text: str) -> List[Dict]:
         """Extract equipment mentions from text"""
-        equipment = []
-
         # Equipment patterns
         equipment_patterns = [
             r'(?:Transformador|Interruptor|Seccionador)\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ0-9\s\-]+)',
@@ -154,24 +182,12 @@ class EntityExtractor:
             r'Línea\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ0-9\s\-]+)',
         ]
 
-        for pattern in equipment_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                equipment_name = match.group(1).strip()
-                if len(equipment_name) > 3 and equipment_name not in [e["name"] for e in equipment]:
-                    equipment.append({
-                        "name": equipment_name,
-                        "raw_context": match.group(0),
-                        "position": match.start()
-                    })
-
-        return equipment
+        return self._match_patterns(text, equipment_patterns, min_length=3)
 
     def _generate_entity_id(self, name: str, entity_type: str) -> str:
         """Generate standardized entity ID"""
-        # Normalize name for ID
-        normalized = re.sub(r'[^a-zA-Z0-9\s]', '', name.lower())
-        normalized = re.sub(r'\s+', '_', normalized.strip())
+        # Normalize name for ID (accents folded, as in gazetteer canonical IDs)
+        normalized = normalize_for_id(name)
 
         # Map entity types to ID prefixes
         type_mapping = {
@@ -219,8 +235,12 @@ class EntityExtractor:
 
     def _calculate_confidence(self, entity_name: str, full_text: str) -> float:
         """Calculate confidence score for entity extraction"""
-        # Simple confidence based on context and repetition
         occurrences = full_text.lower().count(entity_name.lower())
+        return self._confidence_from_mentions(entity_name, occurrences)
+
+    def _confidence_from_mentions(self, entity_name: str, occurrences: int) -> float:
+        """Confidence from a mention count, so it can be merged incrementally"""
+        # Simple confidence based on context and repetition
         base_confidence = min(0.5 + (occurrences * 0.1), 0.95)
 
         # Boost confidence for well-formed names
@@ -233,6 +253,51 @@ class EntityExtractor:
 
         return max(0.1, min(0.99, base_confidence))
 
+class EntityAccumulator:
+    """Entities keyed by canonical @id, merged across pages in one hash map"""
+
+    def __init__(self, extractor: EntityExtractor):
+        self.extractor = extractor
+        self.entities: Dict[str, Dict[str, Dict]] = {
+            category: {} for category in ["power_plants", "companies", "locations", "regulations", "equipment"]
+        }
+
+    def add(self, category: str, entity: Dict, page_number: int = 1):
+        by_id = self.entities.setdefault(category, {})
+        mentions = entity.get("mentions", 1)
+        existing = by_id.get(entity["@id"])
+
+        if existing is None:
+            merged = dict(entity)
+            merged["mentions"] = mentions
+            merged["first_page"] = page_number
+            merged["page_count"] = 1
+            merged["_last_page"] = page_number
+            by_id[entity["@id"]] = merged
+            return
+
+        existing["mentions"] += mentions
+        if existing["_last_page"] != page_number:
+            existing["page_count"] += 1
+            existing["_last_page"] = page_number
+
+    def results(self) -> Dict[str, List[Dict]]:
+        """Entities in first-seen order with confidence from total mentions"""
+        output = {}
+        for category, by_id in self.entities.items():
+            entity_list = []
+            for entity in by_id.values():
+                entity.pop("_last_page", None)
+                if entity.get("source") == "gazetteer":
+                    entity["confidence"] = min(0.99, 0.9 + 0.02 * (entity["mentions"] - 1))
+                elif "confidence" not in entity:
+                    entity["confidence"] = self.extractor._confidence_from_mentions(
+                        entity["name"], entity["mentions"]
+                    )
+                entity_list.append(entity)
+            output[category] = entity_list
+        return output
+
 # Example usage
 if __name__ == "__main__":
     extractor = EntityExtractor()
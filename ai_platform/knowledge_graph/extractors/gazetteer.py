@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Gazetteer Entity Matcher - Single-pass lookup of known entity names
+Aho-Corasick automaton over accent/case-folded names from the domain
+vocabularies and the companies table, with canonical ID resolution
+"""
+
+import json
+import re
+import sqlite3
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Iterable
+
+from ai_platform.core.text_normalization import fold_text
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DEFAULT_VOCABULARY_FILE = Path(__file__).parent.parent / "schemas" / "domain_vocabularies.json"
+DEFAULT_DATABASE = PROJECT_ROOT / "platform_data" / "database" / "dark_data.db"
+
+# Same prefixes as EntityExtractor._generate_entity_id
+ID_PREFIXES = {
+    "power_plants": "plant",
+    "companies": "company",
+    "locations": "location",
+    "regulations": "regulation",
+    "equipment": "equipment"
+}
+
+# Legal-form suffixes dropped to derive a matching alias from a registered company name
+LEGAL_SUFFIX_PATTERN = re.compile(r'[\s,]+(s\.?\s?a\.?|spa|ltda\.?|limitada)\s*$', re.IGNORECASE)
+
+
+def normalize_for_id(name: str) -> str:
+    """Accent-folded snake_case used in canonical entity IDs"""
+    normalized = re.sub(r'[^a-z0-9\s]', '', fold_text(name))
+    return re.sub(r'\s+', '_', normalized.strip())
+
+
+def _fold_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """Fold text and collapse whitespace runs, keeping a map back to original offsets"""
+    folded = fold_text(text)
+    chars = []
+    offsets = []
+    previous_space = True
+    for i, char in enumerate(folded):
+        if char.isspace():
+            if previous_space:
+                continue
+            char = ' '
+            previous_space = True
+        else:
+            previous_space = False
+        chars.append(char)
+        offsets.append(i)
+    return ''.join(chars), offsets
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    """A known entity with its canonical identity"""
+    canonical_id: str
+    name: str
+    category: str
+    entity_type: str
+
+
+@dataclass
+class GazetteerMatch:
+    """One entity mention found in a text"""
+    entry: GazetteerEntry
+    surface: str
+    start: int
+    end: int
+
+
+class Gazetteer:
+    """Aho-Corasick multi-pattern matcher over known entity names"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (pattern length, entry) of the patterns added ending there
+        self._terminals: List[List[Tuple[int, GazetteerEntry]]] = [[]]
+        # The same plus those reached through failure links; set by build()
+        self._outputs: List[List[Tuple[int, GazetteerEntry]]] = [[]]
+        self.entries: Dict[str, GazetteerEntry] = {}
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, name: str, category: str, entity_type: str,
+            aliases: Iterable[str] = (), canonical_id: Optional[str] = None) -> GazetteerEntry:
+        """Register an entity under its name and aliases"""
+        prefix = ID_PREFIXES.get(category, "entity")
+        canonical_id = canonical_id or f"cen:{prefix}:{normalize_for_id(name)}"
+        entry = self.entries.get(canonical_id)
+        if entry is None:
+            entry = GazetteerEntry(canonical_id, name, category, entity_type)
+            self.entries[canonical_id] = entry
+
+        for surface in (name, *aliases):
+            self._add_pattern(surface, entry)
+        return entry
+
+    def _add_pattern(self, surface: str, entry: GazetteerEntry):
+        pattern, _ = _fold_with_offsets(surface.strip())
+        if len(pattern) < 2:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminals.append([])
+            state = next_state
+        if all(existing is not entry for _, existing in self._terminals[state]):
+            self._terminals[state].append((len(pattern), entry))
+        self._built = False
+
+    def build(self):
+        """Compute failure links and outputs (breadth-first over the trie); safe to repeat after add()"""
+        self._outputs = [list(terminals) for terminals in self._terminals]
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+        self._built = True
+
+    def find(self, text: str, categories: Optional[Iterable[str]] = None) -> List[GazetteerMatch]:
+        """
+        Find every known entity mention in one pass over the text
+
+        Matches must sit on word boundaries; overlapping mentions are
+        resolved leftmost-longest ("Enel Green Power" wins over "Enel").
+
+        Returns:
+            Non-overlapping matches ordered by position in the original text
+        """
+        if not self._built:
+            self.build()
+
+        allowed = set(categories) if categories is not None else None
+        folded, offsets = _fold_with_offsets(text)
+        length = len(folded)
+
+        candidates = []
+        state = 0
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        for i, char in enumerate(folded):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+
+            end = i + 1
+            if end < length and folded[end].isalnum():
+                continue
+            for pattern_length, entry in outputs[state]:
+                start = end - pattern_length
+                if start > 0 and folded[start - 1].isalnum():
+                    continue
+                if allowed is not None and entry.category not in allowed:
+                    continue
+                candidates.append((start, end, entry))
+
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        matches = []
+        last_end = 0
+        for start, end, entry in candidates:
+            if start < last_end:
+                continue
+            original_start = offsets[start]
+            original_end = offsets[end - 1] + 1
+            matches.append(GazetteerMatch(entry, text[original_start:original_end], original_start, original_end))
+            last_end = end
+
+        return matches
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def load_vocabulary(self, vocabulary_file: Path = DEFAULT_VOCABULARY_FILE) -> int:
+        """Load the "gazetteer" section of domain_vocabularies.json"""
+        if not vocabulary_file.exists():
+            return 0
+        with open(vocabulary_file, 'r', encoding='utf-8') as f:
+            vocabularies = json.load(f)
+        vocabularies = vocabularies.get("coordinador_vocabularies", vocabularies)
+
+        loaded = 0
+        for category, items in vocabularies.get("gazetteer", {}).items():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                self.add(item["name"], category, item.get("@type", "Entity"),
+                         aliases=item.get("aliases", []), canonical_id=item.get("@id"))
+                loaded += 1
+        return loaded
+
+    def load_companies_table(self, db_path: Path = DEFAULT_DATABASE) -> int:
+        """Load registered company names from the companies table"""
+        if not Path(db_path).exists():
+            return 0
+        try:
+            conn = sqlite3.connect(str(db_path))
+            try:
+                rows = conn.execute("SELECT name FROM companies WHERE name IS NOT NULL").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return 0
+
+        for (name,) in rows:
+            short_name = LEGAL_SUFFIX_PATTERN.sub('', name).strip()
+            aliases = [short_name] if short_name and short_name != name else []
+            self.add(name, "companies", "PowerCompany", aliases=aliases)
+        return len(rows)
+
+
+_default_gazetteers: Dict[Tuple, Gazetteer] = {}
+
+
+def load_default_gazetteer(db_path: Optional[Path] = None) -> Gazetteer:
+    """
+    Shared gazetteer built once from the vocabularies and the companies table
+
+    Rebuilt only when either source file changes on disk.
+    """
+    db_path = Path(db_path) if db_path else DEFAULT_DATABASE
+
+    def mtime(path: Path) -> float:
+        return path.stat().st_mtime if path.exists() else 0.0
+
+    key = (str(db_path), mtime(DEFAULT_VOCABULARY_FILE), mtime(db_path))
+    gazetteer = _default_gazetteers.get(key)
+    if gazetteer is None:
+        gazetteer = Gazetteer()
+        gazetteer.load_vocabulary()
+        gazetteer.load_companies_table(db_path)
+        gazetteer.build()
+        _default_gazetteers.clear()
+        _default_gazetteers[key] = gazetteer
+    return gazetteer
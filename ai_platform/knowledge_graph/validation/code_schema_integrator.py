@@ -144,13 +144,12 @@ def extract_entities_from_data(data: dict) -> dict:
                 for cell_value in row.values():
                     if isinstance(cell_value, str) and is_likely_plant_name(cell_value):
                         plant_name = cell_value.strip()
-                        if not any(p["name"] == plant_name for p in entities["power_plants"]):
-                            entities["power_plants"].append({{
-                                "@id": f"cen:plant:{{normalize_name(plant_name)}}",
-                                "@type": determine_plant_type(plant_name),
-                                "name": plant_name,
-                                "confidence": 0.8
-                            }})
+                        entities["power_plants"].append({{
+                            "@id": f"cen:plant:{{normalize_name(plant_name)}}",
+                            "@type": determine_plant_type(plant_name),
+                            "name": plant_name,
+                            "confidence": 0.8
+                        }})
 
     # Remove duplicates
     entities["power_plants"] = remove_duplicate_entities(entities["power_plants"])
@@ -215,17 +214,19 @@ def normalize_name(name: str) -> str:
     return normalized
 
 def remove_duplicate_entities(entity_list: list) -> list:
-    """Remove duplicate entities by name"""
-    seen_names = set()
-    unique_entities = []
+    """Merge duplicate entities by canonical @id (one hash lookup per entity)"""
+    unique_entities = {{}}
 
     for entity in entity_list:
-        name = entity.get("name", "")
-        if name not in seen_names:
-            seen_names.add(name)
-            unique_entities.append(entity)
+        key = entity.get("@id") or normalize_name(entity.get("name", ""))
+        existing = unique_entities.get(key)
+        if existing is None:
+            unique_entities[key] = dict(entity, mentions=entity.get("mentions", 1))
+        else:
+            existing["mentions"] += entity.get("mentions", 1)
+            existing["confidence"] = max(existing.get("confidence", 0), entity.get("confidence", 0))
 
-    return unique_entities
+    return list(unique_entities.values())
 
 def generate_semantic_tags(data: dict, domain: str) -> list:
     """Generate semantic tags from extraction data"""
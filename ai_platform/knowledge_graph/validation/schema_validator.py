@@ -6,42 +6,105 @@ Forces Claude and all AI systems to respect JSON schema structure
 
 import json
 import jsonschema
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable, Tuple
 from datetime import datetime
 
+VALID_DOMAINS = ["operaciones", "mercados", "legal", "planificacion"]
+
+# Structural contract enforced on every document. The full
+# universal_document_schema.json is stricter and opt-in (full_schema=True).
+CORE_DOCUMENT_SCHEMA = {
+    "version": "1.0.0",
+    "type": "object",
+    "required": ["@context", "@id", "@type", "universal_metadata"],
+    "properties": {
+        "@context": {"type": "string"},
+        "@id": {"type": "string"},
+        "@type": {"type": "string"},
+        "universal_metadata": {
+            "type": "object",
+            "required": ["title", "domain", "document_type", "creation_date"],
+            "properties": {
+                "title": {"type": "string"},
+                "domain": {"type": "string", "enum": VALID_DOMAINS},
+                "document_type": {"type": "string"},
+                "creation_date": {"type": "string"}
+            }
+        },
+        "entities": {"type": "object"},
+        "cross_references": {"type": "array"},
+        "semantic_tags": {"type": "array"},
+        "domain_specific_data": {"type": "object"},
+        "quality_metadata": {"type": "object"}
+    }
+}
+
+# Parsed schema files keyed by (path, mtime), so each new validator
+# instance does not re-read and re-parse them from disk
+_schema_file_cache: Dict[Tuple[str, float], Dict] = {}
+
+
+def _load_schema_file(path: Path) -> Dict:
+    if not path.exists():
+        return {}
+    key = (str(path), path.stat().st_mtime)
+    if key not in _schema_file_cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            _schema_file_cache[key] = json.load(f)
+    return _schema_file_cache[key]
+
+
+# Compiled validators shared by every SchemaValidator instance,
+# keyed by (schema name, schema version)
+_compiled_validators: Dict[Tuple[str, str], Any] = {}
+
+
+def get_compiled_validator(schema: Dict, name: str):
+    """Check and compile a JSON schema once per (name, version)"""
+    key = (name, str(schema.get("version", "unversioned")))
+    validator = _compiled_validators.get(key)
+    if validator is None:
+        validator_class = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        _compiled_validators[key] = validator
+    return validator
+
+
 class SchemaValidator:
     """Validates all document extractions against universal schema"""
 
-    def __init__(self):
+    def __init__(self, full_schema: bool = False):
         self.schemas_dir = Path(__file__).parent.parent / "schemas"
         self.universal_schema = self._load_universal_schema()
         self.domain_vocabularies = self._load_domain_vocabularies()
         self.context_schema = self._load_context_schema()
 
+        if full_schema and self.universal_schema:
+            self.compiled_schema = get_compiled_validator(self.universal_schema, "universal_document_schema")
+        else:
+            self.compiled_schema = get_compiled_validator(CORE_DOCUMENT_SCHEMA, "core_document_schema")
+
+        # Vocabulary lookups are per-instance constants, not per-document work
+        self.entity_vocabulary = self.domain_vocabularies.get("entity_types", {})
+        self.approved_tags = set()
+        for tag_category in self.domain_vocabularies.get("semantic_tags", {}).values():
+            if isinstance(tag_category, list):
+                self.approved_tags.update(tag_category)
+
     def _load_universal_schema(self) -> Dict:
         """Load universal document schema for validation"""
-        schema_file = self.schemas_dir / "universal_document_schema.json"
-        if schema_file.exists():
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return _load_schema_file(self.schemas_dir / "universal_document_schema.json")
 
     def _load_domain_vocabularies(self) -> Dict:
         """Load domain vocabularies for entity validation"""
-        vocab_file = self.schemas_dir / "domain_vocabularies.json"
-        if vocab_file.exists():
-            with open(vocab_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return _load_schema_file(self.schemas_dir / "domain_vocabularies.json")
 
     def _load_context_schema(self) -> Dict:
         """Load JSON-LD context for validation"""
-        context_file = self.schemas_dir / "coordinador_context.jsonld"
-        if context_file.exists():
-            with open(context_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return _load_schema_file(self.schemas_dir / "coordinador_context.jsonld")
 
     def validate_document(self, document: Dict, strict_mode: bool = True) -> Dict:
         """
@@ -58,27 +121,33 @@ class SchemaValidator:
             "valid": True,
             "errors": [],
             "warnings": [],
+            "error_details": [],
             "corrected_document": document.copy(),
             "auto_corrections": []
         }
 
+        def add_errors(check: str, errors: List[str]):
+            validation_result["errors"].extend(errors)
+            validation_result["error_details"].extend(
+                {"check": check, "path": None, "message": error} for error in errors
+            )
+
         # 1. Validate JSON Schema structure
         schema_validation = self._validate_json_schema(document)
         validation_result["errors"].extend(schema_validation["errors"])
+        validation_result["error_details"].extend(schema_validation["details"])
         validation_result["warnings"].extend(schema_validation["warnings"])
 
         # 2. Validate required universal fields
-        universal_validation = self._validate_universal_fields(document)
-        validation_result["errors"].extend(universal_validation["errors"])
+        add_errors("universal_fields", self._validate_universal_fields(document)["errors"])
 
         # 3. Validate entity types against vocabularies
         entity_validation = self._validate_entities(document)
-        validation_result["errors"].extend(entity_validation["errors"])
+        add_errors("entities", entity_validation["errors"])
         validation_result["warnings"].extend(entity_validation["warnings"])
 
         # 4. Validate cross-references
-        cross_ref_validation = self._validate_cross_references(document)
-        validation_result["errors"].extend(cross_ref_validation["errors"])
+        add_errors("cross_references", self._validate_cross_references(document)["errors"])
 
         # 5. Validate semantic tags
         tags_validation = self._validate_semantic_tags(document)
@@ -90,51 +159,98 @@ class SchemaValidator:
             validation_result["corrected_document"] = corrected["document"]
             validation_result["auto_corrections"] = corrected["corrections"]
             validation_result["errors"] = corrected["remaining_errors"]
+            # Schema violations are never auto-corrected
+            remaining = set(corrected["remaining_errors"])
+            validation_result["error_details"] = [
+                detail for detail in validation_result["error_details"]
+                if detail["check"] == "json_schema" or detail["message"] in remaining
+            ]
 
         validation_result["valid"] = len(validation_result["errors"]) == 0
 
         return validation_result
 
+    def validate_batch(self, documents: Iterable[Dict], strict_mode: bool = True,
+                       keep_documents: bool = True) -> Dict:
+        """
+        Validate many documents in one call with the shared compiled schema
+
+        Args:
+            documents: Documents to validate
+            strict_mode: Same meaning as in validate_document
+            keep_documents: If False, drop corrected documents from the
+                per-document results to keep memory flat on large batches
+
+        Returns:
+            Dict with per-document results, flat structured errors and counts
+        """
+        batch_result = {
+            "total": 0,
+            "valid_count": 0,
+            "invalid_count": 0,
+            "results": [],
+            "errors": [],
+            "error_summary": {}
+        }
+        error_counts = Counter()
+
+        for index, document in enumerate(documents):
+            if isinstance(document, dict):
+                result = self.validate_document(document, strict_mode)
+            else:
+                message = f"Document must be object, found: {type(document)}"
+                result = {
+                    "valid": False,
+                    "errors": [message],
+                    "warnings": [],
+                    "error_details": [{"check": "json_schema", "path": None, "message": message}],
+                    "corrected_document": None,
+                    "auto_corrections": []
+                }
+
+            if not keep_documents:
+                result["corrected_document"] = None
+
+            batch_result["total"] += 1
+            if result["valid"]:
+                batch_result["valid_count"] += 1
+            else:
+                batch_result["invalid_count"] += 1
+
+            for detail in result["error_details"]:
+                batch_result["errors"].append({"index": index, **detail})
+                error_counts[detail["check"]] += 1
+
+            batch_result["results"].append(result)
+
+        batch_result["error_summary"] = dict(error_counts)
+        return batch_result
+
     def _validate_json_schema(self, document: Dict) -> Dict:
-        """Validate against JSON Schema"""
+        """Validate against the compiled JSON Schema"""
         errors = []
         warnings = []
+        details = []
 
         try:
-            # Create a basic schema validator for universal structure
-            schema = {
-                "type": "object",
-                "required": ["@context", "@id", "@type", "universal_metadata"],
-                "properties": {
-                    "@context": {"type": "string"},
-                    "@id": {"type": "string"},
-                    "@type": {"type": "string"},
-                    "universal_metadata": {
-                        "type": "object",
-                        "required": ["title", "domain", "document_type", "creation_date"],
-                        "properties": {
-                            "title": {"type": "string"},
-                            "domain": {"type": "string", "enum": ["operaciones", "mercados", "legal", "planificacion"]},
-                            "document_type": {"type": "string"},
-                            "creation_date": {"type": "string"}
-                        }
-                    },
-                    "entities": {"type": "object"},
-                    "cross_references": {"type": "array"},
-                    "semantic_tags": {"type": "array"},
-                    "domain_specific_data": {"type": "object"},
-                    "quality_metadata": {"type": "object"}
-                }
-            }
-
-            jsonschema.validate(document, schema)
+            schema_errors = list(self.compiled_schema.iter_errors(document))
+            if schema_errors:
+                # Report the most relevant violation, as jsonschema.validate did
+                best = jsonschema.exceptions.best_match(schema_errors)
+                errors.append(f"JSON Schema validation failed: {best.message}")
+                for error in schema_errors:
+                    details.append({
+                        "check": "json_schema",
+                        "path": "/".join(str(part) for part in error.absolute_path) or None,
+                        "validator": error.validator,
+                        "message": error.message
+                    })
 
-        except jsonschema.ValidationError as e:
-            errors.append(f"JSON Schema validation failed: {e.message}")
         except Exception as e:
             errors.append(f"Schema validation error: {str(e)}")
+            details.append({"check": "json_schema", "path": None, "message": errors[-1]})
 
-        return {"errors": errors, "warnings": warnings}
+        return {"errors": errors, "warnings": warnings, "details": details}
 
     def _validate_universal_fields(self, document: Dict) -> Dict:
         """Validate universal metadata fields"""
@@ -171,7 +287,7 @@ class SchemaValidator:
         warnings = []
 
         entities = document.get("entities", {})
-        vocab = self.domain_vocabularies.get("entity_types", {})
+        vocab = self.entity_vocabulary
 
         for entity_type, entity_list in entities.items():
             # Check if entity type is in vocabulary
@@ -234,8 +350,7 @@ class SchemaValidator:
 
             # Validate target_domain
             target_domain = ref.get("target_domain")
-            valid_domains = ["operaciones", "mercados", "legal", "planificacion"]
-            if target_domain and target_domain not in valid_domains:
+            if target_domain and target_domain not in VALID_DOMAINS:
                 errors.append(f"Cross-reference {i} invalid target_domain: {target_domain}")
 
         return {"errors": errors}
@@ -249,12 +364,7 @@ class SchemaValidator:
             warnings.append("semantic_tags should be an array")
             return {"warnings": warnings}
 
-        # Load approved tags from vocabulary
-        approved_tags = set()
-        vocab = self.domain_vocabularies.get("semantic_tags", {})
-        for tag_category in vocab.values():
-            if isinstance(tag_category, list):
-                approved_tags.update(tag_category)
+        approved_tags = self.approved_tags
 
         # Check each tag
         for tag in tags:
@@ -505,6 +615,10 @@ if __name__ == "__main__":
     if result['auto_corrections']:
         print("Auto-corrections:", result['auto_corrections'])
 
+    # Batch validation reuses the compiled schema
+    batch = validator.validate_batch([test_doc] * 1000, keep_documents=False)
+    print(f"Batch: {batch['valid_count']}/{batch['total']} valid, errors by check: {batch['error_summary']}")
+
     # Generate enforcer prompt
     prompt = validator.create_schema_enforcer_prompt("operaciones", "anexo_01")
     print("\nSchema Enforcer Prompt Preview:")
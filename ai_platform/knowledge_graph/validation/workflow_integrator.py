@@ -73,10 +73,21 @@ import json
         # Add schema enforcement function
         function_addition = f'''
 
+_schema_enforcer = None
+
+
+def _get_schema_enforcer() -> ClaudeSchemaEnforcer:
+    """One enforcer per process; its compiled schema is reused on every save"""
+    global _schema_enforcer
+    if _schema_enforcer is None:
+        _schema_enforcer = ClaudeSchemaEnforcer()
+    return _schema_enforcer
+
+
 def apply_schema_enforcement(extracted_data: dict, document_text: str = "") -> dict:
     """Apply universal schema enforcement to extracted data"""
 
-    enforcer = ClaudeSchemaEnforcer()
+    enforcer = _get_schema_enforcer()
 
     # If data doesn't have universal structure, wrap it
     if "@context" not in extracted_data:
@@ -126,7 +137,7 @@ def apply_schema_enforcement(extracted_data: dict, document_text: str = "") -> d
 
     # Validate and correct
     validation_result = enforcer.validate_claude_response(
-        response=json.dumps(universal_data),
+        response=universal_data,
         domain="{domain}",
         strict_mode=False
     )
@@ -7,18 +7,34 @@ Centralized resource discovery and cataloging for the AI platform
 import asyncio
 import json
 import os
+import sys
 from pathlib import Path
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ai_platform.core.resource_catalog_index import ResourceCatalogIndex, load_resource
+
 server = Server("resource-discovery-server")
 
+_catalog_index = None
+
 def get_project_root():
     """Get project root directory"""
     return Path(__file__).parent.parent.parent
 
+def get_catalog_index(force_refresh: bool = False) -> ResourceCatalogIndex:
+    """Shared catalogue of domain JSON files, brought up to date incrementally"""
+    global _catalog_index
+    if _catalog_index is None:
+        _catalog_index = ResourceCatalogIndex(str(get_project_root()))
+    _catalog_index.refresh(force=force_refresh)
+    return _catalog_index
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available resource discovery tools."""
@@ -57,9 +73,14 @@ async def handle_list_tools() -> list[types.Tool]:
                     },
                     "document_type": {
                         "type": "string",
-                        "description": "Type of document: extractions, source_documents, all"
+                        "description": "Type of document: extractions, source_documents, schemas, other, all"
                     },
-                    "limit": {"type": "integer", "description": "Maximum results to return", "default": 50}
+                    "limit": {"type": "integer", "description": "Maximum results to return", "default": 50},
+                    "refresh_index": {
+                        "type": "boolean",
+                        "description": "Re-stat every file before searching instead of relying on the incremental catalogue",
+                        "default": False
+                    }
                 },
                 "required": ["query"]
             }
@@ -130,11 +151,10 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             project_root = get_project_root()
             resources_dir = project_root / "ai_platform" / "resources"
 
-            # Load resource catalog
+            # Load resource catalog (cached until the file changes)
             catalog_path = resources_dir / "platform_resource_catalog.json"
             if catalog_path.exists():
-                with open(catalog_path, 'r') as f:
-                    catalog = json.load(f)
+                catalog = load_resource(catalog_path)
 
                 if resource_type == "all":
                     result = catalog
@@ -172,9 +192,11 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
         domains = arguments.get("domains", [])
         document_type = arguments.get("document_type", "all")
         limit = arguments.get("limit", 50)
+        refresh_index = arguments.get("refresh_index", False)
 
         try:
             project_root = get_project_root()
+            catalog_index = get_catalog_index(force_refresh=refresh_index)
             search_results = []
 
             # Search in platform_data
@@ -187,28 +209,34 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                     "search_note": "Use direct database queries for detailed search"
                 })
 
-            # Search in domain extractions
-            domains_path = project_root / "domains"
-            if domains_path.exists():
-                target_domains = domains if domains else ["operaciones", "mercados", "legal"]
-
-                for domain in target_domains:
-                    domain_path = domains_path / domain
-                    if domain_path.exists():
-                        # Find extraction files
-                        extraction_files = list(domain_path.rglob("*.json"))
-                        if extraction_files:
-                            search_results.append({
-                                "domain": domain,
-                                "extraction_files_count": len(extraction_files),
-                                "sample_files": [str(f.relative_to(project_root)) for f in extraction_files[:5]],
-                                "search_note": f"Found {len(extraction_files)} JSON files in {domain} domain"
-                            })
+            # Search in domain extractions (from the catalogue, not the file tree)
+            target_domains = domains if domains else ["operaciones", "mercados", "legal"]
+            for summary in catalog_index.domain_summary(target_domains, document_type):
+                search_results.append({
+                    "domain": summary["domain"],
+                    "extraction_files_count": summary["files"],
+                    "total_size_bytes": summary["total_size"],
+                    "sample_files": summary["sample_files"],
+                    "search_note": f"Found {summary['files']} JSON files in {summary['domain']} domain"
+                })
+
+            # Files whose path or top-level keys match the query
+            matching_files = catalog_index.search(query, target_domains, document_type, limit) if query else []
 
             result = {
                 "query": query,
                 "search_results": search_results[:limit],
-                "total_sources_found": len(search_results)
+                "total_sources_found": len(search_results),
+                "matching_files": [
+                    {
+                        "path": f["path"],
+                        "domain": f["domain"],
+                        "document_type": f["document_type"],
+                        "size": f["size"],
+                        "top_level_keys": f["top_level_keys"][:20]
+                    }
+                    for f in matching_files
+                ]
             }
 
             return [types.TextContent(
@@ -7,9 +7,17 @@ Extracts and structures information from EAF-089/2025 report for RAG application
 import json
 import re
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ai_platform.processors.streaming_chunker import StreamingChunker
 
 @dataclass
 class IncidentInfo:
@@ -409,12 +417,52 @@ class DocumentProcessor:
         
         return chunks
     
-    def export_rag_chunks(self, output_path: str = "rag_chunks.json") -> str:
-        """Export RAG chunks to JSON file"""
+    def iter_text_chunks(self, pages: Optional[Iterable[Tuple[int, str]]] = None,
+                         max_chars: int = 1500, overlap_chars: int = 150) -> Iterator[Dict[str, Any]]:
+        """Stream overlapping RAG chunks over the document text, page by page"""
+        if pages is None:
+            pages = [(1, self.raw_text)]
+        
+        report_id = self.analysis.incident_info.report_id if self.analysis else "document"
+        chunker = StreamingChunker(max_chars, overlap_chars)
+        
+        for chunk in chunker.chunk_pages(pages, report_id):
+            yield {
+                "id": chunk.chunk_id,
+                "type": "document_text",
+                "title": f"{report_id} - Pages {chunk.start_page}-{chunk.end_page}",
+                "content": chunk.text,
+                "keywords": [],
+                "metadata": {
+                    "report_id": report_id,
+                    "chunk_index": chunk.index,
+                    "start_page": chunk.start_page,
+                    "end_page": chunk.end_page
+                }
+            }
+    
+    def export_rag_chunks(self, output_path: str = "rag_chunks.json",
+                          pages: Optional[Iterable[Tuple[int, str]]] = None) -> str:
+        """Export RAG chunks to JSON file
+        
+        With pages, the document text chunks are streamed to the file after
+        the structured chunks without holding the whole text in memory.
+        """
         chunks = self.create_rag_chunks()
         
+        if pages is None:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(chunks, f, indent=2, ensure_ascii=False)
+            return output_path
+        
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
+            f.write('[')
+            written = 0
+            for chunk in chain(chunks, self.iter_text_chunks(pages)):
+                f.write(',\n  ' if written else '\n  ')
+                f.write(json.dumps(chunk, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+                written += 1
+            f.write('\n]' if written else ']')
         
         return output_path
 
@@ -7,13 +7,89 @@ Based on structure analysis of EAF reports
 import PyPDF2
 import re
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Iterator
 from datetime import datetime
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ai_platform.processors.streaming_chunker import StreamingChunker, ChunkStream, TextChunk
+from ai_platform.core.company_index import CompanyIndex
+
+
+class _SectionChunkBuilder:
+    """Turns the chunk stream of one section into section / section_part chunks"""
+
+    def __init__(self, processor: "LargeDocumentProcessor", section: Dict[str, Any], stream: ChunkStream):
+        self.processor = processor
+        self.section = section
+        self.stream = stream
+        self.held = None  # First chunk, until we know whether the section needs parts
+        self.part_number = 0
+
+        # The header opens the section text, as in the combined section text
+        self.pending = self._take(stream.feed(section['start_page'], f"{section['header']}\n\n"))
+
+    def feed(self, page_num: int, page_text: str) -> List[Dict[str, Any]]:
+        chunks = self.pending + self._take(self.stream.feed(page_num, f"[Page {page_num}]\n{page_text}\n\n"))
+        self.pending = []
+        return chunks
+
+    def close(self) -> List[Dict[str, Any]]:
+        chunks = self.pending + self._take(self.stream.close())
+        self.pending = []
+        if self.held is not None:
+            # Whole section fits in one chunk
+            chunks.append(self._chunk_dict(self.held, 'section'))
+            self.held = None
+        return chunks
+
+    def _take(self, text_chunks: List[TextChunk]) -> List[Dict[str, Any]]:
+        chunks = []
+        for text_chunk in text_chunks:
+            if self.held is None and self.part_number == 0:
+                self.held = text_chunk
+                continue
+            if self.held is not None:
+                chunks.append(self._chunk_dict(self.held, 'section_part'))
+                self.held = None
+            chunks.append(self._chunk_dict(text_chunk, 'section_part'))
+        return chunks
+
+    def _chunk_dict(self, chunk: TextChunk, chunk_type: str) -> Dict[str, Any]:
+        extracted_data = {'companies': set(), 'technical_specs': [], 'dates': [], 'compliance_info': []}
+        self.processor._extract_page_data(chunk.text, extracted_data)
+        metadata = {
+            'section_number': self.section.get('section_number'),
+            'start_page': chunk.start_page,
+            'end_page': chunk.end_page,
+            'extracted_data': self.processor._serialize_extracted_data(extracted_data)
+        }
+
+        if chunk_type == 'section':
+            header = self.section['header']
+        else:
+            self.part_number += 1
+            header = f"{self.section['header']} (Part {self.part_number})"
+            metadata['part_number'] = self.part_number
+            metadata['parent_section'] = self.section['header']
+
+        return {
+            'chunk_id': chunk.chunk_id,
+            'type': chunk_type,
+            'header': header,
+            'content': chunk.text,
+            'metadata': metadata
+        }
+
+
 class LargeDocumentProcessor:
-    def __init__(self, max_chunk_size: int = 4000):
+    def __init__(self, max_chunk_size: int = 4000, chunk_overlap: int = 200):
         self.max_chunk_size = max_chunk_size
+        self.chunker = StreamingChunker(max_chunk_size, chunk_overlap)
         self.extraction_patterns = {
             'section_headers': [
                 r'^(\d+)\.\s+(.+)$',  # Numbered sections: "1. Description"
@@ -33,42 +109,23 @@ class LargeDocumentProcessor:
     def extract_document_sections(self, pdf_path: str) -> List[Dict[str, Any]]:
         """Extract major sections from document based on structure analysis"""
         
-        pages_text = self._extract_all_text(pdf_path)
         sections = []
         current_section = None
         
-        for page_num, page_text in pages_text:
+        for page_num, page_text in self._iter_pages(pdf_path):
             # Look for section headers
-            lines = page_text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check for numbered sections (primary structure)
-                for pattern in self.extraction_patterns['section_headers']:
-                    match = re.match(pattern, line)
-                    if match:
-                        # Save previous section
-                        if current_section:
-                            sections.append(current_section)
-                        
-                        # Start new section
-                        current_section = {
-                            'header': line,
-                            'section_number': match.group(1) if '.' in pattern else None,
-                            'title': match.group(2) if len(match.groups()) > 1 else line,
-                            'start_page': page_num,
-                            'content': [],
-                            'extracted_data': {
-                                'companies': set(),
-                                'technical_specs': [],
-                                'dates': [],
-                                'compliance_info': []
-                            }
-                        }
-                        break
+            for header_section in self._find_section_headers(page_text, page_num):
+                # Save previous section
+                if current_section:
+                    sections.append(current_section)
+                current_section = header_section
+                current_section['content'] = []
+                current_section['extracted_data'] = {
+                    'companies': set(),
+                    'technical_specs': [],
+                    'dates': [],
+                    'compliance_info': []
+                }
             
             # Add page content to current section
             if current_section:
@@ -86,10 +143,31 @@ class LargeDocumentProcessor:
         
         return sections
     
-    def _extract_all_text(self, pdf_path: str) -> List[Tuple[int, str]]:
-        """Extract text from all pages"""
-        pages_text = []
+    def _find_section_headers(self, page_text: str, page_num: int) -> List[Dict[str, Any]]:
+        """Section headers that start on this page, in order"""
+        headers = []
         
+        for line in page_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Check for numbered sections (primary structure)
+            for pattern in self.extraction_patterns['section_headers']:
+                match = re.match(pattern, line)
+                if match:
+                    headers.append({
+                        'header': line,
+                        'section_number': match.group(1) if '.' in pattern else None,
+                        'title': match.group(2) if len(match.groups()) > 1 else line,
+                        'start_page': page_num
+                    })
+                    break
+        
+        return headers
+    
+    def _iter_pages(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """Extract text page by page, as it is consumed"""
         try:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
@@ -97,15 +175,17 @@ class LargeDocumentProcessor:
                 for page_num, page in enumerate(pdf_reader.pages, 1):
                     try:
                         text = page.extract_text()
-                        pages_text.append((page_num, text))
                     except Exception as e:
                         print(f"⚠️  Error extracting page {page_num}: {e}")
-                        pages_text.append((page_num, ""))
+                        text = ""
+                    yield page_num, text
                         
         except Exception as e:
             print(f"❌ Error reading PDF: {e}")
-        
-        return pages_text
+    
+    def _extract_all_text(self, pdf_path: str) -> List[Tuple[int, str]]:
+        """Extract text from all pages"""
+        return list(self._iter_pages(pdf_path))
     
     def _extract_page_data(self, page_text: str, extracted_data: Dict[str, Any]):
         """Extract structured data from page text"""
@@ -133,80 +213,42 @@ class LargeDocumentProcessor:
         compliance_matches = re.findall(self.extraction_patterns['compliance_status'], page_text, re.IGNORECASE)
         extracted_data['compliance_info'].extend(compliance_matches)
     
-    def create_intelligent_chunks(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Create intelligent chunks that respect document structure"""
-        
-        chunks = []
+    def iter_chunks(self, pdf_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream intelligent chunks straight from the PDF
         
-        for section in sections:
-            section_text = self._combine_section_text(section)
+        Pages are read lazily and each section is chunked as its pages
+        arrive, so memory does not grow with the document.
+        """
+        doc_name = Path(pdf_path).stem
+        builder = None
+        section_count = 0
+        
+        for page_num, page_text in self._iter_pages(pdf_path):
+            for section in self._find_section_headers(page_text, page_num):
+                if builder:
+                    yield from builder.close()
+                section_count += 1
+                stream = self.chunker.open(f"{doc_name}:s{section_count:04d}")
+                builder = _SectionChunkBuilder(self, section, stream)
             
-            # If section is small enough, keep as single chunk
-            if len(section_text) <= self.max_chunk_size:
-                chunks.append({
-                    'type': 'section',
-                    'header': section['header'],
-                    'content': section_text,
-                    'metadata': {
-                        'section_number': section.get('section_number'),
-                        'start_page': section['start_page'],
-                        'extracted_data': self._serialize_extracted_data(section['extracted_data'])
-                    }
-                })
-            else:
-                # Split large sections into sub-chunks
-                sub_chunks = self._split_large_section(section)
-                chunks.extend(sub_chunks)
+            if builder:
+                yield from builder.feed(page_num, page_text)
         
-        return chunks
+        if builder:
+            yield from builder.close()
     
-    def _combine_section_text(self, section: Dict[str, Any]) -> str:
-        """Combine all text from a section"""
-        combined_text = f"{section['header']}\n\n"
-        
-        for content in section['content']:
-            combined_text += f"[Page {content['page']}]\n{content['text']}\n\n"
+    def create_intelligent_chunks(self, sections: List[Dict[str, Any]], doc_name: str = "doc") -> List[Dict[str, Any]]:
+        """Create intelligent chunks that respect document structure"""
         
-        return combined_text
-    
-    def _split_large_section(self, section: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Split large sections into manageable chunks"""
         chunks = []
-        current_chunk = ""
-        chunk_num = 1
         
-        for content in section['content']:
-            page_text = f"[Page {content['page']}]\n{content['text']}\n\n"
-            
-            # If adding this page would exceed limit, save current chunk
-            if len(current_chunk + page_text) > self.max_chunk_size and current_chunk:
-                chunks.append({
-                    'type': 'section_part',
-                    'header': f"{section['header']} (Part {chunk_num})",
-                    'content': current_chunk,
-                    'metadata': {
-                        'section_number': section.get('section_number'),
-                        'part_number': chunk_num,
-                        'parent_section': section['header']
-                    }
-                })
-                current_chunk = ""
-                chunk_num += 1
-            
-            current_chunk += page_text
-        
-        # Don't forget the last chunk
-        if current_chunk:
-            chunks.append({
-                'type': 'section_part',
-                'header': f"{section['header']} (Part {chunk_num})",
-                'content': current_chunk,
-                'metadata': {
-                    'section_number': section.get('section_number'),
-                    'part_number': chunk_num,
-                    'parent_section': section['header']
-                }
-            })
+        for section_count, section in enumerate(sections, 1):
+            stream = self.chunker.open(f"{doc_name}:s{section_count:04d}")
+            builder = _SectionChunkBuilder(self, section, stream)
+            for content in section['content']:
+                chunks.extend(builder.feed(content['page'], content['text']))
+            chunks.extend(builder.close())
         
         return chunks
     
@@ -241,30 +283,47 @@ class LargeDocumentProcessor:
         # Create output directory
         Path(output_dir).mkdir(exist_ok=True)
         
-        # Step 1: Extract sections
-        print("📄 Extracting document sections...")
-        sections = self.extract_document_sections(pdf_path)
-        print(f"   Found {len(sections)} major sections")
+        # Steps 1-3: Stream sections into chunks, written as they are produced
+        print("🔪 Streaming sections into chunks...")
+        doc_name = Path(pdf_path).stem
+        chunks_file = Path(output_dir) / f"{doc_name}_chunks.json"
+        company_index = {}
+        section_headers = []
+        chunk_count = 0
         
-        # Step 2: Create intelligent chunks
-        print("🔪 Creating intelligent chunks...")
-        chunks = self.create_intelligent_chunks(sections)
-        print(f"   Created {len(chunks)} chunks")
+        # Persistent company index shared by all documents of output_dir;
+        # committed only once the whole document is indexed
+        company_db = CompanyIndex(output_dir)
+        try:
+            company_db.remove_document(doc_name)
+            
+            with open(chunks_file, 'w', encoding='utf-8') as f:
+                f.write('[')
+                for chunk in self.iter_chunks(pdf_path):
+                    if chunk['type'] == 'section' or chunk['metadata'].get('part_number') == 1:
+                        section_headers.append(chunk['metadata'].get('parent_section', chunk['header']))
+                    
+                    for company in chunk['metadata']['extracted_data']['companies']:
+                        company_index.setdefault(company, []).append(chunk_count)
+                    
+                    company_db.add_chunk(doc_name, chunk_count, chunk)
+                    
+                    # Same layout as json.dump(chunks, indent=2)
+                    f.write(',\n  ' if chunk_count else '\n  ')
+                    f.write(json.dumps(chunk, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+                    chunk_count += 1
+                f.write('\n]' if chunk_count else ']')
+            
+            company_db.mark_indexed(doc_name, chunks_file)
+            company_db.conn.commit()
+        finally:
+            company_db.close()
         
-        # Step 3: Create company index
-        print("🏢 Building company index...")
-        company_index = self.create_company_focused_index(chunks)
+        print(f"   Found {len(section_headers)} major sections")
+        print(f"   Created {chunk_count} chunks")
         print(f"   Indexed {len(company_index)} companies")
         
-        # Step 4: Save results
-        doc_name = Path(pdf_path).stem
-        
-        # Save chunks
-        chunks_file = Path(output_dir) / f"{doc_name}_chunks.json"
-        with open(chunks_file, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
-        
-        # Save company index  
+        # Step 4: Save company index
         index_file = Path(output_dir) / f"{doc_name}_company_index.json"
         with open(index_file, 'w', encoding='utf-8') as f:
             json.dump(company_index, f, indent=2, ensure_ascii=False)
@@ -273,12 +332,12 @@ class LargeDocumentProcessor:
         summary = {
             'document': Path(pdf_path).name,
             'processed_at': datetime.now().isoformat(),
-            'sections_found': len(sections),
-            'chunks_created': len(chunks),
+            'sections_found': len(section_headers),
+            'chunks_created': chunk_count,
             'companies_indexed': len(company_index),
-            'section_headers': [s['header'] for s in sections[:10]],  # First 10 headers
+            'section_headers': section_headers[:10],  # First 10 headers
             'top_companies': sorted(company_index.keys())[:20],  # Top 20 companies
-            'files_created': [str(chunks_file), str(index_file)]
+            'files_created': [str(chunks_file), str(index_file), str(Path(output_dir) / CompanyIndex.INDEX_FILENAME)]
         }
         
         summary_file = Path(output_dir) / f"{doc_name}_processing_summary.json"
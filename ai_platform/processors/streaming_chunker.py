@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Streaming Text Chunker
+Cuts a lazily read sequence of pages into overlapping, size-budgeted chunks
+with stable IDs and page ranges, holding at most one chunk of text at a time
+"""
+
+import hashlib
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Any, Iterable, Iterator, List, Tuple
+
+# Preferred cut points, best first: paragraph, line, sentence, word
+BOUNDARIES = ("\n\n", "\n", ". ", " ")
+
+
+@dataclass
+class TextChunk:
+    """One chunk of a text stream"""
+    chunk_id: str
+    index: int
+    text: str
+    start_page: int
+    end_page: int
+    start_offset: int  # Character offsets in the whole stream
+    end_offset: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ChunkStream:
+    """Push-based chunking state for one stream (document or section)"""
+
+    def __init__(self, chunker: "StreamingChunker", stream_id: str):
+        self.chunker = chunker
+        self.stream_id = stream_id
+        self.buffer = ""
+        self.buffer_start = 0  # Stream offset of buffer[0]
+        self.page_marks: Deque[Tuple[int, int]] = deque()  # (stream offset, page) of pages in the buffer
+        self.next_index = 0
+        self.emitted_end = 0  # Stream offset where the last emitted chunk ends
+
+    def feed(self, page_num: int, text: str) -> List[TextChunk]:
+        """Append the text of a page; returns the chunks it completed"""
+        chunks = []
+        max_chars = self.chunker.max_chars
+        self.page_marks.append((self.buffer_start + len(self.buffer), page_num))
+
+        pos = 0
+        while pos < len(text):
+            # Fill the buffer up to the budget only, so each cut costs O(max_chars)
+            take = max_chars - len(self.buffer)
+            self.buffer += text[pos:pos + take]
+            pos += take
+
+            if len(self.buffer) >= max_chars:
+                cut = self.chunker.cut_point(self.buffer)
+                chunk = self._emit(cut)
+                if chunk:
+                    chunks.append(chunk)
+                self._advance(self.chunker.overlap_start(self.buffer, cut))
+
+        return chunks
+
+    def close(self) -> List[TextChunk]:
+        """Flush the remaining text"""
+        chunk = self._emit(len(self.buffer))
+        self._advance(len(self.buffer))
+        return [chunk] if chunk else []
+
+    def _page_at(self, offset: int) -> int:
+        page = self.page_marks[0][1] if self.page_marks else 0
+        for mark_offset, mark_page in self.page_marks:
+            if mark_offset > offset:
+                break
+            page = mark_page
+        return page
+
+    def _emit(self, cut: int):
+        text = self.buffer[:cut]
+        start = self.buffer_start
+        end = start + cut
+        # Nothing past the previous chunk: the buffer only holds its overlap
+        if end <= self.emitted_end or not text.strip():
+            return None
+
+        index = self.next_index
+        self.next_index += 1
+        self.emitted_end = end
+        return TextChunk(
+            chunk_id=self.chunker.chunk_id(self.stream_id, index, text),
+            index=index,
+            text=text.strip(),
+            start_page=self._page_at(start),
+            end_page=self._page_at(end - 1),
+            start_offset=start,
+            end_offset=end
+        )
+
+    def _advance(self, keep_from: int):
+        self.buffer = self.buffer[keep_from:]
+        self.buffer_start += keep_from
+        # Keep the mark of the page the buffer starts in, drop older ones
+        while len(self.page_marks) > 1 and self.page_marks[1][0] <= self.buffer_start:
+            self.page_marks.popleft()
+
+
+class StreamingChunker:
+    """
+    Overlapping chunker over page streams
+
+    Memory is bounded by max_chars plus one page, whatever the document size.
+    Chunks end at the last paragraph, line, sentence or word boundary after
+    min_fill of the budget, and the next chunk repeats the last overlap_chars.
+    """
+
+    def __init__(self, max_chars: int = 4000, overlap_chars: int = 200, min_fill: float = 0.6):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        if overlap_chars < 0 or overlap_chars >= max_chars * min_fill:
+            raise ValueError("overlap_chars must be smaller than max_chars * min_fill")
+
+        self.max_chars = max_chars
+        self.overlap_chars = overlap_chars
+        self.min_cut = max(1, int(max_chars * min_fill))
+
+    @classmethod
+    def for_tokens(cls, max_tokens: int, overlap_tokens: int = 50, chars_per_token: float = 4.0, **kwargs) -> "StreamingChunker":
+        """Chunker budgeted in (approximate) tokens instead of characters"""
+        return cls(int(max_tokens * chars_per_token), int(overlap_tokens * chars_per_token), **kwargs)
+
+    @staticmethod
+    def chunk_id(stream_id: str, index: int, text: str) -> str:
+        """Stable ID: same stream, position and text give the same ID across runs"""
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]
+        return f"{stream_id}:{index:05d}:{digest}"
+
+    def cut_point(self, buffer: str) -> int:
+        """Where to end the chunk in a full buffer"""
+        for boundary in BOUNDARIES:
+            pos = buffer.rfind(boundary, self.min_cut, self.max_chars)
+            if pos != -1:
+                return pos + len(boundary)
+        return self.max_chars
+
+    def overlap_start(self, buffer: str, cut: int) -> int:
+        """Where the next chunk starts: overlap_chars before the cut, on a word start"""
+        if not self.overlap_chars:
+            return cut
+        start = cut - self.overlap_chars
+        space = buffer.find(" ", start, cut)
+        return space + 1 if space != -1 else start
+
+    def open(self, stream_id: str) -> ChunkStream:
+        return ChunkStream(self, stream_id)
+
+    def chunk_pages(self, pages: Iterable[Tuple[int, str]], stream_id: str = "doc") -> Iterator[TextChunk]:
+        """Chunk (page_num, text) pairs as they are read"""
+        stream = self.open(stream_id)
+        for page_num, text in pages:
+            yield from stream.feed(page_num, text)
+        yield from stream.close()
@@ -43,6 +43,10 @@ except ImportError as e:
     import cv2
     import numpy as np
 
+# Shared 24-hour series parser (anexos_eaf/shared/utilities)
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utilities"))
+from hourly_series import parse_hourly_series
+
 def extract_page_text(document_path: str, page_num: int) -> str:
     """Extract text from single page (1-indexed) using PyPDF2"""
     try:
@@ -123,13 +127,16 @@ def find_ocr_row_for_metric(ocr_text: str, metric_pattern: str, raw_line: str) -
     best_match = None
     best_score = 0
     
+    search_terms = [term.lower() for term in search_terms]
+
     for ocr_line in ocr_text.split('\n'):
         ocr_line = ocr_line.strip()
         if not ocr_line:
             continue
         
         # Score based on how many search terms are found
-        score = sum(1 for term in search_terms if term.lower() in ocr_line.lower())
+        ocr_lower = ocr_line.lower()
+        score = sum(1 for term in search_terms if term in ocr_lower)
         
         # Prefer lines with numbers (likely data rows)
         if re.search(r'\d+', ocr_line):
@@ -224,12 +231,7 @@ def smart_number_extraction_with_ocr(line_text: str, ocr_data: Optional[Dict] =
 
 def validate_24_hour_data(hourly_values: List[str]) -> Dict:
     """Validate 24-hour data"""
-    return {
-        "is_valid": len(hourly_values) == 24,
-        "total_values": len(hourly_values),
-        "expected_values": 24,
-        "issues": [] if len(hourly_values) == 24 else [f"Found {len(hourly_values)} values, expected 24"]
-    }
+    return parse_hourly_series(hourly_values).validate()
 
 def extract_enhanced_with_ocr(document_path: str, page_num: int) -> Dict:
     """Main extraction function with OCR per row"""
@@ -293,13 +295,9 @@ def extract_enhanced_with_ocr(document_path: str, page_num: int) -> Dict:
             # Extract numbers with OCR comparison
             numbers, ocr_comparison = smart_number_extraction_with_ocr(raw_line, ocr_data)
             
-            # Determine hourly values and total
-            if len(numbers) >= 24:
-                hourly_values = numbers[:24]
-                total = numbers[24] if len(numbers) > 24 else "calculated"
-            else:
-                hourly_values = numbers
-                total = "calculated"
+            # Typed 24-hour series; a 25th number is the reported total
+            series = parse_hourly_series(numbers, trailing=("total",), label=metric_key)
+            total = series.reported_total if series.reported_total is not None else "calculated"
             
             # Handle special cases
             full_title = metric_key.replace('_', ' ').title()
@@ -320,21 +318,14 @@ def extract_enhanced_with_ocr(document_path: str, page_num: int) -> Dict:
             elif "generacion_total" in metric_key:
                 full_title = "Generación Total [MWh]"
             
-            # Build hourly data with hour numbers
-            hourly_data_with_hours = []
-            for i, value in enumerate(hourly_values, 1):
-                hourly_data_with_hours.append({
-                    "hour": i,
-                    "value": value
-                })
-
             # Build metric data with OCR information
             metric_data = {
                 "full_title": full_title,
-                "hourly_data": hourly_data_with_hours,
+                "hourly_data": series.to_hourly_data(),
                 "total": total,
+                "calculated_total": round(series.total, 4),
                 "raw_line": raw_line,
-                "validation": validate_24_hour_data([item['value'] for item in hourly_data_with_hours]),
+                "validation": series.validate(),
                 "extraction_quality": "enhanced",
                 "ocr_comparison": ocr_comparison
             }
@@ -344,7 +335,7 @@ def extract_enhanced_with_ocr(document_path: str, page_num: int) -> Dict:
             
             system_metrics[metric_key] = metric_data
             
-            print(f"      📊 Values: {len(hourly_values)} hourly + total: {total}")
+            print(f"      📊 Values: {series.data_points} hourly + total: {total}")
             if ocr_comparison["corrections_applied"]:
                 print(f"      🔧 Corrections: {', '.join(ocr_comparison['corrections_applied'])}")
     
@@ -12,6 +12,10 @@ sys.path.append(str(Path(__file__).parent.parent.parent / "shared" / "schemas"))
 from esquema_universal_chileno import UniversalSchemaTemplate
 from extractor_universal_integrado import BaseUniversalExtractor
 
+# Shared 24-hour series parser (same one the processors use)
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utilities"))
+from hourly_series import HourlySeries
+
 class Anexo01ToUniversalAdapter(BaseUniversalExtractor):
     """Transform ANEXO 1 generation programming data to universal format"""
 
@@ -28,8 +32,23 @@ class Anexo01ToUniversalAdapter(BaseUniversalExtractor):
 
     def map_generation_programming_data(self, programming_data: List[Dict]) -> List[Dict]:
         """Map generation programming data to universal entities"""
-        # TODO: Map programming data to universal format
-        pass
+        mapped = []
+        for metric in programming_data:
+            total = metric.get("total")
+            series = HourlySeries.from_hourly_data(
+                metric.get("hourly_data", []),
+                label=metric.get("full_title", ""),
+                total=total if isinstance(total, (int, float)) else None
+            )
+            mapped.append({
+                "metric": series.label,
+                "hourly_values": series.to_list(),
+                "daily_total": series.reported_total if series.reported_total is not None else series.total,
+                "daily_max": series.daily_max,
+                "peak_hour": series.peak_hour,
+                "validation": series.validate()
+            })
+        return mapped
 
     def extract_capacity_allocations(self, data: Dict) -> List[Dict]:
         """Extract capacity allocation data for universal schema"""
@@ -47,6 +47,34 @@ except ImportError as e:
     import cv2
     import numpy as np
 
+# Shared 24-hour series parser (anexos_eaf/shared/utilities)
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utilities"))
+from hourly_series import parse_hourly_series, parse_page_series
+
+# Columns after hour 24 in the ANEXO 2 tables
+TRAILING_COLUMNS = ("total", "dmax", "dmed")
+
+# Plant row labels (PFV-ELBOCO, PMGD-PFV-QUEBRADA, ...)
+PLANT_LABEL_PATTERN = re.compile(r'[A-Z][A-Z\-_0-9]*')
+
+# Row labels of the system summary table -> system_summary_data keys
+SYSTEM_ROW_LABELS = {
+    'TOTAL HORA.': 'total_hora',
+    'TOTAL HORA. SING': 'total_hora_sing',
+    'TOTAL SEN': 'total_sen',
+    'CONS. PROPIOS': 'cons_propios',
+    'CONS. PROPIOS SING': 'cons_propios_sing',
+    'FLUJO CHANGOS->CUMBRES': 'flujo_changos_cumbres',
+    'PERDIDAS APROX.': 'perdidas_aprox',
+    'PERDIDAS APROX. SING': 'perdidas_aprox_sing',
+    'DEMANDA APROX.': 'demanda_aprox',
+    'DEMANDA APROX. SING': 'demanda_aprox_sing',
+}
+
+def system_row_key(label: str) -> Optional[str]:
+    """system_summary_data key of a table row label, None for plant rows"""
+    return SYSTEM_ROW_LABELS.get(" ".join(label.upper().split()))
+
 def extract_date_info(raw_text: str) -> Dict:
     """Extract comprehensive metadata from the document header"""
     # Look for date patterns like "25-02-2025" or "RESUMEN DIARIO DE OPERACION DEL SEN"
@@ -183,9 +211,20 @@ def is_system_summary_page(raw_text: str) -> bool:
     # Require both: multiple system patterns AND actual system data lines
     return pattern_count >= 4 and system_data_lines >= 3
 
-def extract_system_summary_data(raw_text: str) -> Dict:
-    """Extract system-wide summary data (integrated from page 79 extractor)"""
+def extract_system_summary_data(raw_text: str, hourly_table=None) -> Dict:
+    """
+    Extract system-wide summary data (integrated from page 79 extractor)
+
+    Hourly categories found in hourly_table (rows from positioned words) are
+    taken from it; the text patterns cover the rest.
+    """
     system_data = {}
+    table_series = {}
+    if hourly_table is not None:
+        for series in hourly_table.rows():
+            system_type = system_row_key(series.label)
+            if system_type and system_type not in table_series:
+                table_series[system_type] = series
 
     # System summary patterns
     patterns = {
@@ -204,7 +243,12 @@ def extract_system_summary_data(raw_text: str) -> Dict:
     }
 
     for system_type, pattern in patterns.items():
-        match = re.search(pattern, raw_text, re.IGNORECASE | re.DOTALL)
+        if system_type in table_series:
+            match = None
+            series = table_series[system_type]
+        else:
+            match = re.search(pattern, raw_text, re.IGNORECASE | re.DOTALL)
+            series = None
         if match:
             values_text = match.group(1).strip()
 
@@ -235,44 +279,23 @@ def extract_system_summary_data(raw_text: str) -> Dict:
                 # Skip DMED processing since it's handled with DMAX
                 continue
             else:
-                # Parse hourly values
-                hourly_values = []
-                value_parts = re.findall(r'-?\d+(?:,\d+)?', values_text)
-                for part in value_parts[:24]:  # Only take first 24 hours
-                    try:
-                        clean_value = part.replace(',', '.')
-                        value = float(clean_value)
-                        hourly_values.append(value)
-                    except ValueError:
-                        continue
-
-                if hourly_values:
-                    # Build hourly data with hour numbers
-                    hourly_data = []
-                    for i, value in enumerate(hourly_values, 1):
-                        hourly_data.append({
-                            "hour": i,
-                            "value": value
-                        })
-
-                    # Calculate metrics
-                    daily_total = sum(hourly_values)
-                    daily_max = max(hourly_values) if hourly_values else 0.0
-                    daily_min = min(hourly_values) if hourly_values else 0.0
-                    daily_avg = daily_total / len(hourly_values) if hourly_values else 0.0
-
-                    system_data[system_type] = {
-                        "hourly_data": hourly_data,
-                        "daily_total": daily_total,
-                        "daily_max": daily_max,
-                        "daily_min": daily_min,
-                        "daily_avg": daily_avg,
-                        "operational_hours": len([v for v in hourly_values if v > 0]),
-                        "system_category": system_type.replace('_', ' ').title(),
-                        "data_points": len(hourly_values),
-                        "source": "system_summary_extraction",
-                        "data_type": "hourly_series"
-                    }
+                # Parse hourly values (first 24 numbers)
+                series = parse_hourly_series(values_text, label=system_type)
+
+        if series is not None and series.data_points:
+            system_data[system_type] = {
+                "hourly_data": series.to_hourly_data(),
+                "daily_total": series.total,
+                "daily_max": series.daily_max,
+                "daily_min": series.daily_min,
+                "daily_avg": series.daily_avg,
+                "operational_hours": series.operational_hours,
+                "system_category": system_type.replace('_', ' ').title(),
+                "data_points": series.data_points,
+                "validation": series.validate(),
+                "source": "system_summary_extraction",
+                "data_type": "hourly_series"
+            }
 
     return system_data if system_data else None
 
@@ -534,6 +557,20 @@ def extract_colors_from_page(document_path: str, page_num: int) -> Dict:
         print(f"⚠️  Color extraction failed: {e}")
         return {}
 
+def extract_page_words(document_path: str, page_num: int) -> List[Tuple]:
+    """Positioned words of a page (PyMuPDF), for the hourly table"""
+    try:
+        doc = fitz.open(document_path)
+        try:
+            if 0 <= page_num - 1 < len(doc):
+                return doc[page_num - 1].get_text("words")
+            return []
+        finally:
+            doc.close()
+    except Exception as e:
+        print(f"⚠️  Word extraction failed: {e}")
+        return []
+
 def extract_ocr_text(document_path: str, page_num: int) -> str:
     """Extract text using OCR on rendered PDF page"""
     try:
@@ -565,11 +602,135 @@ def extract_ocr_text(document_path: str, page_num: int) -> str:
         print(f"⚠️  OCR extraction failed: {e}")
         return ""
 
-def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, document_path: str = None) -> Dict:
-    """Extract real generation data from page text - handles both plant data and system summary"""
+def build_plant_record(plant_name: str, series, record_index: int, page_text: str, ocr_text: str,
+                       page_num: int, document_path: str = None, source: str = 'tabular_extraction') -> Dict:
+    """Plant generation record from its 24-hour series (TOT.DIA, DMAX, DMED in series.trailing)"""
+    # Determine plant type
+    plant_type = "UNKNOWN"
+    if plant_name.startswith('PFV-'):
+        plant_type = "SOLAR_PV"
+    elif plant_name.startswith('PMGD-PFV-'):
+        plant_type = "DISTRIBUTED_SOLAR_PV"
+    elif plant_name.startswith('PMGD-TER-'):
+        plant_type = "DISTRIBUTED_THERMAL"
+    elif plant_name.startswith('PMGD-DIESEL-'):
+        plant_type = "DISTRIBUTED_DIESEL"
+    elif plant_name.startswith('PMGD-'):
+        plant_type = "DISTRIBUTED_GENERATION"
+    elif 'HIDRO' in plant_name or 'AGUA' in plant_name:
+        plant_type = "HYDROELECTRIC"
+    elif 'EOLICA' in plant_name or 'WIND' in plant_name:
+        plant_type = "WIND"
+    elif 'CARBO' in plant_name or 'COAL' in plant_name:
+        plant_type = "COAL"
+    elif 'GAS' in plant_name:
+        plant_type = "NATURAL_GAS"
+    elif 'NUCLEAR' in plant_name:
+        plant_type = "NUCLEAR"
+
+    # Extract colors using multiple approaches
+    plant_color = "#808080"  # Default gray
+    color_source = "default"
+
+    if document_path:
+        # First priority: Actual PDF colors from graphics/text formatting
+        actual_colors = extract_actual_pdf_colors(document_path, page_num)
+        if actual_colors and actual_colors.get('text_colors'):
+            # Check if plant name appears in colored text
+            for text_key, color_info in actual_colors['text_colors'].items():
+                if plant_name in text_key or text_key in plant_name:
+                    plant_color = color_info['color']
+                    color_source = f"pdf_text_formatting"
+                    print(f"   🎨 Found actual PDF text color {plant_color} for {plant_name}")
+                    break
+
+        # Second priority: OCR-based color detection
+        if color_source == "default":
+            text_colors = extract_colors_via_text_analysis(page_text + "\n" + ocr_text)
+            if text_colors and text_colors.get('color_mapping'):
+                for color_key, color_info in text_colors['color_mapping'].items():
+                    if plant_name in color_key or color_key in plant_name:
+                        plant_color = color_info['color']
+                        color_source = f"ocr_text_{color_info['color_name']}"
+                        print(f"   🎨 OCR detected color {color_info['color_name']} ({plant_color}) for {plant_name}")
+                        break
+
+        # Third priority: PDF graphic colors
+        if color_source == "default" and actual_colors and actual_colors.get('graphic_colors'):
+            graphic_colors = list(actual_colors['graphic_colors'].values())
+            if graphic_colors:
+                # Use plant index to assign different graphic colors
+                color_index = record_index % len(graphic_colors)
+                plant_color = graphic_colors[color_index]['color']
+                color_source = "pdf_graphics"
+                print(f"   🎨 Assigned actual PDF graphic color {plant_color} to {plant_name}")
+
+        # Fourth priority: Fallback to PDF visual colors
+        if color_source == "default":
+            page_colors = extract_colors_from_page(document_path, page_num)
+            detected_colors = page_colors.get('page_colors', [])
+
+            if detected_colors:
+                # Use plant index to assign different detected colors
+                color_index = record_index % len(detected_colors)
+                plant_color = detected_colors[color_index]
+                color_source = "pdf_visual"
+                print(f"   🎨 Assigned PDF color {plant_color} to {plant_name}")
+
+    # Final fallback to unique colors per plant (not type-based)
+    if color_source == "default":
+        # Generate unique colors for each plant using a hash-based approach
+        import hashlib
+
+        # Use plant name to generate a consistent unique color
+        plant_hash = hashlib.md5(plant_name.encode()).hexdigest()[:6]
+        plant_color = f"#{plant_hash}"
+        color_source = f"unique_hash_{plant_name}"
+
+        # Alternative: Use a predefined palette of distinct colors
+        distinct_colors = [
+            "#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7",
+            "#DDA0DD", "#98D8C8", "#F7DC6F", "#BB8FCE", "#85C1E9",
+            "#F8C471", "#82E0AA", "#F1948A", "#85C1E9", "#D7BDE2",
+            "#A3E4D7", "#FCF3CF", "#FADBD8", "#D5DBDB", "#AED6F1"
+        ]
+
+        # Use plant index to assign from distinct color palette
+        plant_index = record_index
+        if plant_index < len(distinct_colors):
+            plant_color = distinct_colors[plant_index]
+            color_source = f"palette_index_{plant_index}"
+
+        print(f"   🎨 Assigned unique color {plant_color} to {plant_name} ({color_source})")
+
+    plant_data = {
+        'plant_name': plant_name,
+        'plant_type': plant_type,
+        'plant_color': plant_color,
+        'daily_total_mwh': series.trailing.get('total', series.total),
+        'daily_max_mw': series.trailing.get('dmax', series.daily_max),
+        'daily_avg_mw': series.trailing.get('dmed', series.daily_avg),
+        'hourly_data': series.to_hourly_data(),
+        'operational_hours': series.operational_hours,
+        'peak_hour': series.peak_hour,
+        'validation': series.validate(),
+        'source': source
+    }
+
+    return plant_data
+
+def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, document_path: str = None,
+                                 words: Optional[List[Tuple]] = None) -> Dict:
+    """
+    Extract real generation data from page text - handles both plant data and system summary
+
+    When the page's positioned words are given, hourly rows are read from the
+    table they form (parse_page_series); the text lines are the fallback.
+    """
 
     # Check if this page has system summary data
     has_system_summary = is_system_summary_page(page_text)
+    hourly_table = parse_page_series(words, trailing=TRAILING_COLUMNS) if words else None
 
     # Initialize extraction data structure
     extracted_data = {
@@ -585,11 +746,14 @@ def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, d
             'patterns_found': 0
         }
     }
+    if hourly_table is not None:
+        # Hour coverage and TOT.DIA of every row, checked in one pass
+        extracted_data['extraction_quality']['hourly_table'] = hourly_table.validate()
 
     # Extract system summary data if present
     if has_system_summary:
         print(f"   🔍 Detected system summary data on page {page_num}")
-        system_summary = extract_system_summary_data(page_text)
+        system_summary = extract_system_summary_data(page_text, hourly_table)
 
         if system_summary:
             extracted_data['system_summary_data'] = system_summary
@@ -631,13 +795,34 @@ def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, d
         except:
             return 0.0
 
+    # Plant rows of the table rebuilt from positioned words: hours aligned by column,
+    # so a blank cell stays a missing hour instead of shifting the row
+    table_plant_rows = []
+    if hourly_table is not None:
+        table_plant_rows = [
+            (row_index, series) for row_index, series in enumerate(hourly_table.rows())
+            if system_row_key(series.label) is None and PLANT_LABEL_PATTERN.fullmatch(series.label)
+        ]
+    for row_index, series in table_plant_rows:
+        plant_data = build_plant_record(
+            series.label, series, len(extracted_data['real_generation_records']),
+            page_text, ocr_text, page_num, document_path, source='positioned_words'
+        )
+        extracted_data['real_generation_records'].append({
+            'plant_name': series.label,
+            'data': plant_data,
+            'source_row': row_index
+        })
+        extracted_data['extraction_quality']['patterns_found'] += 1
+
     for i, line in enumerate(lines):
         line = line.strip()
         if not line:
             continue
-            
-        # Try to extract tabular generation data (main pattern)
-        for pattern in patterns['tabular_generation']:
+
+        # Try to extract tabular generation data (main pattern); text lines
+        # are only parsed when the page had no positioned-word table
+        for pattern in ([] if table_plant_rows else patterns['tabular_generation']):
             match = re.match(pattern, line)
             if match:
                 plant_name = match.group(1)
@@ -645,135 +830,16 @@ def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, d
                 total_daily = convert_to_float(match.group(3))
                 daily_max = convert_to_float(match.group(4))
                 daily_avg = convert_to_float(match.group(5))
-                
-                # Extract hourly values
-                hourly_values = []
-                for hourly_match in re.finditer(r'(\d+,\d+)', hourly_section):
-                    hourly_values.append(convert_to_float(hourly_match.group(1)))
-                
-                # Determine plant type
-                plant_type = "UNKNOWN"
-                if plant_name.startswith('PFV-'):
-                    plant_type = "SOLAR_PV"
-                elif plant_name.startswith('PMGD-PFV-'):
-                    plant_type = "DISTRIBUTED_SOLAR_PV"
-                elif plant_name.startswith('PMGD-TER-'):
-                    plant_type = "DISTRIBUTED_THERMAL"
-                elif plant_name.startswith('PMGD-DIESEL-'):
-                    plant_type = "DISTRIBUTED_DIESEL"
-                elif plant_name.startswith('PMGD-'):
-                    plant_type = "DISTRIBUTED_GENERATION"
-                elif 'HIDRO' in plant_name or 'AGUA' in plant_name:
-                    plant_type = "HYDROELECTRIC"
-                elif 'EOLICA' in plant_name or 'WIND' in plant_name:
-                    plant_type = "WIND"
-                elif 'CARBO' in plant_name or 'COAL' in plant_name:
-                    plant_type = "COAL"
-                elif 'GAS' in plant_name:
-                    plant_type = "NATURAL_GAS"
-                elif 'NUCLEAR' in plant_name:
-                    plant_type = "NUCLEAR"
-
-                # Extract colors using multiple approaches
-                plant_color = "#808080"  # Default gray
-                color_source = "default"
-
-                if document_path:
-                    # First priority: Actual PDF colors from graphics/text formatting
-                    actual_colors = extract_actual_pdf_colors(document_path, page_num)
-                    if actual_colors and actual_colors.get('text_colors'):
-                        # Check if plant name appears in colored text
-                        for text_key, color_info in actual_colors['text_colors'].items():
-                            if plant_name in text_key or text_key in plant_name:
-                                plant_color = color_info['color']
-                                color_source = f"pdf_text_formatting"
-                                print(f"   🎨 Found actual PDF text color {plant_color} for {plant_name}")
-                                break
-
-                    # Second priority: OCR-based color detection
-                    if color_source == "default":
-                        text_colors = extract_colors_via_text_analysis(page_text + "\n" + ocr_text)
-                        if text_colors and text_colors.get('color_mapping'):
-                            for color_key, color_info in text_colors['color_mapping'].items():
-                                if plant_name in color_key or color_key in plant_name:
-                                    plant_color = color_info['color']
-                                    color_source = f"ocr_text_{color_info['color_name']}"
-                                    print(f"   🎨 OCR detected color {color_info['color_name']} ({plant_color}) for {plant_name}")
-                                    break
-
-                    # Third priority: PDF graphic colors
-                    if color_source == "default" and actual_colors and actual_colors.get('graphic_colors'):
-                        graphic_colors = list(actual_colors['graphic_colors'].values())
-                        if graphic_colors:
-                            # Use plant index to assign different graphic colors
-                            color_index = len(extracted_data['real_generation_records']) % len(graphic_colors)
-                            plant_color = graphic_colors[color_index]['color']
-                            color_source = "pdf_graphics"
-                            print(f"   🎨 Assigned actual PDF graphic color {plant_color} to {plant_name}")
-
-                    # Fourth priority: Fallback to PDF visual colors
-                    if color_source == "default":
-                        page_colors = extract_colors_from_page(document_path, page_num)
-                        detected_colors = page_colors.get('page_colors', [])
-
-                        if detected_colors:
-                            # Use plant index to assign different detected colors
-                            color_index = len(extracted_data['real_generation_records']) % len(detected_colors)
-                            plant_color = detected_colors[color_index]
-                            color_source = "pdf_visual"
-                            print(f"   🎨 Assigned PDF color {plant_color} to {plant_name}")
-
-                # Final fallback to unique colors per plant (not type-based)
-                if color_source == "default":
-                    # Generate unique colors for each plant using a hash-based approach
-                    import hashlib
-
-                    # Use plant name to generate a consistent unique color
-                    plant_hash = hashlib.md5(plant_name.encode()).hexdigest()[:6]
-                    plant_color = f"#{plant_hash}"
-                    color_source = f"unique_hash_{plant_name}"
-
-                    # Alternative: Use a predefined palette of distinct colors
-                    distinct_colors = [
-                        "#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7",
-                        "#DDA0DD", "#98D8C8", "#F7DC6F", "#BB8FCE", "#85C1E9",
-                        "#F8C471", "#82E0AA", "#F1948A", "#85C1E9", "#D7BDE2",
-                        "#A3E4D7", "#FCF3CF", "#FADBD8", "#D5DBDB", "#AED6F1"
-                    ]
-
-                    # Use plant index to assign from distinct color palette
-                    plant_index = len(extracted_data['real_generation_records'])
-                    if plant_index < len(distinct_colors):
-                        plant_color = distinct_colors[plant_index]
-                        color_source = f"palette_index_{plant_index}"
-
-                    print(f"   🎨 Assigned unique color {plant_color} to {plant_name} ({color_source})")
-                
-                # Calculate operational metrics
-                operational_hours = sum(1 for v in hourly_values if v > 0.0)
-                peak_hour = hourly_values.index(max(hourly_values)) + 1 if hourly_values else 0
-
-                # Build hourly data with hour numbers
-                hourly_data_with_hours = []
-                for i, value in enumerate(hourly_values, 1):
-                    hourly_data_with_hours.append({
-                        "hour": i,
-                        "value": value
-                    })
-
-                plant_data = {
-                    'plant_name': plant_name,
-                    'plant_type': plant_type,
-                    'plant_color': plant_color,
-                    'daily_total_mwh': total_daily,
-                    'daily_max_mw': daily_max,
-                    'daily_avg_mw': daily_avg,
-                    'hourly_data': hourly_data_with_hours,
-                    'operational_hours': operational_hours,
-                    'peak_hour': peak_hour,
-                    'source': 'tabular_extraction'
-                }
-                
+
+                # Typed 24-hour series, checked against the reported TOT.DIA
+                series = parse_hourly_series(hourly_section, label=plant_name)
+                series.trailing = {"total": total_daily, "dmax": daily_max, "dmed": daily_avg}
+
+                plant_data = build_plant_record(
+                    plant_name, series, len(extracted_data['real_generation_records']),
+                    page_text, ocr_text, page_num, document_path
+                )
+
                 extracted_data['real_generation_records'].append({
                     'plant_name': plant_name,
                     'data': plant_data,
@@ -781,7 +847,7 @@ def extract_real_generation_data(page_text: str, ocr_text: str, page_num: int, d
                 })
                 extracted_data['extraction_quality']['patterns_found'] += 1
                 break
-        
+
         # Fallback: Try to extract just plant names for incomplete lines
         if not any(re.match(pattern, line) for pattern in patterns['tabular_generation']):
             for pattern in patterns['solar_plant']:
@@ -938,6 +1004,7 @@ def process_page(page_num: int, document_path: str) -> Dict:
     # Extract text using both methods
     raw_text = extract_page_text(document_path, page_num)
     ocr_text = extract_ocr_text(document_path, page_num)
+    words = extract_page_words(document_path, page_num)
     
     if not raw_text and not ocr_text:
         print(f"⚠️  No text extracted from page {page_num}")
@@ -949,7 +1016,7 @@ def process_page(page_num: int, document_path: str) -> Dict:
     text_colors = extract_colors_via_text_analysis(raw_text + "\n" + ocr_text)
 
     # Extract generation data (which includes comprehensive metadata)
-    extracted_data = extract_real_generation_data(raw_text, ocr_text, page_num, document_path)
+    extracted_data = extract_real_generation_data(raw_text, ocr_text, page_num, document_path, words)
 
     # Reorganize: Move document_metadata to top and simplify color analysis
     if 'document_metadata' in extracted_data:
@@ -12,6 +12,10 @@ sys.path.append(str(Path(__file__).parent.parent.parent / "shared" / "schemas"))
 from esquema_universal_chileno import UniversalSchemaTemplate
 from extractor_universal_integrado import BaseUniversalExtractor
 
+# Shared 24-hour series parser (same one the processors use)
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "shared" / "utilities"))
+from hourly_series import HourlySeries
+
 class Anexo02ToUniversalAdapter(BaseUniversalExtractor):
     """Transform ANEXO 2 solar/renewable data to universal format"""
 
@@ -38,8 +42,26 @@ class Anexo02ToUniversalAdapter(BaseUniversalExtractor):
 
     def extract_generation_data(self, data: Dict) -> List[Dict]:
         """Extract real generation data for universal schema"""
-        # TODO: Extract and format generation data
-        pass
+        generation = []
+        for record in data.get("real_generation_records", []):
+            plant = record.get("data", {})
+            if "hourly_data" not in plant:
+                continue  # Name-only records carry no series
+            series = HourlySeries.from_hourly_data(
+                plant["hourly_data"],
+                label=record.get("plant_name", ""),
+                total=plant.get("daily_total_mwh")
+            )
+            generation.append({
+                "plant_name": series.label,
+                "plant_type": plant.get("plant_type", "UNKNOWN"),
+                "hourly_values_mw": series.to_list(),
+                "daily_total_mwh": series.reported_total if series.reported_total is not None else series.total,
+                "operational_hours": series.operational_hours,
+                "peak_hour": series.peak_hour,
+                "validation": series.validate()
+            })
+        return generation
 
     def validate_anexo_02_transformation(self, universal_data: Dict) -> bool:
         """Validate the transformed universal data"""
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+INFORME DIARIO Section Grammar
+==============================
+
+Declarative line grammar for the daily report (pages 101-134).
+
+Every section has a state with an ordered list of line rules. The rules of a
+state are compiled once into a single alternation of named groups, so each
+line is classified with one regex match (m.lastgroup is the token kind)
+instead of trying pattern after pattern in Python branches.
+
+Section headers ("1DESVIACIONES...", "3.1. Centrales", "Abreviaturas:") are
+rules of every state; SECTION_TRANSITIONS maps the section number they carry
+to the next state. parse_daily_report() walks the lines of all pages once and
+returns the tokens of every section, which the section extractors of
+informe_diario_processor.py consume without rescanning the text.
+
+Usage:
+    from informe_diario_grammar import parse_daily_report, tokenize
+
+    report = parse_daily_report(page_texts, first_page=101)
+    report.sections["3"].tokens
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MARKERS = r'[*†‡§¶#@]'
+
+# Rules shared by every state; they drive the transitions
+HEADER_RULES = [
+    ("section_header", r'(?P<section_number>[0-9]+)(?P<section_title>[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s\(\)\*]+)'),
+    ("subsection_header", r'(?P<subsection_number>[0-9]+\.[0-9]+\.)\s*(?P<subsection_title>[A-Za-záéíóúñ\s]+)'),
+]
+
+# Subsection lines whose title has other characters ("3.1. Centrales (MW)")
+SUBSECTION_LINE_RULE = ("subsection_line", r'(?P<subsection_prefix>[0-9]+\.[0-9]+\.).*')
+
+TEXT_RULE = ("text", r'.+')
+
+# Section 1 - DESVIACIONES DE LA PROGRAMACION (multi-line plant rows)
+DEVIATION_RULES = [
+    ("plant_known", r'(?P<known_type>PE|PFV|PEO|CTM|CTH|CTA|TER|U)\s+(?P<known_name>.+)'),
+    ("plant_pmgd", r'(?i:(?P<pmgd_type>PMGD\s+[A-Z]+)\s+(?P<pmgd_name>.+))'),
+    ("number", rf'(?P<number_value>\d+\.?\d*)(?P<number_marker>{MARKERS}+)?'),
+    ("percentage", rf'(?P<percent_prefix>\(\*\))?\s*(?P<percent_value>[\+\-]?\d+\.?\d*)\s*%?(?P<percent_marker>{MARKERS}+)?'),
+    ("marker", rf'{MARKERS}+'),
+    ("estado", r'[A-Z]{2,3}'),
+    ("blank", r'-|--|N/A|n/a'),
+    ("abbreviation", r'(?P<abbrev_code>[A-Z]{1,4}):(?P<abbrev_definition>.+)'),
+    ("abbreviations_header", r'(?i:.*abreviatura.*)'),
+    TEXT_RULE,
+]
+
+# Section 2 - JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES
+JUSTIFICATION_RULES = [
+    ("plant", r'(?P<plant_type>HE|HP|PE|PEO|PFV|TER|CTM|CTH|CTA)\s+(?P<plant_name>.+)'),
+    TEXT_RULE,
+]
+
+# Section 3 - ESTADO DE LAS CENTRALES
+STATUS_RULES = [
+    SUBSECTION_LINE_RULE,
+    ("plant", r'(?P<plant_type>HE|HP|PE|PEO|PFV|TER|CTM|CTH|CTA|PMGD)\s+(?P<plant_name>.+)'),
+    ("availability", r'[0-9]+\.[0-9]+'),
+    TEXT_RULE,
+]
+
+# Section 4 - ANTECEDENTES DE LA OPERACIÓN DIARIA SEN
+OPERATIONS_RULES = [
+    SUBSECTION_LINE_RULE,
+    ("time", r'[0-9]{1,2}:[0-9]{2}'),
+    TEXT_RULE,
+]
+
+# Sections 5-8 - SCADA, comunicaciones, cambios topológicos, tensión
+SYSTEM_TABLE_RULES = [
+    ("date", r'[0-9]{1,2}/[0-9]{1,2}/[0-9]{4}'),
+    ("time", r'[0-9]{1,2}:[0-9]{2}'),
+    TEXT_RULE,
+]
+
+STATE_RULES: Dict[str, List[Tuple[str, str]]] = {
+    "preamble": [("abbreviations_header", r'(?i:.*abreviatura.*)'), TEXT_RULE],
+    "deviations": DEVIATION_RULES,
+    "justifications": JUSTIFICATION_RULES,
+    "plant_status": STATUS_RULES,
+    "operations": OPERATIONS_RULES,
+    "system_tables": SYSTEM_TABLE_RULES,
+}
+
+# Section number -> grammar state
+SECTION_TRANSITIONS: Dict[str, str] = {
+    "1": "deviations",
+    "2": "justifications",
+    "3": "plant_status",
+    "4": "operations",
+    "5": "system_tables",
+    "6": "system_tables",
+    "7": "system_tables",
+    "8": "system_tables",
+}
+
+# Token kinds that switch section, and how to read the section number
+TRANSITION_KINDS = {
+    "section_header": lambda m: m.group("section_number"),
+    "subsection_header": lambda m: m.group("subsection_number").split('.')[0],
+    "abbreviations_header": lambda m: "1",  # Abreviaturas belong to section 1
+}
+
+
+def _compile_state(rules: Sequence[Tuple[str, str]]) -> "re.Pattern":
+    alternation = "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in (*HEADER_RULES, *rules))
+    return re.compile(alternation)
+
+
+COMPILED_STATES: Dict[str, "re.Pattern"] = {
+    state: _compile_state(rules) for state, rules in STATE_RULES.items()
+}
+
+
+@dataclass
+class Token:
+    """One non-empty line classified by the grammar of its section"""
+    kind: str
+    line: str
+    match: "re.Match"
+    page: Optional[int] = None
+
+    def group(self, name: str) -> Optional[str]:
+        return self.match.group(name)
+
+
+@dataclass
+class SectionTokens:
+    """Classified lines of one report section"""
+    number: str
+    state: str
+    title: Optional[str] = None
+    subsections: List[str] = field(default_factory=list)
+    pages: List[int] = field(default_factory=list)
+    tokens: List[Token] = field(default_factory=list)
+
+
+@dataclass
+class ParsedReport:
+    """All sections of a daily report, in order of appearance"""
+    sections: Dict[str, SectionTokens] = field(default_factory=dict)
+    preamble: List[Token] = field(default_factory=list)
+
+
+def classify(line: str, state: str) -> Token:
+    """Classify a stripped, non-empty line with the grammar of a state"""
+    match = COMPILED_STATES[state].fullmatch(line)
+    return Token(match.lastgroup, line, match)
+
+
+def tokenize(raw_text: str, section_number: str) -> List[Token]:
+    """Classify the lines of a text known to belong to one section"""
+    pattern = COMPILED_STATES[SECTION_TRANSITIONS.get(section_number, "deviations")]
+    tokens = []
+    for line in raw_text.split('\n'):
+        line = line.strip()
+        if line:
+            match = pattern.fullmatch(line)
+            tokens.append(Token(match.lastgroup, line, match))
+    return tokens
+
+
+def parse_daily_report(page_texts: Iterable[str], first_page: int = 101) -> ParsedReport:
+    """
+    Split a daily report into sections in a single pass over its lines
+
+    Args:
+        page_texts: Text of each page, in order
+        first_page: Page number of the first text
+
+    Returns:
+        ParsedReport with the tokens of every section; text before the
+        first header is kept in preamble
+    """
+    report = ParsedReport()
+    current: Optional[SectionTokens] = None
+    pattern = COMPILED_STATES["preamble"]
+
+    for page_number, page_text in enumerate(page_texts, start=first_page):
+        for line in page_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+
+            match = pattern.fullmatch(line)
+            kind = match.lastgroup
+            read_number = TRANSITION_KINDS.get(kind)
+            number = read_number(match) if read_number else None
+
+            if number in SECTION_TRANSITIONS and (current is None or number != current.number):
+                current = report.sections.get(number)
+                if current is None:
+                    current = SectionTokens(number, SECTION_TRANSITIONS[number])
+                    report.sections[number] = current
+                pattern = COMPILED_STATES[current.state]
+                # Re-classify the header with the new state's grammar
+                match = pattern.fullmatch(line)
+                kind = match.lastgroup
+
+            token = Token(kind, line, match, page_number)
+            if current is None:
+                report.preamble.append(token)
+                continue
+
+            if kind == "section_header" and current.title is None:
+                current.title = match.group("section_title").strip()
+            elif kind in ("subsection_header", "subsection_line"):
+                current.subsections.append(line)
+            if not current.pages or current.pages[-1] != page_number:
+                current.pages.append(page_number)
+            current.tokens.append(token)
+
+    return report
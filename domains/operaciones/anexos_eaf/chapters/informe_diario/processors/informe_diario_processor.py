@@ -16,9 +16,13 @@ This script extracts:
 - Weather conditions impact
 - Operational alerts and notifications
 
+Section boundaries and line types come from the compiled grammar in
+informe_diario_grammar.py; the section extractors consume its tokens.
+
 Usage:
     python extract_informe_diario_day1.py [page_number]
     python extract_informe_diario_day1.py --all  # Process all pages 101-134
+    python extract_informe_diario_day1.py --report  # All sections of pages 101-134 in one pass
 """
 
 import sys
@@ -51,6 +55,20 @@ except ImportError as e:
     import cv2
     import numpy as np
 
+sys.path.append(str(Path(__file__).parent))
+from informe_diario_grammar import Token, tokenize, parse_daily_report
+
+SECTION_TITLES = {
+    "1": "DESVIACIONES DE LA PROGRAMACION",
+    "2": "JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)",
+    "3": "ESTADO DE LAS CENTRALES",
+    "4": "ANTECEDENTES DE LA OPERACIÓN DIARIA SEN",
+    "5": "INDISPONIBILIDAD SCADA SEN",
+    "6": "COMUNICACIONES SEN",
+    "7": "CAMBIOS TOPOLÓGICOS RELEVANTES SEN",
+    "8": "REGULACIÓN DE TENSIÓN SEN"
+}
+
 def extract_date_info(raw_text: str) -> Dict:
     """Extract date and time information from the daily report"""
     date_info = {
@@ -115,80 +133,128 @@ def extract_operational_summary(raw_text: str) -> Dict:
 
     return summary
 
-def detect_abbreviations(raw_text: str) -> Dict:
-    """Extract abbreviation definitions from the text"""
+# Table header words that are never plant names
+TABLE_HEADER_WORDS = {'Centrales', 'Prog.', 'Desv %', 'Estado', 'Real'}
+
+# Token kinds that may start a plant name without a known prefix
+GENERAL_PLANT_KINDS = {'text', 'abbreviation', 'abbreviations_header'}
+
+def _starts_with_digit(line: str) -> bool:
+    return '0' <= line[0] <= '9'
+
+def _is_plain_number_or_percentage(token: Token) -> bool:
+    """Line like "12.5", "-3" or "4.2 %" without markers"""
+    if token.kind == "number":
+        return token.group("number_marker") is None
+    if token.kind == "percentage":
+        return token.group("percent_prefix") is None and token.group("percent_marker") is None
+    return False
+
+def abbreviations_from_tokens(tokens: List[Token]) -> Dict:
+    """Extract abbreviation definitions from section 1 tokens"""
     abbreviations = {
         "abbreviations_found": [],
         "pmgd_plants": [],
         "is_abbreviations_page": False
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
     # Check if this is an abbreviations page
     abbreviation_indicators = ['abreviatura', 'abreviaciones', 'significado', 'definiciones', 'nomenclatura']
-    has_abbreviation_section = any(indicator in raw_text.lower() for indicator in abbreviation_indicators)
+    abbrev_line_index = -1
+    has_abbreviation_section = False
+    for i, token in enumerate(tokens):
+        line_lower = token.line.lower()
+        if abbrev_line_index < 0 and 'abreviatura' in line_lower:
+            abbrev_line_index = i
+        if not has_abbreviation_section:
+            has_abbreviation_section = any(indicator in line_lower for indicator in abbreviation_indicators)
 
     if has_abbreviation_section:
         abbreviations["is_abbreviations_page"] = True
+        seen_codes = set()
 
-        # Find the "Abreviaturas:" line
-        abbrev_line_index = -1
-        for i, line in enumerate(lines):
-            if 'abreviatura' in line.lower():
-                abbrev_line_index = i
-                break
+        def add_abbreviation(token: Token):
+            abbreviations["abbreviations_found"].append({
+                "code": token.group("abbrev_code"),
+                "definition": token.group("abbrev_definition").strip(),
+                "raw_line": token.line
+            })
+            seen_codes.add(token.group("abbrev_code"))
 
-        # Extract abbreviation definitions from lines BEFORE "Abreviaturas:"
+        # Definitions are listed in the lines BEFORE "Abreviaturas:"
         if abbrev_line_index >= 0:
-            # Look at lines before "Abreviaturas:" for definitions
-            for i in range(max(0, abbrev_line_index - 20), abbrev_line_index):
-                line = lines[i]
-                # Pattern: ABC:Definition (with colon) - allow single character codes too
-                abbrev_match = re.match(r'^([A-Z]{1,4}):(.+)$', line)
-                if abbrev_match:
-                    abbrev_code = abbrev_match.group(1)
-                    definition = abbrev_match.group(2).strip()
-                    abbreviations["abbreviations_found"].append({
-                        "code": abbrev_code,
-                        "definition": definition,
-                        "raw_line": line
-                    })
-
-        # Also try general abbreviation extraction for any page
-        for line in lines:
-            # Pattern: ABC:Definition (with colon) - allow single character codes too
-            abbrev_match = re.match(r'^([A-Z]{1,4}):(.+)$', line)
-            if abbrev_match:
-                abbrev_code = abbrev_match.group(1)
-                definition = abbrev_match.group(2).strip()
-                # Avoid duplicates
-                existing_codes = [a["code"] for a in abbreviations["abbreviations_found"]]
-                if abbrev_code not in existing_codes:
-                    abbreviations["abbreviations_found"].append({
-                        "code": abbrev_code,
-                        "definition": definition,
-                        "raw_line": line
-                    })
-
-    # Look for PMGD plants specifically
-    for line in lines:
-        if 'pmgd' in line.lower():
-            # Extract PMGD plant information
-            pmgd_match = re.match(r'^(PMGD\s+[A-Z]+)\s+(.+)$', line, re.IGNORECASE)
-            if pmgd_match:
-                pmgd_type = pmgd_match.group(1).upper()
-                pmgd_name = pmgd_match.group(2).strip()
-                abbreviations["pmgd_plants"].append({
-                    "type": pmgd_type,
-                    "name": pmgd_name,
-                    "raw_line": line
-                })
+            for token in tokens[max(0, abbrev_line_index - 20):abbrev_line_index]:
+                if token.kind == "abbreviation":
+                    add_abbreviation(token)
+
+        # Also take any other definition on the page, avoiding duplicates
+        for token in tokens:
+            if token.kind == "abbreviation" and token.group("abbrev_code") not in seen_codes:
+                add_abbreviation(token)
+
+    # PMGD plants (Pequeños Medios de Generación Distribuida)
+    for token in tokens:
+        if token.kind == "plant_pmgd":
+            abbreviations["pmgd_plants"].append({
+                "type": token.group("pmgd_type").upper(),
+                "name": token.group("pmgd_name").strip(),
+                "raw_line": token.line
+            })
 
     return abbreviations
 
-def detect_table_structure(raw_text: str) -> Dict:
-    """Detect and parse tabular data structure with Estado column and multiple tables"""
+def detect_abbreviations(raw_text: str) -> Dict:
+    """Extract abbreviation definitions from the text"""
+    return abbreviations_from_tokens(tokenize(raw_text, "1"))
+
+def _plant_identity(token: Token) -> Tuple[str, str]:
+    """Plant type and name from a plant-starting token"""
+    if token.kind == "plant_known":
+        return token.group("known_type"), token.group("known_name").strip()
+
+    if token.kind == "plant_pmgd":
+        pmgd_full_type = token.group("pmgd_type").upper()  # e.g., "PMGD PFV"
+        # Extract the actual plant type from PMGD designation
+        if 'PFV' in pmgd_full_type:
+            plant_type = "PFV"  # Solar
+        elif 'PE' in pmgd_full_type or 'PEO' in pmgd_full_type:
+            plant_type = "PEO"  # Wind
+        elif 'HID' in pmgd_full_type:
+            plant_type = "HID"  # Hydro
+        else:
+            plant_type = "PMGD"  # Generic PMGD
+        # Add PMGD designation to name for clarity
+        return plant_type, f"PMGD {token.group('pmgd_name').strip()}"
+
+    # General plant - try to infer type from name patterns
+    full_name = token.line
+    upper_name = full_name.upper()
+    if any(word in upper_name for word in ['SOLAR', 'FOTOVOLTAICA', 'PV']):
+        return "PFV", full_name
+    if any(word in upper_name for word in ['EOLICA', 'WIND', 'VIENTO']):
+        return "PEO", full_name
+    if any(word in upper_name for word in ['TERMICA', 'THERMAL', 'GAS', 'DIESEL', 'CARBON']):
+        return "TER", full_name
+    if any(word in upper_name for word in ['HIDRO', 'HYDRO']):
+        return "HID", full_name
+    return "UNKNOWN", full_name
+
+def _is_general_plant(tokens: List[Token], i: int) -> bool:
+    """Capitalized name followed by a plain number (plant without known prefix)"""
+    token = tokens[i]
+    line = token.line
+    if (token.kind not in GENERAL_PLANT_KINDS or
+        not 'A' <= line[0] <= 'Z' or
+        len(line) <= 4 or
+        line in TABLE_HEADER_WORDS):
+        return False
+    if i + 1 >= len(tokens):
+        return False
+    next_token = tokens[i + 1]
+    return next_token.kind == "number" and next_token.group("number_marker") is None
+
+def table_structure_from_tokens(tokens: List[Token]) -> Dict:
+    """Parse section 1 plant rows (Estado column, left/right tables) from tokens"""
     tables = {
         "power_plants": [],
         "left_table": [],
@@ -198,81 +264,17 @@ def detect_table_structure(raw_text: str) -> Dict:
         "abbreviations": None
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
     # Process multi-line power plant data structure
     i = 0
     current_table_side = "left"  # Track which table we're processing
     plant_count = 0  # Count plants to help detect table switch
 
-    while i < len(lines):
-        line = lines[i]
-
-        # Look for plant name pattern - flexible approach with PMGD support
-        # First try known prefixes (for better classification)
-        known_prefix_match = re.match(r'^(PE|PFV|PEO|CTM|CTH|CTA|TER|U)\s+(.+)$', line)
-
-        # Try PMGD pattern (Pequeños Medios de Generación Distribuida)
-        pmgd_match = re.match(r'^(PMGD\s+[A-Z]+)\s+(.+)$', line, re.IGNORECASE)
-
-        # Also try general plant name pattern (any capitalized name followed by data)
-        general_plant_match = None
-        if not known_prefix_match and not pmgd_match:
-            # Look for potential plant names: starts with capital, not just a code, has substance
-            if (re.match(r'^[A-Z]', line) and
-                len(line) > 4 and
-                not re.match(r'^[A-Z]{1,3}$', line) and  # Not estado codes like RO, GNP
-                not line in ['Centrales', 'Prog.', 'Desv %', 'Estado', 'Real'] and  # Not headers
-                not re.match(r'^\(\*\)', line) and  # Not markers
-                not re.match(r'^[\+\-]?\d+\.?\d*\s*%?$', line)):  # Not percentages
-
-                # Check if followed by numerical data (indicates it's a plant)
-                if i + 1 < len(lines) and re.match(r'^\d+\.?\d*$', lines[i + 1]):
-                    general_plant_match = re.match(r'^(.+)$', line)
-
-        plant_match = known_prefix_match or pmgd_match or general_plant_match
-        if plant_match:
-            if known_prefix_match:
-                # Extract type and name from known prefix pattern
-                plant_type = known_prefix_match.group(1)
-                plant_name = known_prefix_match.group(2).strip()
-            elif pmgd_match:
-                # Extract PMGD type and name
-                pmgd_full_type = pmgd_match.group(1).upper()  # e.g., "PMGD PFV"
-                plant_name = pmgd_match.group(2).strip()
-
-                # Extract the actual plant type from PMGD designation
-                if 'PFV' in pmgd_full_type:
-                    plant_type = "PFV"  # Solar
-                elif 'PE' in pmgd_full_type or 'PEO' in pmgd_full_type:
-                    plant_type = "PEO"  # Wind
-                elif 'HID' in pmgd_full_type:
-                    plant_type = "HID"  # Hydro
-                else:
-                    plant_type = "PMGD"  # Generic PMGD
-
-                # Add PMGD designation to name for clarity
-                plant_name = f"PMGD {plant_name}"
-            else:
-                # General plant - try to extract type from name or use "UNKNOWN"
-                full_name = general_plant_match.group(1).strip()
-                # Try to infer type from name patterns
-                if any(word in full_name.upper() for word in ['SOLAR', 'FOTOVOLTAICA', 'PV']):
-                    plant_type = "PFV"
-                    plant_name = full_name
-                elif any(word in full_name.upper() for word in ['EOLICA', 'WIND', 'VIENTO']):
-                    plant_type = "PEO"
-                    plant_name = full_name
-                elif any(word in full_name.upper() for word in ['TERMICA', 'THERMAL', 'GAS', 'DIESEL', 'CARBON']):
-                    plant_type = "TER"
-                    plant_name = full_name
-                elif any(word in full_name.upper() for word in ['HIDRO', 'HYDRO']):
-                    plant_type = "HID"
-                    plant_name = full_name
-                else:
-                    plant_type = "UNKNOWN"
-                    plant_name = full_name
+    while i < len(tokens):
+        token = tokens[i]
+        line = token.line
 
+        if token.kind in ("plant_known", "plant_pmgd") or _is_general_plant(tokens, i):
+            plant_type, plant_name = _plant_identity(token)
             plant_count += 1
 
             # Detect table side based on plant type and position
@@ -299,19 +301,18 @@ def detect_table_structure(raw_text: str) -> Dict:
             j = i + 1
             values_found = []
 
-            while j < len(lines) and j < i + 6:  # Look at next 5 lines max
-                next_line = lines[j]
+            while j < len(tokens) and j < i + 6:  # Look at next 5 lines max
+                next_token = tokens[j]
+                kind = next_token.kind
+                next_line = next_token.line
 
-                # Check if this is another plant (stop processing current plant)
-                if (re.match(r'^(PE|PFV|PEO|CTM|CTH|CTA|TER|U)\s+(.+)$', next_line) or
-                    re.match(r'^(PMGD\s+[A-Z]+)\s+(.+)$', next_line, re.IGNORECASE)):
+                # Another plant stops the current one
+                if kind in ("plant_known", "plant_pmgd"):
                     break
 
-                # Check for programmed value (number with possible markers)
-                number_with_marker = re.match(r'^(\d+\.?\d*)([*†‡§¶#@]+)?$', next_line)
-                if number_with_marker:
-                    value = float(number_with_marker.group(1))
-                    marker = number_with_marker.group(2)
+                # Programmed/real value (number with possible markers)
+                if kind == "number":
+                    marker = next_token.group("number_marker")
                     if marker:
                         plant_data["special_markers"].append({
                             "type": "programmed_value",
@@ -320,15 +321,13 @@ def detect_table_structure(raw_text: str) -> Dict:
                         })
                         plant_data["comments"].append(f"Programmed value has marker: {marker}")
 
-                    values_found.append(('number', value, next_line))
+                    values_found.append(('number', float(next_token.group("number_value")), next_line))
                     plant_data["raw_lines"].append(next_line)
 
-                # Check for percentage with possible markers - including (*) format
-                elif re.match(r'^(\(\*\))?\s*([\+\-]?\d+\.?\d*)\s*%?([*†‡§¶#@]+)?$', next_line):
-                    percentage_match = re.match(r'^(\(\*\))?\s*([\+\-]?\d+\.?\d*)\s*%?([*†‡§¶#@]+)?$', next_line)
-                    prefix_marker = percentage_match.group(1)  # (*) at beginning
-                    percentage = float(re.sub(r'[%\s*†‡§¶#@()]', '', percentage_match.group(2)))
-                    suffix_marker = percentage_match.group(3)  # markers after percentage
+                # Percentage with possible markers - including (*) format
+                elif kind == "percentage":
+                    prefix_marker = next_token.group("percent_prefix")  # (*) at beginning
+                    suffix_marker = next_token.group("percent_marker")  # markers after percentage
 
                     if prefix_marker:
                         plant_data["special_markers"].append({
@@ -346,17 +345,11 @@ def detect_table_structure(raw_text: str) -> Dict:
                         })
                         plant_data["comments"].append(f"Percentage has suffix marker: {suffix_marker}")
 
-                    values_found.append(('percentage', percentage, next_line))
-                    plant_data["raw_lines"].append(next_line)
-
-                # Check for standard percentage without special markers
-                elif re.match(r'^([\+\-]?\d+\.?\d*)\s*%?$', next_line):
-                    percentage = float(re.sub(r'[%\s]', '', next_line))
-                    values_found.append(('percentage', percentage, next_line))
+                    values_found.append(('percentage', float(next_token.group("percent_value")), next_line))
                     plant_data["raw_lines"].append(next_line)
 
-                # Check for special marker lines (just symbols)
-                elif re.match(r'^[*†‡§¶#@]+$', next_line):
+                # Special marker lines (just symbols)
+                elif kind == "marker":
                     plant_data["special_markers"].append({
                         "type": "standalone_marker",
                         "marker": next_line,
@@ -365,21 +358,14 @@ def detect_table_structure(raw_text: str) -> Dict:
                     plant_data["comments"].append(f"Has special marker: {next_line}")
                     plant_data["raw_lines"].append(next_line)
 
-                # Check for Estado (state codes like RO, FU, etc.)
-                elif re.match(r'^[A-Z]{2,3}$', next_line) and len(next_line) <= 3:
+                # Estado (state codes like RO, FU, etc.)
+                elif kind == "estado":
                     plant_data["estado"] = next_line
                     plant_data["raw_lines"].append(next_line)
 
-                # Check for blank/empty lines or dashes (missing data)
-                elif next_line in ['-', '--', '', 'N/A', 'n/a', '*']:
-                    if next_line == '*':
-                        plant_data["special_markers"].append({
-                            "type": "missing_data",
-                            "marker": "*",
-                            "position": "replacement"
-                        })
-                        plant_data["comments"].append("Data replaced with * (missing/unavailable)")
-                    elif next_line == '-':
+                # Dashes or N/A (missing data)
+                elif kind == "blank":
+                    if next_line == '-':
                         plant_data["comments"].append("Data marked as unavailable with -")
 
                     values_found.append(('blank', None, next_line))
@@ -440,18 +426,18 @@ def detect_table_structure(raw_text: str) -> Dict:
         i += 1
 
     # Extract abbreviations information
-    abbreviations_data = detect_abbreviations(raw_text)
-    tables["abbreviations"] = abbreviations_data
+    tables["abbreviations"] = abbreviations_from_tokens(tokens)
 
     # Look for table headers and summary sections
     potential_headers = []
-    for i, line in enumerate(lines):
+    for i, token in enumerate(tokens):
+        line = token.line
         # Detect potential table headers
         if any(keyword in line.lower() for keyword in
                ['programado', 'real', 'diferencia', 'porcentaje', '%', 'mwh', 'mw', 'total', 'subtotal']):
 
             # Check if it's not just a percentage value
-            if not re.match(r'^[\+\-]?\d+\.?\d*\s*%?$', line.strip()):
+            if not _is_plain_number_or_percentage(token):
                 potential_headers.append({
                     "line_number": i,
                     "header_text": line,
@@ -498,6 +484,10 @@ def detect_table_structure(raw_text: str) -> Dict:
 
     return tables
 
+def detect_table_structure(raw_text: str) -> Dict:
+    """Detect and parse tabular data structure with Estado column and multiple tables"""
+    return table_structure_from_tokens(tokenize(raw_text, "1"))
+
 def extract_generation_data(raw_text: str) -> List[Dict]:
     """Extract generation data from different sources including tabular data"""
     generation_data = []
@@ -686,101 +676,92 @@ def extract_section_1_tables(raw_text: str) -> Dict:
     # Use the existing detect_table_structure function
     return detect_table_structure(raw_text)
 
-def extract_section_2_justifications(raw_text: str) -> Dict:
-    """Extract Section 2: JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES"""
+def _first_subsection(tokens: List[Token], section_number: str) -> Optional[str]:
+    """Subsection line ("3.1. ...") among the first 10 lines"""
+    prefix = f"{section_number}."
+    for token in tokens[:10]:
+        if token.kind in ("subsection_header", "subsection_line") and token.line.startswith(prefix):
+            return token.line
+    return None
+
+def justifications_from_tokens(tokens: List[Token]) -> Dict:
+    """Section 2 consumer: plant line followed by its justification"""
     justifications = {
         "justifications_found": [],
         "total_justifications": 0
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
     i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # Look for plant names (patterns like "HE Plant", "PE Plant", "PFV Plant", "TER Plant")
-        plant_match = re.match(r'^(HE|HP|PE|PEO|PFV|TER|CTM|CTH|CTA)\s+(.+)$', line)
-        if plant_match:
-            plant_type = plant_match.group(1)
-            plant_name = plant_match.group(2).strip()
-
-            # Look for justification in next line
-            if i + 1 < len(lines):
-                justification = lines[i + 1].strip()
-
-                justifications["justifications_found"].append({
-                    "plant_type": plant_type,
-                    "plant_name": plant_name,
-                    "justification": justification,
-                    "source_type": (
-                        "hydro" if plant_type in ["HE", "HP"] else
-                        "wind" if plant_type in ["PE", "PEO"] else
-                        "solar" if plant_type == "PFV" else
-                        "thermal" if plant_type in ["TER", "CTM", "CTH", "CTA"] else
-                        "unknown"
-                    )
-                })
-                i += 2  # Skip both plant name and justification lines
-            else:
-                i += 1
+    while i < len(tokens):
+        token = tokens[i]
+
+        # Plant names (patterns like "HE Plant", "PE Plant", "PFV Plant", "TER Plant")
+        if token.kind == "plant" and i + 1 < len(tokens):
+            plant_type = token.group("plant_type")
+
+            justifications["justifications_found"].append({
+                "plant_type": plant_type,
+                "plant_name": token.group("plant_name").strip(),
+                "justification": tokens[i + 1].line,
+                "source_type": (
+                    "hydro" if plant_type in ["HE", "HP"] else
+                    "wind" if plant_type in ["PE", "PEO"] else
+                    "solar" if plant_type == "PFV" else
+                    "thermal" if plant_type in ["TER", "CTM", "CTH", "CTA"] else
+                    "unknown"
+                )
+            })
+            i += 2  # Skip both plant name and justification lines
         else:
             i += 1
 
     justifications["total_justifications"] = len(justifications["justifications_found"])
     return justifications
 
-def extract_section_3_status(raw_text: str) -> Dict:
-    """Extract Section 3: ESTADO DE LAS CENTRALES"""
+def extract_section_2_justifications(raw_text: str) -> Dict:
+    """Extract Section 2: JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES"""
+    return justifications_from_tokens(tokenize(raw_text, "2"))
+
+def plant_status_from_tokens(tokens: List[Token]) -> Dict:
+    """Section 3 consumer: plant availability and observations"""
     status_data = {
         "plant_status_found": [],
-        "subsection": None,
+        "subsection": _first_subsection(tokens, "3"),
         "total_plants": 0
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
-    # Detect subsection
-    for line in lines[:10]:
-        if re.match(r'^3\.[0-9]+\.', line):
-            status_data["subsection"] = line
-            break
-
     i = 0
-    while i < len(lines):
-        line = lines[i]
+    while i < len(tokens):
+        token = tokens[i]
 
-        # Look for plant names
-        plant_match = re.match(r'^(HE|HP|PE|PEO|PFV|TER|CTM|CTH|CTA|PMGD)\s+(.+)$', line)
-        if plant_match:
-            plant_type = plant_match.group(1)
-            plant_name = plant_match.group(2).strip()
+        if token.kind == "plant":
+            plant_type = token.group("plant_type")
 
             # Look for availability percentage and observations in next lines
             availability = None
             observations = []
 
             j = i + 1
-            while j < len(lines) and j < i + 10:  # Look ahead max 10 lines
-                next_line = lines[j]
+            while j < len(tokens) and j < i + 10:  # Look ahead max 10 lines
+                next_token = tokens[j]
 
                 # Stop if we hit another plant
-                if re.match(r'^(HE|HP|PE|PEO|PFV|TER|CTM|CTH|CTA|PMGD)\s+', next_line):
+                if next_token.kind == "plant":
                     break
 
-                # Look for availability percentage (e.g., "100.0", "85.0")
-                if re.match(r'^[0-9]+\.[0-9]+$', next_line) and availability is None:
-                    availability = float(next_line)
+                # Availability percentage (e.g., "100.0", "85.0")
+                if next_token.kind == "availability" and availability is None:
+                    availability = float(next_token.line)
 
                 # Collect observation text (longer descriptive lines)
-                elif len(next_line) > 20:  # Observations are typically longer
-                    observations.append(next_line)
+                elif len(next_token.line) > 20:  # Observations are typically longer
+                    observations.append(next_token.line)
 
                 j += 1
 
             status_data["plant_status_found"].append({
                 "plant_type": plant_type,
-                "plant_name": plant_name,
+                "plant_name": token.group("plant_name").strip(),
                 "availability_percent": availability,
                 "observations": " ".join(observations) if observations else None,
                 "source_type": (
@@ -799,43 +780,35 @@ def extract_section_3_status(raw_text: str) -> Dict:
     status_data["total_plants"] = len(status_data["plant_status_found"])
     return status_data
 
-def extract_section_4_operations(raw_text: str) -> Dict:
-    """Extract Section 4: ANTECEDENTES DE LA OPERACIÓN DIARIA SEN"""
+def extract_section_3_status(raw_text: str) -> Dict:
+    """Extract Section 3: ESTADO DE LAS CENTRALES"""
+    return plant_status_from_tokens(tokenize(raw_text, "3"))
+
+def operations_from_tokens(tokens: List[Token]) -> Dict:
+    """Section 4 consumer: time / control center / observation triples"""
     operations_data = {
         "observations_found": [],
-        "subsection": None,
+        "subsection": _first_subsection(tokens, "4"),
         "total_observations": 0
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
-    # Detect subsection
-    for line in lines[:10]:
-        if re.match(r'^4\.[0-9]+\.', line):
-            operations_data["subsection"] = line
-            break
-
-    i = 0
     current_time = None
     current_control_center = None
 
-    while i < len(lines):
-        line = lines[i]
+    for token in tokens:
+        line = token.line
 
-        # Look for time patterns (HH:MM)
-        time_match = re.match(r'^([0-9]{1,2}:[0-9]{2})$', line)
-        if time_match:
-            current_time = time_match.group(1)
-            i += 1
+        # Time lines (HH:MM) open a new observation
+        if token.kind == "time":
+            current_time = line
             continue
 
-        # Look for control center names (short lines that could be centers)
-        if len(line) <= 30 and not re.match(r'^[0-9]', line) and current_time:
+        # Control center names (short lines after a time)
+        if len(line) <= 30 and not _starts_with_digit(line) and current_time:
             current_control_center = line
-            i += 1
             continue
 
-        # Look for observation text (longer descriptive lines)
+        # Observation text (longer descriptive lines)
         if len(line) > 30 and current_time and current_control_center:
             operations_data["observations_found"].append({
                 "time": current_time,
@@ -846,61 +819,62 @@ def extract_section_4_operations(raw_text: str) -> Dict:
             current_time = None
             current_control_center = None
 
-        i += 1
-
     operations_data["total_observations"] = len(operations_data["observations_found"])
     return operations_data
 
-def extract_section_5_8_system_tables(raw_text: str, section_number: str) -> Dict:
-    """Extract Sections 5-8: System status tables (SCADA, Communications, etc.)"""
+def extract_section_4_operations(raw_text: str) -> Dict:
+    """Extract Section 4: ANTECEDENTES DE LA OPERACIÓN DIARIA SEN"""
+    return operations_from_tokens(tokenize(raw_text, "4"))
+
+SYSTEM_TABLE_HEADERS = {'Centro de Control', 'Instalación', 'Fecha F/S', 'Hora F/S', 'Fecha E/S', 'Hora E/S'}
+
+def _is_control_center_line(line: str) -> bool:
+    return 5 < len(line) < 50 and not _starts_with_digit(line)
+
+def system_tables_from_tokens(tokens: List[Token], section_number: str) -> Dict:
+    """Sections 5-8 consumer: control center rows with F/S and E/S dates and times"""
     system_data = {
         "system_entries_found": [],
         "section_number": section_number,
         "total_entries": 0
     }
 
-    lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-
     i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # Look for control center names (typically company names)
-        if (len(line) > 5 and len(line) < 50 and
-            not re.match(r'^[0-9]', line) and
-            not line in ['Centro de Control', 'Instalación', 'Fecha F/S', 'Hora F/S', 'Fecha E/S', 'Hora E/S']):
+    while i < len(tokens):
+        line = tokens[i].line
 
+        # Control center names (typically company names)
+        if _is_control_center_line(line) and line not in SYSTEM_TABLE_HEADERS:
             control_center = line
             installation = None
             fecha_fs = None
             hora_fs = None
             fecha_es = None
             hora_es = None
-            description = None
 
             # Look ahead for associated data
             j = i + 1
-            while j < len(lines) and j < i + 10:
-                next_line = lines[j]
+            while j < len(tokens) and j < i + 10:
+                next_token = tokens[j]
+                next_line = next_token.line
 
                 # Stop if we hit another control center
-                if (len(next_line) > 5 and len(next_line) < 50 and
-                    not re.match(r'^[0-9]', next_line) and j > i + 3):
+                if _is_control_center_line(next_line) and j > i + 3:
                     break
 
-                # Look for installation description (longer text)
+                # Installation description (longer text)
                 if len(next_line) > 20 and installation is None:
                     installation = next_line
 
-                # Look for dates (DD/MM/YYYY format)
-                elif re.match(r'^[0-9]{1,2}/[0-9]{1,2}/[0-9]{4}$', next_line):
+                # Dates (DD/MM/YYYY format)
+                elif next_token.kind == "date":
                     if fecha_fs is None:
                         fecha_fs = next_line
                     elif fecha_es is None:
                         fecha_es = next_line
 
-                # Look for times (HH:MM format)
-                elif re.match(r'^[0-9]{1,2}:[0-9]{2}$', next_line):
+                # Times (HH:MM format)
+                elif next_token.kind == "time":
                     if hora_fs is None:
                         hora_fs = next_line
                     elif hora_es is None:
@@ -925,41 +899,77 @@ def extract_section_5_8_system_tables(raw_text: str, section_number: str) -> Dic
     system_data["total_entries"] = len(system_data["system_entries_found"])
     return system_data
 
-def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
-    """Process a single page from the PDF and extract daily report information"""
+def extract_section_5_8_system_tables(raw_text: str, section_number: str) -> Dict:
+    """Extract Sections 5-8: System status tables (SCADA, Communications, etc.)"""
+    return system_tables_from_tokens(tokenize(raw_text, section_number), section_number)
+
+# Section consumers keyed by section number
+SECTION_CONSUMERS = {
+    "1": table_structure_from_tokens,
+    "2": justifications_from_tokens,
+    "3": plant_status_from_tokens,
+    "4": operations_from_tokens,
+    "5": lambda tokens: system_tables_from_tokens(tokens, "5"),
+    "6": lambda tokens: system_tables_from_tokens(tokens, "6"),
+    "7": lambda tokens: system_tables_from_tokens(tokens, "7"),
+    "8": lambda tokens: system_tables_from_tokens(tokens, "8"),
+}
+
+def extract_daily_report_sections(page_texts: List[str], first_page: int = 101) -> Dict:
+    """Parse all pages once with the section grammar and run every section consumer"""
+    report = parse_daily_report(page_texts, first_page)
+
+    sections = {}
+    for number, section in report.sections.items():
+        sections[f"section_{number}"] = {
+            "title": SECTION_TITLES.get(number, section.title),
+            "pages": section.pages,
+            "subsections": section.subsections,
+            "data": SECTION_CONSUMERS[number](section.tokens)
+        }
 
-    try:
-        # Open PDF with PyMuPDF for better text extraction
-        doc = fitz.open(pdf_path)
-        page = doc.load_page(page_number - 1)  # 0-indexed
+    return {
+        "sections": sections,
+        "preamble_lines": len(report.preamble)
+    }
 
-        # Extract text
-        raw_text = page.get_text()
+def extract_page_text(page) -> str:
+    """Page text, falling back to OCR for image-heavy pages"""
+    raw_text = page.get_text()
 
-        # Extract images for OCR if text is insufficient
-        image_list = page.get_images()
+    # Extract images for OCR if text is insufficient
+    image_list = page.get_images()
 
-        if len(raw_text.strip()) < 100 and image_list:
-            # Use OCR for image-heavy pages
-            pix = page.get_pixmap()
-            img_data = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_data))
+    if len(raw_text.strip()) < 100 and image_list:
+        # Use OCR for image-heavy pages
+        pix = page.get_pixmap()
+        img_data = pix.tobytes("png")
+        image = Image.open(io.BytesIO(img_data))
 
-            # Convert to numpy array for OpenCV processing
-            img_array = np.array(image)
+        # Convert to numpy array for OpenCV processing
+        img_array = np.array(image)
 
-            # Preprocess image for better OCR
-            if len(img_array.shape) == 3:
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = img_array
+        # Preprocess image for better OCR
+        if len(img_array.shape) == 3:
+            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = img_array
+
+        # Apply threshold to get better contrast
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-            # Apply threshold to get better contrast
-            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # Use pytesseract for OCR
+        raw_text = pytesseract.image_to_string(thresh, lang='spa')
 
-            # Use pytesseract for OCR
-            raw_text = pytesseract.image_to_string(thresh, lang='spa')
+    return raw_text
 
+def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
+    """Process a single page from the PDF and extract daily report information"""
+
+    try:
+        # Open PDF with PyMuPDF for better text extraction
+        doc = fitz.open(pdf_path)
+        raw_text = extract_page_text(doc.load_page(page_number - 1))  # 0-indexed
         doc.close()
 
         if len(raw_text.strip()) < 50:
@@ -999,7 +1009,7 @@ def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
             # Section 1: DESVIACIONES DE LA PROGRAMACION
             section_1_data = extract_section_1_tables(raw_text)
             result["sections"]["section_1"] = {
-                "title": "DESVIACIONES DE LA PROGRAMACION",
+                "title": SECTION_TITLES["1"],
                 "subsections": {},
                 "data": section_1_data
             }
@@ -1031,7 +1041,7 @@ def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
             # Section 2: JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES
             section_2_data = extract_section_2_justifications(raw_text)
             result["sections"]["section_2"] = {
-                "title": "JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)",
+                "title": SECTION_TITLES["2"],
                 "data": section_2_data
             }
 
@@ -1039,7 +1049,7 @@ def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
             # Section 3: ESTADO DE LAS CENTRALES
             section_3_data = extract_section_3_status(raw_text)
             result["sections"]["section_3"] = {
-                "title": "ESTADO DE LAS CENTRALES",
+                "title": SECTION_TITLES["3"],
                 "subsection": section_3_data.get("subsection"),
                 "data": section_3_data
             }
@@ -1048,23 +1058,16 @@ def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
             # Section 4: ANTECEDENTES DE LA OPERACIÓN DIARIA SEN
             section_4_data = extract_section_4_operations(raw_text)
             result["sections"]["section_4"] = {
-                "title": "ANTECEDENTES DE LA OPERACIÓN DIARIA SEN",
+                "title": SECTION_TITLES["4"],
                 "subsection": section_4_data.get("subsection"),
                 "data": section_4_data
             }
 
         elif section_number in ["5", "6", "7", "8"]:
             # Sections 5-8: System tables
-            section_titles = {
-                "5": "INDISPONIBILIDAD SCADA SEN",
-                "6": "COMUNICACIONES SEN",
-                "7": "CAMBIOS TOPOLÓGICOS RELEVANTES SEN",
-                "8": "REGULACIÓN DE TENSIÓN SEN"
-            }
-
             section_data = extract_section_5_8_system_tables(raw_text, section_number)
             result["sections"][f"section_{section_number}"] = {
-                "title": section_titles[section_number],
+                "title": SECTION_TITLES[section_number],
                 "data": section_data
             }
 
@@ -1093,6 +1096,39 @@ def process_pdf_page(pdf_path: str, page_number: int) -> Dict:
             "status": "failed"
         }
 
+def process_daily_report(pdf_path: str, start_page: int = 101, end_page: int = 134) -> Dict:
+    """Extract every section of the daily report in a single pass over its pages"""
+    page_range = f"{start_page}-{end_page}"
+
+    try:
+        doc = fitz.open(pdf_path)
+        page_texts = [extract_page_text(doc.load_page(n - 1)) for n in range(start_page, end_page + 1)]
+        doc.close()
+
+        report = extract_daily_report_sections(page_texts, start_page)
+        full_text = "\n".join(page_texts)
+
+        return {
+            "page": page_range,
+            "chapter": "INFORME_DIARIO_DAY1",
+            "extraction_timestamp": datetime.now().isoformat(),
+            "date_info": extract_date_info(full_text),
+            "sections": report["sections"],
+            "incidents_and_events": extract_incidents_and_events(full_text),
+            "preamble_lines": report["preamble_lines"],
+            "text_length": len(full_text),
+            "status": "extracted"
+        }
+
+    except Exception as e:
+        return {
+            "page": page_range,
+            "chapter": "INFORME_DIARIO_DAY1",
+            "extraction_timestamp": datetime.now().isoformat(),
+            "error": str(e),
+            "status": "failed"
+        }
+
 def save_extraction_result(result: Dict, output_dir: Path):
     """Save extraction result to JSON file"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1126,7 +1162,18 @@ def main():
 
     # Parse command line arguments
     if len(sys.argv) > 1:
-        if sys.argv[1] == "--all":
+        if sys.argv[1] == "--report":
+            # All sections of pages 101-134 in one pass
+            print(f"🚀 Starting INFORME DIARIO Day 1 report extraction")
+            result = process_daily_report(str(pdf_path))
+            if result.get("status") == "extracted":
+                save_extraction_result(result, output_dir)
+                for key, section in result["sections"].items():
+                    print(f"   📑 {key}: {section['title']} (pages {section['pages']})")
+            else:
+                print(f"   ❌ Failed: {result.get('error', 'Unknown error')}")
+            return
+        elif sys.argv[1] == "--all":
             # Process all pages 101-134
             pages_to_process = list(range(101, 135))
         else:
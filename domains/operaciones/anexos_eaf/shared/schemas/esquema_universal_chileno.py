@@ -5,10 +5,26 @@ Wrapper functions para convertir extracciones del sistema eléctrico chileno
 """
 
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 
+# Raíz del proyecto en el path para importar ai_platform
+project_root = Path(__file__).parents[5]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+_gazetteer = None
+
+def obtener_gazetteer_chile():
+    """Gazetteer compartido de entidades conocidas (vocabularios + tabla companies)"""
+    global _gazetteer
+    if _gazetteer is None:
+        from ai_platform.knowledge_graph.extractors.gazetteer import load_default_gazetteer
+        _gazetteer = load_default_gazetteer()
+    return _gazetteer
+
 def crear_documento_universal_chile(datos_extraccion: dict,
                                   titulo_documento: str,
                                   fecha_documento: str,
@@ -92,6 +108,8 @@ def extraer_entidades_datos_chile(datos: dict) -> dict:
         "equipos": []
     }
 
+    empresas_vistas = set()
+
     # Extraer de upper_table (estructura anexo)
     if "upper_table" in datos and "rows" in datos["upper_table"]:
         for fila in datos["upper_table"]["rows"]:
@@ -126,7 +144,8 @@ def extraer_entidades_datos_chile(datos: dict) -> dict:
                         nombre_empresa = nombre_candidato
                         break
 
-            if nombre_empresa and not any(e["nombre"] == nombre_empresa for e in entidades["empresas"]):
+            if nombre_empresa and nombre_empresa not in empresas_vistas:
+                empresas_vistas.add(nombre_empresa)
                 entidades["empresas"].append({
                     "@id": f"cen:empresa:{normalizar_nombre_chile(nombre_empresa)}",
                     "@type": "EmpresaElectricaChile",
@@ -141,7 +160,7 @@ def extraer_entidades_datos_chile(datos: dict) -> dict:
 
     # Extraer ubicaciones chilenas
     if "upper_table" in datos:
-        texto_completo = json.dumps(datos).lower()
+        texto_completo = json.dumps(datos, ensure_ascii=False)
         regiones_chile = detectar_regiones_chile(texto_completo)
         for region in regiones_chile:
             entidades["ubicaciones"].append({
@@ -216,16 +235,13 @@ def es_probable_nombre_empresa_chile(texto: str) -> bool:
     if not isinstance(texto, str) or len(texto) < 3:
         return False
 
-    # Empresas conocidas del sector eléctrico chileno
-    empresas_chile = ["enel", "colbún", "aes", "engie", "statkraft", "acciona", "solarpack"]
-
     # Formas societarias chilenas
     formas_societarias = ["s.a.", "spa", "ltda.", "limitada"]
 
     texto_lower = texto.lower()
 
-    # Verificar empresas conocidas
-    if any(empresa in texto_lower for empresa in empresas_chile):
+    # Verificar empresas conocidas (una pasada sobre el gazetteer)
+    if obtener_gazetteer_chile().find(texto, categories=["companies"]):
         return True
 
     # Verificar formas societarias + palabras clave del sector
@@ -236,18 +252,12 @@ def es_probable_nombre_empresa_chile(texto: str) -> bool:
     return False
 
 def detectar_regiones_chile(texto: str) -> list:
-    """Detectar regiones de Chile mencionadas en el texto"""
-    regiones_chile = [
-        "Arica y Parinacota", "Tarapacá", "Antofagasta", "Atacama",
-        "Coquimbo", "Valparaíso", "Metropolitana", "O'Higgins",
-        "Maule", "Ñuble", "Biobío", "Araucanía", "Los Ríos",
-        "Los Lagos", "Aysén", "Magallanes"
-    ]
-
+    """Detectar regiones de Chile mencionadas en el texto (sin distinguir acentos ni mayúsculas)"""
     regiones_encontradas = []
-    for region in regiones_chile:
-        if region.lower() in texto:
-            regiones_encontradas.append(region)
+    for coincidencia in obtener_gazetteer_chile().find(texto, categories=["locations"]):
+        entrada = coincidencia.entry
+        if entrada.entity_type == "Region" and entrada.name not in regiones_encontradas:
+            regiones_encontradas.append(entrada.name)
 
     return regiones_encontradas
 
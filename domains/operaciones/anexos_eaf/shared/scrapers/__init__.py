@@ -4,7 +4,7 @@ Simple scraper for finding and downloading EAF documents from coordinador.cl
 """
 
 from .eaf_document_finder import EAFDocumentFinder
-from .eaf_downloader import EAFDownloader
+from .eaf_downloader import EAFDownloader, DownloadResult
 from .document_validator import DocumentValidator
 
-__all__ = ['EAFDocumentFinder', 'EAFDownloader', 'DocumentValidator']
\ No newline at end of file
+__all__ = ['EAFDocumentFinder', 'EAFDownloader', 'DownloadResult', 'DocumentValidator']
\ No newline at end of file
@@ -4,7 +4,7 @@ Validates downloaded EAF documents are complete and readable
 """
 
 from pathlib import Path
-from typing import Dict, bool
+from typing import Dict
 
 class DocumentValidator:
     """Validate downloaded EAF documents"""
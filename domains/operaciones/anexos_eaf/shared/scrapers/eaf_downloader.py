@@ -1,30 +1,325 @@
 """
 EAF Document Downloader
 Downloads EAF PDF documents from coordinador.cl
+
+Documents are fetched in parallel and only when they changed:
+- Conditional requests: the ETag / Last-Modified of the last download are
+  sent back as If-None-Match / If-Modified-Since; a 304 costs no body.
+- Resumable transfers: bytes land in <file>.part; after an interruption the
+  next attempt asks for the rest with Range + If-Range, so a changed file
+  restarts from zero instead of being spliced.
+- Content manifest: document_metadata.json keeps url, validators, size and
+  sha256 of every document. A body whose hash matches the manifest (server
+  without validators) is reported as unchanged, so it is not reprocessed.
 """
 
-from pathlib import Path
-from typing import Optional
+import hashlib
+import http.client
 import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .eaf_document_finder import EAFDocumentFinder
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one document fetch"""
+    filename: str
+    url: str
+    status: str  # "downloaded", "unchanged", "not_modified" or "failed"
+    path: Optional[str] = None
+    sha256: Optional[str] = None
+    size: int = 0
+    bytes_transferred: int = 0
+    resumed: bool = False
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        """New or different content: the document needs (re)processing"""
+        return self.status == "downloaded"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class EAFDownloader:
     """Download EAF documents to local storage"""
 
-    def __init__(self):
-        self.download_dir = Path(__file__).parent / "scraped_data"
-        self.download_dir.mkdir(exist_ok=True)
+    def __init__(self, download_dir: Optional[Path] = None, max_workers: int = 4,
+                 timeout: float = 60.0, max_attempts: int = 3, retry_delay: float = 1.0):
+        self.download_dir = Path(download_dir) if download_dir else Path(__file__).parent / "scraped_data"
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.download_dir / "document_metadata.json"
+        self.log_path = self.download_dir / "download_log.json"
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+        self._lock = threading.Lock()
+        self.manifest: Dict[str, Dict] = self._load_json(self.manifest_path, {})
+
+    @staticmethod
+    def _load_json(path: Path, default):
+        if not path.exists():
+            return default
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def _update_manifest(self, filename: str, entry: Optional[Dict]):
+        # Callers keep mutating their entry after this returns, so the manifest
+        # stores a copy and is dumped from a snapshot taken under the lock
+        with self._lock:
+            if entry is None:
+                self.manifest.pop(filename, None)
+            else:
+                self.manifest[filename] = dict(entry)
+            snapshot = dict(self.manifest)
+            self._write_json(self.manifest_path, snapshot)
+
+    # ------------------------------------------------------------------
+    # Single document
+    # ------------------------------------------------------------------
+
+    def _local_copy_valid(self, path: Path, entry: Dict) -> bool:
+        """Whether the file on disk is the one the manifest describes"""
+        if not path.exists():
+            return False
+        stat = path.stat()
+        if stat.st_size != entry.get('size'):
+            return False
+        # Re-hash only if the file was touched since it was verified
+        if stat.st_mtime == entry.get('mtime'):
+            return True
+        return file_sha256(path) == entry.get('sha256')
+
+    def fetch(self, document_url: str, filename: Optional[str] = None) -> DownloadResult:
+        """
+        Fetch one document unless the local copy is current
+
+        Never raises for network/HTTP errors; they come back as status "failed"
+        (a partial transfer is kept for the next attempt). Protocol errors such
+        as a truncated chunked body (http.client.IncompleteRead) are retried
+        like connection errors.
+        """
+        filename = filename or Path(urlparse(document_url).path).name
+        path = self.download_dir / filename
+        part_path = path.with_name(path.name + ".part")
+        entry = dict(self.manifest.get(filename, {}))
+        if entry.get('url') != document_url:
+            entry = {}
+
+        local_valid = bool(entry.get('sha256')) and self._local_copy_valid(path, entry)
+        result = DownloadResult(filename=filename, url=document_url, status="failed")
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                time.sleep(self.retry_delay * attempt)
+            try:
+                outcome = self._transfer(document_url, path, part_path, entry, local_valid, result)
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                result.error = f"{type(e).__name__}: {e}"
+                continue
+            if outcome is not None:
+                return outcome
+        return result
+
+    def _transfer(self, url: str, path: Path, part_path: Path, entry: Dict,
+                  local_valid: bool, result: DownloadResult) -> Optional[DownloadResult]:
+        headers = {'User-Agent': self.user_agent}
+        if local_valid:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        # Resume only a partial download of this same url with a validator to pin it
+        partial = entry.get('partial') or {}
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        validator = partial.get('etag') or partial.get('last_modified')
+        if offset and validator:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+        elif offset:
+            part_path.unlink()
+            offset = 0
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and local_valid:
+                result.status = "not_modified"
+                result.path = str(path)
+                result.sha256 = entry['sha256']
+                result.size = entry['size']
+                return result
+            if e.code == 416 and offset:
+                # The stored part does not fit the current file: start over
+                part_path.unlink()
+                entry.pop('partial', None)
+                self._update_manifest(path.name, entry)
+                raise urllib.error.URLError("range not satisfiable, restarting")
+            result.error = f"HTTP {e.code}"
+            if e.code >= 500 or e.code == 429:
+                raise
+            return result
+
+        with response:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            resumed = response.status == 206 and offset > 0
+            if not resumed:
+                offset = 0
+
+            # Remember the validators first, so an interrupted body can be resumed
+            entry['url'] = url
+            entry['partial'] = {'etag': etag, 'last_modified': last_modified}
+            self._update_manifest(path.name, entry)
+
+            digest = hashlib.sha256()
+            if resumed:
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+
+            transferred = 0
+            with open(part_path, 'ab' if resumed else 'wb') as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    transferred += len(chunk)
+            result.bytes_transferred += transferred
+
+            expected = self._expected_size(response, offset)
+            size = part_path.stat().st_size
+            if expected is not None and size != expected:
+                raise urllib.error.URLError(f"incomplete body: {size} of {expected} bytes")
+
+        sha256 = digest.hexdigest()
+        # Same content as the manifest: nothing to reprocess (a damaged local copy is still replaced)
+        unchanged = sha256 == entry.get('sha256')
+        if unchanged and local_valid:
+            part_path.unlink()
+        else:
+            os.replace(part_path, path)
+
+        stat = path.stat()
+        entry.pop('partial', None)
+        entry.update({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': sha256,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'verified_at': datetime.now().isoformat()
+        })
+        if not unchanged:
+            entry['downloaded_at'] = entry['verified_at']
+        self._update_manifest(path.name, entry)
+
+        result.status = "unchanged" if unchanged else "downloaded"
+        result.path = str(path)
+        result.sha256 = sha256
+        result.size = stat.st_size
+        result.resumed = resumed
+        result.error = None
+        return result
+
+    @staticmethod
+    def _expected_size(response, offset: int) -> Optional[int]:
+        """Total size announced by Content-Range (206) or Content-Length (200)"""
+        content_range = response.headers.get('Content-Range')
+        if content_range and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            if total.isdigit():
+                return int(total)
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit():
+            return offset + int(length)
+        return None
 
     def download_document(self, document_url: str, filename: str) -> Path:
         """Download EAF document from URL"""
-        # TODO: Implement download logic
-        pass
+        result = self.fetch(document_url, filename)
+        self.update_download_log(asdict(result))
+        if result.status == "failed":
+            raise RuntimeError(f"Could not download {document_url}: {result.error}")
+        return Path(result.path)
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+
+    def sync(self, documents: Iterable) -> List[DownloadResult]:
+        """
+        Fetch many documents in parallel
+
+        Args:
+            documents: URLs, (url, filename) pairs or dicts with "url" and
+                optionally "filename"
+
+        Returns:
+            One DownloadResult per document, in input order; those with
+            .changed are the ones to (re)process
+        """
+        jobs: List[Tuple[str, Optional[str]]] = []
+        for document in documents:
+            if isinstance(document, str):
+                jobs.append((document, None))
+            elif isinstance(document, dict):
+                jobs.append((document['url'], document.get('filename')))
+            else:
+                jobs.append((document[0], document[1]))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda job: self.fetch(*job), jobs))
+
+        self.update_download_log([asdict(result) for result in results])
+        return results
 
     def download_latest_eaf(self) -> Path:
         """Download the most recent EAF document"""
-        # TODO: Implement latest document download
-        pass
+        latest = EAFDocumentFinder().search_latest_eaf()
+        if not latest or not latest.get('url'):
+            raise RuntimeError("No EAF document found to download")
+        return self.download_document(latest['url'], latest.get('filename'))
 
-    def update_download_log(self, document_info: dict):
+    def update_download_log(self, document_info):
         """Update download history log"""
-        # TODO: Implement logging
-        pass
\ No newline at end of file
+        entries = document_info if isinstance(document_info, list) else [document_info]
+        logged_at = datetime.now().isoformat()
+        with self._lock:
+            log = self._load_json(self.log_path, [])
+            log.extend({'logged_at': logged_at, **entry} for entry in entries)
+            self._write_json(self.log_path, log)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Hourly Series Parser - EAF ANEXO Generation Tables
+==================================================
+
+Shared parser for the 24-hour series found in ANEXO 1 (programmed generation,
+costs, marginal cost) and ANEXO 2 (real generation per plant, system summary).
+
+Rows are turned into typed NumPy arrays with one column per hour; missing
+hours are NaN. Hour alignment, reported totals and missing values are checked
+in a single vectorised pass instead of per-token Python loops.
+
+Two entry points:
+- parse_hourly_series(text_or_tokens): a row already isolated as text
+  (values fill hours 1..n in order)
+- parse_page_series(words): positioned words of a page (PyMuPDF
+  page.get_text("words")); values are aligned to the hour columns found in
+  the "1 2 ... 24" header, so a blank cell stays a missing hour instead of
+  shifting the rest of the row
+
+Usage:
+    from domains.operaciones.anexos_eaf.shared.utilities.hourly_series import parse_hourly_series
+
+    series = parse_hourly_series("PFV-ELBOCO 0,0 0,0 ... 12,5", trailing=("total", "dmax", "dmed"))
+    series.validate()["is_valid"]
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+HOURS = 24
+
+# Signed integers or decimals with "," or "." as decimal mark
+NUMBER_PATTERN = re.compile(r'-?\d+(?:[.,]\d+)?')
+
+# Reported totals may differ from the hourly sum by rounding of each cell
+TOTAL_ABS_TOLERANCE = 1.0
+TOTAL_REL_TOLERANCE = 0.01
+
+
+def to_float_array(tokens: Sequence[str]) -> np.ndarray:
+    """Convert numeric tokens (comma or dot decimals) to float64; bad tokens become NaN"""
+    if not tokens:
+        return np.empty(0, dtype=np.float64)
+    normalized = np.char.replace(np.asarray(tokens, dtype=str), ',', '.')
+    try:
+        return normalized.astype(np.float64)
+    except ValueError:
+        result = np.full(len(tokens), np.nan)
+        for i, token in enumerate(normalized):
+            try:
+                result[i] = float(token)
+            except ValueError:
+                pass
+        return result
+
+
+@dataclass
+class HourlySeries:
+    """One 24-hour row: hourly values plus optional trailing values (total, DMAX...)"""
+    values: np.ndarray
+    trailing: Dict[str, float] = field(default_factory=dict)
+    label: str = ""
+    extra_values: int = 0  # Numbers beyond the hours and trailing fields
+
+    @property
+    def present(self) -> np.ndarray:
+        return ~np.isnan(self.values)
+
+    @property
+    def missing_hours(self) -> List[int]:
+        return (np.flatnonzero(~self.present) + 1).tolist()
+
+    @property
+    def data_points(self) -> int:
+        return int(self.present.sum())
+
+    @property
+    def total(self) -> float:
+        return float(np.nansum(self.values))
+
+    @property
+    def reported_total(self) -> Optional[float]:
+        return self.trailing.get("total")
+
+    @property
+    def daily_max(self) -> float:
+        return float(np.nanmax(self.values)) if self.data_points else 0.0
+
+    @property
+    def daily_min(self) -> float:
+        return float(np.nanmin(self.values)) if self.data_points else 0.0
+
+    @property
+    def daily_avg(self) -> float:
+        return self.total / self.data_points if self.data_points else 0.0
+
+    @property
+    def operational_hours(self) -> int:
+        return int((self.values > 0).sum())
+
+    @property
+    def peak_hour(self) -> int:
+        return int(np.nanargmax(self.values)) + 1 if self.data_points else 0
+
+    def validate(self) -> Dict:
+        """Check hour coverage and the reported total against the hourly sum"""
+        issues = []
+        missing = self.missing_hours
+        if missing:
+            issues.append(f"Found {self.data_points} values, expected {HOURS} (missing hours: {missing})")
+        if self.extra_values:
+            issues.append(f"{self.extra_values} unexpected values after the hourly series")
+
+        total_check = None
+        reported = self.reported_total
+        if reported is not None and not np.isnan(reported):
+            difference = reported - self.total
+            tolerance = max(TOTAL_ABS_TOLERANCE, abs(reported) * TOTAL_REL_TOLERANCE)
+            total_check = {
+                "reported": reported,
+                "calculated": round(self.total, 4),
+                "difference": round(difference, 4),
+                "matches": bool(abs(difference) <= tolerance)
+            }
+            if not total_check["matches"]:
+                issues.append(f"Reported total {reported} differs from hourly sum {self.total:.2f}")
+
+        return {
+            "is_valid": not issues,
+            "total_values": self.data_points,
+            "expected_values": HOURS,
+            "missing_hours": missing,
+            "total_check": total_check,
+            "issues": issues
+        }
+
+    def to_hourly_data(self) -> List[Dict]:
+        """[{"hour": 1, "value": ...}, ...] for the hours that have a value"""
+        hours = np.flatnonzero(self.present)
+        return [{"hour": int(h) + 1, "value": float(self.values[h])} for h in hours]
+
+    def to_list(self) -> List[Optional[float]]:
+        """24 values in hour order, None for missing hours"""
+        return [None if np.isnan(v) else float(v) for v in self.values]
+
+    @classmethod
+    def from_hourly_data(cls, hourly_data: List[Dict], label: str = "", **trailing) -> "HourlySeries":
+        """Rebuild a series from the processors' JSON hourly_data list"""
+        values = np.full(HOURS, np.nan)
+        for item in hourly_data:
+            hour = int(item.get("hour", 0))
+            value = item.get("value")
+            if 1 <= hour <= HOURS and value is not None:
+                try:
+                    values[hour - 1] = float(str(value).replace(',', '.'))
+                except ValueError:
+                    pass
+        return cls(values, {k: float(v) for k, v in trailing.items() if v is not None}, label)
+
+
+def parse_hourly_series(
+    source: Union[str, Sequence[str]],
+    trailing: Sequence[str] = (),
+    label: str = ""
+) -> HourlySeries:
+    """
+    Parse one row into an HourlySeries
+
+    Args:
+        source: Row text, or numeric tokens already extracted from it
+        trailing: Names of values expected after the 24 hours (e.g. "total",
+                  "dmax", "dmed"); they are only taken when more than 24
+                  numbers are present, so short rows are never misread
+        label: Row label (plant or metric name)
+    """
+    tokens = NUMBER_PATTERN.findall(source) if isinstance(source, str) else list(source)
+    numbers = to_float_array(tokens)
+
+    values = np.full(HOURS, np.nan)
+    hourly_count = min(len(numbers), HOURS)
+    values[:hourly_count] = numbers[:hourly_count]
+
+    rest = numbers[HOURS:]
+    trailing_values = {name: float(value) for name, value in zip(trailing, rest)}
+    extra = max(0, len(rest) - len(trailing))
+
+    return HourlySeries(values, trailing_values, label, extra)
+
+
+# ----------------------------------------------------------------------
+# Positioned tokens (whole page at once)
+# ----------------------------------------------------------------------
+
+@dataclass
+class HourlyTable:
+    """All hourly rows of a page as one (rows x 24) array"""
+    labels: List[str]
+    values: np.ndarray
+    trailing: np.ndarray  # (rows x len(trailing_names)), NaN where absent
+    trailing_names: Tuple[str, ...] = ()
+
+    def row(self, index: int) -> HourlySeries:
+        trailing = {
+            name: float(value)
+            for name, value in zip(self.trailing_names, self.trailing[index])
+            if not np.isnan(value)
+        }
+        return HourlySeries(self.values[index].copy(), trailing, self.labels[index])
+
+    def rows(self) -> List[HourlySeries]:
+        return [self.row(i) for i in range(len(self.labels))]
+
+    def validate(self) -> Dict:
+        """Vectorised checks over every row: missing hours and totals"""
+        present = ~np.isnan(self.values)
+        hourly_totals = np.nansum(self.values, axis=1)
+        report = {
+            "rows": len(self.labels),
+            "complete_rows": int(present.all(axis=1).sum()),
+            "missing_cells": int((~present).sum()),
+            "total_mismatches": []
+        }
+
+        if "total" in self.trailing_names:
+            reported = self.trailing[:, self.trailing_names.index("total")]
+            tolerance = np.maximum(TOTAL_ABS_TOLERANCE, np.abs(reported) * TOTAL_REL_TOLERANCE)
+            mismatched = ~np.isnan(reported) & (np.abs(reported - hourly_totals) > tolerance)
+            report["total_mismatches"] = [self.labels[i] for i in np.flatnonzero(mismatched)]
+
+        report["is_valid"] = report["missing_cells"] == 0 and not report["total_mismatches"]
+        return report
+
+
+def detect_hour_columns(words: Sequence[Tuple]) -> Optional[np.ndarray]:
+    """
+    Find the x-centres of the hour header ("1 2 ... 24")
+
+    Args:
+        words: PyMuPDF words (x0, y0, x1, y1, text, ...)
+
+    Returns:
+        Array of 24 x-centres, or None if no header row is found
+    """
+    header_words: Dict[float, Dict[int, float]] = {}
+    for word in words:
+        text = word[4].strip()
+        if text.isdigit() and 1 <= int(text) <= HOURS:
+            row_key = round(word[1])
+            header_words.setdefault(row_key, {})[int(text)] = (word[0] + word[2]) / 2
+
+    for hours in header_words.values():
+        if len(hours) == HOURS:
+            centres = np.array([hours[h] for h in range(1, HOURS + 1)])
+            if np.all(np.diff(centres) > 0):
+                return centres
+    return None
+
+
+def parse_page_series(
+    words: Sequence[Tuple],
+    hour_centres: Optional[np.ndarray] = None,
+    trailing: Sequence[str] = (),
+    row_tolerance: float = 2.0,
+    min_values: int = 10
+) -> Optional[HourlyTable]:
+    """
+    Build the (rows x 24) array of a page from positioned words
+
+    Numeric words are assigned to the nearest hour column by x-centre
+    (np.searchsorted on the column midpoints). Numbers right of hour 24 fill
+    the trailing fields in order. Leading non-numeric words form the label.
+
+    Args:
+        words: PyMuPDF words (x0, y0, x1, y1, text, ...)
+        hour_centres: Column centres; detected from the header when None
+        trailing: Names of the columns after hour 24 (e.g. "total")
+        row_tolerance: Max vertical distance (points) between words of one row
+        min_values: Rows with fewer numeric cells are ignored
+    """
+    if hour_centres is None:
+        hour_centres = detect_hour_columns(words)
+        if hour_centres is None:
+            return None
+
+    if not words:
+        return None
+    arr_y = np.array([(w[1] + w[3]) / 2 for w in words])
+    arr_x = np.array([(w[0] + w[2]) / 2 for w in words])
+    texts = [w[4] for w in words]
+
+    # Group words into rows by vertical centre
+    order = np.argsort(arr_y, kind="stable")
+    breaks = np.flatnonzero(np.diff(arr_y[order]) > row_tolerance) + 1
+    row_groups = np.split(order, breaks)
+
+    boundaries = (hour_centres[1:] + hour_centres[:-1]) / 2
+    first_edge = hour_centres[0] - (hour_centres[1] - hour_centres[0]) / 2
+    last_edge = hour_centres[-1] + (hour_centres[-1] - hour_centres[-2]) / 2
+    header_values = np.arange(1, HOURS + 1, dtype=np.float64)
+
+    labels, rows, trailing_rows = [], [], []
+    for group in row_groups:
+        group = group[np.argsort(arr_x[group], kind="stable")]
+        numeric = [i for i in group if NUMBER_PATTERN.fullmatch(texts[i])]
+        if len(numeric) < min_values:
+            continue
+
+        label_parts = [texts[i] for i in group
+                       if arr_x[i] < first_edge and not NUMBER_PATTERN.fullmatch(texts[i])]
+
+        numeric = np.array(numeric)
+        numbers = to_float_array([texts[i] for i in numeric])
+        xs = arr_x[numeric]
+
+        in_hours = (xs >= first_edge) & (xs <= last_edge)
+        row = np.full(HOURS, np.nan)
+        columns = np.searchsorted(boundaries, xs[in_hours])
+        row[columns] = numbers[in_hours]
+        if np.array_equal(row, header_values):
+            continue  # The hour header itself
+
+        after = numbers[xs > last_edge]
+        trailing_row = np.full(len(trailing), np.nan)
+        count = min(len(after), len(trailing))
+        trailing_row[:count] = after[:count]
+
+        labels.append(" ".join(label_parts))
+        rows.append(row)
+        trailing_rows.append(trailing_row)
+
+    if not rows:
+        return None
+
+    return HourlyTable(
+        labels=labels,
+        values=np.vstack(rows),
+        trailing=np.vstack(trailing_rows) if trailing else np.empty((len(rows), 0)),
+        trailing_names=tuple(trailing)
+    )
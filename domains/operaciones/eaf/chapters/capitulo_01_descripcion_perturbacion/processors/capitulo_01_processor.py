@@ -28,6 +28,12 @@ except ImportError as e:
 shared_path = Path(__file__).parent.parent.parent / "shared"
 sys.path.append(str(shared_path))
 
+# Project root for the shared table grid engine
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.table_grid import TableGridBuilder
+from shared_platform.utils.raw_text_store import write_raw_text
+
 
 class Capitulo01Processor:
     """Procesador específico para Capítulo 1 - Descripción de la perturbación."""
@@ -50,6 +56,9 @@ class Capitulo01Processor:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # Tablas reconstruidas por coordenadas, por página (ver _extract_table_grids)
+        self.table_grids: Dict[int, List] = {}
+
         # Inicializar OCR si está disponible
         self.ocr_detector = None
         if OCR_AVAILABLE:
@@ -65,8 +74,9 @@ class Capitulo01Processor:
         """Procesa el capítulo 1 completo siguiendo el dataflow."""
         self.logger.info("Iniciando procesamiento Capítulo 1: Descripción de la perturbación")
 
-        # Paso 1: Extraer texto del PDF
+        # Paso 1: Extraer texto del PDF y tablas por coordenadas
         raw_text = self._extract_pdf_text()
+        self.table_grids = self._extract_table_grids()
 
         # Paso 2: Procesar y estructurar datos
         processed_data = self._process_chapter_content(raw_text)
@@ -118,6 +128,31 @@ class Capitulo01Processor:
 
         return "\n".join(text_parts)
 
+    def _extract_table_grids(self) -> Dict[int, List]:
+        """Reconstruye las tablas con bordes de las páginas 1-11 desde palabras y líneas del PDF."""
+        import fitz  # PyMuPDF
+
+        builder = TableGridBuilder()
+        grids = {}
+
+        try:
+            with fitz.open(str(self.pdf_path)) as doc:
+                for page_index in range(self.chapter_info["start_page"], self.chapter_info["end_page"] + 1):
+                    if page_index < len(doc):
+                        grids[page_index + 1] = builder.build_page(doc[page_index])
+        except Exception as e:
+            self.logger.warning(f"⚠️ No se pudieron reconstruir tablas por coordenadas: {e}")
+
+        return grids
+
+    def _grid_fields(self, page_num: int) -> Dict[str, str]:
+        """Pares campo → valor de las tablas de dos columnas de una página."""
+        fields = {}
+        for grid in self.table_grids.get(page_num, []):
+            for campo, valor in grid.key_values():
+                fields.setdefault(campo.strip().lower(), valor)
+        return fields
+
     def _process_chapter_content(self, text: str) -> Dict:
         """Procesa el contenido específico del capítulo 1."""
         entities = []
@@ -513,11 +548,12 @@ class Capitulo01Processor:
         full_content = '\n'.join(content_lines)
 
         # Procesamiento inteligente del contenido
-        processed_content = self._analyze_page_content(full_content)
+        processed_content = self._analyze_page_content(full_content, page_num)
 
         return {
             "page_number": page_num,
             "content_analysis": processed_content,  # Análisis estructurado
+            "tables": [grid.to_dict() for grid in self.table_grids.get(page_num, [])],
             "raw_content": full_content,  # Mantener también el raw por si acaso
             "character_count": len(full_content),
             "processing_metadata": {
@@ -527,7 +563,7 @@ class Capitulo01Processor:
             }
         }
 
-    def _analyze_page_content(self, content: str) -> Dict:
+    def _analyze_page_content(self, content: str, page_num: int = None) -> Dict:
         """Analiza y estructura inteligentemente el contenido de una página."""
         analysis = {
             "content_type": "unknown",
@@ -555,9 +591,9 @@ class Capitulo01Processor:
         if analysis["content_type"] == "company_reports":
             analysis["tabular_data"] = self._extract_company_reports_table(clean_content)
         elif analysis["content_type"] == "technical_data":
-            analysis["tabular_data"] = self._extract_technical_data_table(clean_content)
+            analysis["tabular_data"] = self._extract_technical_data_table(clean_content, page_num)
         elif analysis["content_type"] == "fault_data":
-            analysis["tabular_data"] = self._extract_fault_data_table(clean_content)
+            analysis["tabular_data"] = self._extract_fault_data_table(clean_content, page_num)
 
         # Enriquecer con análisis OCR si está disponible
         if self.ocr_detector:
@@ -826,8 +862,8 @@ class Capitulo01Processor:
         else:
             return "other"
 
-    def _extract_technical_data_table(self, content: str) -> Dict:
-        """Extrae tablas de datos técnicos."""
+    def _extract_technical_data_table(self, content: str, page_num: int = None) -> Dict:
+        """Extrae tablas de datos técnicos (celdas de la tabla si existe, si no el texto)."""
         technical_data = {
             "table_type": "technical_specifications",
             "sections": {},
@@ -835,44 +871,58 @@ class Capitulo01Processor:
         }
 
         # Secciones de datos técnicos comunes
+        # (campo, patrón del valor, nombre del dato)
         sections = {
             "installation_data": {
                 "patterns": [
-                    (r'Nombre de la instalación\s+(.+)', 'installation_name'),
-                    (r'Tipo de instalación\s+(.+)', 'installation_type'),
-                    (r'Tensión nominal\s+(.+)', 'nominal_voltage'),
-                    (r'Segmento\s+(.+)', 'segment'),
-                    (r'Propietario instalación afectada\s+(.+)', 'owner')
+                    ('Nombre de la instalación', r'(.+)', 'installation_name'),
+                    ('Tipo de instalación', r'(.+)', 'installation_type'),
+                    ('Tensión nominal', r'(.+)', 'nominal_voltage'),
+                    ('Segmento', r'(.+)', 'segment'),
+                    ('Propietario instalación afectada', r'(.+)', 'owner')
                 ]
             },
             "fault_element": {
                 "patterns": [
-                    (r'Nombre del elemento afectado\s+(.+)', 'element_name'),
-                    (r'Propietario elemento fallado\s+(.+)', 'element_owner')
+                    ('Nombre del elemento afectado', r'(.+)', 'element_name'),
+                    ('Propietario elemento fallado', r'(.+)', 'element_owner')
                 ]
             },
             "legal_data": {
                 "patterns": [
-                    (r'RUT\s+([\d\.\-]+)', 'rut'),
-                    (r'Representante Legal\s+(.+)', 'legal_representative'),
-                    (r'Dirección\s+(.+)', 'address')
+                    ('RUT', r'([\d\.\-]+)', 'rut'),
+                    ('Representante Legal', r'(.+)', 'legal_representative'),
+                    ('Dirección', r'(.+)', 'address')
                 ]
             }
         }
 
+        grid_fields = self._grid_fields(page_num) if page_num else {}
+
         for section_name, section_config in sections.items():
             section_data = {}
-            for pattern, field_name in section_config["patterns"]:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    section_data[field_name] = match.group(1).strip()
+            for label, value_pattern, field_name in section_config["patterns"]:
+                value = self._find_table_value(content, grid_fields, label, value_pattern)
+                if value is not None:
+                    section_data[field_name] = value
 
             if section_data:  # Solo agregar si se encontró data
                 technical_data["sections"][section_name] = section_data
 
         return technical_data
 
-    def _extract_fault_data_table(self, content: str) -> Dict:
+    def _find_table_value(self, content: str, grid_fields: Dict[str, str], label: str, value_pattern: str):
+        """Valor de un campo: primero la celda de la tabla reconstruida, luego el texto lineal."""
+        grid_value = grid_fields.get(label.lower())
+        if grid_value:
+            match = re.match(value_pattern, grid_value)
+            if match:
+                return match.group(1).strip()
+
+        match = re.search(re.escape(label) + r'\s+' + value_pattern, content, re.IGNORECASE)
+        return match.group(1).strip() if match else None
+
+    def _extract_fault_data_table(self, content: str, page_num: int = None) -> Dict:
         """Extrae tabla de datos de falla."""
         fault_data = {
             "table_type": "fault_metrics",
@@ -881,21 +931,21 @@ class Capitulo01Processor:
             "classification": {}
         }
 
-        # Patrones para datos de falla
+        # Patrones para datos de falla: (campo, patrón del valor, nombre del dato, categoría)
         fault_patterns = [
-            (r'Fecha\s+(\d{2}/\d{2}/\d{4})', 'fault_date', 'timing'),
-            (r'Hora\s+(\d{1,2}:\d{2})', 'fault_time', 'timing'),
-            (r'Consumos desconectados \(MW\)\s+([\d\.]+)', 'disconnected_consumption_mw', 'fault_info'),
-            (r'Demanda previa del sistema \(MW\)\s+([\d\.]+)', 'previous_demand_mw', 'fault_info'),
-            (r'Porcentaje de desconexión\s+(\d+)%', 'disconnection_percentage', 'fault_info'),
-            (r'Calificación\s+(.+)', 'classification_text', 'classification')
+            ('Fecha', r'(\d{2}/\d{2}/\d{4})', 'fault_date', 'timing'),
+            ('Hora', r'(\d{1,2}:\d{2})', 'fault_time', 'timing'),
+            ('Consumos desconectados (MW)', r'([\d\.]+)', 'disconnected_consumption_mw', 'fault_info'),
+            ('Demanda previa del sistema (MW)', r'([\d\.]+)', 'previous_demand_mw', 'fault_info'),
+            ('Porcentaje de desconexión', r'(\d+)%', 'disconnection_percentage', 'fault_info'),
+            ('Calificación', r'(.+)', 'classification_text', 'classification')
         ]
 
-        for pattern, field_name, category in fault_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                value = match.group(1).strip()
+        grid_fields = self._grid_fields(page_num) if page_num else {}
 
+        for label, value_pattern, field_name, category in fault_patterns:
+            value = self._find_table_value(content, grid_fields, label, value_pattern)
+            if value is not None:
                 # Convertir valores numéricos
                 if field_name in ['disconnected_consumption_mw', 'previous_demand_mw']:
                     try:
@@ -1413,12 +1463,9 @@ class Capitulo01Processor:
     def _save_raw_extraction(self, text: str) -> Path:
         """Guarda la extracción raw del texto."""
         raw_file = self.outputs_dir / "raw_extractions" / "capitulo_01_raw.txt"
-        raw_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(raw_file, 'w', encoding='utf-8') as f:
-            f.write(text)
 
-        return raw_file
+        # Escribe también el índice de offsets por página (capitulo_01_raw.txt.offsets)
+        return write_raw_text(raw_file, text)
 
     def _save_processed_data(self, data: Dict) -> Path:
         """Guarda los datos procesados."""
@@ -8,6 +8,12 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 import logging
+import sys
+
+# Project root for the shared raw text store
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.raw_text_store import split_raw_pages
 
 
 class CompleteContentExtractor:
@@ -64,34 +70,7 @@ class CompleteContentExtractor:
 
     def _split_by_pages(self, raw_text: str) -> Dict[int, str]:
         """Divide el raw text por páginas."""
-
-        pages = {}
-        current_page = None
-        current_content = []
-
-        lines = raw_text.split('\n')
-
-        for line in lines:
-            # Detectar separador de página
-            if line.startswith("=== PÁGINA"):
-                # Guardar página anterior si existe
-                if current_page is not None:
-                    pages[current_page] = '\n'.join(current_content)
-
-                # Extraer número de página nueva
-                page_match = re.search(r'PÁGINA (\d+)', line)
-                if page_match:
-                    current_page = int(page_match.group(1))
-                    current_content = []
-            else:
-                if current_page is not None:
-                    current_content.append(line)
-
-        # Guardar última página
-        if current_page is not None:
-            pages[current_page] = '\n'.join(current_content)
-
-        return pages
+        return split_raw_pages(raw_text)
 
     def _extract_page_completely(self, page_content: str, page_num: int) -> Dict:
         """Extrae COMPLETAMENTE el contenido de una página."""
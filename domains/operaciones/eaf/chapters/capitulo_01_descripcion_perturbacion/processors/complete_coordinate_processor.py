@@ -4,12 +4,18 @@ Extrae todas las páginas del Capítulo 1 usando coordenadas PDF nativas
 """
 
 import json
-import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+# Project root for the shared page layout model and column inference
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.column_inference import ColumnLayout, infer_columns
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+
 
 @dataclass
 class TableCell:
@@ -25,7 +31,6 @@ class CompleteCoordinateProcessor:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
         self.entity_counter = 0
 
     def process_all_pages(self, start_page: int = 1, end_page: int = 11) -> Dict:
@@ -91,15 +96,13 @@ class CompleteCoordinateProcessor:
         print(f"\n✅ Procesamiento completado: {result['extraction_summary']['total_tables']} tablas extraídas")
         return result
 
-    def _process_single_page(self, page_num: int) -> Dict:
+    def _process_single_page(self, page_num: int, layout: Optional[PageLayout] = None) -> Dict:
         """Procesa una página individual."""
-        page = self.pdf_doc[page_num - 1]
-
-        # Extraer texto con coordenadas
-        text_dict = page.get_text("dict")
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
 
-        # Extraer items de texto
-        all_items = self._extract_text_items_with_coords(text_dict["blocks"])
+        # Items de texto con coordenadas
+        all_items = layout.text_items()
 
         # Detectar estructuras
         tables = self._detect_tables_in_page(all_items, page_num)
@@ -126,35 +129,6 @@ class CompleteCoordinateProcessor:
             "text_blocks_count": len(text_blocks)
         }
 
-    def _extract_text_items_with_coords(self, blocks: List) -> List[Dict]:
-        """Extrae todos los items de texto con sus coordenadas."""
-        text_items = []
-
-        for block in blocks:
-            if "lines" not in block:
-                continue
-
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    bbox = span["bbox"]
-                    text = span["text"].strip()
-
-                    if text:  # Solo agregar si tiene texto
-                        text_items.append({
-                            "text": text,
-                            "x": bbox[0],
-                            "y": bbox[1],
-                            "x_end": bbox[2],
-                            "y_end": bbox[3],
-                            "bbox": bbox,
-                            "font": span["font"],
-                            "size": span["size"],
-                            "flags": span["flags"],
-                            "is_bold": bool(span["flags"] & 2**4)
-                        })
-
-        return text_items
-
     def _detect_tables_in_page(self, text_items: List[Dict], page_num: int) -> List[Dict]:
         """Detecta tablas en la página usando coordenadas."""
 
@@ -191,7 +165,7 @@ class CompleteCoordinateProcessor:
                     table = {
                         "start_row": i,
                         "end_row": table_end,
-                        "columns": columns,
+                        "columns": columns.positions,
                         "data": table_data,
                         "title": self._find_table_title(table_rows)
                     }
@@ -236,48 +210,19 @@ class CompleteCoordinateProcessor:
 
         return rows
 
-    def _detect_column_positions(self, rows: List[List[Dict]]) -> List[float]:
-        """Detecta posiciones de columnas basándose en múltiples filas."""
-        all_x_positions = []
-
-        for row in rows:
-            for item in row:
-                all_x_positions.append(item["x"])
+    def _detect_column_positions(self, rows: List[List[Dict]]) -> ColumnLayout:
+        """Detecta posiciones X de columnas en una pasada sobre los bordes de todas las filas."""
+        return infer_columns(
+            (item for row in rows for item in row),
+            cluster_tolerance=5.0,
+            align_tolerance=10.0
+        )
 
-        # Agrupar posiciones X similares
-        columns = []
-        tolerance = 5.0
+    def _row_fits_table_pattern(self, row: List[Dict], columns: ColumnLayout) -> bool:
+        """Verifica si una fila sigue el patrón de columnas (todos los items alineados)."""
+        return columns.fits(row, 1.0)
 
-        for x in sorted(set(all_x_positions)):
-            is_new_column = True
-            for col_x in columns:
-                if abs(x - col_x) <= tolerance:
-                    is_new_column = False
-                    break
-
-            if is_new_column:
-                columns.append(x)
-
-        return sorted(columns)
-
-    def _row_fits_table_pattern(self, row: List[Dict], columns: List[float]) -> bool:
-        """Verifica si una fila encaja con el patrón de columnas de la tabla."""
-        tolerance = 10.0
-
-        for item in row:
-            # Verificar si la posición X del item está cerca de alguna columna
-            matches_column = False
-            for col_x in columns:
-                if abs(item["x"] - col_x) <= tolerance:
-                    matches_column = True
-                    break
-
-            if not matches_column:
-                return False
-
-        return True
-
-    def _build_table_from_rows(self, rows: List[List[Dict]], columns: List[float]) -> List[List[str]]:
+    def _build_table_from_rows(self, rows: List[List[Dict]], columns: ColumnLayout) -> List[List[str]]:
         """Construye tabla asignando items a celdas basándose en columnas."""
         table_data = []
 
@@ -286,7 +231,7 @@ class CompleteCoordinateProcessor:
 
             for item in row:
                 # Encontrar columna más cercana
-                col_idx = self._find_closest_column(item["x"], columns)
+                col_idx = columns.first(item["x"])
                 if col_idx is not None:
                     if row_data[col_idx]:
                         row_data[col_idx] += " " + item["text"]
@@ -297,13 +242,6 @@ class CompleteCoordinateProcessor:
 
         return table_data
 
-    def _find_closest_column(self, x: float, columns: List[float], tolerance: float = 10.0) -> Optional[int]:
-        """Encuentra el índice de la columna más cercana."""
-        for i, col_x in enumerate(columns):
-            if abs(x - col_x) <= tolerance:
-                return i
-        return None
-
     def _find_table_title(self, rows: List[List[Dict]]) -> str:
         """Intenta encontrar el título de la tabla."""
         if not rows:
@@ -4,12 +4,17 @@ Usa las coordenadas nativas del PDF para detectar correctamente los límites de
 """
 
 import json
-import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+# Project root for the shared page layout model
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+
 
 @dataclass
 class TableCell:
@@ -28,14 +33,14 @@ class CoordinateBasedTableProcessor:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
 
     def extract_table_from_page(
         self,
         page_num: int,
         y_start: float = None,
         y_end: float = None,
-        column_positions: List[float] = None
+        column_positions: List[float] = None,
+        layout: Optional[PageLayout] = None
     ) -> Dict:
         """
         Extrae una tabla de una página usando coordenadas.
@@ -45,14 +50,13 @@ class CoordinateBasedTableProcessor:
             y_start: Coordenada Y inicial de la tabla (opcional)
             y_end: Coordenada Y final de la tabla (opcional)
             column_positions: Posiciones X de las columnas (opcional)
+            layout: Layout de la página (opcional, por defecto el compartido del PDF)
         """
-        page = self.pdf_doc[page_num - 1]
-
-        # Extraer texto con coordenadas
-        text_dict = page.get_text("dict")
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
 
-        # Procesar bloques de texto
-        all_text_items = self._extract_text_items_with_coords(text_dict["blocks"])
+        # Items de texto con coordenadas
+        all_text_items = layout.text_items()
 
         # Filtrar por rango Y si se proporciona
         if y_start is not None and y_end is not None:
@@ -83,33 +87,6 @@ class CoordinateBasedTableProcessor:
             "extraction_method": "coordinate_based"
         }
 
-    def _extract_text_items_with_coords(self, blocks: List) -> List[Dict]:
-        """Extrae todos los items de texto con sus coordenadas."""
-        text_items = []
-
-        for block in blocks:
-            if "lines" not in block:
-                continue
-
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    # Extraer información detallada del span
-                    bbox = span["bbox"]
-                    text_items.append({
-                        "text": span["text"].strip(),
-                        "x": bbox[0],
-                        "y": bbox[1],
-                        "x_end": bbox[2],
-                        "y_end": bbox[3],
-                        "bbox": bbox,
-                        "font": span["font"],
-                        "size": span["size"],
-                        "flags": span["flags"],
-                        "is_bold": bool(span["flags"] & 2**4)  # Flag de bold
-                    })
-
-        return [item for item in text_items if item["text"]]  # Filtrar vacíos
-
     def _detect_column_positions(self, text_items: List[Dict]) -> List[float]:
         """
         Detecta las posiciones X de las columnas basándose en los elementos de texto.
@@ -207,12 +184,11 @@ class CoordinateBasedTableProcessor:
         Extrae las 3 tablas de la página 1 con detección automática de columnas.
         """
         page_num = 1
-        page = self.pdf_doc[page_num - 1]
-        page_height = page.rect.height
+        layout = get_page_layout(self.pdf_path, page_num)
+        page_height = layout.height
 
-        # Extraer todo el texto con coordenadas
-        text_dict = page.get_text("dict")
-        all_items = self._extract_text_items_with_coords(text_dict["blocks"])
+        # Todo el texto con coordenadas
+        all_items = layout.text_items()
 
         # TABLA 1: Fecha y Hora de la falla (parte superior de la página)
         print("🔍 Detectando Tabla 1: Fecha y Hora de la falla...")
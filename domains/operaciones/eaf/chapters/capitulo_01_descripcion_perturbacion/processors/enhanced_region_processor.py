@@ -5,6 +5,7 @@ Versión optimizada que mejora el mapeo entre coordenadas PDF y raw text
 
 import json
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import re
@@ -12,6 +13,11 @@ from difflib import SequenceMatcher
 
 from pdf_coordinate_extractor import PDFCoordinateExtractor
 
+# Project root for the shared fuzzy match index
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.fuzzy_index import FuzzyIndex
+
 
 class EnhancedRegionProcessor:
     """Procesador mejorado que mapea mejor las coordenadas al raw text."""
@@ -107,6 +113,8 @@ class EnhancedRegionProcessor:
             "normalized": normalized_text,
             "word_index": word_index,
             "sections": sections,
+            # Índice de n-gramas para la búsqueda por similitud
+            "fuzzy_index": FuzzyIndex(normalized_text.lower()),
             "total_words": len(words),
             "total_chars": len(normalized_text)
         }
@@ -241,7 +249,7 @@ class EnhancedRegionProcessor:
                         }
 
         # Búsqueda por similitud de fragmentos
-        best_match = self._find_similarity_match(normalized_block, normalized_raw)
+        best_match = self._find_similarity_match(normalized_block, preprocessed_text["fuzzy_index"])
         if best_match:
             return best_match
 
@@ -252,33 +260,19 @@ class EnhancedRegionProcessor:
             "similarity_score": 0.0
         }
 
-    def _find_similarity_match(self, block_text: str, raw_text: str) -> Optional[Dict]:
+    def _find_similarity_match(self, block_text: str, fuzzy_index: FuzzyIndex) -> Optional[Dict]:
         """Encuentra coincidencia por similitud."""
 
-        best_match = None
-        best_score = 0.0
-        best_position = -1
-
-        # Dividir el raw text en chunks del tamaño aproximado del bloque
-        chunk_size = max(len(block_text), 100)
-        overlap = chunk_size // 4
-
-        for i in range(0, len(raw_text) - chunk_size + 1, chunk_size - overlap):
-            chunk = raw_text[i:i + chunk_size]
-            similarity = SequenceMatcher(None, block_text, chunk).ratio()
-
-            if similarity > best_score and similarity > 0.4:  # Umbral mínimo de similitud
-                best_score = similarity
-                best_position = i
-                best_match = chunk
+        # Chunks del tamaño aproximado del bloque, candidatos por n-gramas raros
+        best_match = fuzzy_index.best_match(block_text, threshold=0.4)  # Umbral mínimo de similitud
 
         if best_match:
             return {
                 "found": True,
                 "match_type": "similarity",
-                "start_position": best_position,
-                "similarity_score": best_score,
-                "matched_text": best_match,
+                "start_position": best_match.start,
+                "similarity_score": best_match.score,
+                "matched_text": best_match.text,
                 "threshold_used": 0.4
             }
 
@@ -3,8 +3,15 @@ Enhanced Table Detector
 Handles multi-line cells (cDoubleLinea) during PDF extraction
 """
 
+import sys
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
+# Project root for the shared column inference
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.column_inference import ColumnLayout
+
 
 class EnhancedTableDetector:
     """
@@ -187,6 +194,7 @@ class EnhancedTableDetector:
             Table data dict
         """
         table_matrix = []
+        layout = ColumnLayout(positions=columns, align_tolerance=15)  # Slightly more lenient
 
         for row in rows:
             row_data = [""] * len(columns)
@@ -195,15 +203,8 @@ class EnhancedTableDetector:
             sorted_items = sorted(row, key=lambda x: x["x"])
 
             for item in sorted_items:
-                # Assign to closest column
-                closest_col = None
-                min_dist = float('inf')
-
-                for i, col_x in enumerate(columns):
-                    dist = abs(item["x"] - col_x)
-                    if dist < min_dist and dist <= 15:  # Slightly more lenient
-                        min_dist = dist
-                        closest_col = i
+                # Assign to closest column (binary search)
+                closest_col = layout.nearest(item["x"])
 
                 if closest_col is not None:
                     if row_data[closest_col]:
@@ -268,7 +269,7 @@ def patch_smart_classifier(classifier):
             return False, None, start_idx + 1
 
         # Check if it's a table (use original heuristics)
-        consistency_score = classifier._measure_column_consistency(sample_rows, columns)
+        consistency_score = columns.confidence
         has_mixed_content = classifier._has_mixed_content(sample_rows)
         has_table_markers = classifier._has_table_markers(sample_rows)
 
@@ -284,7 +285,7 @@ def patch_smart_classifier(classifier):
         # Find initial end
         end_idx = start_idx + sample_size
         while end_idx < len(rows):
-            if classifier._row_fits_columns(rows[end_idx], columns, tolerance=0.7):
+            if columns.fits(rows[end_idx], 0.7):
                 end_idx += 1
             else:
                 # Check if it's a continuation row
@@ -315,7 +316,7 @@ def patch_smart_classifier(classifier):
         )
 
         # Build enhanced table data
-        table_data = enhancer._build_enhanced_table_data(merged_rows, columns)
+        table_data = enhancer._build_enhanced_table_data(merged_rows, columns.positions)
 
         return True, table_data, new_end_idx
 
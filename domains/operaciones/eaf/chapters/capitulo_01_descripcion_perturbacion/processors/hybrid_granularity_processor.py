@@ -5,11 +5,17 @@ Procesador Híbrido de Granularidad Optimizado
 """
 
 import json
-import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+# Project root for the shared page layout model and column inference
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.column_inference import ColumnLayout, infer_columns
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+
 
 class HybridGranularityProcessor:
     """
@@ -20,7 +26,6 @@ class HybridGranularityProcessor:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
         self.entity_counter = 0
 
     def process_all_pages(self, start_page: int = 1, end_page: int = 11) -> Dict:
@@ -86,13 +91,12 @@ class HybridGranularityProcessor:
         print(f"✅ COMPLETADO: {result['extraction_summary']['total_tables']} tablas + {result['extraction_summary']['total_paragraphs']} párrafos")
         return result
 
-    def _process_single_page(self, page_num: int) -> Dict:
+    def _process_single_page(self, page_num: int, layout: Optional[PageLayout] = None) -> Dict:
         """Procesa una página con estrategia híbrida."""
-        page = self.pdf_doc[page_num - 1]
-        text_dict = page.get_text("dict")
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
 
-        all_items = self._extract_text_items_with_coords(text_dict["blocks"])
-        rows = self._group_items_by_rows(all_items)
+        rows = layout.rows()
 
         # PASO 1: Detectar tablas (granularidad fina)
         tables = self._detect_tables_smart(rows, page_num)
@@ -127,61 +131,6 @@ class HybridGranularityProcessor:
             "paragraphs_count": len(paragraphs)
         }
 
-    def _extract_text_items_with_coords(self, blocks: List) -> List[Dict]:
-        """Extrae items de texto con coordenadas."""
-        text_items = []
-
-        for block in blocks:
-            if "lines" not in block:
-                continue
-
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    bbox = span["bbox"]
-                    text = span["text"].strip()
-
-                    if text:
-                        text_items.append({
-                            "text": text,
-                            "x": bbox[0],
-                            "y": bbox[1],
-                            "x_end": bbox[2],
-                            "y_end": bbox[3],
-                            "bbox": bbox,
-                            "font": span["font"],
-                            "size": span["size"],
-                            "flags": span["flags"],
-                            "is_bold": bool(span["flags"] & 2**4)
-                        })
-
-        return text_items
-
-    def _group_items_by_rows(self, text_items: List[Dict]) -> List[List[Dict]]:
-        """Agrupa items por filas (posición Y similar)."""
-        if not text_items:
-            return []
-
-        sorted_items = sorted(text_items, key=lambda x: x["y"])
-        rows = []
-        current_row = [sorted_items[0]]
-        current_y = sorted_items[0]["y"]
-        tolerance = 3.0
-
-        for item in sorted_items[1:]:
-            if abs(item["y"] - current_y) <= tolerance:
-                current_row.append(item)
-            else:
-                current_row.sort(key=lambda x: x["x"])
-                rows.append(current_row)
-                current_row = [item]
-                current_y = item["y"]
-
-        if current_row:
-            current_row.sort(key=lambda x: x["x"])
-            rows.append(current_row)
-
-        return rows
-
     def _detect_tables_smart(self, rows: List[List[Dict]], page_num: int) -> List[Dict]:
         """
         Detecta tablas de forma inteligente:
@@ -217,7 +166,7 @@ class HybridGranularityProcessor:
                     table = {
                         "start_row": i,
                         "end_row": table_end,
-                        "columns": columns,
+                        "columns": columns.positions,
                         "data": table_data,
                         "title": self._find_table_title(table_rows)
                     }
@@ -231,43 +180,19 @@ class HybridGranularityProcessor:
 
         return tables
 
-    def _detect_column_positions(self, rows: List[List[Dict]]) -> List[float]:
-        """Detecta posiciones X de columnas."""
-        all_x_positions = []
-        for row in rows:
-            for item in row:
-                all_x_positions.append(item["x"])
-
-        columns = []
-        tolerance = 5.0
-
-        for x in sorted(set(all_x_positions)):
-            is_new_column = True
-            for col_x in columns:
-                if abs(x - col_x) <= tolerance:
-                    is_new_column = False
-                    break
-            if is_new_column:
-                columns.append(x)
-
-        return sorted(columns)
-
-    def _row_fits_table_pattern(self, row: List[Dict], columns: List[float]) -> bool:
-        """Verifica si una fila sigue el patrón de columnas."""
-        tolerance = 10.0
-
-        # La fila debe tener items alineados con las columnas
-        matches = 0
-        for item in row:
-            for col_x in columns:
-                if abs(item["x"] - col_x) <= tolerance:
-                    matches += 1
-                    break
-
-        # Al menos 50% de items deben coincidir con columnas
-        return matches >= len(row) * 0.5 if row else False
-
-    def _build_table_from_rows(self, rows: List[List[Dict]], columns: List[float]) -> List[List[str]]:
+    def _detect_column_positions(self, rows: List[List[Dict]]) -> ColumnLayout:
+        """Detecta posiciones X de columnas en una pasada sobre los bordes de todas las filas."""
+        return infer_columns(
+            (item for row in rows for item in row),
+            cluster_tolerance=5.0,
+            align_tolerance=10.0
+        )
+
+    def _row_fits_table_pattern(self, row: List[Dict], columns: ColumnLayout) -> bool:
+        """Verifica si una fila sigue el patrón de columnas (al menos 50% de los items alineados)."""
+        return columns.fits(row, 0.5)
+
+    def _build_table_from_rows(self, rows: List[List[Dict]], columns: ColumnLayout) -> List[List[str]]:
         """Construye tabla asignando items a celdas."""
         table_data = []
 
@@ -275,7 +200,7 @@ class HybridGranularityProcessor:
             row_data = [""] * len(columns)
 
             for item in row:
-                col_idx = self._find_closest_column(item["x"], columns)
+                col_idx = columns.first(item["x"])
                 if col_idx is not None:
                     if row_data[col_idx]:
                         row_data[col_idx] += " " + item["text"]
@@ -286,13 +211,6 @@ class HybridGranularityProcessor:
 
         return table_data
 
-    def _find_closest_column(self, x: float, columns: List[float], tolerance: float = 10.0) -> Optional[int]:
-        """Encuentra columna más cercana."""
-        for i, col_x in enumerate(columns):
-            if abs(x - col_x) <= tolerance:
-                return i
-        return None
-
     def _find_table_title(self, rows: List[List[Dict]]) -> str:
         """Busca título de tabla."""
         for row in rows[:3]:
@@ -4,18 +4,23 @@ Une líneas consecutivas que pertenecen al mismo párrafo
 """
 
 import json
-import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+# Project root for the shared page layout model and column inference
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.column_inference import ColumnLayout, infer_columns
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+
 
 class ImprovedParagraphProcessor:
     """Procesador que agrupa correctamente párrafos completos."""
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
         self.entity_counter = 0
 
     def process_all_pages(self, start_page: int = 1, end_page: int = 11) -> Dict:
@@ -75,15 +80,13 @@ class ImprovedParagraphProcessor:
         print(f"\n✅ Procesamiento completado: {result['extraction_summary']['total_paragraphs']} párrafos agrupados")
         return result
 
-    def _process_single_page(self, page_num: int) -> Dict:
+    def _process_single_page(self, page_num: int, layout: Optional[PageLayout] = None) -> Dict:
         """Procesa una página individual."""
-        page = self.pdf_doc[page_num - 1]
-
-        # Extraer texto con coordenadas
-        text_dict = page.get_text("dict")
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
 
-        # Extraer items de texto
-        all_items = self._extract_text_items_with_coords(text_dict["blocks"])
+        # Items de texto con coordenadas
+        all_items = layout.text_items()
 
         # Detectar tablas
         tables = self._detect_tables_in_page(all_items, page_num)
@@ -116,35 +119,6 @@ class ImprovedParagraphProcessor:
             "paragraphs_count": len(paragraphs)
         }
 
-    def _extract_text_items_with_coords(self, blocks: List) -> List[Dict]:
-        """Extrae todos los items de texto con sus coordenadas."""
-        text_items = []
-
-        for block in blocks:
-            if "lines" not in block:
-                continue
-
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    bbox = span["bbox"]
-                    text = span["text"].strip()
-
-                    if text:
-                        text_items.append({
-                            "text": text,
-                            "x": bbox[0],
-                            "y": bbox[1],
-                            "x_end": bbox[2],
-                            "y_end": bbox[3],
-                            "bbox": bbox,
-                            "font": span["font"],
-                            "size": span["size"],
-                            "flags": span["flags"],
-                            "is_bold": bool(span["flags"] & 2**4)
-                        })
-
-        return text_items
-
     def _get_table_items(self, all_items: List[Dict], tables: List[Dict]) -> set:
         """Obtiene el conjunto de items que pertenecen a tablas."""
         table_items = set()
@@ -332,7 +306,7 @@ class ImprovedParagraphProcessor:
                     table = {
                         "start_row": i,
                         "end_row": table_end,
-                        "columns": columns,
+                        "columns": columns.positions,
                         "data": table_data,
                         "title": self._find_table_title(table_rows)
                     }
@@ -346,46 +320,19 @@ class ImprovedParagraphProcessor:
 
         return tables
 
-    def _detect_column_positions(self, rows: List[List[Dict]]) -> List[float]:
-        """Detecta posiciones de columnas."""
-        all_x_positions = []
-
-        for row in rows:
-            for item in row:
-                all_x_positions.append(item["x"])
+    def _detect_column_positions(self, rows: List[List[Dict]]) -> ColumnLayout:
+        """Detecta posiciones X de columnas en una pasada sobre los bordes de todas las filas."""
+        return infer_columns(
+            (item for row in rows for item in row),
+            cluster_tolerance=5.0,
+            align_tolerance=10.0
+        )
 
-        columns = []
-        tolerance = 5.0
+    def _row_fits_table_pattern(self, row: List[Dict], columns: ColumnLayout) -> bool:
+        """Verifica si una fila sigue el patrón de columnas (todos los items alineados)."""
+        return columns.fits(row, 1.0)
 
-        for x in sorted(set(all_x_positions)):
-            is_new_column = True
-            for col_x in columns:
-                if abs(x - col_x) <= tolerance:
-                    is_new_column = False
-                    break
-
-            if is_new_column:
-                columns.append(x)
-
-        return sorted(columns)
-
-    def _row_fits_table_pattern(self, row: List[Dict], columns: List[float]) -> bool:
-        """Verifica si una fila encaja con el patrón de columnas."""
-        tolerance = 10.0
-
-        for item in row:
-            matches_column = False
-            for col_x in columns:
-                if abs(item["x"] - col_x) <= tolerance:
-                    matches_column = True
-                    break
-
-            if not matches_column:
-                return False
-
-        return True
-
-    def _build_table_from_rows(self, rows: List[List[Dict]], columns: List[float]) -> List[List[str]]:
+    def _build_table_from_rows(self, rows: List[List[Dict]], columns: ColumnLayout) -> List[List[str]]:
         """Construye tabla asignando items a celdas."""
         table_data = []
 
@@ -393,7 +340,7 @@ class ImprovedParagraphProcessor:
             row_data = [""] * len(columns)
 
             for item in row:
-                col_idx = self._find_closest_column(item["x"], columns)
+                col_idx = columns.first(item["x"])
                 if col_idx is not None:
                     if row_data[col_idx]:
                         row_data[col_idx] += " " + item["text"]
@@ -404,13 +351,6 @@ class ImprovedParagraphProcessor:
 
         return table_data
 
-    def _find_closest_column(self, x: float, columns: List[float], tolerance: float = 10.0) -> Optional[int]:
-        """Encuentra el índice de la columna más cercana."""
-        for i, col_x in enumerate(columns):
-            if abs(x - col_x) <= tolerance:
-                return i
-        return None
-
     def _find_table_title(self, rows: List[List[Dict]]) -> str:
         """Intenta encontrar el título de la tabla."""
         if not rows:
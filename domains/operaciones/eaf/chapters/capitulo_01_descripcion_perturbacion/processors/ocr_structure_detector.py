@@ -14,6 +14,16 @@ import json
 from pathlib import Path
 import logging
 import io
+import sys
+
+# Project root for the shared raw text store, agreement metrics and grid engine
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.raw_text_store import open_raw_store
+from shared_platform.utils.table_grid import Segment, TableGrid, TableGridBuilder, raster_segments
+from shared_platform.utils.text_agreement import AGREEMENT_GATE, agreement_batch
+
+RENDER_ZOOM = 2  # Páginas renderizadas a 2x (144 dpi): píxeles por punto PDF
 
 
 class OCRStructureDetector:
@@ -23,6 +33,7 @@ class OCRStructureDetector:
         self.pdf_path = pdf_path
         self.pdf_doc = fitz.open(pdf_path)
         self.logger = logging.getLogger(__name__)
+        self.grid_builder = TableGridBuilder()
 
         # Configuración OCR
         self.tesseract_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
@@ -36,7 +47,7 @@ class OCRStructureDetector:
             page = self.pdf_doc[page_num - 1]  # fitz usa indexación 0
 
             # Convertir página a imagen
-            mat = fitz.Matrix(2, 2)  # Zoom 2x para mejor calidad
+            mat = fitz.Matrix(RENDER_ZOOM, RENDER_ZOOM)  # Zoom 2x para mejor calidad
             pix = page.get_pixmap(matrix=mat)
             img_data = pix.tobytes("png")
 
@@ -46,17 +57,20 @@ class OCRStructureDetector:
             # Convertir a array numpy para OpenCV
             cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
 
+            # Líneas de regla detectadas una vez, en coordenadas PDF
+            ruling_lines = raster_segments(cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY), RENDER_ZOOM)
+
             # Detectar estructuras
             structures = {
                 "page_number": page_num,
                 "image_info": {
                     "width": image.width,
                     "height": image.height,
-                    "dpi": 144  # 2x zoom
+                    "dpi": 72 * RENDER_ZOOM
                 },
-                "detected_structures": self._analyze_visual_layout(cv_image),
+                "detected_structures": self._analyze_visual_layout(cv_image, ruling_lines),
                 "text_analysis": self._analyze_text_structure(cv_image),
-                "table_detection": self._detect_tables(cv_image),
+                "table_detection": self._detect_tables(cv_image, ruling_lines, page_num),
                 "ocr_validation": self._validate_against_raw(cv_image, page_num)
             }
 
@@ -66,13 +80,13 @@ class OCRStructureDetector:
             self.logger.error(f"Error procesando página {page_num}: {str(e)}")
             return {"error": str(e)}
 
-    def _analyze_visual_layout(self, cv_image: np.ndarray) -> Dict:
+    def _analyze_visual_layout(self, cv_image: np.ndarray,
+                               ruling_lines: Tuple[List[Segment], List[Segment]]) -> Dict:
         """Analiza el layout visual de la página."""
         gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
 
-        # Detectar líneas horizontales y verticales
-        horizontal_lines = self._detect_horizontal_lines(gray)
-        vertical_lines = self._detect_vertical_lines(gray)
+        # Líneas horizontales y verticales (ver raster_segments)
+        horizontal_lines, vertical_lines = ruling_lines
 
         # Detectar bloques de texto
         text_blocks = self._detect_text_blocks(gray)
@@ -93,44 +107,6 @@ class OCRStructureDetector:
 
         return layout_analysis
 
-    def _detect_horizontal_lines(self, gray_image: np.ndarray) -> List[Tuple]:
-        """Detecta líneas horizontales que pueden indicar tablas."""
-        # Crear kernel horizontal
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-
-        # Detectar líneas horizontales
-        horizontal_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, horizontal_kernel)
-
-        # Encontrar contornos
-        contours, _ = cv2.findContours(horizontal_lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        lines = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            if w > 100 and h < 10:  # Filtrar líneas horizontales significativas
-                lines.append((x, y, x + w, y + h))
-
-        return lines
-
-    def _detect_vertical_lines(self, gray_image: np.ndarray) -> List[Tuple]:
-        """Detecta líneas verticales que pueden indicar columnas de tablas."""
-        # Crear kernel vertical
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-
-        # Detectar líneas verticales
-        vertical_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, vertical_kernel)
-
-        # Encontrar contornos
-        contours, _ = cv2.findContours(vertical_lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        lines = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            if h > 100 and w < 10:  # Filtrar líneas verticales significativas
-                lines.append((x, y, x + w, y + h))
-
-        return lines
-
     def _detect_text_blocks(self, gray_image: np.ndarray) -> List[Dict]:
         """Detecta bloques de texto usando OCR."""
         try:
@@ -185,39 +161,13 @@ class OCRStructureDetector:
         else:
             return "regular_text"
 
-    def _detect_table_regions(self, horizontal_lines: List, vertical_lines: List) -> List[Dict]:
-        """Detecta regiones que probablemente son tablas."""
-        table_regions = []
-
-        if len(horizontal_lines) >= 2 and len(vertical_lines) >= 1:
-            # Agrupar líneas para formar regiones tabulares
-            for i, h_line in enumerate(horizontal_lines[:-1]):
-                for j, v_line in enumerate(vertical_lines):
-                    # Verificar si hay intersección que forme una región tabular
-                    if self._lines_form_table_region(h_line, horizontal_lines[i+1], v_line):
-                        region = {
-                            "top_line": h_line,
-                            "bottom_line": horizontal_lines[i+1],
-                            "left_boundary": min(v_line[0], v_line[2]),
-                            "right_boundary": max(v_line[0], v_line[2]),
-                            "confidence": 0.8
-                        }
-                        table_regions.append(region)
-
-        return table_regions
-
-    def _lines_form_table_region(self, h_line1: Tuple, h_line2: Tuple, v_line: Tuple) -> bool:
-        """Verifica si las líneas forman una región tabular válida."""
-        # Verificar que las líneas horizontales estén separadas apropiadamente
-        vertical_separation = abs(h_line2[1] - h_line1[1])
-        if vertical_separation < 20 or vertical_separation > 200:
-            return False
-
-        # Verificar que la línea vertical intersecte ambas líneas horizontales
-        v_top, v_bottom = min(v_line[1], v_line[3]), max(v_line[1], v_line[3])
-        h1_y, h2_y = h_line1[1], h_line2[1]
-
-        return v_top <= min(h1_y, h2_y) and v_bottom >= max(h1_y, h2_y)
+    def _detect_table_regions(self, horizontal_lines: List[Segment], vertical_lines: List[Segment],
+                              words: Optional[List[Tuple]] = None, page_num: Optional[int] = None) -> List[TableGrid]:
+        """
+        Tablas con reglas: grillas de celdas armadas con el motor compartido
+        con las páginas nativas (table_grid), en coordenadas PDF.
+        """
+        return self.grid_builder.grids(horizontal_lines, vertical_lines, words, page_num)
 
     def _classify_layout_type(self, text_blocks: List, table_regions: List) -> str:
         """Clasifica el tipo de layout de la página."""
@@ -392,13 +342,13 @@ class OCRStructureDetector:
 
         return [index for index, _ in sorted_lines]
 
-    def _detect_tables(self, cv_image: np.ndarray) -> Dict:
+    def _detect_tables(self, cv_image: np.ndarray, ruling_lines: Tuple[List[Segment], List[Segment]],
+                       page_num: Optional[int] = None) -> Dict:
         """Detecta tablas usando análisis combinado visual + OCR."""
         gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
 
-        # Detectar líneas de tabla
-        horizontal_lines = self._detect_horizontal_lines(gray)
-        vertical_lines = self._detect_vertical_lines(gray)
+        # Líneas de tabla
+        horizontal_lines, vertical_lines = ruling_lines
 
         # Extraer texto con coordenadas
         text_data = pytesseract.image_to_data(gray, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
@@ -406,15 +356,41 @@ class OCRStructureDetector:
         # Identificar regiones tabulares
         table_regions = self._identify_tabular_regions(horizontal_lines, vertical_lines, text_data)
 
+        # Grillas de celdas con las palabras OCR ubicadas en su celda
+        grids = self._detect_table_regions(
+            horizontal_lines, vertical_lines, self._ocr_words(text_data), page_num
+        )
+
         table_detection = {
             "tables_found": len(table_regions),
             "table_regions": table_regions,
+            "grids": [grid.to_dict() for grid in grids],
             "detection_method": "combined_visual_ocr",
             "confidence": self._calculate_table_detection_confidence(table_regions, horizontal_lines, vertical_lines)
         }
 
         return table_detection
 
+    def _ocr_words(self, text_data: Dict) -> List[Tuple]:
+        """Palabras OCR en coordenadas PDF, con la forma de page.get_text("words")."""
+        words = []
+        for i, text in enumerate(text_data['text']):
+            text = text.strip()
+            if not text:
+                continue
+            x0 = text_data['left'][i] / RENDER_ZOOM
+            y0 = text_data['top'][i] / RENDER_ZOOM
+            words.append((
+                x0, y0,
+                x0 + text_data['width'][i] / RENDER_ZOOM,
+                y0 + text_data['height'][i] / RENDER_ZOOM,
+                text,
+                text_data['block_num'][i],
+                text_data['par_num'][i] * 1000 + text_data['line_num'][i],
+                text_data['word_num'][i]
+            ))
+        return words
+
     def _identify_tabular_regions(self, h_lines: List, v_lines: List, text_data: Dict) -> List[Dict]:
         """Identifica regiones tabulares específicas."""
         regions = []
@@ -481,6 +457,9 @@ class OCRStructureDetector:
 
         return min(confidence, 1.0)
 
+    def _raw_file(self) -> Path:
+        return Path(__file__).parent.parent / "outputs" / "raw_extractions" / "capitulo_01_raw.txt"
+
     def _validate_against_raw(self, cv_image: np.ndarray, page_num: int) -> Dict:
         """Valida resultados OCR contra extracción raw existente."""
         try:
@@ -488,49 +467,55 @@ class OCRStructureDetector:
             gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
             ocr_text = pytesseract.image_to_string(gray, config=self.tesseract_config)
 
-            # Intentar cargar texto raw existente
-            raw_file = Path(__file__).parent.parent / "outputs" / "raw_extractions" / "capitulo_01_raw.txt"
-
-            if raw_file.exists():
-                with open(raw_file, 'r', encoding='utf-8') as f:
-                    raw_content = f.read()
+            return self.validate_pages_against_raw({page_num: ocr_text})[page_num]
 
-                # Extraer contenido de esta página del raw
-                page_raw = self._extract_page_from_raw(raw_content, page_num)
-
-                # Comparar similitud
-                similarity = self._calculate_text_similarity(ocr_text, page_raw)
+        except Exception as e:
+            return {"error": str(e)}
 
-                validation = {
-                    "ocr_available": True,
-                    "raw_available": True,
-                    "similarity_score": similarity,
-                    "validation_status": "good" if similarity > 0.7 else "needs_review",
-                    "ocr_char_count": len(ocr_text),
-                    "raw_char_count": len(page_raw)
-                }
-            else:
-                validation = {
+    def validate_pages_against_raw(self, ocr_texts: Dict[int, str]) -> Dict[int, Dict]:
+        """
+        Valida en lote el texto OCR de varias páginas contra la extracción raw.
+
+        "similarity_score" y "validation_status" conservan su significado
+        (ratio de SequenceMatcher, umbral 0.7). "text_agreement" es la métrica
+        combinada de shared_platform.utils.text_agreement y "agreement_status"
+        su umbral AGREEMENT_GATE (validado contra el ratio en el docstring de
+        ese módulo).
+
+        Args:
+            ocr_texts: número de página -> texto OCR (p.ej. todo el capítulo)
+        """
+        raw_file = self._raw_file()
+        if not raw_file.exists():
+            return {
+                page_num: {
                     "ocr_available": True,
                     "raw_available": False,
                     "validation_status": "no_raw_reference"
                 }
+                for page_num in ocr_texts
+            }
 
-            return validation
-
-        except Exception as e:
-            return {"error": str(e)}
-
-    def _extract_page_from_raw(self, raw_content: str, page_num: int) -> str:
-        """Extrae el contenido de una página específica del raw."""
-        # Buscar marcadores de página
-        page_pattern = rf"=== PÁGINA {page_num} ===.*?(?==== PÁGINA {page_num + 1} ===|$)"
-        match = re.search(page_pattern, raw_content, re.DOTALL)
-
-        if match:
-            return match.group(0)
-        else:
-            return ""
+        # Leer solo las páginas validadas del raw (offsets indexados, archivo mapeado)
+        store = open_raw_store(raw_file)
+        raw_pages = {page_num: store.page(page_num) for page_num in ocr_texts}
+        agreements = agreement_batch(ocr_texts, raw_pages)
+
+        validations = {}
+        for page_num, result in agreements.items():
+            similarity = self._calculate_text_similarity(ocr_texts[page_num], raw_pages[page_num])
+            validations[page_num] = {
+                "ocr_available": True,
+                "raw_available": True,
+                "similarity_score": similarity,
+                "validation_status": "good" if similarity > 0.7 else "needs_review",
+                "text_agreement": result.agreement,
+                "agreement_status": "good" if result.agreement > AGREEMENT_GATE else "needs_review",
+                "agreement_metrics": result.to_dict(),
+                "ocr_char_count": len(ocr_texts[page_num]),
+                "raw_char_count": len(raw_pages[page_num])
+            }
+        return validations
 
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calcula similitud entre dos textos."""
@@ -662,6 +647,7 @@ def main():
         validation = result["ocr_validation"]
         if "similarity_score" in validation:
             print(f"✅ Similitud OCR-Raw: {validation['similarity_score']:.2f}")
+            print(f"🤝 Acuerdo OCR-Raw: {validation['text_agreement']:.2f}")
             print(f"📊 Estado validación: {validation['validation_status']}")
 
     print("\n" + "=" * 60)
@@ -3,11 +3,17 @@ Extractor de Coordenadas PDF - Análisis Nativo
 Extrae texto con coordenadas directamente del PDF sin OCR
 """
 
-import fitz  # PyMuPDF
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
+import sys
+
+# Project root for the shared page layout model and block-to-raw alignment index
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+from shared_platform.utils.text_alignment import TextAligner, lines_in_region
 
 
 class PDFCoordinateExtractor:
@@ -15,28 +21,30 @@ class PDFCoordinateExtractor:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
         self.logger = logging.getLogger(__name__)
 
-    def extract_page_with_coordinates(self, page_num: int) -> Dict:
-        """Extrae texto con coordenadas de una página específica."""
-        try:
-            page = self.pdf_doc[page_num - 1]  # fitz usa indexación 0
+    def extract_page_with_coordinates(self, page_num: int, layout: Optional[PageLayout] = None) -> Dict:
+        """
+        Extrae texto con coordenadas de una página específica.
 
-            # Extraer texto con coordenadas
-            text_dict = page.get_text("dict")
+        Args:
+            layout: Layout ya extraído de la página; por defecto el compartido del PDF
+        """
+        try:
+            if layout is None:
+                layout = get_page_layout(self.pdf_path, page_num)
 
             # Procesar la estructura de texto
             page_analysis = {
                 "page_number": page_num,
                 "page_size": {
-                    "width": page.rect.width,
-                    "height": page.rect.height
+                    "width": layout.width,
+                    "height": layout.height
                 },
-                "blocks": self._process_text_blocks(text_dict["blocks"]),
-                "images": self._extract_images(page),
-                "drawings": self._extract_drawings(page),
-                "tables": self._detect_table_regions(text_dict["blocks"])
+                "blocks": self._process_text_blocks(layout.blocks),
+                "images": self._extract_images(layout),
+                "drawings": self._extract_drawings(layout),
+                "tables": self._detect_table_regions(layout.blocks)
             }
 
             return page_analysis
@@ -98,49 +106,27 @@ class PDFCoordinateExtractor:
 
         return processed_blocks
 
-    def _extract_images(self, page) -> List[Dict]:
-        """Extrae información de imágenes de la página."""
-        images = []
-        image_list = page.get_images()
-
-        for img_index, img in enumerate(image_list):
-            img_info = {
-                "image_id": img_index,
-                "xref": img[0],
-                "smask": img[1],
-                "width": img[2],
-                "height": img[3],
-                "bpc": img[4],  # bits per component
-                "colorspace": img[5],
-                "alt": img[6],
-                "name": img[7],
-                "filter": img[8]
+    def _extract_images(self, layout: PageLayout) -> List[Dict]:
+        """Información de las imágenes de la página."""
+        return [
+            {key: image[key] for key in (
+                "image_id", "xref", "smask", "width", "height",
+                "bpc", "colorspace", "alt", "name", "filter"
+            )}
+            for image in layout.images
+        ]
+
+    def _extract_drawings(self, layout: PageLayout) -> List[Dict]:
+        """Información de los dibujos/líneas de la página."""
+        return [
+            {
+                "drawing_id": drawing["drawing_id"],
+                "bbox": drawing["bbox"],
+                "type": drawing["type"],
+                "items": drawing["items"]
             }
-            images.append(img_info)
-
-        return images
-
-    def _extract_drawings(self, page) -> List[Dict]:
-        """Extrae información de dibujos/líneas de la página."""
-        drawings = []
-
-        try:
-            # Obtener dibujos de la página
-            drawing_list = page.get_drawings()
-
-            for draw_index, drawing in enumerate(drawing_list):
-                draw_info = {
-                    "drawing_id": draw_index,
-                    "bbox": drawing["rect"],
-                    "type": drawing.get("type", "unknown"),
-                    "items": len(drawing.get("items", []))
-                }
-                drawings.append(draw_info)
-
-        except Exception as e:
-            self.logger.warning(f"Error extrayendo dibujos: {e}")
-
-        return drawings
+            for drawing in layout.drawings
+        ]
 
     def _detect_table_regions(self, blocks: List) -> List[Dict]:
         """Detecta regiones que parecen tablas basándose en alineación de texto."""
@@ -300,10 +286,11 @@ class PDFCoordinateExtractor:
 
         return document_structure
 
-    def create_region_based_structure(self, page_num: int, raw_text: str) -> Dict:
+    def create_region_based_structure(self, page_num: int, raw_text: str,
+                                      layout: Optional[PageLayout] = None) -> Dict:
         """Crea estructura basada en regiones visuales pero usando raw text."""
         # Obtener coordenadas nativas
-        coordinate_data = self.extract_page_with_coordinates(page_num)
+        coordinate_data = self.extract_page_with_coordinates(page_num, layout)
 
         if "error" in coordinate_data:
             return {"error": coordinate_data["error"]}
@@ -315,10 +302,16 @@ class PDFCoordinateExtractor:
             "text_mapping": self._map_text_to_regions(raw_text, coordinate_data)
         }
 
+        # Indexar el raw una vez y alinear todos los bloques en una pasada (orden de lectura)
+        aligner = TextAligner(raw_text)
+        text_blocks = [block for block in coordinate_data["blocks"] if block["block_type"] == "text"]
+        block_spans = aligner.align([self._block_text(block) for block in text_blocks])
+        raw_matches = {id(block): span.to_dict() for block, span in zip(text_blocks, block_spans)}
+
         # Procesar cada bloque como una región
         for block in coordinate_data["blocks"]:
             if block["block_type"] == "text":
-                region = self._classify_text_region(block, raw_text)
+                region = self._classify_text_region(block, raw_matches[id(block)])
                 regions["regions"].append(region)
             elif block["block_type"] == "image":
                 region = {
@@ -337,20 +330,20 @@ class PDFCoordinateExtractor:
                 "type": "table",
                 "bbox": table["bbox"],
                 "confidence": table["confidence"],
-                "content": self._extract_table_content_from_raw(table, raw_text)
+                "content": self._extract_table_content_from_raw(table, aligner, text_blocks)
             }
             regions["regions"].append(region)
 
         return regions
 
-    def _classify_text_region(self, block: Dict, raw_text: str) -> Dict:
+    def _block_text(self, block: Dict) -> str:
+        """Texto de un bloque, una línea por renglón."""
+        return "\n".join(line["text"] for line in block["lines"]).strip()
+
+    def _classify_text_region(self, block: Dict, raw_match: Dict) -> Dict:
         """Clasifica una región de texto."""
         # Extraer texto del bloque
-        block_text = ""
-        for line in block["lines"]:
-            block_text += line["text"] + "\n"
-
-        block_text = block_text.strip()
+        block_text = self._block_text(block)
 
         # Clasificar tipo de región
         region_type = "paragraph"
@@ -369,7 +362,7 @@ class PDFCoordinateExtractor:
             "bbox": block["bbox"],
             "content": {
                 "text": block_text,
-                "raw_match": self._find_text_in_raw(block_text, raw_text),
+                "raw_match": raw_match,
                 "formatting": self._extract_formatting_info(block)
             }
         }
@@ -424,50 +417,19 @@ class PDFCoordinateExtractor:
 
         return mapping
 
-    def _find_text_in_raw(self, block_text: str, raw_text: str) -> Dict:
-        """Encuentra el texto del bloque en el raw text."""
-        # Normalizar textos para comparación
-        normalized_block = block_text.strip().lower()
-        normalized_raw = raw_text.lower()
-
-        # Buscar coincidencia exacta
-        start_pos = normalized_raw.find(normalized_block)
-
-        if start_pos != -1:
-            return {
-                "found": True,
-                "start_position": start_pos,
-                "end_position": start_pos + len(normalized_block),
-                "match_type": "exact"
-            }
-
-        # Buscar coincidencia parcial (primeras palabras)
-        words = normalized_block.split()
-        if words:
-            first_words = " ".join(words[:3])  # Primeras 3 palabras
-            partial_pos = normalized_raw.find(first_words)
-            if partial_pos != -1:
-                return {
-                    "found": True,
-                    "start_position": partial_pos,
-                    "end_position": partial_pos + len(first_words),
-                    "match_type": "partial"
-                }
-
-        return {
-            "found": False,
-            "match_type": "none"
-        }
-
-    def _extract_table_content_from_raw(self, table_info: Dict, raw_text: str) -> Dict:
+    def _extract_table_content_from_raw(self, table_info: Dict, aligner: TextAligner, text_blocks: List[Dict]) -> Dict:
         """Extrae contenido de tabla desde el raw text basándose en región."""
-        # Esta función necesitaría lógica más compleja para mapear
-        # las coordenadas de tabla al contenido raw correspondiente
+        # Líneas cuyo centro cae dentro de la tabla, en orden de lectura
+        content = aligner.region_content(lines_in_region(text_blocks, table_info["bbox"]))
         return {
             "extraction_method": "coordinate_based",
             "estimated_rows": table_info["estimated_rows"],
             "estimated_columns": table_info["estimated_columns"],
-            "raw_content": "TODO: Implementar mapeo coordenadas->raw"
+            "raw_content": content["text"],
+            "raw_start": content["raw_start"],
+            "raw_end": content["raw_end"],
+            "matched_lines": content["matched_units"],
+            "total_lines": content["units"]
         }
 
 
@@ -8,6 +8,13 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import re
+import sys
+
+# Project root for the shared raw text store and alignment index
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.raw_text_store import split_raw_pages
+from shared_platform.utils.text_alignment import TextAligner, TextSpan, lines_in_region
 
 from pdf_coordinate_extractor import PDFCoordinateExtractor
 from ocr_structure_detector import OCRStructureDetector
@@ -49,12 +56,15 @@ class RegionBasedProcessor:
             "pages": {}
         }
 
+        # Dividir el raw por marcadores de página una sola vez
+        raw_pages = split_raw_pages(raw_text)
+
         # Procesar cada página
         for page_num in range(self.start_page, self.end_page + 1):
             self.logger.info(f"📄 Procesando página {page_num}")
 
             # Extraer contenido raw de esta página
-            page_raw_text = self._extract_page_raw_text(raw_text, page_num)
+            page_raw_text = self._extract_page_raw_text(raw_text, page_num, raw_pages)
 
             # Analizar la página con múltiples métodos
             page_analysis = self._analyze_page_multi_source(page_num, page_raw_text)
@@ -70,8 +80,12 @@ class RegionBasedProcessor:
         self.logger.info("✅ Procesamiento por regiones completado")
         return chapter_data
 
-    def _extract_page_raw_text(self, raw_text: str, page_num: int) -> str:
+    def _extract_page_raw_text(self, raw_text: str, page_num: int, raw_pages: Optional[Dict[int, str]] = None) -> str:
         """Extrae el contenido raw text de una página específica."""
+        # Marcadores "=== PÁGINA N ===" ya indexados
+        if raw_pages and page_num in raw_pages:
+            return raw_pages[page_num]
+
         # Buscar delimitadores de página en el raw text
         page_pattern = fr"Page {page_num}.*?(?=Page {page_num + 1}|$)"
         match = re.search(page_pattern, raw_text, re.DOTALL | re.IGNORECASE)
@@ -178,16 +192,21 @@ class RegionBasedProcessor:
 
         # Procesar bloques de texto
         text_blocks = [block for block in coord_data["blocks"] if block["block_type"] == "text"]
-
+        candidates = []
         for i, block in enumerate(text_blocks):
             # Extraer texto del bloque
             block_text = self._extract_text_from_coordinate_block(block)
 
-            if not block_text or len(block_text.strip()) < 3:
-                continue
+            if block_text and len(block_text.strip()) >= 3:
+                candidates.append((i, block, block_text))
+
+        # Indexar el raw una vez y alinear todos los bloques en una pasada (orden de lectura)
+        aligner = TextAligner(raw_text)
+        spans = aligner.align([block_text for _, _, block_text in candidates])
 
-            # Encontrar coincidencia en raw text
-            raw_match = self._find_text_in_raw(block_text, raw_text)
+        for (i, block, block_text), span in zip(candidates, spans):
+            # Coincidencia en raw text
+            raw_match = self._raw_match(aligner, span, block_text)
 
             # Clasificar tipo de región
             region_type = self._classify_region_content(block_text, block, ocr_data)
@@ -215,7 +234,7 @@ class RegionBasedProcessor:
 
         # Agregar regiones de tablas detectadas
         for i, table in enumerate(coord_data.get("tables", [])):
-            table_region = self._create_table_region_from_coordinates(table, raw_text, i)
+            table_region = self._create_table_region_from_coordinates(table, aligner, text_blocks, i)
             if table_region:
                 regions.append(table_region)
 
@@ -345,45 +364,18 @@ class RegionBasedProcessor:
 
         return hints
 
-    def _find_text_in_raw(self, block_text: str, raw_text: str) -> Dict:
-        """Encuentra el texto del bloque en el raw text."""
-
-        # Limpiar textos para comparación
-        clean_block = re.sub(r'\s+', ' ', block_text.strip().lower())
-        clean_raw = re.sub(r'\s+', ' ', raw_text.lower())
-
-        # Buscar coincidencia exacta
-        start_pos = clean_raw.find(clean_block)
-        if start_pos != -1:
+    def _raw_match(self, aligner: TextAligner, span: TextSpan, block_text: str) -> Dict:
+        """Describe la coincidencia de un bloque en el raw text."""
+        if not span.found:
             return {
-                "found": True,
-                "match_type": "exact",
-                "start_position": start_pos,
-                "end_position": start_pos + len(clean_block),
-                "context_before": clean_raw[max(0, start_pos-50):start_pos],
-                "context_after": clean_raw[start_pos+len(clean_block):start_pos+len(clean_block)+50]
+                "found": False,
+                "match_type": "none",
+                "search_attempted": re.sub(r'\s+', ' ', block_text.strip().lower())[:100]  # Primeros 100 chars buscados
             }
 
-        # Buscar coincidencia parcial (primeras palabras)
-        words = clean_block.split()
-        if len(words) >= 2:
-            partial_text = " ".join(words[:3])  # Primeras 3 palabras
-            partial_pos = clean_raw.find(partial_text)
-            if partial_pos != -1:
-                return {
-                    "found": True,
-                    "match_type": "partial",
-                    "start_position": partial_pos,
-                    "end_position": partial_pos + len(partial_text),
-                    "matched_words": 3,
-                    "total_words": len(words)
-                }
-
-        return {
-            "found": False,
-            "match_type": "none",
-            "search_attempted": clean_block[:100]  # Primeros 100 chars buscados
-        }
+        raw_match = span.to_dict()
+        raw_match["context_before"], raw_match["context_after"] = aligner.context(span)
+        return raw_match
 
     def _calculate_region_confidence(self, text: str, raw_match: Dict, region_type: str) -> float:
         """Calcula la confianza de la región."""
@@ -394,8 +386,8 @@ class RegionBasedProcessor:
         if raw_match["found"]:
             if raw_match["match_type"] == "exact":
                 confidence += 0.5
-            elif raw_match["match_type"] == "partial":
-                confidence += 0.3
+            elif raw_match["match_type"] == "approximate":
+                confidence += 0.3 * raw_match["score"] + 0.1
 
         # Confianza basada en contenido
         if len(text.strip()) > 10:
@@ -412,14 +404,15 @@ class RegionBasedProcessor:
 
         return min(confidence, 1.0)
 
-    def _create_table_region_from_coordinates(self, table: Dict, raw_text: str, table_index: int) -> Optional[Dict]:
+    def _create_table_region_from_coordinates(self, table: Dict, aligner: TextAligner, text_blocks: List[Dict],
+                                              table_index: int) -> Optional[Dict]:
         """Crea una región de tabla basándose en coordenadas."""
 
         if table["confidence"] < 0.6:  # Solo tablas con alta confianza
             return None
 
         # Extraer contenido de tabla desde raw text basándose en posición
-        table_content = self._extract_table_content_from_raw(table, raw_text)
+        table_content = self._extract_table_content_from_raw(table, aligner, text_blocks)
 
         region = {
             "region_id": f"table_{table_index}",
@@ -437,10 +430,11 @@ class RegionBasedProcessor:
 
         return region
 
-    def _extract_table_content_from_raw(self, table: Dict, raw_text: str) -> str:
-        """Extrae contenido de tabla del raw text (implementación básica)."""
-        # Esta es una implementación simplificada
-        # En un caso real, necesitarías mapear las coordenadas bbox a posiciones en el texto
+    def _extract_table_content_from_raw(self, table: Dict, aligner: TextAligner, text_blocks: List[Dict]) -> str:
+        """Extrae del raw text el tramo que cubren las líneas dentro del bbox de la tabla."""
+        content = aligner.region_content(lines_in_region(text_blocks, table["bbox"]))
+        if content["text"]:
+            return content["text"]
         return f"Tabla detectada con {table['estimated_rows']} filas y {table['estimated_columns']} columnas"
 
     def _analyze_table_structure(self, table_content: str) -> Dict:
@@ -10,13 +10,19 @@ Detecta el tipo de contenido ANTES de procesarlo:
 """
 
 import json
-import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
+# Project root for the shared page layout model and column inference
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.column_inference import ColumnLayout, infer_columns
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
+
 
 class ContentType(Enum):
     """Tipos de contenido posibles."""
@@ -49,22 +55,23 @@ class SmartContentClassifier:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
-        self.pdf_doc = fitz.open(pdf_path)
 
-    def classify_page_content(self, page_num: int) -> List[ContentBlock]:
-        """Clasifica todo el contenido de una página."""
-        print(f"📄 Analizando página {page_num}...")
+    def classify_page_content(self, page_num: int, layout: Optional[PageLayout] = None) -> List[ContentBlock]:
+        """
+        Clasifica todo el contenido de una página.
 
-        page = self.pdf_doc[page_num - 1]
-        text_dict = page.get_text("dict")
+        Args:
+            layout: Layout ya extraído de la página; si no se entrega se usa
+                el compartido del PDF (extraído una sola vez por página)
+        """
+        print(f"📄 Analizando página {page_num}...")
 
-        # Extraer elementos con coordenadas
-        text_items = self._extract_text_items(text_dict["blocks"])
-        images = self._extract_images(page)
-        drawings = self._extract_drawings(page)
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
 
-        # Agrupar en filas
-        rows = self._group_into_rows(text_items)
+        # Elementos con coordenadas, agrupados en filas
+        images = self._extract_images(layout)
+        rows = layout.rows()
 
         # Clasificar cada región
         content_blocks = []
@@ -81,13 +88,13 @@ class SmartContentClassifier:
             ))
 
         # PASO 1.5: Detectar tablas con PyMuPDF primero (más preciso)
-        pymupdf_tables = self._detect_tables_with_pymupdf(page, page_num)
+        pymupdf_tables = self._detect_tables_with_pymupdf(layout, page_num)
         table_regions = [t.bbox for t in pymupdf_tables]
         content_blocks.extend(pymupdf_tables)
 
         # PASO 2: Clasificar texto por regiones (excluir regiones ya clasificadas como tablas)
         # IMPORTANTE: SIEMPRE usar PyMuPDF para tablas, nunca detección manual
-        page_height = page.rect.height  # Get actual page height
+        page_height = layout.height  # Get actual page height
         i = 0
         while i < len(rows):
             # Skip rows that are inside table regions
@@ -208,132 +215,41 @@ class SmartContentClassifier:
 
         return False
 
-    def _detect_tables_with_pymupdf(self, page, page_num: int) -> List[ContentBlock]:
-        """Detect tables using PyMuPDF's built-in find_tables()."""
+    def _detect_tables_with_pymupdf(self, layout: PageLayout, page_num: int) -> List[ContentBlock]:
+        """Tables found by PyMuPDF's find_tables() when the layout was extracted."""
         tables = []
 
-        try:
-            table_finder = page.find_tables()
-
-            for table_obj in table_finder:
-                table_data = table_obj.extract()
-                bbox = table_obj.bbox
-
-                if table_data:
-                    tables.append(ContentBlock(
-                        type=ContentType.TABLE,
-                        content={"data": table_data},
-                        bbox=bbox,
-                        confidence=0.95,
-                        page=page_num,
-                        metadata={
-                            "rows": len(table_data),
-                            "cols": len(table_data[0]) if table_data else 0,
-                            "method": "pymupdf_find_tables"
-                        }
-                    ))
-        except Exception:
-            pass
+        for candidate in layout.table_candidates:
+            table_data = candidate["data"]
+
+            if table_data:
+                tables.append(ContentBlock(
+                    type=ContentType.TABLE,
+                    content={"data": table_data},
+                    bbox=tuple(candidate["bbox"]),
+                    confidence=0.95,
+                    page=page_num,
+                    metadata={
+                        "rows": candidate["rows"],
+                        "cols": candidate["cols"],
+                        "method": candidate["method"]
+                    }
+                ))
 
         return tables
 
-    def _extract_text_items(self, blocks: List) -> List[Dict]:
-        """Extrae items de texto con metadatos."""
-        items = []
-
-        for block in blocks:
-            if "lines" not in block:
-                continue
-
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    bbox = span["bbox"]
-                    text = span["text"].strip()
-
-                    if text:
-                        items.append({
-                            "text": text,
-                            "x": bbox[0],
-                            "y": bbox[1],
-                            "x_end": bbox[2],
-                            "y_end": bbox[3],
-                            "bbox": bbox,
-                            "font": span["font"],
-                            "size": span["size"],
-                            "flags": span["flags"],
-                            "is_bold": bool(span["flags"] & 2**4),
-                            "is_italic": bool(span["flags"] & 2**1),
-                            "color": span.get("color", 0)
-                        })
-
-        return items
-
-    def _extract_images(self, page) -> List[Dict]:
-        """Extrae información de imágenes."""
-        images = []
-        image_list = page.get_images()
-
-        for img_index, img in enumerate(image_list):
-            # Obtener bbox de la imagen
-            xref = img[0]
-            try:
-                bbox = page.get_image_bbox(xref)
-                images.append({
-                    "image_id": img_index,
-                    "xref": xref,
-                    "bbox": tuple(bbox),
-                    "width": img[2],
-                    "height": img[3]
-                })
-            except:
-                pass
-
-        return images
-
-    def _extract_drawings(self, page) -> List[Dict]:
-        """Extrae líneas y formas (pueden indicar tablas)."""
-        drawings = []
-
-        try:
-            drawing_list = page.get_drawings()
-
-            for draw in drawing_list:
-                drawings.append({
-                    "type": draw.get("type", "unknown"),
-                    "bbox": draw["rect"],
-                    "items": len(draw.get("items", []))
-                })
-
-        except:
-            pass
-
-        return drawings
-
-    def _group_into_rows(self, items: List[Dict]) -> List[List[Dict]]:
-        """Agrupa items en filas."""
-        if not items:
-            return []
-
-        sorted_items = sorted(items, key=lambda x: x["y"])
-        rows = []
-        current_row = [sorted_items[0]]
-        current_y = sorted_items[0]["y"]
-        tolerance = 3.0
-
-        for item in sorted_items[1:]:
-            if abs(item["y"] - current_y) <= tolerance:
-                current_row.append(item)
-            else:
-                current_row.sort(key=lambda x: x["x"])
-                rows.append(current_row)
-                current_row = [item]
-                current_y = item["y"]
-
-        if current_row:
-            current_row.sort(key=lambda x: x["x"])
-            rows.append(current_row)
-
-        return rows
+    def _extract_images(self, layout: PageLayout) -> List[Dict]:
+        """Imágenes con posición conocida en la página."""
+        return [
+            {
+                "image_id": image["image_id"],
+                "xref": image["xref"],
+                "bbox": tuple(image["bbox"]),
+                "width": image["width"],
+                "height": image["height"]
+            }
+            for image in layout.placed_images()
+        ]
 
     def _classify_text_region(
         self,
@@ -637,8 +553,8 @@ class SmartContentClassifier:
         if len(columns) < 2:
             return False, None, start_idx + 1
 
-        # CRITERIO 2: Verificar consistencia de columnas
-        consistency_score = self._measure_column_consistency(sample_rows, columns)
+        # CRITERIO 2: Verificar consistencia de columnas (items alineados con alguna columna)
+        consistency_score = columns.confidence
 
         if consistency_score < 0.6:  # Al menos 60% de consistencia
             return False, None, start_idx + 1
@@ -670,7 +586,7 @@ class SmartContentClassifier:
             total_text = "".join([item.get("text", "") for item in current_row]).strip()
             is_empty_row = len(current_row) < 2 or len(total_text) < 5
 
-            if self._row_fits_columns(current_row, columns, tolerance=0.7):
+            if columns.fits(current_row, 0.7):
                 end_idx += 1
                 empty_row_count = 0  # Reset counter
             elif is_empty_row and empty_row_count < 2:
@@ -686,53 +602,13 @@ class SmartContentClassifier:
 
         return True, table_data, end_idx
 
-    def _detect_columns_smart(self, rows: List[List[Dict]]) -> List[float]:
-        """Detecta columnas usando clustering de posiciones X."""
-        all_x = []
-        for row in rows:
-            for item in row:
-                all_x.append(item["x"])
-
-        if not all_x:
-            return []
-
-        # Clustering simple
-        columns = []
-        tolerance = 8.0
-
-        for x in sorted(set(all_x)):
-            is_new = True
-            for col_x in columns:
-                if abs(x - col_x) <= tolerance:
-                    is_new = False
-                    break
-            if is_new:
-                columns.append(x)
-
-        return sorted(columns)
-
-    def _measure_column_consistency(
-        self,
-        rows: List[List[Dict]],
-        columns: List[float]
-    ) -> float:
-        """Mide qué tan consistente es la alineación de columnas."""
-        if not rows or not columns:
-            return 0.0
-
-        total_items = 0
-        aligned_items = 0
-
-        for row in rows:
-            for item in row:
-                total_items += 1
-                # Verificar si está cerca de alguna columna
-                for col_x in columns:
-                    if abs(item["x"] - col_x) <= 10:
-                        aligned_items += 1
-                        break
-
-        return aligned_items / total_items if total_items > 0 else 0.0
+    def _detect_columns_smart(self, rows: List[List[Dict]]) -> ColumnLayout:
+        """Detecta columnas agrupando los bordes X de todas las filas en una pasada."""
+        return infer_columns(
+            (item for row in rows for item in row),
+            cluster_tolerance=8.0,
+            align_tolerance=10.0
+        )
 
     def _has_mixed_content(self, rows: List[List[Dict]]) -> bool:
         """Verifica si hay contenido mixto (texto + números)."""
@@ -766,30 +642,10 @@ class SmartContentClassifier:
 
         return False
 
-    def _row_fits_columns(
-        self,
-        row: List[Dict],
-        columns: List[float],
-        tolerance: float = 0.7
-    ) -> bool:
-        """Verifica si una fila encaja con las columnas."""
-        if not row:
-            return False
-
-        matches = 0
-        for item in row:
-            for col_x in columns:
-                if abs(item["x"] - col_x) <= 10:
-                    matches += 1
-                    break
-
-        fit_ratio = matches / len(row) if row else 0
-        return fit_ratio >= tolerance
-
     def _build_table_data(
         self,
         rows: List[List[Dict]],
-        columns: List[float]
+        columns: ColumnLayout
     ) -> Dict:
         """Construye datos estructurados de tabla."""
         table_matrix = []
@@ -798,15 +654,8 @@ class SmartContentClassifier:
             row_data = [""] * len(columns)
 
             for item in row:
-                # Asignar a columna más cercana
-                closest_col = None
-                min_dist = float('inf')
-
-                for i, col_x in enumerate(columns):
-                    dist = abs(item["x"] - col_x)
-                    if dist < min_dist and dist <= 10:
-                        min_dist = dist
-                        closest_col = i
+                # Asignar a columna más cercana (búsqueda binaria)
+                closest_col = columns.nearest(item["x"])
 
                 if closest_col is not None:
                     if row_data[closest_col]:
@@ -821,7 +670,7 @@ class SmartContentClassifier:
         bbox = self._calculate_bbox(all_items)
 
         return {
-            "columns": columns,
+            "columns": columns.positions,
             "data": table_matrix,
             "bbox": bbox,
             "row_count": len(table_matrix),
@@ -207,10 +207,10 @@ def patch_classifier_with_splitter(classifier):
     # Save original method
     original_classify = classifier.classify_page_content
 
-    def classify_with_splitting(page_num: int):
+    def classify_with_splitting(page_num: int, layout=None):
         """Wrapper that splits tables into sections."""
         # Get original blocks
-        blocks = original_classify(page_num)
+        blocks = original_classify(page_num, layout=layout)
 
         # Split tables into sections
         split_blocks = splitter.split_all_tables(blocks)
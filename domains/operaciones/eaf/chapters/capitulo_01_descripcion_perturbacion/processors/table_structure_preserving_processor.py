@@ -5,17 +5,29 @@ Mantiene el formato de tabla original y detecta las estructuras correctamente
 
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
+# Project root for the shared table grid engine
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.table_grid import TableGrid, reconstruct_pdf_tables
+from shared_platform.utils.raw_text_store import split_raw_pages
+
 
 class TableStructurePreservingProcessor:
     """Procesador que preserva la estructura tabular real."""
 
-    def __init__(self):
+    def __init__(self, pdf_path: str = None):
         self.entity_counter = 1
 
+        # Con el PDF, las tablas con bordes se reconstruyen desde coordenadas
+        self.table_grids: Dict[int, List[TableGrid]] = {}
+        if pdf_path:
+            self.table_grids = reconstruct_pdf_tables(pdf_path, 1, 11)
+
     def process_preserving_table_structure(self, raw_text: str) -> Dict:
         """Procesa preservando la estructura tabular real."""
 
@@ -61,28 +73,7 @@ class TableStructurePreservingProcessor:
 
     def _split_by_pages(self, raw_text: str) -> Dict[int, str]:
         """Divide el raw text por páginas."""
-        pages = {}
-        current_page = None
-        current_content = []
-
-        lines = raw_text.split('\n')
-
-        for line in lines:
-            if line.startswith("=== PÁGINA"):
-                if current_page is not None:
-                    pages[current_page] = '\n'.join(current_content)
-                page_match = re.search(r'PÁGINA (\d+)', line)
-                if page_match:
-                    current_page = int(page_match.group(1))
-                    current_content = []
-            else:
-                if current_page is not None:
-                    current_content.append(line)
-
-        if current_page is not None:
-            pages[current_page] = '\n'.join(current_content)
-
-        return pages
+        return split_raw_pages(raw_text)
 
     def _extract_page_with_table_structure(self, page_content: str, page_num: int) -> Tuple[List[Dict], Dict]:
         """Extrae página preservando estructura tabular."""
@@ -100,8 +91,25 @@ class TableStructurePreservingProcessor:
             }
         }
 
+        grids = self.table_grids.get(page_num)
+
+        # Tablas reconstruidas desde coordenadas: celdas y spans reales
+        if grids:
+            for index, grid in enumerate(grids, 1):
+                table = self._grid_table_structure(grid, page_num, index)
+                entities.append(self._create_table_entity_with_structure(table, page_num))
+                page_structure["tables"].append(table)
+                page_structure["metadata"]["table_count"] += 1
+
+            # Los párrafos siguen saliendo del texto
+            if page_num != 1:
+                for section in self._detect_general_sections_with_tables(page_content, page_num):
+                    if section["type"] != "table":
+                        page_structure["paragraphs"].append(section)
+                        page_structure["metadata"]["paragraph_count"] += 1
+
         # Detectar secciones específicas para página 1
-        if page_num == 1:
+        elif page_num == 1:
             tables = self._extract_page_1_tables_with_structure(page_content)
 
             for table in tables:
@@ -129,6 +137,51 @@ class TableStructurePreservingProcessor:
 
         return entities, page_structure
 
+    def _grid_table_structure(self, grid: TableGrid, page_num: int, index: int) -> Dict:
+        """Convierte una tabla reconstruida al formato de tabla de este procesador."""
+        matrix = grid.matrix()
+
+        # Una primera fila que abarca todo el ancho es el título de la tabla
+        title_cell = next((c for c in grid.cells if c.row == 0 and c.col == 0), None)
+        has_title_row = title_cell is not None and title_cell.col_span == grid.n_cols and grid.n_cols > 1
+        title = title_cell.text if has_title_row and title_cell.text else f"Tabla {index} (página {page_num})"
+
+        key_values = grid.key_values()
+        if key_values:
+            table_format = "key_value_pairs"
+            headers = ["Campo", "Valor"]
+            rows = [
+                {"row_id": i, "campo": campo, "valor": valor}
+                for i, (campo, valor) in enumerate(key_values, 1)
+            ]
+        else:
+            table_format = "grid"
+            body = matrix[1:] if has_title_row else matrix
+            headers = [text or f"col_{i}" for i, text in enumerate(body[0])] if body else []
+            rows = [
+                {"row_id": i, **{headers[c]: text for c, text in enumerate(row) if text is not None}}
+                for i, row in enumerate(body[1:], 1)
+            ]
+
+        return {
+            "table_id": f"page_{page_num}_table_{index}",
+            "title": title,
+            "type": "table",
+            "format": table_format,
+            "parsed_structure": {
+                "headers": headers,
+                "rows": rows,
+                "row_count": len(rows),
+                "column_count": grid.n_cols,
+                "cells": [cell.to_dict() for cell in grid.cells]
+            },
+            "metadata": {
+                "parsing_method": "coordinate_grid",
+                "confidence": 0.95,
+                "bbox": grid.bbox
+            }
+        }
+
     def _extract_page_1_tables_with_structure(self, content: str) -> List[Dict]:
         """Extrae las 3 tablas de la página 1 con estructura preservada."""
 
@@ -529,7 +582,9 @@ def main():
     print("📊 PROCESANDO PRESERVANDO ESTRUCTURA TABULAR REAL")
     print("=" * 60)
 
-    processor = TableStructurePreservingProcessor()
+    # PDF opcional: python table_structure_preserving_processor.py [ruta_pdf]
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else None
+    processor = TableStructurePreservingProcessor(pdf_path)
     result = processor.process_preserving_table_structure(raw_text)
 
     # Guardar resultado
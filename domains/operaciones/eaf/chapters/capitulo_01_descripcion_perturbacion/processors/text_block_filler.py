@@ -3,9 +3,9 @@ Text Block Filler
 Detects text that was missed by the classifier and adds it as text/metadata blocks
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from smart_content_classifier import ContentBlock, ContentType
-import fitz
+from shared_platform.utils.page_layout import PageLayout, get_page_layout
 
 
 class TextBlockFiller:
@@ -14,12 +14,13 @@ class TextBlockFiller:
     """
 
     def __init__(self, pdf_path: str):
-        self.pdf_doc = fitz.open(pdf_path)
+        self.pdf_path = pdf_path
 
     def find_unclassified_text(
         self,
         page_num: int,
-        existing_blocks: List[ContentBlock]
+        existing_blocks: List[ContentBlock],
+        layout: Optional[PageLayout] = None
     ) -> List[ContentBlock]:
         """
         Finds text that wasn't covered by existing blocks.
@@ -27,28 +28,16 @@ class TextBlockFiller:
         Args:
             page_num: Page number (1-indexed)
             existing_blocks: Already classified blocks
+            layout: Page layout; defaults to the shared one for this PDF
 
         Returns:
             List of new text blocks for uncovered text
         """
-        page = self.pdf_doc[page_num - 1]
-
-        # Get all text blocks from PDF
-        text_dict = page.get_text("dict")
-        all_text_items = []
-
-        for block in text_dict["blocks"]:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        bbox = span["bbox"]
-                        text = span["text"].strip()
-                        if text:
-                            all_text_items.append({
-                                "bbox": bbox,
-                                "text": text,
-                                "size": span["size"]
-                            })
+        if layout is None:
+            layout = get_page_layout(self.pdf_path, page_num)
+
+        # All text spans of the page
+        all_text_items = layout.text_items()
 
         # Check which text items are NOT covered by existing blocks
         uncovered_items = []
@@ -144,12 +133,13 @@ class TextBlockFiller:
     def fill_gaps(
         self,
         page_num: int,
-        blocks: List[ContentBlock]
+        blocks: List[ContentBlock],
+        layout: Optional[PageLayout] = None
     ) -> List[ContentBlock]:
         """
         Adds missing text blocks to fill gaps.
         """
-        new_blocks = self.find_unclassified_text(page_num, blocks)
+        new_blocks = self.find_unclassified_text(page_num, blocks, layout)
 
         # Combine and sort by Y position
         all_blocks = blocks + new_blocks
@@ -167,9 +157,9 @@ def patch_classifier_with_filler(classifier, pdf_path: str):
 
     original_classify = classifier.classify_page_content
 
-    def classify_with_filling(page_num: int):
-        blocks = original_classify(page_num)
-        filled_blocks = filler.fill_gaps(page_num, blocks)
+    def classify_with_filling(page_num: int, layout=None):
+        blocks = original_classify(page_num, layout=layout)
+        filled_blocks = filler.fill_gaps(page_num, blocks, layout)
         return filled_blocks
 
     classifier.classify_page_content = classify_with_filling
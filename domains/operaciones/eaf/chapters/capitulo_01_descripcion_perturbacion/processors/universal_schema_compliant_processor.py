@@ -9,6 +9,12 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 import uuid
+import sys
+
+# Project root for the shared raw text store
+project_root = Path(__file__).resolve().parents[6]
+sys.path.append(str(project_root))
+from shared_platform.utils.raw_text_store import split_raw_pages
 
 
 class UniversalSchemaCompliantProcessor:
@@ -69,28 +75,7 @@ class UniversalSchemaCompliantProcessor:
 
     def _split_by_pages(self, raw_text: str) -> Dict[int, str]:
         """Divide el raw text por páginas."""
-        pages = {}
-        current_page = None
-        current_content = []
-
-        lines = raw_text.split('\n')
-
-        for line in lines:
-            if line.startswith("=== PÁGINA"):
-                if current_page is not None:
-                    pages[current_page] = '\n'.join(current_content)
-                page_match = re.search(r'PÁGINA (\d+)', line)
-                if page_match:
-                    current_page = int(page_match.group(1))
-                    current_content = []
-            else:
-                if current_page is not None:
-                    current_content.append(line)
-
-        if current_page is not None:
-            pages[current_page] = '\n'.join(current_content)
-
-        return pages
+        return split_raw_pages(raw_text)
 
     def _extract_page_entities(self, page_content: str, page_num: int) -> tuple[List[Dict], Dict]:
         """Extrae entidades de una página respetando el esquema universal."""
@@ -8,33 +8,41 @@ for efficient processing of large documents.
 import PyPDF2
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import json
 
 
 class EAFChapterDetector:
     """Detects and segments EAF documents into logical processing chapters."""
 
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, page_texts: Optional[List[str]] = None):
         self.pdf_path = Path(pdf_path)
         self.chapters = []
         self.metadata = {}
+        # Text of every page (0-indexed); kept so chapter extraction can reuse it
+        self.page_texts = page_texts
+
+    def extract_page_texts(self) -> List[str]:
+        """Extract (once) and cache the text of every page."""
+        if self.page_texts is None:
+            with open(self.pdf_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                self.page_texts = [page.extract_text() or '' for page in reader.pages]
+        return self.page_texts
 
     def analyze_document(self) -> Dict:
         """Analyze the PDF and detect chapter structure."""
-        with open(self.pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            total_pages = len(reader.pages)
+        page_texts = self.extract_page_texts()
 
-            self.metadata = {
-                'total_pages': total_pages,
-                'document_title': self._extract_title(reader.pages[0]),
-                'document_type': 'EAF',
-                'processing_date': None
-            }
+        self.metadata = {
+            'total_pages': len(page_texts),
+            'document_title': self._extract_title(page_texts[0]),
+            'document_type': 'EAF',
+            'processing_date': None
+        }
 
-            # Detect chapters based on content patterns
-            self.chapters = self._detect_chapters(reader)
+        # Detect chapters based on content patterns
+        self.chapters = self._detect_chapters(page_texts)
 
         return {
             'metadata': self.metadata,
@@ -42,9 +50,8 @@ class EAFChapterDetector:
             'processing_strategy': self._recommend_processing_strategy()
         }
 
-    def _extract_title(self, first_page) -> str:
-        """Extract document title and metadata from first page."""
-        text = first_page.extract_text()
+    def _extract_title(self, text: str) -> str:
+        """Extract document title and metadata from first page text."""
         lines = text.split('\n')
 
         # Extract main title
@@ -88,17 +95,14 @@ class EAFChapterDetector:
 
         return main_title
 
-    def _detect_chapters(self, reader) -> List[Dict]:
+    def _detect_chapters(self, page_texts: List[str]) -> List[Dict]:
         """Detect logical chapters in the document."""
         chapters = []
 
         # Scan ALL pages to find numbered chapters
         found_chapters = []
 
-        for i in range(len(reader.pages)):
-            page = reader.pages[i]
-            text = page.extract_text()
-
+        for i, text in enumerate(page_texts):
             # Look for main chapter pattern: number followed by title
             # Pattern: \d+\.\s+[A-Z or lowercase start][text that continues for reasonable length]
             chapter_pattern = r'^(\d+)\.\s+([A-Z][^.\n]{10,150})'
@@ -145,7 +149,7 @@ class EAFChapterDetector:
             if i + 1 < len(unique_chapters):
                 end_page = unique_chapters[i + 1]['page'] - 1
             else:
-                end_page = len(reader.pages) - 1
+                end_page = len(page_texts) - 1
 
             chapters.append({
                 'number': chapter['number'],
@@ -159,7 +163,7 @@ class EAFChapterDetector:
         # If no numbered chapters found, fallback to original detection
         if not chapters:
             print("No numbered chapters found, using fallback detection...")
-            chapters = self._fallback_chapter_detection(reader)
+            chapters = self._fallback_chapter_detection(page_texts)
 
         return chapters
 
@@ -213,7 +217,7 @@ class EAFChapterDetector:
         else:
             return 'general'
 
-    def _fallback_chapter_detection(self, reader) -> List[Dict]:
+    def _fallback_chapter_detection(self, page_texts: List[str]) -> List[Dict]:
         """Fallback to original chapter detection method."""
         chapters = []
         current_chapter = None
@@ -228,9 +232,8 @@ class EAFChapterDetector:
         ]
 
         # Sample pages to detect structure
-        for i in range(0, len(reader.pages), max(1, len(reader.pages) // 50)):
-            page = reader.pages[i]
-            text = page.extract_text()
+        for i in range(0, len(page_texts), max(1, len(page_texts) // 50)):
+            text = page_texts[i]
 
             # Check for chapter markers
             for pattern in chapter_patterns:
@@ -252,12 +255,12 @@ class EAFChapterDetector:
 
         # Close last chapter
         if current_chapter:
-            current_chapter['end_page'] = len(reader.pages) - 1
+            current_chapter['end_page'] = len(page_texts) - 1
             chapters.append(current_chapter)
 
         # If still no chapters detected, create page-based chunks
         if not chapters:
-            chapters = self._create_page_chunks(len(reader.pages))
+            chapters = self._create_page_chunks(len(page_texts))
 
         return chapters
 
@@ -10,7 +10,6 @@ import logging
 import sqlite3
 from pathlib import Path
 from typing import Dict, List
-import PyPDF2
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 
@@ -23,12 +22,17 @@ eaf_root = Path(__file__).parent.parent
 sys.path.append(str(eaf_root))
 
 from chapter_detection.eaf_chapter_detector import EAFChapterDetector
+from utilities.page_text_pool import extract_page_texts, assemble_chapter_text
+
+# Repository root (shared_platform package)
+sys.path.append(str(Path(__file__).resolve().parents[5]))
+from shared_platform.utils.raw_text_store import write_raw_text
 
 
 class EAFMainProcessor:
     """Main processor for EAF documents with chapter-based processing."""
 
-    def __init__(self, pdf_path: str, output_dir: str = None):
+    def __init__(self, pdf_path: str, output_dir: str = None, max_workers: int = None):
         self.pdf_path = Path(pdf_path)
         self.output_dir = Path(output_dir) if output_dir else self.pdf_path.parent / "processed"
         self.project_root = project_root
@@ -38,6 +42,10 @@ class EAFMainProcessor:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # Worker processes for the page-level text pass (default: CPU count)
+        self.max_workers = max_workers
+        self.page_texts = None
+
         # Initialize chapter detector
         self.detector = EAFChapterDetector(str(self.pdf_path))
         self.chapters_info = None
@@ -53,14 +61,8 @@ class EAFMainProcessor:
         """Process the complete EAF document."""
         self.logger.info(f"Starting EAF document processing: {self.pdf_path.name}")
 
-        # Step 1: Analyze document structure
-        self.logger.info("Step 1: Analyzing document structure...")
-        self.chapters_info = self.detector.analyze_document()
-        self.results['metadata'] = self.chapters_info['metadata']
-
-        # Step 2: Create output directories
-        self.logger.info("Step 2: Setting up output directories...")
-        self._setup_output_directories()
+        # Steps 1-2: structure analysis and output directories
+        self.analyze_document()
 
         # Step 3: Process chapters
         self.logger.info("Step 3: Processing chapters...")
@@ -69,6 +71,58 @@ class EAFMainProcessor:
         else:
             self._process_chapters_sequential()
 
+        # Steps 4-6: universal JSON, database ingestion and summary
+        self.finalize()
+
+        self.logger.info("EAF document processing completed!")
+        return self.results
+
+    def analyze_document(self, page_texts: List[str] = None) -> Dict:
+        """
+        Detect the chapters and create their output directories.
+
+        Args:
+            page_texts: Already extracted page texts; extracted here if omitted
+
+        Returns:
+            The chapter detection result (also kept in self.chapters_info)
+        """
+        # Step 1: Extract every page once (page-level process pool), then
+        # analyze document structure from the cached texts
+        self.logger.info("Step 1: Extracting page texts and analyzing document structure...")
+        if page_texts is None:
+            page_texts = extract_page_texts(str(self.pdf_path), max_workers=self.max_workers)
+        self.page_texts = page_texts
+        self.detector.page_texts = self.page_texts
+        self.chapters_info = self.detector.analyze_document()
+        self.results['metadata'] = self.chapters_info['metadata']
+
+        # Step 2: Create output directories
+        self.logger.info("Step 2: Setting up output directories...")
+        self._setup_output_directories()
+        return self.chapters_info
+
+    def process_chapter(self, chapter_idx: int) -> Dict:
+        """
+        Extract one chapter of an analyzed document.
+
+        Independent of the other chapters, so chapters can run as separate
+        jobs once chapters_info and page_texts are set.
+        """
+        return self._process_single_chapter(chapter_idx, self.chapters_info['chapters'][chapter_idx])
+
+    def finalize(self, chapter_results: List[Dict] = None) -> Dict:
+        """
+        Universal JSON, database ingestion and summary report.
+
+        Args:
+            chapter_results: process_chapter() results, when the chapters ran
+                elsewhere; defaults to the ones collected by process_document()
+        """
+        if chapter_results is not None:
+            self.results['metadata'] = self.chapters_info['metadata']
+            self.results['chapters'] = sorted(chapter_results, key=lambda ch: ch['chapter_idx'])
+
         # Step 4: Transform to universal JSON
         self.logger.info("Step 4: Transforming to universal JSON...")
         self._transform_to_universal_json()
@@ -80,8 +134,6 @@ class EAFMainProcessor:
         # Step 6: Generate summary report
         self.logger.info("Step 6: Generating summary report...")
         self._generate_summary_report()
-
-        self.logger.info("EAF document processing completed!")
         return self.results
 
     def _setup_output_directories(self):
@@ -100,7 +152,12 @@ class EAFMainProcessor:
             (chapter_dir / "universal_json").mkdir(exist_ok=True)
 
     def _process_chapters_parallel(self):
-        """Process chapters in parallel."""
+        """
+        Process chapters in parallel.
+
+        The expensive PDF parsing already ran page-by-page in the process pool,
+        so chapter jobs only assemble cached text and run regex extraction.
+        """
         max_workers = min(4, len(self.chapters_info['chapters']))
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -120,6 +177,9 @@ class EAFMainProcessor:
                 except Exception as exc:
                     self.logger.error(f"Chapter {chapter_idx + 1} generated an exception: {exc}")
 
+        # Keep document order regardless of completion order
+        self.results['chapters'].sort(key=lambda ch: ch['chapter_idx'])
+
     def _process_chapters_sequential(self):
         """Process chapters sequentially."""
         for i, chapter in enumerate(self.chapters_info['chapters']):
@@ -141,9 +201,10 @@ class EAFMainProcessor:
         )
 
         # Save raw extraction
-        raw_file = self.output_dir / chapter_name / "raw_extractions" / f"{chapter_name}_raw.txt"
-        with open(raw_file, 'w', encoding='utf-8') as f:
-            f.write(chapter_text)
+        raw_file = write_raw_text(
+            self.output_dir / chapter_name / "raw_extractions" / f"{chapter_name}_raw.txt",
+            chapter_text
+        )
 
         # Process based on content type
         processed_data = self._process_by_content_type(chapter_text, chapter_info['content_type'])
@@ -165,18 +226,10 @@ class EAFMainProcessor:
         }
 
     def _extract_chapter_text(self, start_page: int, end_page: int) -> str:
-        """Extract text from specific page range."""
-        text_parts = []
-
-        with open(self.pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-
-            for page_num in range(start_page, min(end_page + 1, len(reader.pages))):
-                page = reader.pages[page_num]
-                text = page.extract_text()
-                text_parts.append(f"=== PAGE {page_num + 1} ===\n{text}\n")
-
-        return '\n'.join(text_parts)
+        """Assemble chapter text from the cached page texts."""
+        if self.page_texts is None:
+            self.page_texts = self.detector.extract_page_texts()
+        return assemble_chapter_text(self.page_texts, start_page, end_page)
 
     def _process_by_content_type(self, text: str, content_type: str) -> Dict:
         """Process text based on its content type."""
@@ -441,13 +494,14 @@ def main():
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python eaf_main_processor.py <pdf_path> [output_dir]")
+        print("Usage: python eaf_main_processor.py <pdf_path> [output_dir] [max_workers]")
         return
 
     pdf_path = sys.argv[1]
     output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
 
-    processor = EAFMainProcessor(pdf_path, output_dir)
+    processor = EAFMainProcessor(pdf_path, output_dir, max_workers=max_workers)
     results = processor.process_document()
 
     print(f"\nProcessing completed! Results saved to: {processor.output_dir}")
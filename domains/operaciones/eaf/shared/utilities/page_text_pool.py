@@ -0,0 +1,79 @@
+"""
+EAF Page Text Pool
+Extracts the text of every PDF page exactly once using a page-granular
+process pool, so chapter detection and chapter extraction share one pass.
+
+PyPDF2 text extraction is pure Python and GIL-bound, so threads do not help.
+Pages are submitted as small batches to a ProcessPoolExecutor whose shared
+call queue hands the next batch to whichever worker is idle; a 60-page annex
+is therefore spread across all cores instead of pinning a single worker
+while 1-page chapters finish instantly.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import PyPDF2
+
+# Per-process reader, opened once by the pool initializer
+_worker_reader = None
+
+
+def _init_worker(pdf_path: str):
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(pdf_path)
+
+
+def _extract_page_batch(page_indices: Sequence[int]) -> List[Tuple[int, str]]:
+    return [(i, _worker_reader.pages[i].extract_text() or "") for i in page_indices]
+
+
+def extract_page_texts(
+    pdf_path: str,
+    max_workers: Optional[int] = None,
+    batch_size: int = 4,
+    min_pages_for_pool: int = 20
+) -> List[str]:
+    """
+    Extract the text of every page (0-indexed list).
+
+    Args:
+        pdf_path: Path to PDF
+        max_workers: Worker processes (default: CPU count)
+        batch_size: Pages per queued task; small batches balance uneven pages
+        min_pages_for_pool: Below this page count, extract in-process
+    """
+    pdf_path = str(Path(pdf_path))
+    reader = PyPDF2.PdfReader(pdf_path)
+    total_pages = len(reader.pages)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if total_pages < min_pages_for_pool or max_workers == 1:
+        return [page.extract_text() or "" for page in reader.pages]
+    del reader
+
+    texts = [""] * total_pages
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(pdf_path,)
+    ) as executor:
+        futures = [
+            executor.submit(_extract_page_batch, range(start, min(start + batch_size, total_pages)))
+            for start in range(0, total_pages, batch_size)
+        ]
+        for future in as_completed(futures):
+            for page_idx, text in future.result():
+                texts[page_idx] = text
+
+    return texts
+
+
+def assemble_chapter_text(page_texts: List[str], start_page: int, end_page: int) -> str:
+    """Join cached page texts (0-indexed, inclusive range) with page markers."""
+    text_parts = []
+    for page_num in range(start_page, min(end_page + 1, len(page_texts))):
+        text_parts.append(f"=== PAGE {page_num + 1} ===\n{page_texts[page_num]}\n")
+    return '\n'.join(text_parts)
@@ -6,11 +6,18 @@ Loads power system failure JSON data into SQLite database
 
 import json
 import sqlite3
+import sys
 from datetime import datetime
 from typing import Dict, Any, List
 import os
 from pathlib import Path
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared_platform.web.incident_store import IncidentStore
+
 class DataIngester:
     def __init__(self, db_path: str = None):
         if db_path is None:
@@ -108,21 +115,8 @@ class DataIngester:
             extraction_date
         ))
         
-        incident_id = cursor.lastrowid
-        
-        # Insert into full-text search table
-        cursor.execute("""
-            INSERT INTO incidents_fts (rowid, report_id, title, failure_cause_text, technical_summary)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            incident_id,
-            incident_info.get('report_id', ''),
-            incident_info.get('title', ''),
-            failure_cause_text,
-            technical_summary
-        ))
-        
-        return incident_id
+        # incidents_fts and the generation unit table are kept in sync by triggers
+        return cursor.lastrowid
     
     def insert_compliance_reports(self, incident_id: int, json_data: Dict[str, Any]):
         """Insert compliance reports for companies"""
@@ -199,6 +193,8 @@ class DataIngester:
         print(f"Starting ingestion of: {json_file_path}")
         
         try:
+            # Viewer tables, FTS triggers and indexes (no-op once migrated)
+            IncidentStore(str(self.db_path)).ensure_schema()
             self.connect()
             
             # Load JSON data
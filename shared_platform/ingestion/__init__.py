@@ -0,0 +1,18 @@
+"""
+Shared Platform Ingestion
+=========================
+
+Continuous ingestion: an inbox watcher feeding a prioritized, idempotent job
+queue with concurrent workers (SQLite broker, optional Celery/Redis).
+"""
+
+from .job_queue import Job, JobQueue, JobDeferred, LeaseLost, WorkerPool, run_job
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobDeferred",
+    "LeaseLost",
+    "WorkerPool",
+    "run_job"
+]
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Ingestion Daemon
+================
+
+Watches an inbox directory and turns every new document into queued jobs:
+
+    document (PDF)  -> page texts + chapter detection, then one job per chapter
+    chapter         -> EAFMainProcessor chapter extraction (runs concurrently)
+    finalize        -> universal JSON, database ingestion and summary, once
+                       every chapter of the document has finished
+    json            -> DataIngester.ingest_json_file
+
+Idempotency keys are derived from file content (SHA-256), so a file that is
+copied into the inbox again, or seen again after a restart, is not reprocessed.
+
+Brokers:
+    sqlite (default)  JobQueue file; workers are threads or processes of the daemon
+    redis://...       Jobs are still recorded in the SQLite queue (idempotency,
+                      retries, state) and dispatched to Celery workers
+                      (celery -A shared_platform.ingestion.daemon worker)
+
+Usage:
+    python -m shared_platform.ingestion.daemon --inbox data/inbox --workers 4
+    python -m shared_platform.ingestion.daemon --inbox data/inbox --once   # drain and exit
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .job_queue import DONE, FAILED, Job, JobDeferred, JobQueue, WorkerPool, run_job
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+EAF_TOOLS_DIR = PROJECT_ROOT / "domains" / "operaciones" / "eaf" / "shared" / "tools"
+DEFAULT_QUEUE = PROJECT_ROOT / "platform_data" / "database" / "ingestion_queue.db"
+
+# Higher runs first: finish the chapters already queued before opening new documents
+PRIORITIES = {
+    "chapter": 20,
+    "finalize": 15,
+    "document": 10,
+    "json": 10,
+}
+
+WATCHED_SUFFIXES = {".pdf": "document", ".json": "json"}
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Job handlers
+# ----------------------------------------------------------------------
+
+def _eaf_processor(pdf_path: str, output_dir: str):
+    if str(EAF_TOOLS_DIR) not in sys.path:
+        sys.path.append(str(EAF_TOOLS_DIR))
+    from eaf_main_processor import EAFMainProcessor
+    return EAFMainProcessor(pdf_path, output_dir)
+
+
+def _state_file(output_dir: str) -> Path:
+    return Path(output_dir) / "ingestion_state.json"
+
+
+def handle_document(job: Job, queue: JobQueue) -> Dict[str, Any]:
+    """Extract page texts once, detect chapters and queue one job per chapter"""
+    if str(EAF_TOOLS_DIR.parent) not in sys.path:
+        sys.path.append(str(EAF_TOOLS_DIR.parent))
+    from utilities.page_text_pool import extract_page_texts
+
+    payload = job.payload
+    Path(payload["output_dir"]).mkdir(parents=True, exist_ok=True)
+    processor = _eaf_processor(payload["path"], payload["output_dir"])
+    processor.analyze_document(extract_page_texts(payload["path"]))
+
+    # Chapter jobs read the cached texts instead of re-parsing the PDF
+    with open(_state_file(payload["output_dir"]), 'w', encoding='utf-8') as f:
+        json.dump({
+            "chapters_info": processor.chapters_info,
+            "page_texts": processor.page_texts
+        }, f, ensure_ascii=False)
+
+    chapters = processor.chapters_info['chapters']
+    for idx in range(len(chapters)):
+        queue.enqueue(
+            "chapter", {**payload, "chapter_idx": idx},
+            priority=PRIORITIES["chapter"],
+            idempotency_key=f"chapter:{payload['digest']}:{idx}",
+            parent_id=job.id
+        )
+    queue.enqueue(
+        "finalize", payload,
+        priority=PRIORITIES["finalize"],
+        idempotency_key=f"finalize:{payload['digest']}",
+        parent_id=job.id
+    )
+    return {"chapters": len(chapters), "pages": len(processor.page_texts)}
+
+
+def _load_processor_state(payload: Dict[str, Any]):
+    processor = _eaf_processor(payload["path"], payload["output_dir"])
+    with open(_state_file(payload["output_dir"]), 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    processor.chapters_info = state["chapters_info"]
+    processor.page_texts = state["page_texts"]
+    return processor
+
+
+def handle_chapter(job: Job, queue: JobQueue) -> Dict[str, Any]:
+    processor = _load_processor_state(job.payload)
+    return processor.process_chapter(job.payload["chapter_idx"])
+
+
+def handle_finalize(job: Job, queue: JobQueue) -> Dict[str, Any]:
+    """Universal JSON, database ingestion and summary once all chapters are done"""
+    chapters = queue.children(job.parent_id, kind="chapter")
+    if any(chapter.status not in (DONE, FAILED) for chapter in chapters):
+        raise JobDeferred(delay=2.0, reason="chapters still running")
+
+    processor = _load_processor_state(job.payload)
+    processor.finalize([chapter.result for chapter in chapters if chapter.status == DONE])
+
+    failed = [chapter.payload["chapter_idx"] for chapter in chapters if chapter.status == FAILED]
+    return {**processor.results['summary'], "failed_chapters": failed}
+
+
+def handle_json(job: Job, queue: JobQueue) -> Dict[str, Any]:
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.append(str(PROJECT_ROOT))
+    from shared_platform.database_tools.ingest_data import DataIngester
+
+    ingester = DataIngester(job.payload.get("db_path"))
+    ingester.ingest_json_file(job.payload["path"])
+    return {"ingested": job.payload["path"]}
+
+
+HANDLERS = {
+    "document": handle_document,
+    "chapter": handle_chapter,
+    "finalize": handle_finalize,
+    "json": handle_json,
+}
+
+
+# ----------------------------------------------------------------------
+# Inbox watcher
+# ----------------------------------------------------------------------
+
+class InboxWatcher:
+    """
+    Polling directory watcher
+
+    A file is queued once its size and mtime are unchanged between two polls
+    (i.e. it has finished copying). The content digest is the idempotency key.
+    Files that vanish or cannot be read during a scan are skipped until the
+    next one.
+    """
+
+    def __init__(self, inbox: str, queue: JobQueue, output_root: Optional[str] = None,
+                 db_path: Optional[str] = None):
+        self.inbox = Path(inbox)
+        self.queue = queue
+        self.output_root = Path(output_root) if output_root else self.inbox / "processed"
+        self.db_path = db_path
+        self._seen: Dict[Path, Tuple[float, int]] = {}
+        self._queued: Dict[Path, Tuple[float, int]] = {}
+
+    def scan(self) -> int:
+        """Queue the stable new or changed files; returns how many jobs were created"""
+        created_count = 0
+        try:
+            paths = sorted(self.inbox.iterdir())
+        except OSError as e:
+            logger.warning(f"⚠️  Cannot list inbox {self.inbox}: {e}")
+            return 0
+
+        present = set()
+        for path in paths:
+            kind = WATCHED_SUFFIXES.get(path.suffix.lower())
+            if kind is None:
+                continue
+
+            # The file may be removed, renamed or locked between listing and reading
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+                present.add(path)
+                signature = (stat.st_mtime, stat.st_size)
+                if self._queued.get(path) == signature:
+                    continue
+                if self._seen.get(path) != signature:
+                    # First sighting (or still growing): wait for the next poll
+                    self._seen[path] = signature
+                    continue
+
+                digest = file_digest(path)
+            except OSError as e:
+                logger.warning(f"⚠️  Skipping {path.name}: {e}")
+                continue
+
+            payload = {
+                "path": str(path.resolve()),
+                "digest": digest,
+                "output_dir": str((self.output_root / path.stem).resolve()),
+            }
+            if self.db_path:
+                payload["db_path"] = self.db_path
+
+            job_id, created = self.queue.enqueue(
+                kind, payload,
+                priority=PRIORITIES[kind],
+                idempotency_key=f"{kind}:{digest}"
+            )
+            self._queued[path] = signature
+            if created:
+                created_count += 1
+                logger.info(f"📥 Queued {kind} job {job_id}: {path.name}")
+
+        # Forget files that left the inbox
+        for tracked in (self._seen, self._queued):
+            for path in [path for path in tracked if path not in present]:
+                del tracked[path]
+        return created_count
+
+
+# ----------------------------------------------------------------------
+# Celery bridge (optional)
+# ----------------------------------------------------------------------
+
+try:
+    from celery import Celery
+except ImportError:
+    Celery = None
+
+celery_app = None
+if Celery is not None:
+    celery_app = Celery(
+        "ingestion",
+        broker=os.environ.get("INGESTION_BROKER_URL", "redis://localhost:6379/0")
+    )
+
+    @celery_app.task(name="ingestion.run_job", bind=True, max_retries=None)
+    def celery_run_job(self, job_id: int, queue_path: str):
+        """Run one queued job; the SQLite record keeps state, retries and idempotency"""
+        queue = JobQueue(queue_path)
+        queue.on_enqueue = lambda job: dispatch_to_celery(job, queue_path)
+        try:
+            job = queue.claim(self.request.hostname or "celery", job_id=job_id)
+            if job is None:
+                return  # Already done, or claimed elsewhere
+            run_job(queue, job, HANDLERS)
+            job = queue.get(job_id)
+            if job.status not in (DONE, FAILED):
+                available_in = queue.conn.execute(
+                    "SELECT available_at FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()[0] - time.time()
+                raise self.retry(countdown=max(0.0, available_in))
+        finally:
+            queue.close()
+
+
+def dispatch_to_celery(job: Job, queue_path: str):
+    celery_app.send_task(
+        "ingestion.run_job", args=[job.id, queue_path],
+        priority=min(9, max(0, job.priority // 3))
+    )
+
+
+# ----------------------------------------------------------------------
+# Daemon
+# ----------------------------------------------------------------------
+
+def run_daemon(inbox: str, queue_path: str = str(DEFAULT_QUEUE), workers: int = 4,
+               use_processes: bool = False, broker: str = "sqlite", poll_interval: float = 2.0,
+               output_root: Optional[str] = None, db_path: Optional[str] = None,
+               once: bool = False) -> Dict[str, int]:
+    """
+    Watch the inbox and process its documents until interrupted
+
+    With once=True, queue what is in the inbox, drain the queue and return.
+    """
+    queue = JobQueue(queue_path)
+    watcher = InboxWatcher(inbox, queue, output_root, db_path)
+
+    pool = None
+    if broker == "sqlite":
+        pool = WorkerPool(queue_path, HANDLERS, workers=workers, use_processes=use_processes)
+    else:
+        if celery_app is None:
+            raise RuntimeError("Celery is not installed; use --broker sqlite or pip install celery redis")
+        celery_app.conf.broker_url = broker
+        queue.on_enqueue = lambda job: dispatch_to_celery(job, queue_path)
+
+    print(f"👀 Watching {inbox} ({broker} broker, {workers if pool else 'celery'} workers)")
+
+    try:
+        if once:
+            # Two scans: files are queued once seen unchanged twice
+            watcher.scan()
+            watcher.scan()
+            if pool:
+                pool.start(exit_when_idle=True)
+                pool.join()
+        else:
+            if pool:
+                pool.start()
+            while True:
+                watcher.scan()
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping ingestion daemon...")
+    finally:
+        if pool:
+            pool.stop()
+        stats = queue.stats()
+        queue.close()
+
+    print(f"📊 Jobs: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion daemon: inbox watcher + job queue workers")
+    parser.add_argument("--inbox", required=True, help="Directory to watch for PDF/JSON documents")
+    parser.add_argument("--queue", default=str(DEFAULT_QUEUE), help="SQLite queue file")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", action="store_true", help="Run workers as processes instead of threads")
+    parser.add_argument("--broker", default="sqlite", help="'sqlite' or a Celery broker URL (redis://...)")
+    parser.add_argument("--output-dir", help="Output root (default: <inbox>/processed)")
+    parser.add_argument("--db", help="Database for JSON ingestion (default: platform database)")
+    parser.add_argument("--poll", type=float, default=2.0, help="Inbox poll interval in seconds")
+    parser.add_argument("--once", action="store_true", help="Process the current inbox and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run_daemon(args.inbox, args.queue, args.workers, args.processes, args.broker,
+               args.poll, args.output_dir, args.db, args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+SQLite Job Queue for Ingestion
+==============================
+
+Durable broker for ingestion jobs that needs no Redis: jobs live in one
+SQLite table (WAL mode), so any number of worker threads or processes can
+share a queue file.
+
+- Priorities: higher priority jobs are claimed first, then FIFO.
+- Idempotency: a job's idempotency_key is UNIQUE; enqueueing the same key
+  again returns the existing job instead of creating a new one.
+- Retries: a failed job goes back to the queue with exponential backoff until
+  max_attempts, then stays "failed" with its last error.
+- Leases: a claimed job is leased to its worker; if the worker dies the
+  lease expires and another worker picks the job up again. An expired lease
+  counts as an attempt, so a job that keeps killing its worker ends up
+  "failed" too. Only the worker holding the lease can record the outcome.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """The job is no longer leased to this worker (lease expired and reclaimed, or finished)"""
+
+    def __init__(self, job_id: int, worker: str):
+        super().__init__(f"Job {job_id} is no longer leased to {worker}")
+        self.job_id = job_id
+        self.worker = worker
+
+
+class JobDeferred(Exception):
+    """Raised by a handler whose job cannot run yet; requeued without using an attempt"""
+
+    def __init__(self, delay: float = 5.0, reason: str = "deferred"):
+        super().__init__(reason)
+        self.delay = delay
+
+
+@dataclass
+class Job:
+    """One unit of ingestion work"""
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    priority: int = 0
+    idempotency_key: Optional[str] = None
+    status: str = QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    parent_id: Optional[int] = None
+    last_error: Optional[str] = None
+    result: Any = None
+    worker: Optional[str] = None
+
+
+JOB_COLUMNS = (
+    "id, kind, payload, priority, idempotency_key, status, attempts, max_attempts, "
+    "parent_id, last_error, result, worker"
+)
+
+
+def _row_to_job(row: Sequence) -> Job:
+    return Job(
+        id=row[0],
+        kind=row[1],
+        payload=json.loads(row[2]) if row[2] else {},
+        priority=row[3],
+        idempotency_key=row[4],
+        status=row[5],
+        attempts=row[6],
+        max_attempts=row[7],
+        parent_id=row[8],
+        last_error=row[9],
+        result=json.loads(row[10]) if row[10] else None,
+        worker=row[11]
+    )
+
+
+class JobQueue:
+    """Priority job queue persisted in SQLite; safe across threads and processes"""
+
+    def __init__(self, db_path: str, retry_backoff: float = 5.0, lease_seconds: float = 1800.0):
+        self.db_path = str(db_path)
+        self.retry_backoff = retry_backoff
+        self.lease_seconds = lease_seconds
+        # Called with each newly created job (e.g. to dispatch it to Celery)
+        self.on_enqueue: Optional[Callable[[Job], None]] = None
+        self._local = threading.local()
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA busy_timeout = 30000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload JSON,
+                priority INTEGER DEFAULT 0,
+                idempotency_key TEXT UNIQUE,
+                status TEXT DEFAULT 'queued',
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 3,
+                parent_id INTEGER,
+                available_at REAL,
+                lease_until REAL,
+                worker TEXT,
+                last_error TEXT,
+                result JSON,
+                created_at REAL,
+                updated_at REAL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority DESC, available_at, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_parent ON jobs(parent_id);
+        """)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Producing
+    # ------------------------------------------------------------------
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], priority: int = 0,
+                idempotency_key: Optional[str] = None, max_attempts: int = 3,
+                parent_id: Optional[int] = None, delay: float = 0.0) -> Tuple[int, bool]:
+        """
+        Add a job
+
+        Returns:
+            (job_id, created); created is False when a job with the same
+            idempotency_key already exists (whatever its status)
+        """
+        now = time.time()
+        cursor = self.conn.execute("""
+            INSERT OR IGNORE INTO jobs
+            (kind, payload, priority, idempotency_key, status, max_attempts, parent_id,
+             available_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            kind, json.dumps(payload, ensure_ascii=False), priority, idempotency_key, QUEUED,
+            max_attempts, parent_id, now + delay, now, now
+        ))
+
+        if cursor.rowcount:
+            job_id = cursor.lastrowid
+            if self.on_enqueue:
+                self.on_enqueue(self.get(job_id))
+            return job_id, True
+
+        row = self.conn.execute(
+            "SELECT id FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+        return row[0], False
+
+    # ------------------------------------------------------------------
+    # Consuming
+    # ------------------------------------------------------------------
+
+    def claim(self, worker: str, kinds: Optional[Sequence[str]] = None,
+              job_id: Optional[int] = None) -> Optional[Job]:
+        """
+        Lease the next ready job (or a specific one) to a worker
+
+        Ready: queued and due, or running with an expired lease and attempts
+        left. Expired jobs without attempts left are marked failed instead.
+        """
+        now = time.time()
+        query = f"""
+            SELECT {JOB_COLUMNS} FROM jobs
+            WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?))
+        """
+        params: List[Any] = [QUEUED, now, RUNNING, now]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+        if kinds:
+            query += f" AND kind IN ({','.join(['?'] * len(kinds))})"
+            params.extend(kinds)
+        query += " ORDER BY priority DESC, available_at, id LIMIT 1"
+
+        conn = self.conn
+        # BEGIN IMMEDIATE takes the write lock, so two workers never claim the same job
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A worker that keeps dying on a job must not get it back forever
+            conn.execute("""
+                UPDATE jobs SET status = ?, lease_until = NULL, available_at = NULL,
+                       last_error = 'Lease expired on ' || COALESCE(worker, '?') || ' after ' || attempts || ' attempts',
+                       updated_at = ?
+                WHERE status = ? AND lease_until < ? AND attempts >= max_attempts
+            """, (FAILED, now, RUNNING, now))
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("""
+                UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?,
+                       lease_until = ?, updated_at = ?
+                WHERE id = ?
+            """, (RUNNING, worker, now + self.lease_seconds, now, row[0]))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = _row_to_job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        job.worker = worker
+        return job
+
+    def complete(self, job_id: int, worker: str, result: Any = None):
+        """Record the result of a job leased to worker; raises LeaseLost otherwise"""
+        cursor = self.conn.execute("""
+            UPDATE jobs SET status = ?, result = ?, lease_until = NULL, last_error = NULL, updated_at = ?
+            WHERE id = ? AND worker = ? AND status = ?
+        """, (DONE, json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker, RUNNING))
+        if not cursor.rowcount:
+            raise LeaseLost(job_id, worker)
+
+    def fail(self, job_id: int, worker: str, error: str) -> str:
+        """
+        Record a failure of a job leased to worker; requeue with backoff while
+        attempts remain. Returns the new status; raises LeaseLost if the job
+        is no longer leased to worker
+        """
+        row = self.conn.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+            (job_id, worker, RUNNING)
+        ).fetchone()
+        if row is None:
+            raise LeaseLost(job_id, worker)
+        attempts, max_attempts = row
+        now = time.time()
+
+        if attempts < max_attempts:
+            status = QUEUED
+            available_at = now + self.retry_backoff * (2 ** (attempts - 1))
+        else:
+            status = FAILED
+            available_at = None
+
+        cursor = self.conn.execute("""
+            UPDATE jobs SET status = ?, available_at = ?, lease_until = NULL, last_error = ?, updated_at = ?
+            WHERE id = ? AND worker = ? AND status = ?
+        """, (status, available_at, error, now, job_id, worker, RUNNING))
+        if not cursor.rowcount:
+            raise LeaseLost(job_id, worker)
+        return status
+
+    def defer(self, job_id: int, worker: str, delay: float):
+        """Put a job leased to worker back without counting the attempt; raises LeaseLost otherwise"""
+        now = time.time()
+        cursor = self.conn.execute("""
+            UPDATE jobs SET status = ?, attempts = attempts - 1, available_at = ?,
+                   lease_until = NULL, updated_at = ?
+            WHERE id = ? AND worker = ? AND status = ?
+        """, (QUEUED, now + delay, now, job_id, worker, RUNNING))
+        if not cursor.rowcount:
+            raise LeaseLost(job_id, worker)
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[Job]:
+        row = self.conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def children(self, parent_id: int, kind: Optional[str] = None) -> List[Job]:
+        query = f"SELECT {JOB_COLUMNS} FROM jobs WHERE parent_id = ?"
+        params: List[Any] = [parent_id]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY id"
+        return [_row_to_job(row) for row in self.conn.execute(query, params)]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")))
+        return counts
+
+    def pending(self) -> int:
+        """Jobs not finished yet (queued or running)"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+
+Handler = Callable[[Job, JobQueue], Any]
+
+
+def run_job(queue: JobQueue, job: Job, handlers: Dict[str, Handler]) -> str:
+    """
+    Execute one claimed job and record its outcome; returns the new status
+
+    If the lease was lost meanwhile (the job ran past lease_seconds and was
+    reclaimed), the outcome is dropped and the job's current status returned.
+    """
+    try:
+        handler = handlers.get(job.kind)
+        if handler is None:
+            return queue.fail(job.id, job.worker, f"No handler for job kind '{job.kind}'")
+
+        try:
+            result = handler(job, queue)
+        except JobDeferred as deferred:
+            queue.defer(job.id, job.worker, deferred.delay)
+            return QUEUED
+        except Exception as e:
+            return queue.fail(job.id, job.worker, f"{type(e).__name__}: {e}")
+
+        queue.complete(job.id, job.worker, result)
+        return DONE
+    except LeaseLost as e:
+        logger.warning(f"⚠️  {e}; its outcome was discarded")
+        return queue.get(job.id).status
+
+
+def worker_loop(db_path: str, handlers: Dict[str, Handler], stop: Optional[threading.Event] = None,
+                poll_interval: float = 1.0, kinds: Optional[Sequence[str]] = None,
+                exit_when_idle: bool = False, name: Optional[str] = None, **queue_options):
+    """Claim and run jobs until stopped (or until the queue is drained, with exit_when_idle)"""
+    queue = JobQueue(db_path, **queue_options)
+    worker = name or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def wait(seconds: float):
+        if stop is not None:
+            stop.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    busy_retries = 0
+    try:
+        while stop is None or not stop.is_set():
+            try:
+                job = queue.claim(worker, kinds)
+            except sqlite3.OperationalError as e:
+                # "database is locked" past busy_timeout: back off, keep the worker alive
+                busy_retries += 1
+                logger.warning(f"⚠️  {worker} could not claim a job ({e}); retrying")
+                wait(min(poll_interval * 2 ** busy_retries, 60.0))
+                continue
+            busy_retries = 0
+            if job is None:
+                if exit_when_idle and not queue.pending():
+                    break
+                wait(poll_interval)
+                continue
+            run_job(queue, job, handlers)
+    finally:
+        queue.close()
+
+
+@dataclass
+class WorkerPool:
+    """
+    Concurrent workers over one queue file
+
+    Threads suit jobs that wait on I/O or already use their own process pool
+    (page extraction); processes (use_processes=True) suit CPU-bound handlers,
+    which must then be importable module-level functions.
+    """
+    db_path: str
+    handlers: Dict[str, Handler]
+    workers: int = 4
+    use_processes: bool = False
+    poll_interval: float = 1.0
+    queue_options: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._stop = None
+        self._workers: List[Any] = []
+
+    def start(self, exit_when_idle: bool = False):
+        if self.use_processes:
+            import multiprocessing
+            self._stop = multiprocessing.Event()
+            worker_class = multiprocessing.Process
+        else:
+            self._stop = threading.Event()
+            worker_class = threading.Thread
+
+        for i in range(self.workers):
+            worker = worker_class(
+                target=worker_loop,
+                args=(self.db_path, self.handlers, self._stop, self.poll_interval),
+                kwargs={"exit_when_idle": exit_when_idle, **self.queue_options},
+                name=f"ingestion-worker-{i + 1}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout: Optional[float] = None):
+        if self._stop is not None:
+            self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None):
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
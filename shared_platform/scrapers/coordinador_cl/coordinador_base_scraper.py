@@ -6,22 +6,44 @@ Shared functionality that all domain scrapers can inherit from
 
 import asyncio
 import json
+import os
+import sys
+from datetime import datetime
 from pathlib import Path
-from playwright.async_api import async_playwright
+from typing import Dict, Optional
 from abc import ABC, abstractmethod
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared_platform.scrapers.coordinador_cl.crawl_runtime import CheckpointLedger, CrawlRunner, HostRateLimiter
+
 class CoordinadorBaseScraper(ABC):
     """Base class for all coordinador.cl domain scrapers"""
 
-    def __init__(self, domain_name: str):
+    def __init__(self, domain_name: str, base_url: str = "https://www.coordinador.cl",
+                 output_dir: Optional[Path] = None, requests_per_second: float = 1.0,
+                 host_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            domain_name: Domain whose extractions folder receives the output
+            base_url: Site root (a local fixture server in tests)
+            output_dir: Override for domains/<domain_name>/extractions
+            requests_per_second: Default per-host request rate (<= 0: unlimited)
+            host_rates: Per-host overrides of requests_per_second
+        """
         self.domain_name = domain_name
-        self.base_url = "https://www.coordinador.cl"
+        self.base_url = base_url.rstrip('/')
         self.patterns = self._load_patterns()
+        self.rate_limiter = HostRateLimiter(requests_per_second, host_rates)
 
         # Each domain saves to its own extractions folder
-        project_root = Path(__file__).parent.parent.parent.parent
-        self.output_dir = project_root / "domains" / domain_name / "extractions"
+        if output_dir is None:
+            output_dir = project_root / "domains" / domain_name / "extractions"
+        self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.ledger_path = self.output_dir / f".{domain_name}_crawl_ledger.jsonl"
 
     def _load_patterns(self):
         """Load shared scraping patterns"""
@@ -37,6 +59,8 @@ class CoordinadorBaseScraper(ABC):
 
     async def create_browser_context(self):
         """Create browser context with coordinador.cl optimized settings"""
+        from playwright.async_api import async_playwright
+
         p = await async_playwright().start()
 
         browser = await p.chromium.launch(
@@ -62,6 +86,7 @@ class CoordinadorBaseScraper(ABC):
         full_url = f"{self.base_url}/{section_path}"
 
         try:
+            await self.rate_limiter.acquire(full_url)
             response = await page.goto(full_url, wait_until='domcontentloaded', timeout=30000)
             if response and response.status == 200:
                 await page.wait_for_timeout(2000)  # Wait for dynamic content
@@ -102,51 +127,81 @@ class CoordinadorBaseScraper(ABC):
             })
         """)
 
-    def save_extraction(self, data: dict, filename: str):
+    def save_extraction(self, data: dict, filename: str) -> Path:
         """Save extraction data to domain's extractions folder"""
         filepath = self.output_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
+        # Write then rename, so an interrupted run never leaves a partial file behind
+        temp_path = filepath.with_name(filepath.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, filepath)
 
         print(f"💾 Saved {self.domain_name} extraction: {filepath}")
+        return filepath
 
     @abstractmethod
     async def scrape_domain_data(self, page):
         """Each domain implements its specific scraping logic"""
         pass
 
-    async def run_scraper(self, section_paths: list):
-        """Main scraper execution method"""
+    async def scrape_section(self, page, section_path: str) -> Optional[Path]:
+        """Scrape one section into its extraction file; None if it did not load"""
+        print(f"🔍 Scraping {self.domain_name}: {section_path}")
+
+        if not await self.navigate_to_section(page, section_path):
+            print(f"❌ Failed to load section: {section_path}")
+            return None
+
+        # Extract common elements
+        common_data = await self.extract_common_elements(page)
+
+        # Extract domain-specific data
+        domain_data = await self.scrape_domain_data(page)
+
+        # Combine and save
+        extraction = {
+            'domain': self.domain_name,
+            'section_path': section_path,
+            'timestamp': datetime.now().isoformat(),
+            'common_elements': common_data,
+            'domain_specific': domain_data
+        }
+
+        filename = f"{self.domain_name}_{section_path.replace('/', '_')}_extraction.json"
+        return self.save_extraction(extraction, filename)
+
+    async def run_scraper(self, section_paths: list, concurrency: int = 4,
+                          resume: bool = True, max_attempts: int = 2) -> Dict[str, list]:
+        """
+        Main scraper execution method
+
+        Sections are scraped concurrently on up to `concurrency` pages. Each
+        outcome is logged in the checkpoint ledger, so with resume=True the
+        sections completed by an earlier interrupted (or partly failed) run
+        are skipped. Once a run finishes with no failed sections the ledger
+        is cleared, so the next run scrapes everything again.
+
+        Returns:
+            {"done": [...], "failed": [...], "skipped": [...]} section paths
+        """
+        ledger = CheckpointLedger(self.ledger_path)
+        if not resume:
+            ledger.reset()
+
         p, browser, context = await self.create_browser_context()
 
         try:
-            page = await context.new_page()
-
-            for section_path in section_paths:
-                print(f"🔍 Scraping {self.domain_name}: {section_path}")
-
-                if await self.navigate_to_section(page, section_path):
-                    # Extract common elements
-                    common_data = await self.extract_common_elements(page)
-
-                    # Extract domain-specific data
-                    domain_data = await self.scrape_domain_data(page)
-
-                    # Combine and save
-                    extraction = {
-                        'domain': self.domain_name,
-                        'section_path': section_path,
-                        'timestamp': str(Path().cwd()),
-                        'common_elements': common_data,
-                        'domain_specific': domain_data
-                    }
-
-                    filename = f"{self.domain_name}_{section_path.replace('/', '_')}_extraction.json"
-                    self.save_extraction(extraction, filename)
-                else:
-                    print(f"❌ Failed to load section: {section_path}")
-
+            runner = CrawlRunner(context, ledger, concurrency=concurrency, max_attempts=max_attempts)
+            summary = await runner.run(section_paths, self.scrape_section)
         finally:
             await browser.close()
-            await p.stop()
\ No newline at end of file
+            await p.stop()
+
+        if not summary['failed']:
+            # Complete: the next run is a fresh refresh, not a resume
+            ledger.reset()
+
+        print(f"✅ {self.domain_name}: {len(summary['done'])} scraped, "
+              f"{len(summary['skipped'])} already done, {len(summary['failed'])} failed")
+        return summary
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Crawl runtime for Coordinador.cl scrapers
+Concurrent section crawling over a bounded page pool, with per-host rate
+limits and a checkpoint ledger so interrupted runs resume where they stopped
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """
+    Minimum spacing between requests to the same host
+
+    Each host gets its own slot schedule, so a slow host never delays the
+    others; requests to one host are spread 1/rate seconds apart however
+    many workers ask at once.
+    """
+
+    def __init__(self, default_rate: float = 1.0, rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            default_rate: Requests per second for hosts not listed in rates (<= 0: unlimited)
+            rates: Requests per second by host name
+        """
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    def rate_for(self, host: str) -> float:
+        return self.rates.get(host, self.default_rate)
+
+    async def acquire(self, url: str):
+        """Wait until a request to url's host is allowed"""
+        host = urlparse(url).netloc
+        rate = self.rate_for(host)
+        if rate <= 0:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / rate
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class CheckpointLedger:
+    """
+    Append-only JSON-lines log of section outcomes
+
+    One line per attempt: {"section_path", "status", "output", "attempt", "timestamp", ...}.
+    The last line of a section wins; a torn last line (killed mid-write) or a
+    line that is not an entry is ignored.
+    """
+
+    def __init__(self, ledger_path: Path):
+        self.ledger_path = Path(ledger_path)
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        if not self.ledger_path.exists():
+            return
+        with open(self.ledger_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict) or not isinstance(entry.get('section_path'), str):
+                    continue
+                self.entries[entry['section_path']] = entry
+
+    def is_complete(self, section_path: str) -> bool:
+        """Completed in an earlier run and its output is still on disk"""
+        entry = self.entries.get(section_path)
+        return bool(entry and entry.get('status') == 'done' and entry.get('output')
+                    and Path(entry['output']).exists())
+
+    def record(self, section_path: str, status: str, **details):
+        entry = {
+            'section_path': section_path,
+            'status': status,
+            'timestamp': datetime.now().isoformat(),
+            **details
+        }
+        self.entries[section_path] = entry
+        with open(self.ledger_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def reset(self):
+        self.entries = {}
+        if self.ledger_path.exists():
+            self.ledger_path.unlink()
+
+
+class CrawlRunner:
+    """
+    Runs one coroutine per section over a pool of pages
+
+    `concurrency` workers each own a page from the context and take sections
+    from a shared queue, so at most `concurrency` pages are open at a time.
+    """
+
+    def __init__(self, context, ledger: Optional[CheckpointLedger] = None,
+                 concurrency: int = 4, max_attempts: int = 2, retry_delay: float = 2.0):
+        """
+        Args:
+            context: Anything with an async new_page() (a Playwright BrowserContext)
+            ledger: Checkpoint ledger; completed sections are skipped
+            concurrency: Pages (and sections in flight)
+            max_attempts: Tries per section before it is recorded as failed
+            retry_delay: Seconds before a retry, doubled on every attempt
+        """
+        self.context = context
+        self.ledger = ledger
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+
+    async def run(self, section_paths: List[str],
+                  process_section: Callable[[object, str], Awaitable[Optional[str]]]) -> Dict[str, List[str]]:
+        """
+        Crawl sections
+
+        Args:
+            section_paths: Sections in the order they should start
+            process_section: async (page, section_path) -> output path, or None
+                if the section could not be loaded; exceptions count as failures
+
+        Returns:
+            {"done": [...], "failed": [...], "skipped": [...]}
+        """
+        summary = {'done': [], 'failed': [], 'skipped': []}
+        queue: asyncio.Queue = asyncio.Queue()
+        for section_path in dict.fromkeys(section_paths):
+            if self.ledger is not None and self.ledger.is_complete(section_path):
+                summary['skipped'].append(section_path)
+            else:
+                queue.put_nowait(section_path)
+
+        workers = [
+            asyncio.create_task(self._worker(queue, process_section, summary))
+            for _ in range(min(self.concurrency, queue.qsize()))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return summary
+
+    async def _worker(self, queue: asyncio.Queue, process_section, summary):
+        page = await self.context.new_page()
+        try:
+            while True:
+                try:
+                    section_path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._run_section(page, section_path, process_section, summary)
+        finally:
+            await page.close()
+
+    async def _run_section(self, page, section_path: str, process_section, summary):
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                output = await process_section(page, section_path)
+                if output is not None:
+                    if self.ledger is not None:
+                        self.ledger.record(section_path, 'done', output=str(output), attempt=attempt)
+                    summary['done'].append(section_path)
+                    return
+                error = "section did not load"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+        if self.ledger is not None:
+            self.ledger.record(section_path, 'failed', error=error, attempt=self.max_attempts)
+        summary['failed'].append(section_path)
@@ -13,11 +13,41 @@ from .content_classifier import (
 )
 
 from .table_cell_merger import TableCellMerger
+from .page_furniture import PageFurnitureDetector, DocumentFurniture
+from .table_grid import TableGridBuilder, TableGrid, GridCell
+from .fuzzy_index import FuzzyIndex, FuzzyMatch
+from .raw_text_store import RawTextStore, open_raw_store, write_raw_text, split_raw_pages
+from .text_agreement import TextAgreement, text_agreement, agreement_batch
+from .text_alignment import TextAligner, TextSpan
+from .page_layout import PageLayout, PageLayoutStore, get_page_layout, release_layout_store
+from .column_inference import ColumnLayout, infer_columns
 
 __all__ = [
     "ContentClassifier",
     "ContentType",
     "ContentBlock",
     "classify_pdf",
-    "TableCellMerger"
-]act
\ No newline at end of file
+    "TableCellMerger",
+    "PageFurnitureDetector",
+    "DocumentFurniture",
+    "TableGridBuilder",
+    "TableGrid",
+    "GridCell",
+    "FuzzyIndex",
+    "FuzzyMatch",
+    "RawTextStore",
+    "open_raw_store",
+    "write_raw_text",
+    "split_raw_pages",
+    "TextAgreement",
+    "text_agreement",
+    "agreement_batch",
+    "TextAligner",
+    "TextSpan",
+    "PageLayout",
+    "PageLayoutStore",
+    "get_page_layout",
+    "release_layout_store",
+    "ColumnLayout",
+    "infer_columns"
+]
@@ -9,6 +9,7 @@ import fitz  # PyMuPDF
 from pathlib import Path
 from datetime import datetime
 from content_classifier import ContentClassifier
+from page_furniture import PageFurnitureDetector
 
 
 def filter_garbage(blocks):
@@ -62,7 +63,8 @@ def filter_garbage(blocks):
     return clean_blocks
 
 
-def extract_batch_clean(pdf_path: str, start_page: int, end_page: int, output_dir: str = "outputs"):
+def extract_batch_clean(pdf_path: str, start_page: int, end_page: int, output_dir: str = "outputs",
+                        page_furniture=None):
     """
     Extract clean content from a page range and save to JSON.
 
@@ -71,6 +73,7 @@ def extract_batch_clean(pdf_path: str, start_page: int, end_page: int, output_di
         start_page: Starting page (1-indexed)
         end_page: Ending page (1-indexed)
         output_dir: Output directory
+        page_furniture: Precomputed DocumentFurniture; detected on the page range if None
     """
     pdf_path = Path(pdf_path)
     output_path = Path(output_dir)
@@ -78,8 +81,12 @@ def extract_batch_clean(pdf_path: str, start_page: int, end_page: int, output_di
 
     print(f"\n📄 Extracting pages {start_page}-{end_page} from {pdf_path.name}")
 
+    # Detect repeated headers/footers once, then classify without them
+    if page_furniture is None:
+        page_furniture = PageFurnitureDetector().detect(pdf_path, start_page, end_page)
+
     # Create classifier
-    classifier = ContentClassifier(str(pdf_path))
+    classifier = ContentClassifier(str(pdf_path), page_furniture=page_furniture)
 
     # Extract content for page range
     results = {
@@ -99,7 +106,8 @@ def extract_batch_clean(pdf_path: str, start_page: int, end_page: int, output_di
             "source_file": str(pdf_path),
             "page_range": f"{start_page}-{end_page}",
             "extraction_date": datetime.now().isoformat(),
-            "garbage_filtered": True
+            "garbage_filtered": True,
+            "page_furniture_fingerprints": len(page_furniture.fingerprints)
         }
     }
 
@@ -199,6 +207,10 @@ def batch_extract_clean_all(pdf_path: str, batch_size: int = 50, output_dir: str
 
     print("\n" + "=" * 80)
 
+    # One furniture pass for the whole document, shared by every batch
+    page_furniture = PageFurnitureDetector().detect(pdf_path)
+    print(f"🧭 Page furniture: {len(page_furniture.fingerprints)} recurring header/footer lines")
+
     # Extract each batch
     output_files = []
     total_blocks_clean = 0
@@ -214,7 +226,8 @@ def batch_extract_clean_all(pdf_path: str, batch_size: int = 50, output_dir: str
                 str(pdf_path),
                 start_page=start_page,
                 end_page=end_page,
-                output_dir=output_dir
+                output_dir=output_dir,
+                page_furniture=page_furniture
             )
             output_files.append(output_file)
 
@@ -9,7 +9,8 @@ from pathlib import Path
 from create_enhanced_pdf_clean import create_multi_page_document
 
 
-def batch_process_pdf_clean(pdf_path: str, batch_size: int = 50, output_dir: str = "outputs"):
+def batch_process_pdf_clean(pdf_path: str, batch_size: int = 50, output_dir: str = "outputs",
+                            mode: str = "vector"):
     """
     Process a PDF in batches of N pages with garbage filtering.
 
@@ -17,6 +18,7 @@ def batch_process_pdf_clean(pdf_path: str, batch_size: int = 50, output_dir: str
         pdf_path: Path to the PDF file
         batch_size: Number of pages per batch (default: 50)
         output_dir: Output directory for results
+        mode: "vector" overlay (default) or "raster" page images
     """
     pdf_path = Path(pdf_path)
 
@@ -61,7 +63,8 @@ def batch_process_pdf_clean(pdf_path: str, batch_size: int = 50, output_dir: str
                 str(pdf_path),
                 start_page=start_page,
                 end_page=end_page,
-                output_dir=output_dir
+                output_dir=output_dir,
+                mode=mode
             )
             print(f"✅ Batch {i} completed successfully")
         except Exception as e:
@@ -131,7 +134,7 @@ if __name__ == "__main__":
 🧹 CLEAN Batch PDF Processing - Visual outputs without garbage
 
 Usage:
-    python batch_process_pdf_clean.py <pdf_path> [batch_size]
+    python batch_process_pdf_clean.py <pdf_path> [batch_size] [vector|raster]
     python batch_process_pdf_clean.py <pdf_path> --list
 
 Examples:
@@ -141,6 +144,9 @@ Examples:
     # Process PDF in 100-page batches - CLEAN VERSION
     python batch_process_pdf_clean.py document.pdf 100
 
+    # Legacy rasterised page images instead of the vector overlay
+    python batch_process_pdf_clean.py document.pdf 50 raster
+
     # List existing clean outputs
     python batch_process_pdf_clean.py document.pdf --list
 
@@ -160,5 +166,6 @@ Features:
         list_existing_outputs(pdf_path, str(output_dir))
     else:
         batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+        mode = sys.argv[3] if len(sys.argv) > 3 else "vector"
         output_dir = Path(__file__).parent / "outputs"
-        batch_process_pdf_clean(pdf_path, batch_size, str(output_dir))
+        batch_process_pdf_clean(pdf_path, batch_size, str(output_dir), mode)
@@ -0,0 +1,129 @@
+"""
+Column Inference
+================
+
+Column positions of a tabular region from the left edges of its text spans,
+and span-to-column assignment, without comparing every item against every
+candidate column.
+
+1. Columns: the left edges of all spans in the region are sorted once and
+   swept; an edge further than `cluster_tolerance` from the current column
+   anchor opens a new column (leader clustering on the x-projection of the
+   span edges). O(n log n) for the region.
+2. Assignment: columns are sorted, so the column of a span is found by
+   bisect on its left edge (nearest anchor within `align_tolerance`).
+3. Confidence: the share of spans aligned with some column, which is what
+   the chapter classifiers call column consistency.
+4. Boundaries: the x extent [anchor, rightmost span end] of each column,
+   from the spans assigned to it.
+
+Usage:
+    from shared_platform.utils.column_inference import infer_columns
+
+    columns = infer_columns(item for row in rows for item in row)
+    columns.positions, columns.confidence, columns.boundaries
+    columns.nearest(item["x"])        # column index or None
+    columns.fits(row, ratio=0.7)      # share of the row's items on a column
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def cluster_positions(positions: Iterable[float], tolerance: float) -> List[float]:
+    """
+    Column anchors: sorted distinct positions, each anchor absorbing the
+    positions within tolerance to its right
+    """
+    anchors: List[float] = []
+    for x in sorted(set(positions)):
+        if not anchors or x - anchors[-1] > tolerance:
+            anchors.append(x)
+    return anchors
+
+
+@dataclass
+class ColumnLayout:
+    """Columns of a region: anchors, extents and how well the spans align"""
+    positions: List[float]  # Left-edge anchor of each column, ascending
+    align_tolerance: float = 10.0
+    boundaries: List[Tuple[float, float]] = field(default_factory=list)
+    support: List[int] = field(default_factory=list)  # Spans assigned to each column
+    confidence: float = 0.0  # Share of spans aligned with a column
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def nearest(self, x: float) -> Optional[int]:
+        """Nearest column within align_tolerance (the left one on ties)"""
+        positions = self.positions
+        index = bisect_left(positions, x)
+        best = None
+        best_distance = self.align_tolerance
+        for candidate in (index - 1, index):
+            if 0 <= candidate < len(positions):
+                distance = abs(x - positions[candidate])
+                if distance < best_distance or (distance == best_distance and best is None):
+                    best, best_distance = candidate, distance
+        return best
+
+    def first(self, x: float) -> Optional[int]:
+        """Leftmost column within align_tolerance"""
+        index = bisect_left(self.positions, x - self.align_tolerance)
+        if index < len(self.positions) and self.positions[index] <= x + self.align_tolerance:
+            return index
+        return None
+
+    def fit_ratio(self, row: Sequence[Dict]) -> float:
+        """Share of a row's items whose left edge lies on a column"""
+        if not row:
+            return 0.0
+        return sum(1 for item in row if self.nearest(item["x"]) is not None) / len(row)
+
+    def fits(self, row: Sequence[Dict], ratio: float) -> bool:
+        return bool(row) and self.fit_ratio(row) >= ratio
+
+    def to_dict(self) -> Dict:
+        return {
+            "positions": self.positions,
+            "boundaries": self.boundaries,
+            "support": self.support,
+            "confidence": self.confidence
+        }
+
+
+def infer_columns(
+    items: Iterable[Dict],
+    cluster_tolerance: float = 8.0,
+    align_tolerance: float = 10.0
+) -> ColumnLayout:
+    """
+    Columns of a region in one pass over its spans
+
+    Args:
+        items: Span dicts with "x" (left edge) and optionally "x_end"
+        cluster_tolerance: Left edges within this of an anchor join its column
+        align_tolerance: Max distance between a span and the column it is assigned to
+    """
+    items = list(items)
+    layout = ColumnLayout(
+        positions=cluster_positions((item["x"] for item in items), cluster_tolerance),
+        align_tolerance=align_tolerance
+    )
+    if not items:
+        return layout
+
+    extents = [[x, x] for x in layout.positions]
+    support = [0] * len(layout)
+    for item in items:
+        column = layout.nearest(item["x"])
+        if column is None:
+            continue
+        support[column] += 1
+        extents[column][1] = max(extents[column][1], item.get("x_end", item["x"]))
+
+    layout.support = support
+    layout.boundaries = [(x0, x1) for x0, x1 in extents]
+    layout.confidence = sum(support) / len(items)
+    return layout
@@ -29,6 +29,11 @@ from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    from .table_grid import TableGridBuilder, TableGrid
+except ImportError:  # imported as a top-level module (scripts in this directory)
+    from table_grid import TableGridBuilder, TableGrid
+
 
 class ContentType(Enum):
     """Standard content types found in documents."""
@@ -79,7 +84,9 @@ class ContentClassifier:
         use_ocr: bool = False,
         ocr_language: str = "spa+eng",
         table_detection_threshold: float = 0.7,
-        detect_vector_graphics: bool = True
+        detect_vector_graphics: bool = True,
+        page_furniture=None,
+        table_engine: str = "pymupdf"
     ):
         """
         Initialize classifier.
@@ -90,12 +97,19 @@ class ContentClassifier:
             ocr_language: Tesseract language codes (default: Spanish + English)
             table_detection_threshold: Minimum confidence for table detection (0-1)
             detect_vector_graphics: Detect charts/diagrams as images (slower but more complete)
+            page_furniture: Optional DocumentFurniture (see page_furniture.py); masked
+                headers/footers are dropped before classification
+            table_engine: "pymupdf" (page.find_tables) or "grid" (TableGridBuilder:
+                ruled grids rebuilt from words and drawings, with typed cells and spans)
         """
         self.pdf_path = Path(pdf_path)
         self.use_ocr = use_ocr
         self.ocr_language = ocr_language
         self.table_threshold = table_detection_threshold
         self.detect_vector_graphics = detect_vector_graphics
+        self.page_furniture = page_furniture
+        self.table_engine = table_engine
+        self.grid_builder = TableGridBuilder()
 
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
@@ -158,17 +172,27 @@ class ContentClassifier:
         # Get images
         images = self._extract_images(page)
 
+        # Vector paths are fetched once and shared by drawings, tables and graphics
+        paths = self._get_page_paths(page)
+
         # Get drawing elements (lines, rectangles - table indicators)
-        drawings = self._extract_drawings(page)
+        drawings = self._extract_drawings(page, paths)
 
         # Get text items with coordinates
         text_items = self._extract_text_items(text_dict.get("blocks", []))
 
+        # Drop repeated headers/footers found by the document-level furniture pass
+        if self.page_furniture is not None:
+            text_items = self.page_furniture.filter_items(page_num, text_items)
+
         # Group text into rows
         rows = self._group_into_rows(text_items)
 
-        # Detect tables using PyMuPDF's built-in detector
-        tables = self._detect_tables_with_pymupdf(page)
+        # Detect tables (PyMuPDF's built-in detector or the grid engine)
+        if self.table_engine == "grid":
+            tables = self._detect_tables_with_grid(page, paths)
+        else:
+            tables = self._detect_tables_with_pymupdf(page)
 
         # Classify content blocks
         content_blocks = []
@@ -202,7 +226,8 @@ class ContentClassifier:
                 metadata={
                     "rows": table.get("rows", 0),
                     "cols": table.get("cols", 0),
-                    "extraction_method": "pymupdf_find_tables"
+                    "extraction_method": table.get("extraction_method", "pymupdf_find_tables"),
+                    **({"grid": table["grid"]} if "grid" in table else {})
                 }
             ))
 
@@ -213,7 +238,7 @@ class ContentClassifier:
         if self.detect_vector_graphics:
             existing_bboxes = [b.bbox for b in content_blocks]  # Tables so far
             # Pass text rows as well to calculate real page occupancy
-            vector_images = self._detect_vector_graphics(page, existing_bboxes, rows)
+            vector_images = self._detect_vector_graphics(page, existing_bboxes, rows, paths)
             content_blocks.extend(vector_images)
             # Add vector image bboxes to exclusion list
             image_bboxes.extend([vi.bbox for vi in vector_images])
@@ -359,12 +384,19 @@ class ContentClassifier:
 
         return images
 
-    def _extract_drawings(self, page) -> List[Dict]:
+    def _get_page_paths(self, page) -> List[Dict]:
+        """Vector paths of the page (page.get_drawings()), fetched once per page."""
+        try:
+            return page.get_drawings()
+        except Exception:
+            return []
+
+    def _extract_drawings(self, page, paths: Optional[List[Dict]] = None) -> List[Dict]:
         """Extract drawing elements (lines, rectangles - table indicators)."""
         drawings = []
 
         try:
-            drawing_list = page.get_drawings()
+            drawing_list = paths if paths is not None else page.get_drawings()
 
             for draw in drawing_list:
                 drawings.append({
@@ -402,6 +434,36 @@ class ContentClassifier:
 
         return tables
 
+    def _detect_tables_with_grid(self, page, paths: Optional[List[Dict]] = None) -> List[Dict]:
+        """Detect ruled tables with the shared grid engine (see table_grid.py)."""
+        tables = []
+
+        for grid in self.grid_builder.build_page(page, paths):
+            tables.append({
+                "bbox": grid.bbox,
+                "data": grid.matrix(),
+                "rows": grid.n_rows,
+                "cols": grid.n_cols,
+                "confidence": 0.9,
+                "extraction_method": "table_grid",
+                "grid": grid.to_dict()
+            })
+
+        return tables
+
+    def extract_table_grids(self, page_num: int) -> List[TableGrid]:
+        """
+        Reconstruct the ruled tables of a page as typed cell grids.
+
+        Args:
+            page_num: Page number (1-indexed)
+        """
+        if page_num < 1 or page_num > len(self.pdf_doc):
+            raise ValueError(f"Invalid page number: {page_num}")
+
+        page = self.pdf_doc[page_num - 1]
+        return self.grid_builder.build_page(page, self._get_page_paths(page))
+
     def _group_into_rows(self, items: List[Dict], tolerance: float = 3.0) -> List[List[Dict]]:
         """Group text items into horizontal rows."""
         if not items:
@@ -881,7 +943,8 @@ class ContentClassifier:
 
         return False
 
-    def _detect_vector_graphics(self, page, existing_bboxes: List[Tuple], text_rows: List[List[Dict]] = None) -> List[ContentBlock]:
+    def _detect_vector_graphics(self, page, existing_bboxes: List[Tuple], text_rows: List[List[Dict]] = None,
+                                paths: Optional[List[Dict]] = None) -> List[ContentBlock]:
         """Detect visual content (charts, diagrams) - FAST version using empty space detection."""
         vector_images = []
 
@@ -933,8 +996,18 @@ class ContentClassifier:
             if occupied_ratio > 0.50:
                 return vector_images
 
-            # PASO 2: AHORA SÍ llamar get_drawings() (solo si hay espacio vacío significativo)
-            paths = page.get_drawings()
+            # PASO 2: paths de la página (reutiliza los ya obtenidos en classify_page)
+            if paths is None:
+                paths = page.get_drawings()
+
+            # Tablas con reglas vectoriales no son gráficos: el motor de grillas
+            # (el mismo de las páginas escaneadas) las encuentra en un barrido y
+            # sus paths se excluyen igual que los de las tablas ya detectadas
+            if self.table_engine != "grid":
+                horizontals, verticals = self.grid_builder.ruling_segments(paths)
+                existing_bboxes = list(existing_bboxes) + [
+                    grid.bbox for grid in self.grid_builder.grids(horizontals, verticals)
+                ]
 
             # Filtrar paths dentro de contenido existente
             paths_outside = 0
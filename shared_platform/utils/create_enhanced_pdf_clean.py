@@ -1,9 +1,15 @@
 """
 Multi-Page PDF Content Classification Visualizer - CLEAN VERSION
 Creates visualization with colored boxes but filters out garbage (metadata, page numbers, etc.)
+
+Two output modes:
+    vector  - boxes and labels drawn as native PDF shapes on a copy of the source
+              pages (small, text-searchable, fast; default)
+    raster  - pages rendered at 2x and annotated with PIL (legacy look)
 """
 
 import sys
+from functools import lru_cache
 import fitz  # PyMuPDF
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
@@ -11,6 +17,7 @@ import io
 
 # Use the universal ContentClassifier from shared_platform/utils
 from content_classifier import ContentClassifier, ContentType
+from page_furniture import PageFurnitureDetector
 
 
 # Color mapping for content types (RGB)
@@ -39,6 +46,26 @@ ICONS = {
 }
 
 
+OUTPUT_MODES = ("vector", "raster")
+
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=None)
+def _load_font(path: str, size: int):
+    """Load a TrueType font once per (path, size) instead of once per block."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _rgb_to_unit(color):
+    """Convert 0-255 RGB to the 0-1 floats PyMuPDF expects."""
+    return tuple(c / 255 for c in color)
+
+
 def filter_garbage(blocks):
     """
     Remove garbage content (metadata, page numbers, headers, footers).
@@ -137,9 +164,13 @@ def merge_consecutive_texts(blocks):
     return merged
 
 
-def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClassifier):
-    """Create a classified image for a single page with garbage filtering and text merging."""
+def classify_clean_page(page_num: int, classifier: ContentClassifier):
+    """
+    Classify a page, filter garbage and merge consecutive text blocks.
 
+    Returns:
+        Tuple: (clean_blocks, metadata_blocks, garbage_removed)
+    """
     # Classify content with universal detector
     blocks = classifier.classify_page(page_num)
 
@@ -151,7 +182,72 @@ def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClas
     # MERGE CONSECUTIVE TEXT BLOCKS
     blocks = merge_consecutive_texts(blocks)
 
-    blocks_after = len(blocks)
+    return blocks, metadata_blocks, garbage_removed
+
+
+def _block_stats(blocks):
+    stats = {}
+    for block in blocks:
+        stats[block.type] = stats.get(block.type, 0) + 1
+    return stats
+
+
+def annotate_page_vector(page, blocks, metadata_blocks, page_num: int, garbage_removed: int):
+    """
+    Draw the classification overlay as native vector shapes on a PDF page.
+
+    The original page content is untouched, so text stays selectable and searchable.
+    """
+    # Draw bounding boxes for CONTENT blocks
+    for i, block in enumerate(blocks, 1):
+        rect = fitz.Rect(block.bbox)
+        color = _rgb_to_unit(COLORS.get(block.type, (128, 128, 128)))
+
+        page.draw_rect(rect, color=color, fill=color, fill_opacity=0.15, width=1.5, overlay=True)
+
+        label = f"{block.type.upper()} #{i} conf:{block.confidence:.2f}"
+        label_rect = fitz.Rect(rect.x0, rect.y0 - 10, rect.x0 + max(60, len(label) * 4.2), rect.y0)
+        page.draw_rect(label_rect, color=color, fill=color, fill_opacity=0.9, width=0, overlay=True)
+        page.insert_text((label_rect.x0 + 2, label_rect.y1 - 2.5), label,
+                         fontsize=7, fontname="hebo", color=(1, 1, 1), overlay=True)
+
+    # Draw METADATA boxes (purple color)
+    meta_color = _rgb_to_unit(COLORS["metadata"])
+    for meta_block in metadata_blocks:
+        rect = fitz.Rect(meta_block.bbox)
+        page.draw_rect(rect, color=meta_color, fill=meta_color, fill_opacity=0.2, width=1.5, overlay=True)
+
+        label_rect = fitz.Rect(rect.x0, rect.y0 - 10, rect.x0 + 50, rect.y0)
+        page.draw_rect(label_rect, color=meta_color, fill=meta_color, fill_opacity=0.9, width=0, overlay=True)
+        page.insert_text((label_rect.x0 + 2, label_rect.y1 - 2.5), "METADATA",
+                         fontsize=7, fontname="hebo", color=(1, 1, 1), overlay=True)
+
+    # Page banner at top
+    page_label = f"Page {page_num} [CLEAN - {garbage_removed} garbage removed]"
+    banner = fitz.Rect(5, 5, 300, 20)
+    page.draw_rect(banner, color=(0, 0.5, 0), fill=(0, 0.5, 0), fill_opacity=0.8, width=0, overlay=True)
+    page.insert_text((banner.x0 + 4, banner.y1 - 4), page_label,
+                     fontsize=9, fontname="hebo", color=(1, 1, 1), overlay=True)
+
+    # Statistics at bottom
+    stats_text = " | ".join(f"{ct.upper()}:{count}" for ct, count in _block_stats(blocks).items())
+    if stats_text:
+        footer = fitz.Rect(5, page.rect.height - 20, page.rect.width - 5, page.rect.height - 5)
+        page.draw_rect(footer, color=(0, 0, 0), fill=(1, 1, 1), fill_opacity=0.9, width=0.5, overlay=True)
+        page.insert_text((footer.x0 + 4, footer.y1 - 4), stats_text,
+                         fontsize=8, fontname="helv", color=(0, 0, 0), overlay=True)
+
+
+def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClassifier):
+    """Create a classified image for a single page with garbage filtering and text merging."""
+
+    blocks, metadata_blocks, garbage_removed = classify_clean_page(page_num, classifier)
+
+    type_font = _load_font(FONT_BOLD, 18)
+    conf_font = _load_font(FONT_REGULAR, 14)
+    meta_font = _load_font(FONT_BOLD, 16)
+    page_font = _load_font(FONT_BOLD, 24)
+    stats_font = _load_font(FONT_REGULAR, 16)
 
     # Render page
     page = pdf_doc[page_num - 1]
@@ -189,13 +285,6 @@ def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClas
         draw.rectangle(label_bg, fill=color + (240,))
 
         # Text
-        try:
-            type_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-            conf_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-        except:
-            type_font = ImageFont.load_default()
-            conf_font = ImageFont.load_default()
-
         draw.text((x0 + 8, y0 - 32), type_name, fill=(255, 255, 255), font=type_font)
         draw.text((x0 + 8, y0 - 14), f"#{i} conf:{confidence_label}", fill=(255, 255, 255), font=conf_font)
 
@@ -215,41 +304,22 @@ def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClas
         border_color = meta_color + (200,)
         draw.rectangle([x0, y0, x1, y1], outline=border_color, width=3)
 
-        # Label
-        try:
-            meta_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-        except:
-            meta_font = ImageFont.load_default()
-
         # Label background
         label_bg = [x0, y0 - 30, x0 + 140, y0]
         draw.rectangle(label_bg, fill=meta_color + (240,))
         draw.text((x0 + 8, y0 - 26), "METADATA", fill=(255, 255, 255), font=meta_font)
 
     # Add page number at top
-    try:
-        page_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-    except:
-        page_font = ImageFont.load_default()
-
     page_label = f"Page {page_num} [CLEAN - {garbage_removed} garbage removed]"
     draw.rectangle([10, 10, 600, 50], fill=(0, 128, 0, 200))
     draw.text((20, 18), page_label, fill=(255, 255, 255), font=page_font)
 
     # Add statistics at bottom
-    stats = {}
-    for block in blocks:
-        block_type = block.type
-        stats[block_type] = stats.get(block_type, 0) + 1
+    stats = _block_stats(blocks)
 
     stats_text = " | ".join([f"{ICONS.get(ct, '')} {ct.upper()}:{count}"
                              for ct, count in stats.items() if count > 0])
 
-    try:
-        stats_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-    except:
-        stats_font = ImageFont.load_default()
-
     stats_bg = [10, img.height - 50, img.width - 10, img.height - 10]
     draw.rectangle(stats_bg, fill=(255, 255, 255, 230), outline=(0, 0, 0), width=2)
     draw.text((20, img.height - 42), stats_text, fill=(0, 0, 0), font=stats_font)
@@ -257,11 +327,21 @@ def create_classified_page_image(pdf_doc, page_num: int, classifier: ContentClas
     return img, blocks, garbage_removed
 
 
-def create_multi_page_document(pdf_path: str, start_page: int, end_page: int, output_dir: str = "outputs"):
+def create_multi_page_document(pdf_path: str, start_page: int, end_page: int,
+                               output_dir: str = "outputs", mode: str = "vector"):
     """
     Create a multi-page PDF with CLEAN classification visualization.
     Garbage (metadata, page numbers, headers) is filtered out.
+
+    Pages are written one at a time into the output document, so no page
+    images are accumulated in memory.
+
+    Args:
+        mode: "vector" (native PDF overlay on the source pages) or "raster"
     """
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {OUTPUT_MODES}")
+
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
 
@@ -269,14 +349,17 @@ def create_multi_page_document(pdf_path: str, start_page: int, end_page: int, ou
     print(f"📄 Pages: {start_page} to {end_page}")
     print(f"✅ Using PyMuPDF for accurate table detection")
     print(f"🗑️  Garbage filtering: ENABLED")
+    print(f"🖌️  Output mode: {mode.upper()}")
     print("=" * 80)
 
     # Open PDF and create classifier
     pdf_doc = fitz.open(pdf_path)
-    classifier = ContentClassifier(pdf_path)
+    page_furniture = PageFurnitureDetector().detect(pdf_doc, start_page, min(end_page, len(pdf_doc)))
+    print(f"🧭 Page furniture: {len(page_furniture.fingerprints)} recurring header/footer lines")
+    classifier = ContentClassifier(pdf_path, page_furniture=page_furniture)
+    out_doc = fitz.open()
 
     # Process all pages
-    all_images = []
     total_stats = {}
     total_garbage = 0
     total_blocks_raw = 0
@@ -285,17 +368,26 @@ def create_multi_page_document(pdf_path: str, start_page: int, end_page: int, ou
     for page_num in range(start_page, min(end_page + 1, len(pdf_doc) + 1)):
         print(f"📄 Processing page {page_num}...", end=" ")
 
-        img, blocks, garbage_removed = create_classified_page_image(pdf_doc, page_num, classifier)
-        all_images.append(img)
+        if mode == "vector":
+            blocks, metadata_blocks, garbage_removed = classify_clean_page(page_num, classifier)
+            out_doc.insert_pdf(pdf_doc, from_page=page_num - 1, to_page=page_num - 1)
+            annotate_page_vector(out_doc[-1], blocks, metadata_blocks, page_num, garbage_removed)
+        else:
+            img, blocks, garbage_removed = create_classified_page_image(pdf_doc, page_num, classifier)
+            source_rect = pdf_doc[page_num - 1].rect
+            page = out_doc.new_page(width=source_rect.width, height=source_rect.height)
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG", optimize=True)
+            page.insert_image(page.rect, stream=buffer.getvalue())
+            del img, buffer
 
         total_garbage += garbage_removed
         total_blocks_raw += len(blocks) + garbage_removed
         total_blocks_clean += len(blocks)
 
         # Update total stats
-        for block in blocks:
-            block_type = block.type
-            total_stats[block_type] = total_stats.get(block_type, 0) + 1
+        for block_type, count in _block_stats(blocks).items():
+            total_stats[block_type] = total_stats.get(block_type, 0) + count
 
         print(f"✅ {len(blocks)} clean blocks ({garbage_removed} garbage removed)")
 
@@ -305,14 +397,10 @@ def create_multi_page_document(pdf_path: str, start_page: int, end_page: int, ou
 
     print(f"\n💾 Saving to: {output_pdf.name}")
 
-    if all_images:
-        all_images[0].save(
-            output_pdf,
-            "PDF",
-            resolution=100.0,
-            save_all=True,
-            append_images=all_images[1:]
-        )
+    if len(out_doc):
+        out_doc.save(str(output_pdf), garbage=3, deflate=True)
+    out_doc.close()
+    classifier.close()
 
     pdf_doc.close()
 
@@ -339,12 +427,13 @@ def create_multi_page_document(pdf_path: str, start_page: int, end_page: int, ou
 if __name__ == "__main__":
     # Parse command-line arguments
     if len(sys.argv) < 2:
-        print("Usage: python create_enhanced_pdf_clean.py <pdf_path> [start_page] [end_page]")
+        print("Usage: python create_enhanced_pdf_clean.py <pdf_path> [start_page] [end_page] [vector|raster]")
         exit(1)
 
     pdf_path = Path(sys.argv[1])
     start_page = int(sys.argv[2]) if len(sys.argv) > 2 else 1
     end_page = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+    mode = sys.argv[4] if len(sys.argv) > 4 else "vector"
 
     if not pdf_path.exists():
         print(f"❌ PDF not found: {pdf_path}")
@@ -357,5 +446,6 @@ if __name__ == "__main__":
         str(pdf_path),
         start_page=start_page,
         end_page=end_page,
-        output_dir=str(output_dir)
+        output_dir=str(output_dir),
+        mode=mode
     )
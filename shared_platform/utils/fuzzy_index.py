@@ -0,0 +1,339 @@
+"""
+Fuzzy Match Index
+=================
+
+Finds the windows of a long text that best match a short query, without
+running difflib.SequenceMatcher over every window of the text.
+
+The text is indexed once by character n-grams (gram -> positions). A query:
+1. Picks its rarest n-grams (at most max_grams), so the cost depends on the
+   size of a few posting lists, not on the length of the text.
+2. Each occurrence votes for the windows that would align the query with it
+   (diagonal voting); windows are the same overlapping chunks the linear scan
+   uses (window = max(len(query), 100), step = window - window // 4).
+3. The best-voted windows are verified in vote order. A bit-parallel LCS gives
+   an upper bound on SequenceMatcher.ratio() (matching blocks are a common
+   subsequence, so ratio <= 2·LCS / total length); windows whose bound cannot
+   beat the threshold or the current top_k are skipped, the rest get the exact
+   SequenceMatcher ratio, so scores and thresholds stay comparable with the scan.
+
+NGramPostings (gram -> positions, rarest-gram selection, diagonal votes) is
+the part shared with text_alignment.TextAligner.
+
+Usage:
+    from shared_platform.utils.fuzzy_index import FuzzyIndex
+
+    index = FuzzyIndex(raw_text.lower())
+    matches = index.search(block_text.lower(), threshold=0.4, top_k=3)
+    matches[0].start, matches[0].score
+
+    python fuzzy_index.py raw_text.txt [n_queries]   # benchmark vs the difflib scan
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+MIN_WINDOW = 100
+
+
+@dataclass
+class FuzzyMatch:
+    """One window of the indexed text that matches a query"""
+    start: int
+    end: int
+    score: float
+    text: str
+    votes: int = 0
+
+
+def lcs_length(a: str, b: str) -> int:
+    """
+    Length of the longest common subsequence of two strings
+
+    Bit-parallel (Allison-Dix / Hyyrö): one big-int update per character of b,
+    i.e. O(len(a) · len(b) / word size).
+    """
+    if not a or not b:
+        return 0
+
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+
+    full = (1 << len(a)) - 1
+    v = full
+    for char in b:
+        u = v & masks.get(char, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - v.bit_count()
+
+
+def indel_distance(a: str, b: str) -> int:
+    """Insertions + deletions needed to turn a into b"""
+    return len(a) + len(b) - 2 * lcs_length(a, b)
+
+
+def ratio_upper_bound(a: str, b: str) -> float:
+    """Upper bound of SequenceMatcher(None, a, b).ratio()"""
+    total = len(a) + len(b)
+    return 2.0 * lcs_length(a, b) / total if total else 1.0
+
+
+def default_window(query: str, window: Optional[int] = None, step: Optional[int] = None) -> Tuple[int, int]:
+    """Chunk size and stride of the linear scan for a query"""
+    window = window or max(len(query), MIN_WINDOW)
+    step = step or max(1, window - window // 4)
+    return window, step
+
+
+class NGramPostings:
+    """Character n-gram -> sorted positions over one text"""
+
+    def __init__(self, text: str, n: int = 3):
+        self.text = text
+        self.n = n
+        self.postings: Dict[str, List[int]] = {}
+
+        postings = self.postings
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            positions = postings.get(gram)
+            if positions is None:
+                postings[gram] = [i]
+            else:
+                positions.append(i)
+
+    def query_grams(self, query: str, max_grams: Optional[int] = None) -> Tuple[List[Tuple[str, int]], int]:
+        """
+        Distinct grams of the query present in the text, rarest first, with their first offset
+
+        Returns:
+            (grams, distinct) where grams holds at most max_grams entries and
+            distinct counts every distinct gram of the query, present in the
+            text or not (fewer present than that: no verbatim match)
+        """
+        offsets: Dict[str, int] = {}
+        seen = set()
+        for j in range(len(query) - self.n + 1):
+            gram = query[j:j + self.n]
+            if gram in seen:
+                continue
+            seen.add(gram)
+            if gram in self.postings:
+                offsets[gram] = j
+
+        rarest = sorted(offsets, key=lambda gram: len(self.postings[gram]))[:max_grams]
+        return [(gram, offsets[gram]) for gram in rarest], len(seen)
+
+    def gram_diagonals(self, grams: Sequence[Tuple[str, int]]) -> Iterator[Set[int]]:
+        """For each (gram, offset), the start offsets of the query its occurrences imply"""
+        for gram, offset in grams:
+            yield {position - offset for position in self.postings[gram]}
+
+    def diagonal_votes(self, grams: Sequence[Tuple[str, int]]) -> Counter:
+        """Start offset -> number of grams placing the query there"""
+        votes: Counter = Counter()
+        for diagonals in self.gram_diagonals(grams):
+            votes.update(diagonals)
+        return votes
+
+
+class FuzzyIndex(NGramPostings):
+    """Character n-gram index over one text, queried for approximate matches"""
+
+    def candidate_windows(
+        self,
+        query: str,
+        window: int,
+        step: int,
+        max_grams: int = 48,
+        max_candidates: int = 24
+    ) -> List[Tuple[int, int]]:
+        """
+        Windows that share the most rare grams with the query
+
+        Returns:
+            (window_index, votes) sorted by votes; window k starts at k * step
+        """
+        last_start = len(self.text) - window
+        if last_start < 0:
+            return []
+        last_window = last_start // step
+        query_len = len(query)
+
+        grams, _ = self.query_grams(query, max_grams)
+        votes: Counter = Counter()
+        for diagonals in self.gram_diagonals(grams):
+            voted = set()
+            for start in diagonals:
+                # Query placed at `start`: the windows that contain it
+                first = max(0, -(-(start + query_len - window) // step))
+                last = min(last_window, start // step) if start >= 0 else -1
+                if first > last:
+                    # Query straddles two windows: vote for both
+                    first = min(last_window, max(0, start // step))
+                    last = min(last_window, first + 1)
+                voted.update(range(first, last + 1))
+            votes.update(voted)
+
+        return votes.most_common(max_candidates)
+
+    def search(
+        self,
+        query: str,
+        threshold: float = 0.4,
+        top_k: int = 1,
+        window: Optional[int] = None,
+        step: Optional[int] = None,
+        max_grams: int = 48,
+        max_candidates: int = 24
+    ) -> List[FuzzyMatch]:
+        """
+        Best windows for a query
+
+        Args:
+            query: Text to look for (same normalisation as the indexed text)
+            threshold: Minimum SequenceMatcher ratio (exclusive, as in the scan)
+            top_k: Number of matches to return
+            window, step: Chunking; defaults to the linear scan's
+            max_grams: Rarest query grams used for voting
+            max_candidates: Windows verified at most
+
+        Returns:
+            Matches sorted by score (ties: earliest window first)
+        """
+        if len(query) < self.n:
+            return []
+
+        window, step = default_window(query, window, step)
+        matcher = SequenceMatcher(None, query)
+        matches: List[FuzzyMatch] = []
+
+        for k, window_votes in self.candidate_windows(query, window, step, max_grams, max_candidates):
+            start = k * step
+            chunk = self.text[start:start + window]
+
+            floor = threshold
+            if len(matches) >= top_k:
+                floor = max(floor, matches[top_k - 1].score)
+            if ratio_upper_bound(query, chunk) <= floor:
+                continue
+
+            matcher.set_seq2(chunk)
+            score = matcher.ratio()
+            if score > floor:
+                matches.append(FuzzyMatch(start, start + len(chunk), score, chunk, window_votes))
+                matches.sort(key=lambda m: (-m.score, m.start))
+                del matches[top_k:]
+
+        return matches
+
+    def best_match(self, query: str, threshold: float = 0.4, **kwargs) -> Optional[FuzzyMatch]:
+        matches = self.search(query, threshold, top_k=1, **kwargs)
+        return matches[0] if matches else None
+
+
+def scan_best_match(text: str, query: str, threshold: float = 0.4,
+                    window: Optional[int] = None, step: Optional[int] = None) -> Optional[FuzzyMatch]:
+    """Reference linear scan: SequenceMatcher against every window"""
+    window, step = default_window(query, window, step)
+
+    best = None
+    for start in range(0, len(text) - window + 1, step):
+        chunk = text[start:start + window]
+        score = SequenceMatcher(None, query, chunk).ratio()
+        if score > threshold and (best is None or score > best.score):
+            best = FuzzyMatch(start, start + len(chunk), score, chunk)
+    return best
+
+
+def benchmark(text: str, queries: Sequence[str], threshold: float = 0.4) -> Dict:
+    """
+    Compare FuzzyIndex with the linear difflib scan on the same queries
+
+    Returns:
+        Timings, how often both pick the same window, and how often the
+        index misses a match the scan finds
+    """
+    t0 = time.perf_counter()
+    index = FuzzyIndex(text)
+    build_time = time.perf_counter() - t0
+
+    index_time = scan_time = 0.0
+    same_window = missed = extra = both = 0
+    score_gap = 0.0
+
+    for query in queries:
+        t0 = time.perf_counter()
+        fast = index.best_match(query, threshold)
+        index_time += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        reference = scan_best_match(text, query, threshold)
+        scan_time += time.perf_counter() - t0
+
+        if reference and fast:
+            both += 1
+            same_window += fast.start == reference.start
+            score_gap += reference.score - fast.score
+        elif reference:
+            missed += 1
+        elif fast:
+            extra += 1
+
+    total = len(queries) or 1
+    return {
+        "text_chars": len(text),
+        "queries": len(queries),
+        "build_ms": build_time * 1000,
+        "index_ms_per_query": index_time * 1000 / total,
+        "scan_ms_per_query": scan_time * 1000 / total,
+        "speedup": scan_time / index_time if index_time else None,
+        "found_by_both": both,
+        "same_window": same_window,
+        "missed_by_index": missed,
+        "found_only_by_index": extra,
+        "mean_score_gap": score_gap / both if both else 0.0
+    }
+
+
+if __name__ == "__main__":
+    import random
+    import re
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python fuzzy_index.py raw_text.txt [n_queries]")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        text = re.sub(r'\s+', ' ', f.read()).lower()
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    # Queries: text fragments with OCR-like noise (~8% of characters edited)
+    rng = random.Random(0)
+    alphabet = "abcdefghijklmnopqrstuvwxyzáéíóúñ0123456789 .,"
+    queries = []
+    for _ in range(n_queries):
+        length = rng.randint(40, 400)
+        start = rng.randrange(max(1, len(text) - length))
+        chars = list(text[start:start + length])
+        for _ in range(len(chars) * 8 // 100):
+            i = rng.randrange(len(chars))
+            chars[i] = rng.choice(alphabet)
+        queries.append("".join(chars))
+
+    result = benchmark(text, queries)
+    print(f"📊 {result['queries']} queries over {result['text_chars']} chars")
+    print(f"   Index build:       {result['build_ms']:.1f} ms")
+    print(f"   FuzzyIndex:        {result['index_ms_per_query']:.2f} ms/query")
+    print(f"   difflib scan:      {result['scan_ms_per_query']:.2f} ms/query")
+    if result["speedup"]:
+        print(f"   Speedup:           {result['speedup']:.1f}x")
+    print(f"   Same window:       {result['same_window']}/{result['found_by_both']}")
+    print(f"   Missed by index:   {result['missed_by_index']}")
+    print(f"   Only by index:     {result['found_only_by_index']}")
+    print(f"   Mean score gap:    {result['mean_score_gap']:.4f}")
@@ -31,6 +31,11 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import Counter
 
+try:
+    from .page_furniture import PageFurnitureDetector
+except ImportError:  # run as a script from this directory
+    from page_furniture import PageFurnitureDetector
+
 
 @dataclass
 class HeadingCandidate:
@@ -84,7 +89,8 @@ class HeadingDetector:
         pdf_path: str,
         min_heading_score: float = 15.0,
         detect_unnumbered: bool = True,
-        language: str = "es"
+        language: str = "es",
+        page_furniture=None
     ):
         """
         Initialize heading detector.
@@ -94,11 +100,14 @@ class HeadingDetector:
             min_heading_score: Minimum score to consider as heading (default: 15.0)
             detect_unnumbered: Detect headings without numbering (default: True)
             language: Document language for keyword matching (es/en)
+            page_furniture: Optional DocumentFurniture (see page_furniture.py); masked
+                header/footer lines are skipped before scoring
         """
         self.pdf_path = Path(pdf_path)
         self.min_heading_score = min_heading_score
         self.detect_unnumbered = detect_unnumbered
         self.language = language
+        self.page_furniture = page_furniture
 
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
@@ -369,6 +378,12 @@ class HeadingDetector:
                 if len(full_text) < 5:
                     continue
 
+                # Encabezados/pies repetidos (máscara de documento), salvo el título en página 1
+                if (self.page_furniture is not None
+                        and self.page_furniture.is_furniture(page_num, bbox)
+                        and not self._is_document_metadata(full_text, page_num)):
+                    continue
+
                 if self._is_page_metadata(full_text):
                     continue
 
@@ -987,7 +1002,8 @@ class HeadingDetector:
 def generate_toc(
     pdf_path: str,
     min_score: float = 15.0,
-    export_format: str = "dict"
+    export_format: str = "dict",
+    page_furniture=None
 ) -> Dict:
     """
     Quick TOC generation function.
@@ -996,11 +1012,16 @@ def generate_toc(
         pdf_path: Path to PDF
         min_score: Minimum heading score
         export_format: "dict", "markdown", or "json"
+        page_furniture: Precomputed DocumentFurniture; detected on the whole
+            document if None
 
     Returns:
         Table of contents in requested format
     """
-    with HeadingDetector(pdf_path, min_heading_score=min_score) as detector:
+    if page_furniture is None:
+        page_furniture = PageFurnitureDetector().detect(pdf_path)
+
+    with HeadingDetector(pdf_path, min_heading_score=min_score, page_furniture=page_furniture) as detector:
         toc = detector.generate_toc()
 
         if export_format == "markdown":
@@ -0,0 +1,188 @@
+"""
+Page Furniture Detector
+=======================
+
+One-pass, document-level detection of repeated headers, footers and page
+numbers ("page furniture").
+
+Every text line in the top/bottom margin bands is fingerprinted by its
+normalised text (lowercase, accents folded, digit runs collapsed to "#") plus
+a quantised vertical band. Fingerprints that recur on enough pages are
+furniture, and their boxes become per-page exclusion masks.
+
+Extractors (ContentClassifier, HeadingDetector, ParagraphExtractor) accept the
+resulting DocumentFurniture and drop masked text BEFORE classification, so
+running headers like "Estudio para análisis de falla EAF 089/2025" or
+"Página 12 de 399" are handled once per document instead of once per block.
+
+Usage:
+    from shared_platform.utils.page_furniture import PageFurnitureDetector
+
+    furniture = PageFurnitureDetector().detect("document.pdf")
+    classifier = ContentClassifier("document.pdf", page_furniture=furniture)
+"""
+
+import fitz  # PyMuPDF
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Union
+
+BBox = Tuple[float, float, float, float]
+
+
+def normalize_furniture_text(text: str) -> str:
+    """Normalise text for fingerprinting: fold accents/case, collapse digits."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"\d+", "#", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@dataclass
+class DocumentFurniture:
+    """Per-page exclusion masks produced by PageFurnitureDetector."""
+    masks: Dict[int, List[BBox]] = field(default_factory=dict)  # page (1-indexed) -> bboxes
+    fingerprints: List[Dict] = field(default_factory=list)
+    pages_analyzed: int = 0
+
+    def page_mask(self, page_num: int) -> List[BBox]:
+        return self.masks.get(page_num, [])
+
+    def is_furniture(self, page_num: int, bbox: BBox, min_overlap: float = 0.5) -> bool:
+        """True if bbox lies (mostly) inside a masked region of the page."""
+        mask = self.masks.get(page_num)
+        if not mask:
+            return False
+
+        x0, y0, x1, y1 = bbox[:4]
+        area = max(x1 - x0, 0) * max(y1 - y0, 0)
+        for mx0, my0, mx1, my1 in mask:
+            ix = min(x1, mx1) - max(x0, mx0)
+            iy = min(y1, my1) - max(y0, my0)
+            if ix <= 0 or iy <= 0:
+                continue
+            if area == 0 or (ix * iy) / area >= min_overlap:
+                return True
+        return False
+
+    def filter_items(self, page_num: int, items: List[Dict], bbox_key: str = "bbox") -> List[Dict]:
+        """Drop items (spans, lines, blocks) whose bbox is furniture."""
+        if page_num not in self.masks:
+            return items
+        return [item for item in items if not self.is_furniture(page_num, item[bbox_key])]
+
+    def to_dict(self) -> Dict:
+        return {
+            "pages_analyzed": self.pages_analyzed,
+            "fingerprints": self.fingerprints,
+            "masks": {str(page): [list(b) for b in boxes] for page, boxes in self.masks.items()}
+        }
+
+
+class PageFurnitureDetector:
+    """
+    Detect recurring header/footer lines across a document.
+
+    Args:
+        margin_ratio: Fraction of page height treated as header/footer band
+        min_page_ratio: Fraction of analysed pages a fingerprint must appear on
+        min_pages: Absolute minimum number of pages for a fingerprint
+        band_size: Vertical quantisation (points) for the position fingerprint
+    """
+
+    def __init__(
+        self,
+        margin_ratio: float = 0.12,
+        min_page_ratio: float = 0.3,
+        min_pages: int = 3,
+        band_size: float = 12.0
+    ):
+        self.margin_ratio = margin_ratio
+        self.min_page_ratio = min_page_ratio
+        self.min_pages = min_pages
+        self.band_size = band_size
+
+    def detect(
+        self,
+        pdf: Union[str, Path, "fitz.Document"],
+        start_page: int = 1,
+        end_page: Optional[int] = None
+    ) -> DocumentFurniture:
+        """
+        Run the fingerprinting pass over a page range.
+
+        Args:
+            pdf: Path to PDF or an open fitz.Document
+            start_page: Starting page (1-indexed)
+            end_page: Ending page (1-indexed), None = last page
+        """
+        owns_doc = not isinstance(pdf, fitz.Document)
+        doc = fitz.open(str(pdf)) if owns_doc else pdf
+
+        try:
+            if end_page is None:
+                end_page = len(doc)
+            occurrences = self._collect_margin_lines(doc, start_page, end_page)
+        finally:
+            if owns_doc:
+                doc.close()
+
+        pages_analyzed = end_page - start_page + 1
+        threshold = max(self.min_pages, int(pages_analyzed * self.min_page_ratio + 0.5))
+        if pages_analyzed < self.min_pages:
+            # Too few pages to call anything "recurring"
+            return DocumentFurniture(pages_analyzed=pages_analyzed)
+
+        furniture = DocumentFurniture(pages_analyzed=pages_analyzed)
+        for (text_key, band), hits in occurrences.items():
+            pages = {page for page, _ in hits}
+            if len(pages) < threshold:
+                continue
+
+            furniture.fingerprints.append({
+                "text": text_key,
+                "band": band,
+                "page_count": len(pages)
+            })
+            for page, bbox in hits:
+                furniture.masks.setdefault(page, []).append(bbox)
+
+        furniture.fingerprints.sort(key=lambda f: -f["page_count"])
+        return furniture
+
+    def _collect_margin_lines(self, doc, start_page: int, end_page: int) -> Dict:
+        """Fingerprint every text line inside the header/footer bands."""
+        occurrences = defaultdict(list)
+
+        for page_num in range(start_page, end_page + 1):
+            page = doc[page_num - 1]
+            height = page.rect.height
+            top_limit = height * self.margin_ratio
+            bottom_limit = height * (1 - self.margin_ratio)
+
+            for block in page.get_text("dict").get("blocks", []):
+                if block.get("type") != 0:
+                    continue
+                for line in block.get("lines", []):
+                    x0, y0, x1, y1 = line["bbox"]
+                    if y1 > top_limit and y0 < bottom_limit:
+                        continue
+
+                    text = " ".join(span["text"] for span in line["spans"]).strip()
+                    text_key = normalize_furniture_text(text)
+                    if not text_key:
+                        continue
+
+                    # Band measured from the nearest page edge so footers match
+                    # across pages of slightly different heights
+                    if y0 < top_limit:
+                        band = ("top", int(y0 // self.band_size))
+                    else:
+                        band = ("bottom", int((height - y1) // self.band_size))
+
+                    occurrences[(text_key, band)].append((page_num, (x0, y0, x1, y1)))
+
+        return occurrences
@@ -0,0 +1,509 @@
+"""
+Page Layout Model
+=================
+
+One extraction per PDF page, shared by every processor that needs the page's
+geometry: text blocks/lines/spans with coordinates and fonts, images with
+their placement, vector drawings, and PyMuPDF table candidates.
+
+Processors used to call page.get_text("dict"), get_images(), get_drawings()
+and find_tables() on their own, so running several of them over a chapter
+extracted each page several times. A PageLayout is built once, kept in a
+per-PDF store (and optionally on disk as JSON), and handed to each processor,
+which derives what it needs from it (text items, rows, columns...).
+
+Only the text (get_text("dict")) is extracted up front. Images, drawings and
+table candidates are extracted the first time a processor reads them, so
+text-only processors never pay for get_drawings() or find_tables().
+
+Shared stores keep their PDF open; at most MAX_SHARED_STORES stay cached
+(least recently used first out), and release_layout_store() closes one
+explicitly once a document is done.
+
+Usage:
+    from shared_platform.utils.page_layout import get_page_layout
+
+    layout = get_page_layout(pdf_path, page_num)          # shared per PDF + page
+    layout = get_page_layout(pdf_path, page_num, cache_dir="outputs/layouts")
+
+    layout.text_items()          # span dicts: text, x, y, x_end, y_end, font, size, ...
+    layout.rows(tolerance=3.0)   # text items grouped by baseline, left to right
+    layout.images, layout.drawings, layout.table_candidates   # extracted on first access
+    layout.save(path); PageLayout.load(path)
+    release_layout_store(pdf_path)
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import fitz  # PyMuPDF
+
+LAYOUT_VERSION = 2
+
+# Shared stores (open PDFs) kept at once
+MAX_SHARED_STORES = 8
+
+# Keys holding coordinate tuples, which JSON turns into lists
+TUPLE_KEYS = {"bbox", "dir", "origin"}
+
+PathLike = Union[str, Path]
+
+
+def _bbox(rect) -> Tuple[float, float, float, float]:
+    return tuple(float(v) for v in rect)
+
+
+def _serialise_blocks(blocks: List[Dict]) -> List[Dict]:
+    """get_text("dict") blocks without image bytes, JSON-ready"""
+    result = []
+    for block in blocks:
+        if "lines" in block:
+            result.append({
+                "type": 0,
+                "number": block.get("number", len(result)),
+                "bbox": _bbox(block["bbox"]),
+                "lines": [
+                    {
+                        "bbox": _bbox(line["bbox"]),
+                        "wmode": line.get("wmode", 0),
+                        "dir": tuple(line.get("dir", (1.0, 0.0))),
+                        "spans": [
+                            {
+                                "bbox": _bbox(span["bbox"]),
+                                "text": span["text"],
+                                "font": span["font"],
+                                "size": span["size"],
+                                "flags": span["flags"],
+                                "color": span.get("color", 0),
+                                "origin": tuple(span.get("origin", (span["bbox"][0], span["bbox"][3])))
+                            }
+                            for span in line["spans"]
+                        ]
+                    }
+                    for line in block["lines"]
+                ]
+            })
+        elif "image" in block:
+            result.append({
+                "type": 1,
+                "number": block.get("number", len(result)),
+                "bbox": _bbox(block["bbox"]),
+                "width": block.get("width", 0),
+                "height": block.get("height", 0),
+                "colorspace": block.get("colorspace", "unknown"),
+                "ext": block.get("ext", ""),
+                "image": None  # Bytes are not kept; the key marks an image block
+            })
+    return result
+
+
+def _extract_images(page) -> List[Dict]:
+    images = []
+    # get_image_bbox needs the full=True entries (with the referencing xref)
+    for image_id, img in enumerate(page.get_images(full=True)):
+        try:
+            bbox = _bbox(page.get_image_bbox(img))
+        except Exception:
+            bbox = None
+        images.append({
+            "image_id": image_id,
+            "xref": img[0],
+            "smask": img[1],
+            "width": img[2],
+            "height": img[3],
+            "bpc": img[4],  # bits per component
+            "colorspace": img[5],
+            "alt": img[6],
+            "name": img[7],
+            "filter": img[8],
+            "bbox": bbox
+        })
+    return images
+
+
+def _extract_drawings(page) -> List[Dict]:
+    """Drawing paths with their straight segments (lines and rectangle edges)"""
+    drawings = []
+    for drawing_id, drawing in enumerate(page.get_drawings()):
+        segments = []
+        for item in drawing.get("items", []):
+            if item[0] == "l":
+                segments.append((float(item[1].x), float(item[1].y), float(item[2].x), float(item[2].y)))
+            elif item[0] == "re":
+                x0, y0, x1, y1 = _bbox(item[1])
+                segments.extend([(x0, y0, x1, y0), (x0, y1, x1, y1), (x0, y0, x0, y1), (x1, y0, x1, y1)])
+        drawings.append({
+            "drawing_id": drawing_id,
+            "type": drawing.get("type", "unknown"),
+            "bbox": _bbox(drawing["rect"]),
+            "items": len(drawing.get("items", [])),
+            "width": drawing.get("width"),
+            "fill": drawing.get("fill"),
+            "color": drawing.get("color"),
+            "segments": segments
+        })
+    return drawings
+
+
+def _extract_tables(page) -> List[Dict]:
+    candidates = []
+    try:
+        for table_id, table in enumerate(page.find_tables()):
+            data = table.extract()
+            candidates.append({
+                "table_id": table_id,
+                "bbox": _bbox(table.bbox),
+                "rows": len(data),
+                "cols": len(data[0]) if data else 0,
+                "data": data,
+                "method": "pymupdf_find_tables"
+            })
+    except Exception:
+        pass
+    return candidates
+
+
+# Page parts extracted on first access
+PART_EXTRACTORS: Dict[str, Callable[[Any], List[Dict]]] = {
+    "images": _extract_images,
+    "drawings": _extract_drawings,
+    "table_candidates": _extract_tables,
+}
+
+
+def _restore_tuples(value, key: Optional[str] = None):
+    """Undo JSON's tuple-to-list conversion for coordinates and segments"""
+    if isinstance(value, dict):
+        return {k: _restore_tuples(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        if key in TUPLE_KEYS:
+            return tuple(value)
+        if key == "segments":
+            return [tuple(segment) for segment in value]
+        return [_restore_tuples(item) for item in value]
+    return value
+
+
+@dataclass
+class PageLayout:
+    """
+    Everything the chapter processors read from one PDF page
+
+    images, drawings and table_candidates are None until first read; then
+    they are extracted by the loader (the PageLayoutStore the layout came
+    from), or are empty if there is none.
+    """
+    page_number: int  # 1-indexed
+    width: float
+    height: float
+    blocks: List[Dict] = field(default_factory=list)  # get_text("dict") blocks, no image bytes
+    _images: Optional[List[Dict]] = field(default=None, repr=False)
+    _drawings: Optional[List[Dict]] = field(default=None, repr=False)
+    _table_candidates: Optional[List[Dict]] = field(default=None, repr=False)
+    loader: Optional[Callable[[int, str], List[Dict]]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_page(cls, page, find_tables: bool = True, lazy: bool = False) -> "PageLayout":
+        """
+        Extract a page (fitz.Page)
+
+        With lazy=True only the text is read now; set loader to extract the
+        other parts on demand.
+        """
+        layout = cls(
+            page_number=page.number + 1,
+            width=float(page.rect.width),
+            height=float(page.rect.height),
+            blocks=_serialise_blocks(page.get_text("dict")["blocks"])
+        )
+        if not lazy:
+            layout._images = _extract_images(page)
+            layout._drawings = _extract_drawings(page)
+            layout._table_candidates = _extract_tables(page) if find_tables else []
+        return layout
+
+    def _part(self, name: str) -> List[Dict]:
+        value = getattr(self, "_" + name)
+        if value is None:
+            value = self.loader(self.page_number, name) if self.loader else []
+            setattr(self, "_" + name, value)
+        return value
+
+    @property
+    def images(self) -> List[Dict]:
+        return self._part("images")
+
+    @property
+    def drawings(self) -> List[Dict]:
+        return self._part("drawings")
+
+    @property
+    def table_candidates(self) -> List[Dict]:
+        return self._part("table_candidates")
+
+    # ------------------------------------------------------------------
+    # Derived views (fresh objects on every call: processors may annotate them)
+    # ------------------------------------------------------------------
+
+    def text_blocks(self) -> List[Dict]:
+        return [block for block in self.blocks if "lines" in block]
+
+    def text_items(self) -> List[Dict]:
+        """Non-empty spans, stripped, with coordinates and font attributes"""
+        items = []
+        for block in self.text_blocks():
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if not text:
+                        continue
+                    bbox = tuple(span["bbox"])
+                    items.append({
+                        "text": text,
+                        "x": bbox[0],
+                        "y": bbox[1],
+                        "x_end": bbox[2],
+                        "y_end": bbox[3],
+                        "bbox": bbox,
+                        "font": span["font"],
+                        "size": span["size"],
+                        "flags": span["flags"],
+                        "is_bold": bool(span["flags"] & 2**4),
+                        "is_italic": bool(span["flags"] & 2**1),
+                        "color": span.get("color", 0)
+                    })
+        return items
+
+    def rows(self, tolerance: float = 3.0, items: Optional[List[Dict]] = None) -> List[List[Dict]]:
+        """Text items grouped into rows (tops within tolerance of the row's last item), left to right"""
+        items = self.text_items() if items is None else items
+        if not items:
+            return []
+
+        sorted_items = sorted(items, key=lambda item: item["y"])
+        rows = []
+        current_row = [sorted_items[0]]
+        current_y = sorted_items[0]["y"]
+
+        for item in sorted_items[1:]:
+            if abs(item["y"] - current_y) <= tolerance:
+                current_row.append(item)
+            else:
+                current_row.sort(key=lambda x: x["x"])
+                rows.append(current_row)
+                current_row = [item]
+                current_y = item["y"]
+
+        current_row.sort(key=lambda x: x["x"])
+        rows.append(current_row)
+        return rows
+
+    def columns(self, tolerance: float = 5.0, min_items: int = 3) -> List[Dict]:
+        """
+        Left edges shared by at least min_items text items
+
+        Returns:
+            [{"x": mean left edge, "count": items}] sorted by x
+        """
+        lefts = sorted(item["x"] for item in self.text_items())
+        clusters: List[List[float]] = []
+        for x in lefts:
+            if clusters and x - clusters[-1][-1] <= tolerance:
+                clusters[-1].append(x)
+            else:
+                clusters.append([x])
+        return [
+            {"x": sum(cluster) / len(cluster), "count": len(cluster)}
+            for cluster in clusters
+            if len(cluster) >= min_items
+        ]
+
+    def placed_images(self) -> List[Dict]:
+        """Images whose position on the page is known"""
+        return [dict(image) for image in self.images if image.get("bbox") is not None]
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready layout; parts not extracted yet are None"""
+        return {
+            "version": LAYOUT_VERSION,
+            "page_number": self.page_number,
+            "width": self.width,
+            "height": self.height,
+            "blocks": self.blocks,
+            "images": self._images,
+            "drawings": self._drawings,
+            "table_candidates": self._table_candidates
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  loader: Optional[Callable[[int, str], List[Dict]]] = None) -> "PageLayout":
+        data = _restore_tuples(data)
+        return cls(
+            page_number=data["page_number"],
+            width=data["width"],
+            height=data["height"],
+            blocks=data.get("blocks", []),
+            _images=data.get("images"),
+            _drawings=data.get("drawings"),
+            _table_candidates=data.get("table_candidates"),
+            loader=loader
+        )
+
+    def save(self, path: PathLike, source: Optional[Dict[str, Any]] = None) -> Path:
+        """Write the layout as JSON; source identifies the PDF it was read from"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.to_dict()
+        if source:
+            data["source"] = source
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> "PageLayout":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _pdf_signature(pdf_path: Path) -> Dict[str, Any]:
+    stat = pdf_path.stat()
+    return {"pdf": str(pdf_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class PageLayoutStore:
+    """
+    Page layouts of one PDF, each extracted at most once
+
+    The text of a page is extracted when the page is first requested; its
+    images, drawings and table candidates when first read. With cache_dir,
+    layouts are also written as <stem>_p<N>.layout.json and reused by later
+    runs while the PDF's size and mtime are unchanged.
+    """
+
+    def __init__(self, pdf_path: PathLike, cache_dir: Optional[PathLike] = None, find_tables: bool = True):
+        self.pdf_path = Path(pdf_path).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.find_tables = find_tables
+        self.signature = _pdf_signature(self.pdf_path)
+        self._layouts: Dict[int, PageLayout] = {}
+        self._doc = None
+        self._closed = False
+        self._lock = threading.RLock()
+
+    def _cache_file(self, page_num: int) -> Path:
+        return self.cache_dir / f"{self.pdf_path.stem}_p{page_num}.layout.json"
+
+    def _load_cached(self, page_num: int) -> Optional[PageLayout]:
+        try:
+            with open(self._cache_file(page_num), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != LAYOUT_VERSION or data.get("source") != self.signature:
+            return None
+        return PageLayout.from_dict(data, loader=self._load_part)
+
+    def _open(self):
+        if self._doc is None:
+            self._doc = fitz.open(str(self.pdf_path))
+        return self._doc
+
+    def _load_part(self, page_num: int, name: str) -> List[Dict]:
+        """Extract one deferred part of a page (the layouts' loader)"""
+        if name == "table_candidates" and not self.find_tables:
+            return []
+        with self._lock:
+            if self._closed:
+                # The layout outlived its store: read the part without keeping the PDF open
+                with fitz.open(str(self.pdf_path)) as doc:
+                    return PART_EXTRACTORS[name](doc[page_num - 1])
+
+            value = PART_EXTRACTORS[name](self._open()[page_num - 1])
+            layout = self._layouts.get(page_num)
+            if self.cache_dir and layout is not None:
+                setattr(layout, "_" + name, value)
+                layout.save(self._cache_file(page_num), source=self.signature)
+            return value
+
+    def page(self, page_num: int) -> PageLayout:
+        """Layout of a page (1-indexed)"""
+        with self._lock:
+            layout = self._layouts.get(page_num)
+            if layout is not None:
+                return layout
+
+            if self.cache_dir:
+                layout = self._load_cached(page_num)
+            if layout is None:
+                layout = PageLayout.from_page(self._open()[page_num - 1], lazy=True)
+                layout.loader = self._load_part
+                if self.cache_dir:
+                    layout.save(self._cache_file(page_num), source=self.signature)
+
+            self._layouts[page_num] = layout
+            return layout
+
+    def pages(self, page_nums: Iterable[int]) -> Dict[int, PageLayout]:
+        """Layouts of several pages, e.g. a whole chapter, before running the processors"""
+        return {page_num: self.page(page_num) for page_num in page_nums}
+
+    def close(self):
+        """Close the PDF and drop the layouts (ones still held elsewhere keep working)"""
+        with self._lock:
+            self._closed = True
+            self._layouts = {}
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+
+
+# Shared stores: every processor in the process reads the same extraction
+_stores: "OrderedDict[Tuple[Path, Optional[Path]], PageLayoutStore]" = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def _store_key(pdf_path: PathLike, cache_dir: Optional[PathLike]) -> Tuple[Path, Optional[Path]]:
+    return Path(pdf_path).resolve(), Path(cache_dir).resolve() if cache_dir else None
+
+
+def layout_store(pdf_path: PathLike, cache_dir: Optional[PathLike] = None) -> PageLayoutStore:
+    """Shared store for a PDF, replaced if the file changes on disk"""
+    key = _store_key(pdf_path, cache_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.signature != _pdf_signature(key[0]):
+            if store is not None:
+                store.close()
+            store = PageLayoutStore(key[0], cache_dir)
+            _stores[key] = store
+        _stores.move_to_end(key)
+        while len(_stores) > MAX_SHARED_STORES:
+            _, evicted = _stores.popitem(last=False)
+            evicted.close()
+        return store
+
+
+def release_layout_store(pdf_path: PathLike, cache_dir: Optional[PathLike] = None):
+    """Close and forget the shared store of a PDF (no-op if there is none)"""
+    with _stores_lock:
+        store = _stores.pop(_store_key(pdf_path, cache_dir), None)
+    if store is not None:
+        store.close()
+
+
+def get_page_layout(pdf_path: PathLike, page_num: int, cache_dir: Optional[PathLike] = None) -> PageLayout:
+    """Layout of a page (1-indexed), extracted once per PDF and page"""
+    return layout_store(pdf_path, cache_dir).page(page_num)
@@ -18,6 +18,7 @@ import re
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from detailed_heading_detector import DetailedHeadingDetector
+from page_furniture import PageFurnitureDetector
 
 
 class ParagraphExtractor:
@@ -183,11 +184,16 @@ class ParagraphExtractor:
         self,
         pdf_path: Path,
         start_page: int,
-        end_page: int
+        end_page: int,
+        page_furniture=None
     ) -> List[Dict]:
         """
         Extrae todos los text blocks de un rango de páginas en orden de lectura.
 
+        Args:
+            page_furniture: DocumentFurniture opcional; los blocks enmascarados
+                (encabezados/pies repetidos) se descartan antes de clasificar
+
         Returns:
             Lista de blocks con su texto, bbox, página, etc.
         """
@@ -203,6 +209,10 @@ class ParagraphExtractor:
                     if block.get('type') != 0:  # Solo text blocks
                         continue
 
+                    if page_furniture is not None and page_furniture.is_furniture(
+                            page_num + 1, block.get('bbox', (0, 0, 0, 0))):
+                        continue
+
                     lines = block.get('lines', [])
                     if not lines:
                         continue
@@ -309,7 +319,8 @@ class ParagraphExtractor:
         pdf_path: Path,
         start_page: int,
         end_page: int,
-        headings: Optional[List[Dict]] = None
+        headings: Optional[List[Dict]] = None,
+        page_furniture=None
     ) -> List[Dict]:
         """
         Extrae todos los párrafos narrativos de un rango de páginas.
@@ -319,12 +330,13 @@ class ParagraphExtractor:
             start_page: Página inicial (1-indexed)
             end_page: Página final (1-indexed)
             headings: Lista de títulos detectados (para asociar párrafos a secciones)
+            page_furniture: DocumentFurniture opcional (ver page_furniture.py)
 
         Returns:
             Lista de párrafos con texto, ubicación y metadatos
         """
         # 1. Extraer todos los text blocks
-        all_blocks = self.extract_text_blocks(pdf_path, start_page, end_page)
+        all_blocks = self.extract_text_blocks(pdf_path, start_page, end_page, page_furniture)
 
         # 2. Crear lista de textos de títulos ya detectados
         detected_heading_texts = []
@@ -454,13 +466,15 @@ if __name__ == "__main__":
 
     print(f"✅ Detectados {len(headings)} títulos")
 
-    # 2. Extraer párrafos
+    # 2. Extraer párrafos (sin encabezados/pies repetidos)
+    page_furniture = PageFurnitureDetector().detect(pdf_path, 1, 11)
     extractor = ParagraphExtractor()
     paragraphs = extractor.extract_paragraphs(
         pdf_path,
         start_page=1,
         end_page=11,
-        headings=headings
+        headings=headings,
+        page_furniture=page_furniture
     )
 
     print(f"✅ Extraídos {len(paragraphs)} párrafos\n")
@@ -0,0 +1,270 @@
+"""
+Raw Text Store
+==============
+
+Page-addressable access to the raw extraction files that chapter processors
+write to ``outputs/raw_extractions`` (pages separated by ``=== PÁGINA N ===``
+or ``=== PAGE N ===`` marker lines).
+
+Writing a raw file through ``write_raw_text`` also writes a small sidecar
+index (``<file>.offsets``) with the byte range of every page. Readers
+memory-map the file and slice one page by its offsets, so reading page N
+costs the same whatever the size of the chapter. Files written by other
+means are indexed on first open by one scan of the markers, and the index is
+rebuilt whenever the file's size or mtime no longer match it.
+
+Shared stores are closed (file handle and mapping) when they are replaced,
+i.e. when the file is rewritten, so take pages from open_raw_store() when
+they are needed rather than keeping a store across writes.
+
+Usage:
+    from shared_platform.utils.raw_text_store import open_raw_store, write_raw_text
+
+    write_raw_text(raw_file, chapter_text)
+    store = open_raw_store(raw_file)   # shared instance per path
+    store.page(3)          # page body, without its marker line
+    store.page_block(3)    # marker line + body, as laid out in the file
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+INDEX_SUFFIX = ".offsets"
+INDEX_VERSION = 1
+
+MARKER_PATTERN = r"^=== (?:PÁGINA|PAGE) (\d+) ===[ \t]*\r?$"
+_TEXT_MARKER_RE = re.compile(MARKER_PATTERN, re.MULTILINE)
+_BYTES_MARKER_RE = re.compile(MARKER_PATTERN.encode("utf-8"), re.MULTILINE)
+
+PathLike = Union[str, Path]
+
+# (marker start, body start, body end) in bytes
+PageSpan = Tuple[int, int, int]
+
+
+def _scan_markers(data, marker_re) -> Dict[int, PageSpan]:
+    """
+    Page spans from one pass over the markers
+
+    The body runs from the line after the marker to the next marker, minus
+    the newline that separates it from that marker. A page number that
+    appears twice keeps its last occurrence.
+    """
+    spans: Dict[int, PageSpan] = {}
+    markers = list(marker_re.finditer(data))
+    newline = b"\n" if isinstance(data, (bytes, bytearray, mmap.mmap)) else "\n"
+
+    for i, match in enumerate(markers):
+        body_start = min(match.end() + 1, len(data))
+        if i + 1 < len(markers):
+            end = markers[i + 1].start()
+            if end > body_start and data[end - 1:end] == newline:
+                end -= 1
+        else:
+            end = len(data)
+        spans[int(match.group(1))] = (match.start(), body_start, max(body_start, end))
+
+    return spans
+
+
+def split_raw_pages(raw_text: str) -> Dict[int, str]:
+    """Page number -> page body of a raw text already in memory"""
+    return {
+        page_num: raw_text[body_start:end]
+        for page_num, (_, body_start, end) in _scan_markers(raw_text, _TEXT_MARKER_RE).items()
+    }
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _save_index(path: Path, spans: Dict[int, PageSpan]):
+    """Best effort: a read-only outputs directory only costs a rescan next time"""
+    stat = path.stat()
+    index = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "pages": {str(page_num): list(span) for page_num, span in sorted(spans.items())}
+    }
+    try:
+        tmp_path = _index_path(path).with_name(_index_path(path).name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, _index_path(path))
+    except OSError:
+        pass
+
+
+def _load_index(path: Path) -> Optional[Dict[int, PageSpan]]:
+    """Stored page spans, or None if missing or stale"""
+    try:
+        with open(_index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+
+    if (index.get("version") != INDEX_VERSION
+            or index.get("size") != stat.st_size
+            or index.get("mtime_ns") != stat.st_mtime_ns):
+        return None
+    return {int(page_num): tuple(span) for page_num, span in index["pages"].items()}
+
+
+def write_raw_text(path: PathLike, text: str) -> Path:
+    """
+    Write a raw extraction file and its page index
+
+    Offsets are taken from the encoded text while writing, so the file is
+    never read back to index it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+
+    # Replace rather than truncate: a store mapping the old file (here or in
+    # another process) never faults on a shrunk mapping
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    _forget_shared(path)
+
+    _save_index(path, _scan_markers(data, _BYTES_MARKER_RE))
+    return path
+
+
+class RawTextStore:
+    """Memory-mapped, page-addressable view of one raw extraction file"""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self.signature: Tuple[int, int, int] = (0, 0, 0)
+        self.spans: Dict[int, PageSpan] = {}
+        self.closed = False
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self.signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        if stat.st_size == 0:
+            self._map = None  # mmap cannot map an empty file
+            self.spans = {}
+            return
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        spans = _load_index(self.path)
+        if spans is None:
+            spans = _scan_markers(self._map, _BYTES_MARKER_RE)
+            _save_index(self.path, spans)
+        self.spans = spans
+
+    def close(self):
+        self.closed = True
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def is_current(self) -> bool:
+        """Whether the file on disk is still the one that was mapped"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self.signature
+
+    def _read(self, start: int, end: int) -> str:
+        if self.closed:
+            raise ValueError(f"Raw text store of {self.path} is closed")
+        return self._map[start:end].decode("utf-8")
+
+    def page(self, page_num: int, default: str = "") -> str:
+        """Body of a page (text between its marker line and the next marker)"""
+        span = self.spans.get(page_num)
+        if span is None:
+            return default
+        return self._read(span[1], span[2])
+
+    def page_block(self, page_num: int, default: str = "") -> str:
+        """Marker line and body of a page"""
+        span = self.spans.get(page_num)
+        if span is None:
+            return default
+        return self._read(span[0], span[2])
+
+    def page_numbers(self) -> List[int]:
+        return sorted(self.spans)
+
+    def pages(self) -> Dict[int, str]:
+        """Page number -> body for every page"""
+        return {page_num: self.page(page_num) for page_num in self.page_numbers()}
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """(page_num, body) in page order, one page decoded at a time"""
+        for page_num in self.page_numbers():
+            yield page_num, self.page(page_num)
+
+    def text(self) -> str:
+        """The whole file"""
+        if self._map is None and not self.closed:
+            return ""
+        return self._read(0, len(self._map))
+
+    def __contains__(self, page_num: int) -> bool:
+        return page_num in self.spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Shared instances: every processor of a run reads the same mapping
+_shared: Dict[Path, RawTextStore] = {}
+_shared_lock = threading.Lock()
+
+
+def _forget_shared(path: Path):
+    """Drop and close the shared store of a rewritten file"""
+    with _shared_lock:
+        store = _shared.pop(path.resolve(), None)
+    if store is not None:
+        store.close()
+
+
+def open_raw_store(path: PathLike) -> RawTextStore:
+    """
+    Shared store for a raw extraction file
+
+    The same instance is returned for the same path until the file changes
+    on disk, then it is remapped and the old instance closed. Raises
+    FileNotFoundError if the file is missing.
+    """
+    key = Path(path).resolve()
+    with _shared_lock:
+        store = _shared.get(key)
+        if store is not None and store.is_current():
+            return store
+        if store is not None:
+            store.close()
+        store = RawTextStore(key)
+        _shared[key] = store
+        return store
@@ -15,6 +15,7 @@ import sys
 import json
 from pathlib import Path
 from heading_detector import HeadingDetector
+from page_furniture import PageFurnitureDetector
 
 
 def test_heading_detector(
@@ -46,7 +47,12 @@ def test_heading_detector(
     print(f"📋 Format: {export_format}\n")
 
     try:
-        with HeadingDetector(pdf_path, min_heading_score=min_score) as detector:
+        # Running headers/footers are masked once for the whole document
+        page_furniture = PageFurnitureDetector().detect(pdf_path)
+        print(f"🧭 Page furniture: {len(page_furniture.fingerprints)} recurring header/footer lines\n")
+
+        with HeadingDetector(pdf_path, min_heading_score=min_score,
+                             page_furniture=page_furniture) as detector:
             # Generate TOC first (this triggers typography learning)
             print("🔍 Analyzing document typography and extracting headings...")
 
@@ -0,0 +1,288 @@
+"""
+Block-to-Raw Text Alignment
+===========================
+
+Maps the text blocks of a page (PyMuPDF coordinate blocks, lines, OCR
+regions) to character spans of the page's raw text, without lowercasing
+and rescanning the raw text for every block.
+
+The raw text is normalised once (lowercase, collapsed whitespace) keeping a
+map back to raw offsets, and indexed by character n-grams (gram -> sorted
+positions; the NGramPostings of fuzzy_index). Blocks are then aligned in one
+pass, in reading order:
+
+1. Exact: the block's rarest n-gram gives the few positions where the block
+   can start; each is verified with startswith(). Positions at or after the
+   end of the previous match are tried first (monotonic order), so a repeated
+   label ("informe en plazo") maps to the occurrence that follows the
+   previous block instead of the first one in the page.
+2. Approximate: when the block does not occur verbatim (hyphenation, merged
+   cells, extraction differences), its rarest grams vote for the diagonal
+   (start offset) they imply; the best supported diagonal after the cursor
+   wins, or the best anywhere, flagged as out of order.
+
+Each lookup reads a few posting lists, so aligning a page costs about the
+size of its blocks instead of blocks × raw length.
+
+Usage:
+    from shared_platform.utils.text_alignment import TextAligner
+
+    aligner = TextAligner(page_raw_text)
+    spans = aligner.align(block_texts)          # one TextSpan per block
+    spans[0].raw_start, spans[0].match_type
+    aligner.region_content(lines_in_region(blocks, table_bbox))  # raw text covering a region
+"""
+
+import bisect
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .fuzzy_index import NGramPostings
+
+BBox = Sequence[float]
+
+
+@dataclass
+class TextSpan:
+    """Where one block lies in the raw text"""
+    found: bool
+    match_type: str  # "exact", "approximate" or "none"
+    start: int = -1  # Offsets in the normalised text
+    end: int = -1
+    raw_start: int = -1  # Offsets in the original raw text
+    raw_end: int = -1
+    score: float = 0.0  # 1.0 for exact matches, estimated share of the block's grams supporting it otherwise
+    in_order: bool = True  # Starts at or after the previous match
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["normalized_start"] = result.pop("start")
+        result["normalized_end"] = result.pop("end")
+        result["start_position"] = self.raw_start
+        result["end_position"] = self.raw_end
+        return result
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """
+    Lowercase and collapse whitespace, keeping the raw offset of every char
+
+    Returns:
+        (normalised text, offsets) where offsets[i] is the raw index of
+        normalised char i; offsets has one extra entry, len(text)
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    pending_space = False
+
+    for i, char in enumerate(text):
+        if char.isspace():
+            pending_space = bool(chars)
+            continue
+        if pending_space:
+            chars.append(" ")
+            offsets.append(i - 1)
+            pending_space = False
+        lowered = char.lower()
+        chars.extend(lowered)
+        offsets.extend([i] * len(lowered))
+
+    offsets.append(len(text))
+    return "".join(chars), offsets
+
+
+def normalize(text: str) -> str:
+    return normalize_with_offsets(text)[0]
+
+
+def in_region(bbox: BBox, region: BBox) -> bool:
+    """Whether the centre of bbox lies inside region (both x0, y0, x1, y1)"""
+    x = (bbox[0] + bbox[2]) / 2
+    y = (bbox[1] + bbox[3]) / 2
+    return region[0] <= x <= region[2] and region[1] <= y <= region[3]
+
+
+def lines_in_region(blocks: Sequence[Dict[str, Any]], region: BBox) -> List[str]:
+    """
+    Texts of the block lines whose centre lies inside region, in reading order
+
+    Args:
+        blocks: Coordinate text blocks ({"lines": [{"text", "bbox"}, ...]})
+        region: x0, y0, x1, y1
+    """
+    lines = [
+        line
+        for block in blocks
+        for line in block.get("lines", [])
+        if line.get("text", "").strip() and in_region(line["bbox"], region)
+    ]
+    lines.sort(key=lambda line: (round(line["bbox"][1]), line["bbox"][0]))
+    return [line["text"] for line in lines]
+
+
+class TextAligner(NGramPostings):
+    """N-gram position index over one raw text, for aligning blocks to it"""
+
+    def __init__(self, raw_text: str, n: int = 4, max_grams: int = 32, min_score: float = 0.3):
+        self.raw_text = raw_text
+        self.max_grams = max_grams
+        self.min_score = min_score
+        text, self.offsets = normalize_with_offsets(raw_text)
+        super().__init__(text, n)
+
+    def _span(self, start: int, end: int, match_type: str, score: float, in_order: bool) -> TextSpan:
+        return TextSpan(
+            found=True,
+            match_type=match_type,
+            start=start,
+            end=end,
+            raw_start=self.offsets[start],
+            raw_end=self.offsets[end - 1] + 1 if end > start else self.offsets[start],
+            score=score,
+            in_order=in_order
+        )
+
+    def _find_exact(self, query: str, cursor: int, grams: List[Tuple[str, int]],
+                    complete: bool) -> Optional[Tuple[int, bool]]:
+        if len(query) < self.n:
+            start = self.text.find(query, cursor)
+            if start != -1:
+                return start, True
+            start = self.text.find(query, 0, cursor + len(query))
+            return (start, False) if start != -1 else None
+
+        if not grams or not complete:
+            return None
+
+        gram, offset = grams[0]
+        positions = self.postings[gram]
+        split = bisect.bisect_left(positions, cursor + offset)
+        for k in range(split, len(positions)):
+            start = positions[k] - offset
+            if self.text.startswith(query, start):
+                return start, True
+        for k in range(split):
+            start = positions[k] - offset
+            if start >= 0 and self.text.startswith(query, start):
+                return start, False
+        return None
+
+    def _find_approximate(self, query: str, cursor: int, grams: List[Tuple[str, int]],
+                          distinct: int) -> Optional[TextSpan]:
+        # Grams absent from the text count against the score: a query sharing
+        # one gram with the page must not score like a full match
+        present = len(grams)
+        grams = grams[:self.max_grams]
+        if not grams:
+            return None
+
+        votes = self.diagonal_votes(grams)
+
+        # Gather each diagonal with its neighbours, so small indels still add up
+        tolerance = max(2, len(query) // 20)
+        diagonals = sorted(votes)
+        best: Dict[bool, Tuple[int, int]] = {}
+        low = 0
+        window_votes = 0
+        for high, diagonal in enumerate(diagonals):
+            window_votes += votes[diagonal]
+            while diagonals[low] < diagonal - 2 * tolerance:
+                window_votes -= votes[diagonals[low]]
+                low += 1
+            center = diagonals[(low + high) // 2]
+            after_cursor = center >= cursor
+            if window_votes > best.get(after_cursor, (0, 0))[0]:
+                best[after_cursor] = (window_votes, center)
+
+        # Share of the voting grams that support the diagonal, scaled by the
+        # share of the query's grams found in the text at all
+        coverage = present / distinct
+        for in_order in (True, False):
+            if in_order not in best:
+                continue
+            supported, diagonal = best[in_order]
+            score = min(1.0, supported / len(grams)) * coverage
+            if score >= self.min_score:
+                start = max(0, diagonal)
+                end = min(len(self.text), diagonal + len(query))
+                if end > start:
+                    return self._span(start, end, "approximate", score, in_order)
+        return None
+
+    def locate(self, block_text: str, cursor: int = 0) -> TextSpan:
+        """Span of one block, preferring a match at or after cursor"""
+        query = normalize(block_text)
+        if not query:
+            return TextSpan(found=False, match_type="none")
+
+        grams, distinct = self.query_grams(query)
+        exact = self._find_exact(query, cursor, grams, len(grams) == distinct)
+        if exact is not None:
+            start, in_order = exact
+            return self._span(start, start + len(query), "exact", 1.0, in_order)
+
+        approximate = self._find_approximate(query, cursor, grams, distinct)
+        if approximate is not None:
+            return approximate
+        return TextSpan(found=False, match_type="none")
+
+    def align(self, block_texts: Sequence[str], cursor: int = 0) -> List[TextSpan]:
+        """
+        Spans of blocks given in reading order, in one pass
+
+        The cursor moves to the end of every in-order match, so each block is
+        looked for after the previous one first.
+        """
+        spans = []
+        for block_text in block_texts:
+            span = self.locate(block_text, cursor)
+            if span.found and span.in_order:
+                cursor = span.end
+            spans.append(span)
+        return spans
+
+    def region_content(self, texts: Sequence[str], cursor: int = 0, slack: int = 40) -> Dict[str, Any]:
+        """
+        Raw text covering a region, from the texts of the units inside it
+
+        Args:
+            texts: Texts of the lines/blocks inside the region, in reading order
+            slack: How far (normalised chars) short units may lie outside the
+                span of the long ones and still count
+
+        Returns:
+            raw_start/raw_end of the span covering the matched units, the raw
+            text itself, and how many units were matched
+        """
+        spans = self.align(texts, cursor)
+        matched = [span for span in spans if span.found and span.in_order]
+        if not matched:
+            matched = [span for span in spans if span.found]
+
+        # Short units ("hora", "3") match anywhere: keep those close to the longer ones
+        anchors = [span for span in matched if span.end - span.start >= 2 * self.n]
+        bounds = matched
+        if anchors:
+            low = min(span.start for span in anchors) - slack
+            high = max(span.end for span in anchors) + slack
+            bounds = [span for span in matched if low <= span.start and span.end <= high]
+
+        content = {
+            "units": len(texts),
+            "matched_units": len(matched),
+            "coverage": len(matched) / len(texts) if texts else 0.0,
+            "raw_start": -1,
+            "raw_end": -1,
+            "text": ""
+        }
+        if bounds:
+            raw_start = min(span.raw_start for span in bounds)
+            raw_end = max(span.raw_end for span in bounds)
+            content.update(raw_start=raw_start, raw_end=raw_end, text=self.raw_text[raw_start:raw_end])
+        return content
+
+    def context(self, span: TextSpan, chars: int = 50) -> Tuple[str, str]:
+        """Normalised text just before and after a span"""
+        if not span.found:
+            return "", ""
+        return self.text[max(0, span.start - chars):span.start], self.text[span.end:span.end + chars]
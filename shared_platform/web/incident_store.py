@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Incident Store for the Web Viewer
+Keyset-paginated, index-backed queries over incidents and their generation units
+
+The generation units of each incident live as a JSON array in
+incidents.generation_units. The store keeps them normalised in
+incident_generation_units (one row per unit), filled from that column by
+triggers on incidents, so any writer (ingest_data.py, simple_viewer.py) keeps
+it in sync without changes. Existing databases are backfilled once, the first
+time the table is created.
+
+The store itself never writes: ensure_schema() is the migration, run by
+DataIngester when it connects, or by hand with
+    python shared_platform/web/incident_store.py <database>
+Until then the viewer reads the database as it is (unit pages need the
+migration; search falls back to LIKE).
+
+Pages are addressed by an opaque cursor holding the (sort key, id) of the
+last row served; the next page starts right after it through an index on
+(sort key, id), so every page costs the same however many rows precede it.
+Text search goes through the incidents_fts FTS5 table instead of
+LIKE '%term%' scans, which changes what matches: every word of the query
+must start a word of the title or failure cause ("nehu" finds "Nehuenco",
+"huenco" no longer does), plus incidents whose classification equals the
+query. Triggers keep incidents_fts in step with every insert, update and
+delete, so search never serves a stale index.
+"""
+
+import base64
+import json
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS incident_generation_units (
+        id INTEGER PRIMARY KEY,
+        incident_id INTEGER NOT NULL,
+        report_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        plant_name TEXT NOT NULL DEFAULT '',
+        unit_name TEXT NOT NULL DEFAULT '',
+        capacity_mw REAL,
+        technology_type TEXT NOT NULL DEFAULT '',
+        disconnection_time TEXT NOT NULL DEFAULT '',
+        normalization_time TEXT NOT NULL DEFAULT '',
+        raw JSON
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_units_report ON incident_generation_units(report_id, position);
+    CREATE INDEX IF NOT EXISTS idx_units_incident ON incident_generation_units(incident_id);
+    CREATE INDEX IF NOT EXISTS idx_units_capacity ON incident_generation_units(IFNULL(capacity_mw, -1.0));
+    CREATE INDEX IF NOT EXISTS idx_units_technology ON incident_generation_units(technology_type, IFNULL(capacity_mw, -1.0));
+    CREATE INDEX IF NOT EXISTS idx_units_plant ON incident_generation_units(plant_name);
+    CREATE INDEX IF NOT EXISTS idx_units_disconnection ON incident_generation_units(disconnection_time);
+
+    CREATE INDEX IF NOT EXISTS idx_incidents_mw ON incidents(IFNULL(disconnected_mw, 0.0));
+    CREATE INDEX IF NOT EXISTS idx_incidents_class_date ON incidents(classification, failure_date);
+    CREATE INDEX IF NOT EXISTS idx_incidents_class_nocase ON incidents(classification COLLATE NOCASE);
+
+    -- INSERT OR REPLACE gives the incident a new id without firing the delete
+    -- trigger, so rows are cleared by report_id before inserting
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_units_insert AFTER INSERT ON incidents
+    BEGIN
+        DELETE FROM incident_generation_units WHERE report_id = NEW.report_id;
+        INSERT INTO incident_generation_units ({columns})
+        SELECT {values} FROM json_each(NEW.generation_units)
+        WHERE json_valid(NEW.generation_units) AND json_type(NEW.generation_units) = 'array'
+          AND json_each.type = 'object';
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_units_update
+    AFTER UPDATE OF generation_units, report_id ON incidents
+    BEGIN
+        DELETE FROM incident_generation_units WHERE incident_id = OLD.id;
+        INSERT INTO incident_generation_units ({columns})
+        SELECT {values} FROM json_each(NEW.generation_units)
+        WHERE json_valid(NEW.generation_units) AND json_type(NEW.generation_units) = 'array'
+          AND json_each.type = 'object';
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_units_delete AFTER DELETE ON incidents
+    BEGIN
+        DELETE FROM incident_generation_units WHERE incident_id = OLD.id;
+    END;
+"""
+
+FTS_COLUMNS = "report_id, title, failure_cause_text, technical_summary"
+
+FTS_TRIGGERS = ("trg_incidents_fts_replace", "trg_incidents_fts_insert",
+                "trg_incidents_fts_update", "trg_incidents_fts_delete")
+
+# External-content FTS5 index of incidents (same definition as database_schema.sql)
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS incidents_fts USING fts5(
+        report_id, title, failure_cause_text, technical_summary,
+        content=incidents
+    );
+
+    -- INSERT OR REPLACE deletes the old row without firing the delete
+    -- trigger, so its entry is dropped while the row can still be read
+    -- (a plain INSERT that conflicts rolls this back with the statement)
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_fts_replace BEFORE INSERT ON incidents
+    BEGIN
+        INSERT INTO incidents_fts(incidents_fts, rowid, {columns})
+        SELECT 'delete', id, {columns} FROM incidents WHERE report_id = NEW.report_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_fts_insert AFTER INSERT ON incidents
+    BEGIN
+        INSERT INTO incidents_fts(rowid, {columns})
+        VALUES (NEW.id, NEW.report_id, NEW.title, NEW.failure_cause_text, NEW.technical_summary);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_fts_update
+    AFTER UPDATE OF {columns} ON incidents
+    BEGIN
+        INSERT INTO incidents_fts(incidents_fts, rowid, {columns})
+        VALUES ('delete', OLD.id, OLD.report_id, OLD.title, OLD.failure_cause_text, OLD.technical_summary);
+        INSERT INTO incidents_fts(rowid, {columns})
+        VALUES (NEW.id, NEW.report_id, NEW.title, NEW.failure_cause_text, NEW.technical_summary);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_incidents_fts_delete AFTER DELETE ON incidents
+    BEGIN
+        INSERT INTO incidents_fts(incidents_fts, rowid, {columns})
+        VALUES ('delete', OLD.id, OLD.report_id, OLD.title, OLD.failure_cause_text, OLD.technical_summary);
+    END;
+""".replace("{columns}", FTS_COLUMNS)
+
+UNIT_COLUMNS = (
+    "incident_id, report_id, position, plant_name, unit_name, capacity_mw, "
+    "technology_type, disconnection_time, normalization_time, raw"
+)
+
+
+def _unit_values(incident: str) -> str:
+    """SELECT list turning one json_each() row of an incident into a unit row"""
+    def text(field):
+        return f"IFNULL(CAST(json_extract(value, '$.{field}') AS TEXT), '')"
+    return ", ".join([
+        f"{incident}.id",
+        f"{incident}.report_id",
+        "CAST(key AS INTEGER)",
+        text("plant_name"),
+        text("unit_name"),
+        "CAST(json_extract(value, '$.capacity_mw') AS REAL)",
+        text("technology_type"),
+        text("disconnection_time"),
+        text("normalization_time"),
+        "json(value)"
+    ])
+
+
+# Sort name -> SQL expression; each one has an index on (expression, rowid)
+INCIDENT_SORTS = {
+    "failure_date": "failure_date",
+    "report_id": "report_id",
+    "disconnected_mw": "IFNULL(disconnected_mw, 0.0)"
+}
+
+UNIT_SORTS = {
+    "capacity_mw": "IFNULL(capacity_mw, -1.0)",
+    "plant_name": "plant_name",
+    "disconnection_time": "disconnection_time",
+    "report_id": "report_id"
+}
+
+INCIDENT_FIELDS = (
+    "id, report_id, title, failure_date, failure_time, "
+    "disconnected_mw, classification, document_pages"
+)
+
+UNIT_FIELDS = (
+    "id, report_id, position, plant_name, unit_name, capacity_mw, "
+    "technology_type, disconnection_time, normalization_time"
+)
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """(sort value, id) of a cursor; ValueError if it was not made by encode_cursor"""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(row_id, int) or isinstance(sort_value, (list, dict)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return sort_value, row_id
+
+
+def fts_query(term: str) -> str:
+    """FTS5 query matching every word of term as a token prefix"""
+    words = [word.replace('"', '""') for word in term.split()]
+    return " ".join(f'"{word}"*' for word in words if word)
+
+
+class SchemaNotReady(RuntimeError):
+    """The database has not been migrated with ensure_schema() yet"""
+
+
+class IncidentStore:
+    """Keyset-paginated queries over the incidents database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # Set on first query: whether incidents_fts is trigger-maintained, and
+        # whether the unit table exists
+        self._fts = None
+        self._units = None
+
+    def get_connection(self):
+        db_path = str(self.db_path)
+        conn = sqlite3.connect(db_path, uri=db_path.startswith("file:"))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def ensure_schema(self) -> Dict[str, int]:
+        """
+        Migrate the database: unit table, FTS index, triggers and indexes
+
+        Backfills the unit table from incidents.generation_units when it is
+        created, and rebuilds incidents_fts when its triggers are created (the
+        index may have drifted before) or when it does not cover every incident.
+        """
+        stats = {"units_backfilled": 0, "fts_rebuilt": 0}
+        conn = self.get_connection()
+        try:
+            existing = {
+                row["name"] for row in
+                conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
+            }
+            if "incidents" not in existing:
+                return stats
+
+            script = SCHEMA.replace("{columns}", UNIT_COLUMNS).replace("{values}", _unit_values("NEW"))
+            if "incident_generation_units" not in existing:
+                script += f"""
+                    INSERT INTO incident_generation_units ({UNIT_COLUMNS})
+                    SELECT {_unit_values("incidents")}
+                    FROM incidents, json_each(incidents.generation_units)
+                    WHERE json_valid(incidents.generation_units)
+                      AND json_type(incidents.generation_units) = 'array'
+                      AND json_each.type = 'object';
+                """
+            # One transaction, so the table never exists without its backfill
+            conn.executescript(f"BEGIN; {script} COMMIT;")
+            if "incident_generation_units" not in existing:
+                stats["units_backfilled"] = conn.execute(
+                    "SELECT COUNT(*) FROM incident_generation_units"
+                ).fetchone()[0]
+
+            self._sync_fts(conn, stats)
+        finally:
+            conn.close()
+        self._fts = self._units = None
+        return stats
+
+    @staticmethod
+    def _sync_fts(conn, stats):
+        """Create incidents_fts and its triggers; rebuild the index if it may be stale"""
+        triggers = {
+            row["name"] for row in
+            conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        }
+        try:
+            conn.executescript(f"BEGIN; {FTS_SCHEMA} COMMIT;")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE scans
+            conn.rollback()
+            return
+        with conn:
+            indexed = conn.execute("SELECT COUNT(*) FROM incidents_fts_docsize").fetchone()[0]
+            total = conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+            if not triggers.issuperset(FTS_TRIGGERS) or indexed != total:
+                conn.execute("INSERT INTO incidents_fts(incidents_fts) VALUES ('rebuild')")
+                stats["fts_rebuilt"] = 1
+
+    def _ensure(self):
+        """Read which parts of the schema exist (once per store; never writes)"""
+        if self._fts is not None:
+            return
+        conn = self.get_connection()
+        try:
+            names = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master")}
+        finally:
+            conn.close()
+        # Without its triggers the index may lag behind edits: use LIKE instead
+        self._fts = "incidents_fts" in names and names.issuperset(FTS_TRIGGERS)
+        self._units = "incident_generation_units" in names
+
+    # ------------------------------------------------------------------
+    # Keyset pagination
+    # ------------------------------------------------------------------
+
+    def _keyset(self, table: str, fields: str, sorts: Dict[str, str], sort: str,
+                descending: bool, limit: int, cursor: Optional[str],
+                where: List[str], params: List[Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        Rows of one page, then the cursor of the next one
+
+        The returned iterator yields ("item", row dict) for each row and finally
+        ("cursor", str or None); rows are read from the SQLite cursor one at a
+        time. The sort and cursor are checked here, before anything is read, so
+        a bad request fails before a response starts streaming.
+        """
+        if sort not in sorts:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {sorted(sorts)}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        key = sorts[sort]
+        where = list(where)
+        params = list(params)
+
+        if cursor:
+            sort_value, row_id = decode_cursor(cursor)
+            # Spelled out rather than as a row value, so expression indexes are seeked too
+            op = "<" if descending else ">"
+            where.append(f"{key} {op}= ? AND ({key} {op} ? OR {table}.id {op} ?)")
+            params.extend([sort_value, sort_value, row_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"""
+            SELECT {fields}, {key} AS sort_key FROM {table}
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {key} {direction}, {table}.id {direction}
+            LIMIT ?
+        """
+        params.append(limit + 1)
+        return self._page_rows(sql, params, limit)
+
+    def _page_rows(self, sql: str, params: List[Any], limit: int) -> Iterator[Tuple[str, Any]]:
+        conn = self.get_connection()
+        try:
+            last = None
+            served = 0
+            for row in conn.execute(sql, params):
+                if served == limit:
+                    yield "cursor", encode_cursor(last["sort_key"], last["id"])
+                    return
+                item = dict(row)
+                del item["sort_key"]
+                yield "item", item
+                last = row
+                served += 1
+            yield "cursor", None
+        finally:
+            conn.close()
+
+    def _incident_query(self, classification=None, date_from=None, date_to=None,
+                        min_mw=None, search=None) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        if classification:
+            where.append("classification = ?")
+            params.append(classification)
+        if date_from:
+            where.append("failure_date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("failure_date <= ?")
+            params.append(date_to)
+        if min_mw is not None:
+            where.append("IFNULL(disconnected_mw, 0.0) >= ?")
+            params.append(float(min_mw))
+        if search:
+            query = fts_query(search)
+            if self._fts and query:
+                where.append(
+                    "incidents.id IN (SELECT rowid FROM incidents_fts WHERE incidents_fts MATCH ?"
+                    " UNION SELECT id FROM incidents WHERE classification = ? COLLATE NOCASE)"
+                )
+                params.extend([f"{{title failure_cause_text}} : ({query})", search.strip()])
+            else:
+                pattern = f"%{search}%"
+                where.append("(title LIKE ? OR failure_cause_text LIKE ? OR classification LIKE ?)")
+                params.extend([pattern, pattern, pattern])
+        return where, params
+
+    def iter_incidents(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                       sort: str = "failure_date", descending: bool = True,
+                       **filters) -> Iterator[Tuple[str, Any]]:
+        """
+        One page of incidents, see _keyset()
+
+        Filters: classification, date_from, date_to (ISO dates), min_mw, search
+        """
+        self._ensure()
+        where, params = self._incident_query(**filters)
+        return self._keyset("incidents", INCIDENT_FIELDS, INCIDENT_SORTS, sort,
+                            descending, limit, cursor, where, params)
+
+    def iter_generation_units(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                              sort: str = "capacity_mw", descending: bool = True,
+                              report_id: Optional[str] = None, technology: Optional[str] = None,
+                              plant: Optional[str] = None,
+                              min_capacity: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        One page of generation units, see _keyset()
+
+        Filters: report_id, technology (exact), plant (name prefix), min_capacity (MW)
+
+        Raises SchemaNotReady if the database was never migrated.
+        """
+        self._ensure()
+        if not self._units:
+            raise SchemaNotReady(
+                f"{self.db_path} has no incident_generation_units table; "
+                f"run: python shared_platform/web/incident_store.py {self.db_path}"
+            )
+        where, params = [], []
+        if report_id:
+            where.append("report_id = ?")
+            params.append(report_id)
+        if technology:
+            where.append("technology_type = ?")
+            params.append(technology)
+        if plant:
+            # Range on the plant_name index instead of LIKE 'plant%'
+            where.append("plant_name >= ? AND plant_name < ?")
+            params.extend([plant, plant + "\U0010ffff"])
+        if min_capacity is not None:
+            where.append("IFNULL(capacity_mw, -1.0) >= ?")
+            params.append(float(min_capacity))
+        return self._keyset("incident_generation_units", UNIT_FIELDS, UNIT_SORTS, sort,
+                            descending, limit, cursor, where, params)
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def collect(page: Iterator[Tuple[str, Any]]) -> Dict[str, Any]:
+        """{"items": [...], "next_cursor": ...} of a page"""
+        items, next_cursor = [], None
+        for kind, value in page:
+            if kind == "item":
+                items.append(value)
+            else:
+                next_cursor = value
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def stream_json(page: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+        """The same document as collect(), written out one item at a time"""
+        yield '{"items": ['
+        first = True
+        next_cursor = None
+        for kind, value in page:
+            if kind == "item":
+                yield ("" if first else ",") + json.dumps(value, ensure_ascii=False)
+                first = False
+            else:
+                next_cursor = value
+        yield "], " + f'"next_cursor": {json.dumps(next_cursor)}' + "}"
+
+
+def main():
+    """Migrate a database for the viewer: python incident_store.py <database>"""
+    if len(sys.argv) != 2:
+        print("Usage: python incident_store.py <database>")
+        return
+    stats = IncidentStore(sys.argv[1]).ensure_schema()
+    print(f"🗂️ Generation units backfilled: {stats['units_backfilled']}, "
+          f"FTS index rebuilt: {'yes' if stats['fts_rebuilt'] else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,31 @@ Flask-based web viewer for the database
 
 import sqlite3
 import json
-from flask import Flask, render_template, request, jsonify
+import sys
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context, url_for
 from pathlib import Path
 
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared_platform.web.incident_store import IncidentStore, SchemaNotReady, DEFAULT_PAGE_SIZE
+
 app = Flask(__name__)
 
 class WebViewer:
     def __init__(self, db_path: str = "power_system_analysis.db"):
         self.db_path = db_path
+        self.store = IncidentStore(db_path)
         
     def get_connection(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
         
-    def get_incidents(self):
-        with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT report_id, title, failure_date, failure_time, 
-                       disconnected_mw, classification, document_pages
-                FROM incidents
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+    def get_incidents(self, limit=DEFAULT_PAGE_SIZE, cursor=None, **params):
+        """One page of incidents: {"items": [...], "next_cursor": ...}"""
+        return self.store.collect(self.store.iter_incidents(limit, cursor, **params))
             
     def get_incident_details(self, report_id):
         with self.get_connection() as conn:
@@ -45,43 +48,70 @@ class WebViewer:
                 return incident
             return None
             
-    def get_generation_units(self, report_id=None):
-        with self.get_connection() as conn:
-            if report_id:
-                cursor = conn.execute("""
-                    SELECT generation_units FROM incidents WHERE report_id = ?
-                """, (report_id,))
-            else:
-                cursor = conn.execute("SELECT generation_units FROM incidents")
-                
-            units = []
-            for row in cursor.fetchall():
-                if row['generation_units']:
-                    units.extend(json.loads(row['generation_units']))
-            return units
+    def get_generation_units(self, report_id=None, limit=DEFAULT_PAGE_SIZE, cursor=None, **params):
+        """One page of generation units from the normalised unit table"""
+        if report_id:
+            params.setdefault("sort", "report_id")
+        return self.store.collect(
+            self.store.iter_generation_units(limit, cursor, report_id=report_id, **params)
+        )
             
-    def search_incidents(self, search_term):
-        with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    incidents.report_id,
-                    incidents.title,
-                    incidents.failure_date,
-                    incidents.classification
-                FROM incidents
-                WHERE incidents.title LIKE ? 
-                   OR incidents.failure_cause_text LIKE ?
-                   OR incidents.classification LIKE ?
-            """, (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-            return [dict(row) for row in cursor.fetchall()]
+    def search_incidents(self, search_term, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """Incidents matching every word of search_term (title/cause prefixes or classification)"""
+        return self.get_incidents(limit, cursor, search=search_term)
 
 viewer = WebViewer()
 
+def page_args():
+    """Pagination arguments of the request: limit, cursor, sort, descending"""
+    args = {
+        "limit": request.args.get("limit", DEFAULT_PAGE_SIZE, type=int),
+        "cursor": request.args.get("cursor") or None,
+        "descending": request.args.get("order", "desc") != "asc"
+    }
+    if request.args.get("sort"):
+        args["sort"] = request.args["sort"]
+    return args
+
+def incident_filters():
+    filters = {
+        "classification": request.args.get("classification"),
+        "date_from": request.args.get("from"),
+        "date_to": request.args.get("to"),
+        "min_mw": request.args.get("min_mw", type=float),
+        "search": request.args.get("q")
+    }
+    return {key: value for key, value in filters.items() if value is not None}
+
+def unit_filters():
+    filters = {
+        "report_id": request.args.get("report_id"),
+        "technology": request.args.get("technology"),
+        "plant": request.args.get("plant"),
+        "min_capacity": request.args.get("min_capacity", type=float)
+    }
+    return {key: value for key, value in filters.items() if value is not None}
+
+def next_page_url(next_cursor):
+    """The current view with the same filters, sort and order, at next_cursor"""
+    if not next_cursor:
+        return None
+    args = request.args.to_dict(flat=False)
+    args["cursor"] = next_cursor
+    return url_for(request.endpoint, **args)
+
+def stream_page(page):
+    """Streamed {"items": [...], "next_cursor": ...} response"""
+    return Response(stream_with_context(IncidentStore.stream_json(page)), mimetype='application/json')
+
 @app.route('/')
 def index():
     """Main dashboard"""
-    incidents = viewer.get_incidents()
-    return render_template('index.html', incidents=incidents)
+    try:
+        page = viewer.get_incidents(**page_args(), **incident_filters())
+    except ValueError as e:
+        return str(e), 400
+    return render_template('index.html', incidents=page["items"], next_url=next_page_url(page["next_cursor"]))
 
 @app.route('/incident/<report_id>')
 def incident_detail(report_id):
@@ -94,17 +124,45 @@ def incident_detail(report_id):
 @app.route('/generation')
 def generation():
     """Generation units view"""
-    units = viewer.get_generation_units()
-    return render_template('generation.html', units=units)
+    try:
+        page = viewer.get_generation_units(**page_args(), **unit_filters())
+    except ValueError as e:
+        return str(e), 400
+    except SchemaNotReady as e:
+        return str(e), 503
+    return render_template('generation.html', units=page["items"], next_url=next_page_url(page["next_cursor"]))
+
+@app.route('/api/incidents')
+def incidents_api():
+    """Incidents, keyset-paginated: ?limit=&cursor=&sort=&order=&classification=&from=&to=&min_mw=&q="""
+    try:
+        page = viewer.store.iter_incidents(**page_args(), **incident_filters())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return stream_page(page)
+
+@app.route('/api/generation_units')
+def generation_units_api():
+    """Generation units, keyset-paginated: ?limit=&cursor=&sort=&order=&report_id=&technology=&plant=&min_capacity="""
+    try:
+        page = viewer.store.iter_generation_units(**page_args(), **unit_filters())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SchemaNotReady as e:
+        return jsonify({"error": str(e)}), 503
+    return stream_page(page)
 
 @app.route('/api/search')
 def search_api():
     """Search API endpoint"""
     term = request.args.get('q', '')
-    if term:
-        results = viewer.search_incidents(term)
-        return jsonify(results)
-    return jsonify([])
+    if not term:
+        return jsonify({"items": [], "next_cursor": None})
+    try:
+        page = viewer.store.iter_incidents(**page_args(), search=term)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return stream_page(page)
 
 # Create templates directory and files
 def create_templates():
@@ -187,6 +245,11 @@ def create_templates():
                         </tbody>
                     </table>
                 </div>
+                {% if next_url %}
+                <a href="{{ next_url }}" class="btn btn-outline-secondary">
+                    Next page <i class="fas fa-arrow-right"></i>
+                </a>
+                {% endif %}
             </div>
         </div>
     </div>
@@ -201,7 +264,7 @@ document.getElementById('searchInput').addEventListener('input', function(e) {
         fetch(`/api/search?q=${encodeURIComponent(searchTerm)}`)
             .then(response => response.json())
             .then(data => {
-                console.log('Search results:', data);
+                console.log('Search results:', data.items);
                 // Update table with search results
             });
     }
@@ -304,6 +367,55 @@ document.getElementById('searchInput').addEventListener('input', function(e) {
         {% endif %}
     </div>
 </div>
+{% endblock %}"""
+    
+    # Generation units template
+    generation_template = """{% extends "base.html" %}
+
+{% block content %}
+<div class="row">
+    <div class="col-12">
+        <h1><i class="fas fa-industry"></i> Generation Units</h1>
+        
+        <div class="card">
+            <div class="card-body">
+                <div class="table-responsive">
+                    <table class="table table-striped table-sm">
+                        <thead>
+                            <tr>
+                                <th>Report ID</th>
+                                <th>Plant</th>
+                                <th>Unit</th>
+                                <th>Capacity (MW)</th>
+                                <th>Technology</th>
+                                <th>Disconnection Time</th>
+                                <th>Restoration Time</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            {% for unit in units %}
+                            <tr>
+                                <td><a href="/incident/{{ unit.report_id }}">{{ unit.report_id }}</a></td>
+                                <td>{{ unit.plant_name }}</td>
+                                <td>{{ unit.unit_name }}</td>
+                                <td>{{ unit.capacity_mw }}</td>
+                                <td><span class="badge bg-info">{{ unit.technology_type }}</span></td>
+                                <td>{{ unit.disconnection_time }}</td>
+                                <td>{{ unit.normalization_time }}</td>
+                            </tr>
+                            {% endfor %}
+                        </tbody>
+                    </table>
+                </div>
+                {% if next_url %}
+                <a href="{{ next_url }}" class="btn btn-outline-secondary">
+                    Next page <i class="fas fa-arrow-right"></i>
+                </a>
+                {% endif %}
+            </div>
+        </div>
+    </div>
+</div>
 {% endblock %}"""
     
     # Write templates
@@ -316,6 +428,9 @@ document.getElementById('searchInput').addEventListener('input', function(e) {
     with open(templates_dir / "incident_detail.html", "w", encoding="utf-8") as f:
         f.write(incident_detail_template)
 
+    with open(templates_dir / "generation.html", "w", encoding="utf-8") as f:
+        f.write(generation_template)
+
 if __name__ == "__main__":
     create_templates()
     print("🌐 Starting web interface...")
@@ -0,0 +1,301 @@
+"""CrawlRunner and CoordinadorBaseScraper against a local static HTTP site: rate limits, interruption and resume"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.scrapers.coordinador_cl.coordinador_base_scraper import CoordinadorBaseScraper  # noqa: E402
+from shared_platform.scrapers.coordinador_cl.crawl_runtime import (  # noqa: E402
+    CheckpointLedger, CrawlRunner, HostRateLimiter
+)
+
+SECTIONS = [f"operaciones/seccion-{i}" for i in range(8)]
+RATE = 10.0
+
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, sections):
+        super().__init__(("127.0.0.1", 0), SiteHandler)
+        self.pages = {f"/{section}": f"<html><h1>{section}</h1></html>".encode() for section in sections}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def requested(self):
+        with self.lock:
+            return [path.lstrip("/") for _, path in self.requests]
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), self.path))
+        body = server.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Response:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+
+class FixturePage:
+    """The part of a Playwright page the crawl uses, over urllib"""
+
+    def __init__(self, context):
+        self.context = context
+        self.response = None
+
+    async def goto(self, url, **kwargs):
+        self.response = await asyncio.to_thread(self._get, url)
+        return self.response
+
+    @staticmethod
+    def _get(url):
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return Response(response.status, response.read())
+        except urllib.error.HTTPError as e:
+            return Response(e.code, b"")
+
+    async def wait_for_timeout(self, milliseconds):
+        pass
+
+    async def evaluate(self, script):
+        return {}
+
+    async def close(self):
+        self.context.open_pages -= 1
+
+
+class FixtureContext:
+    def __init__(self):
+        self.open_pages = 0
+        self.peak_pages = 0
+
+    async def new_page(self):
+        self.open_pages += 1
+        self.peak_pages = max(self.peak_pages, self.open_pages)
+        return FixturePage(self)
+
+
+class SectionScraper:
+    """Same flow as CoordinadorBaseScraper.scrape_section, minus the browser"""
+
+    def __init__(self, base_url, output_dir, limiter):
+        self.base_url = base_url
+        self.output_dir = output_dir
+        self.limiter = limiter
+        self.saved = []
+
+    async def scrape_section(self, page, section_path):
+        url = f"{self.base_url}/{section_path}"
+        await self.limiter.acquire(url)
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        if response.status != 200:
+            return None
+        path = self.output_dir / f"{section_path.replace('/', '_')}_extraction.json"
+        path.write_text(json.dumps({'section_path': section_path, 'html': response.body.decode()}))
+        self.saved.append(section_path)
+        return path
+
+
+class FixtureBrowser:
+    """Stands in for both the Playwright driver and the browser"""
+
+    async def close(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class FixtureScraper(CoordinadorBaseScraper):
+    def __init__(self, base_url, output_dir):
+        super().__init__("operaciones", base_url=base_url, output_dir=output_dir, requests_per_second=RATE)
+        self.saved = []
+
+    async def create_browser_context(self):
+        return FixtureBrowser(), FixtureBrowser(), FixtureContext()
+
+    async def scrape_domain_data(self, page):
+        return {'html': page.response.body.decode()}
+
+    def save_extraction(self, data, filename):
+        path = super().save_extraction(data, filename)
+        self.saved.append(data['section_path'])
+        return path
+
+
+@pytest.fixture
+def site():
+    server = SiteServer(SECTIONS)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def assert_rate_respected(requests):
+    times = sorted(timestamp for timestamp, _ in requests)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    # Small allowance for the time between the limiter slot and the server seeing the request
+    assert min(gaps) >= 1.0 / RATE - 0.02
+
+
+async def crawl_until_interrupted(run, scraper, stop_after):
+    """Start a crawl and cancel it, like a killed run, once scraper has saved stop_after sections"""
+    crawl = asyncio.create_task(run)
+    while len(scraper.saved) < stop_after:
+        await asyncio.sleep(0.01)
+    crawl.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await crawl
+
+
+def test_interrupted_crawl_resumes_without_repeating_sections(site, tmp_path):
+    ledger_path = tmp_path / ".operaciones_crawl_ledger.jsonl"
+    sections = SECTIONS + ["operaciones/no-existe"]
+
+    # First run: killed after three sections
+    context = FixtureContext()
+    scraper = SectionScraper(site.base_url, tmp_path, HostRateLimiter(RATE))
+    runner = CrawlRunner(context, CheckpointLedger(ledger_path), concurrency=3, max_attempts=1)
+    asyncio.run(crawl_until_interrupted(runner.run(sections, scraper.scrape_section), scraper, stop_after=3))
+
+    assert context.open_pages == 0
+    assert context.peak_pages == 3
+    assert_rate_respected(site.requests)
+    completed = {
+        section for section, entry in CheckpointLedger(ledger_path).entries.items()
+        if entry['status'] == 'done'
+    }
+    assert len(completed) >= 3
+    assert completed < set(SECTIONS)
+
+    # Resumed run: completed sections are skipped and not requested again
+    first_requests = len(site.requests)
+    context = FixtureContext()
+    scraper = SectionScraper(site.base_url, tmp_path, HostRateLimiter(RATE))
+    runner = CrawlRunner(context, CheckpointLedger(ledger_path), concurrency=3, max_attempts=1)
+    summary = asyncio.run(runner.run(sections, scraper.scrape_section))
+
+    assert set(summary['skipped']) == completed
+    assert set(summary['done']) == set(SECTIONS) - completed
+    assert summary['failed'] == ["operaciones/no-existe"]
+    resumed_requests = site.requested()[first_requests:]
+    assert sorted(resumed_requests) == sorted(set(sections) - completed)
+    assert_rate_respected(site.requests[first_requests:])
+    assert context.open_pages == 0
+
+    # A third run only retries the failed section
+    scraper = SectionScraper(site.base_url, tmp_path, HostRateLimiter(RATE))
+    runner = CrawlRunner(FixtureContext(), CheckpointLedger(ledger_path), concurrency=3, max_attempts=1)
+    summary = asyncio.run(runner.run(sections, scraper.scrape_section))
+    assert set(summary['skipped']) == set(SECTIONS)
+    assert summary['failed'] == ["operaciones/no-existe"]
+
+
+def test_rate_limits_are_per_host(site):
+    limiter = HostRateLimiter(RATE, rates={"slow.example": 1.0})
+
+    async def acquire_all():
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(f"{site.base_url}/{section}") for section in SECTIONS[:4]))
+        fast_done = time.monotonic() - started
+        await limiter.acquire("https://slow.example/a")
+        await limiter.acquire("https://slow.example/b")
+        return fast_done, time.monotonic() - started
+
+    fast_done, total = asyncio.run(acquire_all())
+    assert 3 / RATE - 0.02 <= fast_done < 1.0
+    # The slow host waits a full second for its second request, independently of the fast one
+    assert total >= fast_done + 0.9
+
+
+def test_ledger_ignores_torn_and_foreign_lines(tmp_path):
+    output = tmp_path / "seccion_extraction.json"
+    output.write_text("{}")
+    ledger_path = tmp_path / "ledger.jsonl"
+    ledger_path.write_text("\n".join([
+        json.dumps({'section_path': 'a', 'status': 'done', 'output': str(output)}),
+        json.dumps({'status': 'done', 'output': str(output)}),
+        json.dumps(['b', 'done']),
+        json.dumps({'section_path': 'c', 'status': 'done', 'output': str(tmp_path / "borrado.json")}),
+        '{"section_path": "d", "sta',
+    ]))
+
+    ledger = CheckpointLedger(ledger_path)
+    assert set(ledger.entries) == {'a', 'c'}
+    assert ledger.is_complete('a')
+    # Done, but its output is gone: scraped again
+    assert not ledger.is_complete('c')
+    assert not ledger.is_complete('d')
+
+
+def test_run_scraper_refreshes_everything_after_a_complete_run(site, tmp_path):
+    scraper = FixtureScraper(site.base_url, tmp_path)
+    summary = asyncio.run(scraper.run_scraper(SECTIONS, concurrency=3))
+    assert sorted(summary['done']) == sorted(SECTIONS)
+    assert not scraper.ledger_path.exists()
+    extraction = json.loads((tmp_path / "operaciones_operaciones_seccion-0_extraction.json").read_text())
+    assert extraction['section_path'] == "operaciones/seccion-0"
+    assert "seccion-0" in extraction['domain_specific']['html']
+
+    # A later scheduled run scrapes the whole site again
+    summary = asyncio.run(FixtureScraper(site.base_url, tmp_path).run_scraper(SECTIONS, concurrency=3))
+    assert sorted(summary['done']) == sorted(SECTIONS)
+    assert summary['skipped'] == []
+    assert len(site.requests) == 2 * len(SECTIONS)
+
+
+def test_run_scraper_resumes_interrupted_and_failed_runs(site, tmp_path):
+    sections = SECTIONS + ["operaciones/no-existe"]
+
+    # Killed partway: the ledger survives
+    scraper = FixtureScraper(site.base_url, tmp_path)
+    run = scraper.run_scraper(sections, concurrency=3, max_attempts=1)
+    asyncio.run(crawl_until_interrupted(run, scraper, stop_after=3))
+    completed = set(scraper.saved)
+    assert scraper.ledger_path.exists()
+
+    # Resumed: completed sections are skipped; the failed one keeps the ledger alive
+    summary = asyncio.run(FixtureScraper(site.base_url, tmp_path).run_scraper(sections, concurrency=3, max_attempts=1))
+    assert set(summary['skipped']) >= completed
+    assert summary['failed'] == ["operaciones/no-existe"]
+    assert scraper.ledger_path.exists()
+
+    # Once the missing section is published, the run completes and the ledger is cleared
+    site.pages["/operaciones/no-existe"] = b"<html>ahora existe</html>"
+    summary = asyncio.run(FixtureScraper(site.base_url, tmp_path).run_scraper(sections, concurrency=3))
+    assert summary['done'] == ["operaciones/no-existe"]
+    assert set(summary['skipped']) == set(SECTIONS)
+    assert not scraper.ledger_path.exists()
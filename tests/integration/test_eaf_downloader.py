@@ -0,0 +1,230 @@
+"""EAFDownloader against a local HTTP server with ETag, Last-Modified and Range support"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from domains.operaciones.anexos_eaf.shared.scrapers.eaf_downloader import EAFDownloader  # noqa: E402
+
+LAST_MODIFIED = "Mon, 03 Mar 2025 10:00:00 GMT"
+
+
+class DocumentServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DocumentHandler)
+        # path -> (body, etag, last_modified)
+        self.documents = {}
+        self.cut_once = set()
+        self.garbled_once = set()
+        self.body_bytes = {}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def publish(self, path, body, etag=True, last_modified=True):
+        self.documents[path] = (
+            body,
+            f'"{hashlib.md5(body).hexdigest()}"' if etag else None,
+            LAST_MODIFIED if last_modified else None
+        )
+
+    def sent(self, path):
+        return self.body_bytes.get(path, 0)
+
+
+class DocumentHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path not in server.documents:
+            self.send_error(404)
+            return
+        body, etag, last_modified = server.documents[self.path]
+
+        with server.lock:
+            garbled = self.path in server.garbled_once
+            server.garbled_once.discard(self.path)
+        if garbled:
+            # Not HTTP at all: the client fails with http.client.BadStatusLine
+            self.wfile.write(b"garbage\r\n\r\n")
+            self.close_connection = True
+            return
+
+        if etag and self.headers.get('If-None-Match') == etag:
+            return self._not_modified()
+        if not etag and last_modified and self.headers.get('If-Modified-Since') == last_modified:
+            return self._not_modified()
+
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') in (etag, last_modified):
+            start = int(range_header.split('=')[1].rstrip('-'))
+
+        payload = body[start:]
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header('Content-Length', str(len(payload)))
+        if etag:
+            self.send_header('ETag', etag)
+        if last_modified:
+            self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+
+        with server.lock:
+            cut = self.path in server.cut_once
+            server.cut_once.discard(self.path)
+        if cut:
+            # Drop the connection halfway through the body
+            payload = payload[:len(payload) // 2]
+            self.close_connection = True
+        self.wfile.write(payload)
+        with server.lock:
+            server.body_bytes[self.path] = server.body_bytes.get(self.path, 0) + len(payload)
+
+    def _not_modified(self):
+        self.send_response(304)
+        self.end_headers()
+
+
+@pytest.fixture
+def server():
+    server = DocumentServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def document(seed, size=200_000):
+    return hashlib.sha256(seed.encode()).digest() * (size // 32)
+
+
+def statuses(results):
+    return {result.filename: result.status for result in results}
+
+
+def test_sync_resume_conditional_and_changed(server, tmp_path):
+    server.publish("/etag.pdf", document("etag"))
+    server.publish("/modified.pdf", document("modified"), etag=False)
+    server.publish("/plain.pdf", document("plain"), etag=False, last_modified=False)
+    server.cut_once.add("/etag.pdf")
+    urls = [server.base_url + path for path in ("/etag.pdf", "/modified.pdf", "/plain.pdf")]
+    downloader = EAFDownloader(tmp_path, max_workers=3, timeout=5, retry_delay=0)
+
+    # First sync: everything is new; the cut transfer resumes from its .part
+    results = downloader.sync(urls)
+    assert statuses(results) == {"etag.pdf": "downloaded", "modified.pdf": "downloaded", "plain.pdf": "downloaded"}
+    assert results[0].resumed
+    assert server.sent("/etag.pdf") == len(document("etag"))
+    for name in ("etag", "modified", "plain"):
+        assert (tmp_path / f"{name}.pdf").read_bytes() == document(name)
+    assert not list(tmp_path.glob("*.part"))
+
+    manifest = json.loads((tmp_path / "document_metadata.json").read_text())
+    assert manifest["etag.pdf"]["sha256"] == hashlib.sha256(document("etag")).hexdigest()
+    assert "partial" not in manifest["etag.pdf"]
+
+    # Second sync: 304 for documents with validators, a same-hash body otherwise
+    sent_before = dict(server.body_bytes)
+    results = downloader.sync(urls)
+    assert statuses(results) == {"etag.pdf": "not_modified", "modified.pdf": "not_modified", "plain.pdf": "unchanged"}
+    assert not any(result.changed for result in results)
+    assert server.sent("/etag.pdf") == sent_before["/etag.pdf"]
+    assert server.sent("/modified.pdf") == sent_before["/modified.pdf"]
+
+    # A changed document is the only one re-downloaded
+    server.publish("/etag.pdf", document("etag v2"))
+    results = downloader.sync(urls)
+    assert statuses(results) == {"etag.pdf": "downloaded", "modified.pdf": "not_modified", "plain.pdf": "unchanged"}
+    assert (tmp_path / "etag.pdf").read_bytes() == document("etag v2")
+
+    log = json.loads((tmp_path / "download_log.json").read_text())
+    assert len(log) == 9
+
+
+def test_damaged_local_copy_is_restored(server, tmp_path):
+    body = document("damaged")
+    server.publish("/report.pdf", body)
+    url = server.base_url + "/report.pdf"
+    downloader = EAFDownloader(tmp_path, timeout=5, retry_delay=0)
+    assert downloader.fetch(url).status == "downloaded"
+
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"\0" * len(body))
+    os.utime(path, (1, 1))
+
+    # Same content as the manifest, so nothing to reprocess, but the file is replaced
+    result = downloader.fetch(url)
+    assert result.status == "unchanged"
+    assert path.read_bytes() == body
+
+
+def test_changed_document_restarts_interrupted_transfer(server, tmp_path):
+    server.publish("/report.pdf", document("v1"))
+    server.cut_once.add("/report.pdf")
+    url = server.base_url + "/report.pdf"
+
+    downloader = EAFDownloader(tmp_path, timeout=5, max_attempts=1)
+    assert downloader.fetch(url).status == "failed"
+    assert (tmp_path / "report.pdf.part").exists()
+
+    # If-Range no longer matches: the server sends the whole new file
+    server.publish("/report.pdf", document("v2"))
+    result = EAFDownloader(tmp_path, timeout=5, max_attempts=1).fetch(url)
+    assert result.status == "downloaded"
+    assert not result.resumed
+    assert (tmp_path / "report.pdf").read_bytes() == document("v2")
+
+
+def test_parallel_sync_keeps_every_manifest_entry(server, tmp_path):
+    paths = [f"/doc_{i:03d}.pdf" for i in range(300)]
+    for path in paths:
+        server.publish(path, document(path, size=2048))
+    urls = [server.base_url + path for path in paths]
+
+    downloader = EAFDownloader(tmp_path, max_workers=32, timeout=5, retry_delay=0)
+    results = downloader.sync(urls)
+    assert all(result.status == "downloaded" for result in results)
+
+    manifest = json.loads((tmp_path / "document_metadata.json").read_text())
+    assert len(manifest) == len(paths)
+    assert not any('partial' in entry for entry in manifest.values())
+
+    results = EAFDownloader(tmp_path, max_workers=32, timeout=5).sync(urls)
+    assert all(result.status == "not_modified" for result in results)
+
+
+def test_protocol_errors_are_retried_and_logged(server, tmp_path):
+    server.publish("/report.pdf", document("report"))
+    server.publish("/other.pdf", document("other"))
+    url = server.base_url + "/report.pdf"
+
+    server.garbled_once.add("/report.pdf")
+    result = EAFDownloader(tmp_path, timeout=5, retry_delay=0).fetch(url)
+    assert result.status == "downloaded"
+
+    # Out of attempts: a failed result, not an exception escaping the pool
+    server.garbled_once.add("/other.pdf")
+    downloader = EAFDownloader(tmp_path / "single", max_attempts=1, timeout=5)
+    results = downloader.sync([url, server.base_url + "/other.pdf"])
+    assert statuses(results) == {"report.pdf": "downloaded", "other.pdf": "failed"}
+    assert results[1].error.startswith("BadStatusLine")
+    log = json.loads((tmp_path / "single" / "download_log.json").read_text())
+    assert [entry["status"] for entry in log] == ["downloaded", "failed"]
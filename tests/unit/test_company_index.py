@@ -0,0 +1,55 @@
+"""Tests for the persistent company index"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from ai_platform.core.company_index import CompanyIndex  # noqa: E402
+from ai_platform.knowledge_graph.extractors.gazetteer import Gazetteer  # noqa: E402
+
+
+@pytest.fixture
+def index(tmp_path):
+    gazetteer = Gazetteer()
+    gazetteer.add("Colbún", "companies", "Company")
+    gazetteer.add("Nehuenco", "power_plants", "PowerPlant")
+    index = CompanyIndex(str(tmp_path), gazetteer=gazetteer)
+    yield index
+    index.close()
+
+
+def chunk(content, companies=(), page=1):
+    return {
+        'content': content,
+        'metadata': {
+            'start_page': page,
+            'end_page': page,
+            'extracted_data': {'companies': list(companies), 'dates': []}
+        }
+    }
+
+
+def test_regex_names_resolve_to_gazetteer_entities(index):
+    index.add_chunk("eaf", 0, chunk("Colbún S.A. informó la falla de Nehuenco.", ["Colbún S.A."]))
+
+    mentions = index.find_mentions("colbun")
+    assert [(m['document'], m['chunk_index'], m['canonical_id']) for m in mentions] == [
+        ("eaf", 0, "cen:company:colbun")
+    ]
+    assert [entity['canonical_id'] for entity in index.search_prefix("colbun")] == ["cen:company:colbun"]
+    # The legal form is kept as a surface form of the same entity
+    assert index.find_mentions("colbun s.a.", prefix=False)[0]['canonical_id'] == "cen:company:colbun"
+
+
+def test_find_mentions_returns_each_chunk_once(index):
+    # Two entities matching the prefix in the same chunk
+    index.add_chunk("eaf", 0, chunk("Colbún y Colbún Transmisión S.A. reportaron.", ["Colbún Transmisión S.A."]))
+    index.add_chunk("eaf", 1, chunk("Colbún opera Nehuenco.", page=2))
+
+    assert len(index.search_prefix("colbun")) == 2
+    mentions = index.find_mentions("colbun", limit=2)
+    assert [(m['document'], m['chunk_index']) for m in mentions] == [("eaf", 0), ("eaf", 1)]
@@ -0,0 +1,130 @@
+"""Tests for the n-gram fuzzy match index against the linear difflib scan"""
+
+import random
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.utils.fuzzy_index import (  # noqa: E402
+    FuzzyIndex, NGramPostings, default_window, indel_distance, lcs_length,
+    ratio_upper_bound, scan_best_match
+)
+
+WORDS = (
+    "central unidad desconexion falla linea transformador protección diferencial "
+    "subestación interruptor frecuencia tensión consumo potencia generación informe "
+    "horas minutos operación sistema coordinador eléctrico nacional empresa"
+).split()
+
+
+def make_text(seed=3, words=900):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randint(0, 99)) for _ in range(words))
+
+
+def add_noise(text, rng, edits):
+    chars = list(text)
+    for _ in range(edits):
+        i = rng.randrange(len(chars))
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def lcs_reference(a, b):
+    previous = [0] * (len(b) + 1)
+    for char_a in a:
+        current = [0]
+        for j, char_b in enumerate(b, 1):
+            current.append(previous[j - 1] + 1 if char_a == char_b else max(previous[j], current[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("a, b", [
+    ("", "abc"), ("abc", "abc"), ("abcbdab", "bdcaba"), ("x" * 80, "x" * 70 + "y" * 10),
+    ("falla en la línea", "falla de linea"),
+])
+def test_lcs_and_bounds(a, b):
+    assert lcs_length(a, b) == lcs_reference(a, b)
+    assert indel_distance(a, b) == len(a) + len(b) - 2 * lcs_reference(a, b)
+    assert SequenceMatcher(None, a, b).ratio() <= ratio_upper_bound(a, b) + 1e-12
+
+
+def test_postings_and_query_grams():
+    index = NGramPostings("abcabcxyz", n=3)
+    assert index.postings["abc"] == [0, 3]
+    assert index.postings["xyz"] == [6]
+
+    grams, distinct = index.query_grams("abcxyzqq")
+    # Rarest first (ties in query order), with their offset; "yzq"/"zqq" are not in the text
+    assert grams == [("bcx", 1), ("cxy", 2), ("xyz", 3), ("abc", 0)]
+    assert distinct == 6
+    assert index.query_grams("abcxyzqq", max_grams=2)[0] == grams[:2]
+
+    votes = index.diagonal_votes([("abc", 0), ("bcx", 1), ("xyz", 3)])
+    assert votes[3] == 3  # Every gram places "abcxyz" at 3
+    assert votes[0] == 1
+
+
+def test_default_window_matches_the_scan():
+    assert default_window("a" * 10) == (100, 75)
+    assert default_window("a" * 400) == (400, 300)
+    assert default_window("abc", window=40, step=10) == (40, 10)
+
+
+def test_exact_fragment_is_found():
+    text = make_text()
+    index = FuzzyIndex(text)
+    start = 1500
+    query = text[start:start + 120]
+
+    # Windows are the scan's fixed chunks, so the fragment straddles two of them
+    match = index.best_match(query)
+    assert match.score > 0.6
+    assert match.start < start + len(query) and start < match.end
+    reference = scan_best_match(text, query)
+    assert (match.start, match.score) == (reference.start, reference.score)
+    assert text[match.start:match.end] == match.text
+
+
+def test_noisy_queries_agree_with_the_scan():
+    text = make_text()
+    index = FuzzyIndex(text)
+    rng = random.Random(11)
+
+    found = agreed = 0
+    for _ in range(25):
+        start = rng.randrange(0, len(text) - 200)
+        query = add_noise(text[start:start + rng.randint(60, 200)], rng, edits=8)
+        fast = index.best_match(query, threshold=0.4)
+        reference = scan_best_match(text, query, threshold=0.4)
+        if reference is None:
+            # The index verifies a subset of the scan's windows
+            assert fast is None
+            continue
+        found += 1
+        # Scores are SequenceMatcher ratios of a window, never better than the scan's best
+        assert fast is not None and fast.score <= reference.score + 1e-12
+        agreed += fast.start == reference.start
+    assert found >= 15
+    assert agreed >= found - 2
+
+
+def test_search_top_k_and_threshold():
+    text = make_text()
+    index = FuzzyIndex(text)
+    query = text[3000:3150]
+
+    matches = index.search(query, threshold=0.4, top_k=3)
+    assert 1 <= len(matches) <= 3
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    assert all(m.score > 0.4 for m in matches)
+
+    assert index.search("qqqqqqqqqqqqqqqqqqqqqqqq") == []
+    assert index.search("ab") == []  # Shorter than a gram
+    assert FuzzyIndex("corto").search("corto pero más largo que el texto") == []
@@ -0,0 +1,99 @@
+"""Tests for the Aho-Corasick gazetteer entity matcher"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from ai_platform.core.text_normalization import fold_text, tokenize  # noqa: E402
+from ai_platform.knowledge_graph.extractors.gazetteer import Gazetteer, normalize_for_id  # noqa: E402
+
+
+def make_gazetteer():
+    gazetteer = Gazetteer()
+    gazetteer.add("Enel Green Power Chile S.A.", "companies", "PowerCompany", aliases=["Enel Green Power"])
+    gazetteer.add("Enel Generación Chile S.A.", "companies", "PowerCompany", aliases=["Enel"])
+    gazetteer.add("Central Nehuenco", "power_plants", "PowerPlant", aliases=["Nehuenco"])
+    gazetteer.add("Región del Biobío", "locations", "Location")
+    return gazetteer
+
+
+def mentions(matches):
+    return [(match.surface, match.entry.canonical_id) for match in matches]
+
+
+def test_folding_keeps_offsets():
+    assert fold_text("Región del BIOBÍO") == "region del biobio"
+    assert len(fold_text("Ñuble – Ärger")) == len("Ñuble – Ärger")
+    assert tokenize("Central Nehuenco-II, Región") == ["central", "nehuenco", "ii", "region"]
+    assert normalize_for_id("Enel Generación Chile S.A.") == "enel_generacion_chile_sa"
+
+
+def test_leftmost_longest_on_word_boundaries():
+    text = "La central  NEHUENCO II de Enel Green Power, en la region del biobio; Enelsa no."
+    matches = make_gazetteer().find(text)
+
+    assert mentions(matches) == [
+        ("central  NEHUENCO", "cen:plant:central_nehuenco"),
+        ("Enel Green Power", "cen:company:enel_green_power_chile_sa"),
+        ("region del biobio", "cen:location:region_del_biobio"),
+    ]
+    for match in matches:
+        assert text[match.start:match.end] == match.surface
+
+
+def test_whitespace_runs_and_categories():
+    text = "Informe de Enel\nGeneración Chile S.A. sobre Nehuenco"
+    gazetteer = make_gazetteer()
+
+    assert mentions(gazetteer.find(text)) == [
+        ("Enel\nGeneración Chile S.A.", "cen:company:enel_generacion_chile_sa"),
+        ("Nehuenco", "cen:plant:central_nehuenco"),
+    ]
+    assert mentions(gazetteer.find(text, categories=["power_plants"])) == [
+        ("Nehuenco", "cen:plant:central_nehuenco"),
+    ]
+
+
+def test_add_after_build_does_not_duplicate_matches():
+    gazetteer = make_gazetteer()
+    text = "Falla en Nehuenco y en Colbún"
+    assert len(gazetteer.find(text)) == 1
+
+    gazetteer.add("Colbún S.A.", "companies", "PowerCompany", aliases=["Colbún"])
+    gazetteer.build()
+    gazetteer.build()
+    # Every output list holds each (length, entry) once, however often build() ran
+    for outputs in gazetteer._outputs:
+        assert len(outputs) == len(set(outputs))
+    assert mentions(gazetteer.find(text)) == [
+        ("Nehuenco", "cen:plant:central_nehuenco"),
+        ("Colbún", "cen:company:colbun_sa"),
+    ]
+
+
+def test_same_entry_is_registered_once():
+    gazetteer = make_gazetteer()
+    again = gazetteer.add("Central Nehuenco", "power_plants", "PowerPlant", aliases=["nehuenco", "NEHUENCO"])
+    assert len(gazetteer) == 4
+    assert again is gazetteer.entries["cen:plant:central_nehuenco"]
+    assert len(gazetteer.find("Nehuenco")) == 1
+
+
+def test_companies_table_adds_short_names(tmp_path):
+    db_path = tmp_path / "dark_data.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE companies (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO companies (name) VALUES (?)", [("Colbún S.A.",), ("Guacolda Energía SpA",)])
+    conn.commit()
+    conn.close()
+
+    gazetteer = Gazetteer()
+    assert gazetteer.load_companies_table(db_path) == 2
+    assert mentions(gazetteer.find("Colbún y Guacolda Energía")) == [
+        ("Colbún", "cen:company:colbun_sa"),
+        ("Guacolda Energía", "cen:company:guacolda_energia_spa"),
+    ]
+    assert Gazetteer().load_companies_table(tmp_path / "missing.db") == 0
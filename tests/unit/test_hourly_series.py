@@ -0,0 +1,141 @@
+"""Tests for the ANEXO 24-hour series parser and its use in the ANEXO 2 processor"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+anexos_root = project_root / "domains" / "operaciones" / "anexos_eaf"
+sys.path.insert(0, str(anexos_root / "shared" / "utilities"))
+
+from hourly_series import detect_hour_columns, parse_hourly_series, parse_page_series  # noqa: E402
+
+HOUR_X = {hour: 100.0 + 20.0 * hour for hour in range(1, 25)}
+TRAILING_X = (620.0, 650.0, 680.0)
+
+
+def word(x_centre, y, text, width=8.0):
+    return (x_centre - width / 2, y - 4.0, x_centre + width / 2, y + 4.0, text, 0, 0, 0)
+
+
+def table_row(y, label_words, values, trailing=()):
+    """Words of one row: label at the left, value per hour (None = blank cell), trailing columns"""
+    words = [word(20.0 + 30.0 * i, y, text, width=24.0) for i, text in enumerate(label_words)]
+    words += [word(HOUR_X[hour], y, f"{value:.1f}".replace('.', ','))
+              for hour, value in enumerate(values, start=1) if value is not None]
+    words += [word(x, y, f"{value:.1f}".replace('.', ','), width=14.0) for x, value in zip(TRAILING_X, trailing)]
+    return words
+
+
+ELBOCO = [0.0] * 6 + [5.0, 12.5, 20.0, 30.0, 35.5, 40.0, 40.0, 38.0, 30.0, 20.0, 10.0, 2.5] + [0.0] * 6
+QUEBRADA = [None if hour == 5 else float(hour) for hour in range(1, 25)]
+TOTAL_SEN = [8000.0 + 10 * hour for hour in range(1, 25)]
+
+
+@pytest.fixture
+def page_words():
+    words = [word(HOUR_X[hour], 50.0, str(hour)) for hour in range(1, 25)]
+    words += [word(x, 50.0, text, width=20.0) for x, text in zip(TRAILING_X, ("TOT.DIA", "DMAX", "DMED"))]
+    words += table_row(70.0, ["PFV-ELBOCO"], ELBOCO, (sum(ELBOCO), 40.0, 11.8))
+    # Hour 5 is blank; the reported total is off by far more than rounding
+    words += table_row(90.0, ["PMGD-PFV-QUEBRADA"], QUEBRADA, (500.0, 24.0, 12.5))
+    words += table_row(110.0, ["TOTAL", "SEN"], TOTAL_SEN)
+    # PyMuPDF does not return words in reading order
+    return words[::-1]
+
+
+def test_detect_hour_columns(page_words):
+    centres = detect_hour_columns(page_words)
+    assert centres is not None
+    np.testing.assert_allclose(centres, [HOUR_X[hour] for hour in range(1, 25)])
+
+
+def test_detect_hour_columns_without_header(page_words):
+    body = [w for w in page_words if w[1] > 60.0]
+    assert detect_hour_columns(body) is None
+    assert parse_page_series(body) is None
+
+
+def test_parse_page_series_aligns_values_to_hours(page_words):
+    table = parse_page_series(page_words, trailing=("total", "dmax", "dmed"))
+
+    assert table.labels == ["PFV-ELBOCO", "PMGD-PFV-QUEBRADA", "TOTAL SEN"]
+    assert table.values.shape == (3, 24)
+    np.testing.assert_allclose(table.values[0], ELBOCO)
+    np.testing.assert_allclose(table.values[2], TOTAL_SEN)
+
+    # The blank cell stays a missing hour instead of shifting the rest of the row
+    quebrada = table.row(1)
+    assert quebrada.missing_hours == [5]
+    assert quebrada.values[5] == 6.0
+    assert quebrada.values[23] == 24.0
+
+    np.testing.assert_allclose(table.trailing[0], [sum(ELBOCO), 40.0, 11.8])
+    assert np.isnan(table.trailing[2]).all()
+    assert table.row(2).reported_total is None
+
+
+def test_table_validate(page_words):
+    report = parse_page_series(page_words, trailing=("total",)).validate()
+
+    assert report["rows"] == 3
+    assert report["complete_rows"] == 2
+    assert report["missing_cells"] == 1
+    assert report["total_mismatches"] == ["PMGD-PFV-QUEBRADA"]
+    assert not report["is_valid"]
+
+
+def test_parse_hourly_series_trailing_only_after_24_values():
+    series = parse_hourly_series("PFV-X " + " ".join(["1,5"] * 24) + " 36,0 1,5 1,5", trailing=("total", "dmax", "dmed"))
+    assert series.data_points == 24
+    assert series.trailing == {"total": 36.0, "dmax": 1.5, "dmed": 1.5}
+    assert series.validate()["is_valid"]
+
+    short = parse_hourly_series("1 2 3", trailing=("total",))
+    assert short.trailing == {}
+    assert short.missing_hours == list(range(4, 25))
+
+
+@pytest.fixture
+def anexo_02():
+    for module in ("PyPDF2", "pytesseract", "PIL", "fitz", "cv2"):
+        pytest.importorskip(module)
+    path = anexos_root / "chapters" / "anexo_02" / "processors" / "anexo_02_processor.py"
+    spec = importlib.util.spec_from_file_location("anexo_02_processor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_anexo_02_reads_plant_rows_from_positioned_words(anexo_02, page_words):
+    data = anexo_02.extract_real_generation_data("", "", 65, words=page_words)
+
+    records = {record['plant_name']: record['data'] for record in data['real_generation_records']}
+    assert list(records) == ["PFV-ELBOCO", "PMGD-PFV-QUEBRADA"]
+
+    elboco = records["PFV-ELBOCO"]
+    assert elboco['source'] == 'positioned_words'
+    assert elboco['plant_type'] == 'SOLAR_PV'
+    assert elboco['daily_total_mwh'] == pytest.approx(sum(ELBOCO))
+    assert elboco['peak_hour'] == 12
+    assert elboco['validation']['is_valid']
+
+    quebrada = records["PMGD-PFV-QUEBRADA"]
+    assert quebrada['plant_type'] == 'DISTRIBUTED_SOLAR_PV'
+    assert [item['hour'] for item in quebrada['hourly_data']] == [h for h in range(1, 25) if h != 5]
+    assert quebrada['validation']['missing_hours'] == [5]
+    assert not quebrada['validation']['total_check']['matches']
+
+    assert data['extraction_quality']['hourly_table']['total_mismatches'] == ["PMGD-PFV-QUEBRADA"]
+
+
+def test_anexo_02_system_summary_from_table(anexo_02, page_words):
+    table = parse_page_series(page_words, trailing=anexo_02.TRAILING_COLUMNS)
+    summary = anexo_02.extract_system_summary_data("", table)
+
+    assert list(summary) == ["total_sen"]
+    assert summary["total_sen"]["daily_total"] == pytest.approx(sum(TOTAL_SEN))
+    assert summary["total_sen"]["data_points"] == 24
@@ -0,0 +1,180 @@
+"""Tests for the keyset-paginated incident store and the viewer's next-page links"""
+
+import itertools
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.web.incident_store import IncidentStore, SchemaNotReady  # noqa: E402
+
+SCHEMA_SQL = project_root / "platform_data" / "schemas" / "database_schema.sql"
+_databases = itertools.count()
+
+INCIDENTS = [
+    # report_id, title, failure_date, disconnected_mw, classification, units
+    ("EAF-001", "Desconexión de Nehuenco 2", "2025-01-03", 120.0, "Falla", [("Nehuenco", 400.0, "Gas")]),
+    ("EAF-002", "Falla en línea Charrúa", "2025-01-03", None, "Falla", []),
+    ("EAF-003", "Apertura de interruptor", "2025-01-05", 35.5, "Evento", [("Rapel", 75.0, "Hidro"), ("Rapel", 75.0, "Hidro")]),
+    ("EAF-004", "Desconexión parque solar", "2025-01-07", 60.0, "Falla", [("Sol del Norte", 90.0, "Solar")]),
+    ("EAF-005", "Falla de Nehuenco 1", "2025-01-07", 310.0, "Falla", [("Nehuenco", 350.0, "Gas"), ("Sin dato", None, "")]),
+    ("EAF-006", "Oscilación de tensión", "2025-01-09", 0.0, "Evento", []),
+]
+
+
+def insert_incident(conn, report_id, title, failure_date, mw, classification, units, verb="INSERT"):
+    generation_units = [
+        {"plant_name": plant, "unit_name": f"U{i}", "capacity_mw": capacity, "technology_type": technology}
+        for i, (plant, capacity, technology) in enumerate(units)
+    ]
+    conn.execute(
+        f"""{verb} INTO incidents (report_id, title, failure_date, failure_time, disconnected_mw,
+                                    classification, generation_units, failure_cause_text, technical_summary)
+            VALUES (?, ?, ?, '00:00', ?, ?, ?, ?, '')""",
+        (report_id, title, failure_date, mw, classification, json.dumps(generation_units), title)
+    )
+
+
+@pytest.fixture
+def db_uri():
+    """A shared in-memory database with the repo schema, alive for the test"""
+    uri = f"file:incidents_{next(_databases)}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True)
+    keeper.executescript(SCHEMA_SQL.read_text(encoding="utf-8"))
+    with keeper:
+        for incident in INCIDENTS:
+            insert_incident(keeper, *incident)
+    yield uri
+    keeper.close()
+
+
+@pytest.fixture
+def store(db_uri):
+    store = IncidentStore(db_uri)
+    store.ensure_schema()
+    return store
+
+
+def read_all(iter_page, limit, **kwargs):
+    """Every page in turn: (report ids per page, items in order)"""
+    pages, items, cursor = [], [], None
+    while True:
+        page = IncidentStore.collect(iter_page(limit=limit, cursor=cursor, **kwargs))
+        pages.append([item["report_id"] for item in page["items"]])
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages, items
+
+
+@pytest.mark.parametrize("sort, descending", [
+    ("failure_date", True), ("failure_date", False),
+    ("disconnected_mw", True), ("disconnected_mw", False), ("report_id", False)
+])
+def test_incident_pages_are_contiguous(store, sort, descending):
+    _, everything = read_all(store.iter_incidents, limit=100, sort=sort, descending=descending)
+    pages, items = read_all(store.iter_incidents, limit=2, sort=sort, descending=descending)
+
+    # Ties on the sort key (same date, NULL vs 0 MW) are split by id without gaps or repeats
+    assert [item["id"] for item in items] == [item["id"] for item in everything]
+    assert len(items) == len(INCIDENTS)
+    assert [len(page) for page in pages] == [2, 2, 2]
+    key = {"failure_date": lambda item: item["failure_date"],
+           "disconnected_mw": lambda item: item["disconnected_mw"] or 0.0,
+           "report_id": lambda item: item["report_id"]}[sort]
+    assert [key(item) for item in items] == sorted(map(key, items), reverse=descending)
+
+
+def test_incident_filters_apply_on_every_page(store):
+    _, items = read_all(store.iter_incidents, limit=1, classification="Falla", min_mw=50)
+    assert [item["report_id"] for item in items] == ["EAF-005", "EAF-004", "EAF-001"]
+
+    _, items = read_all(store.iter_incidents, limit=1, date_from="2025-01-05", date_to="2025-01-07",
+                        sort="report_id", descending=False)
+    assert [item["report_id"] for item in items] == ["EAF-003", "EAF-004", "EAF-005"]
+
+
+def test_generation_unit_pages(store):
+    _, units = read_all(store.iter_generation_units, limit=2)
+    assert [unit["capacity_mw"] for unit in units] == [400.0, 350.0, 90.0, 75.0, 75.0, None]
+
+    _, units = read_all(store.iter_generation_units, limit=1, plant="Nehu", sort="report_id",
+                        descending=False)
+    assert [(unit["report_id"], unit["position"]) for unit in units] == [("EAF-001", 0), ("EAF-005", 0)]
+
+
+def test_bad_sort_and_cursor_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.iter_incidents(sort="title")
+    with pytest.raises(ValueError):
+        store.iter_incidents(cursor="not-a-cursor")
+
+
+def test_search_follows_edits(store, db_uri):
+    def search(term):
+        page = store.collect(store.iter_incidents(search=term, sort="report_id"))
+        return [item["report_id"] for item in page["items"]]
+
+    assert search("nehu") == ["EAF-005", "EAF-001"]
+    assert search("evento") == ["EAF-006", "EAF-003"]  # Classification, case-insensitive
+
+    conn = sqlite3.connect(db_uri, uri=True)
+    with conn:
+        # Same row count before and after every edit
+        conn.execute("UPDATE incidents SET title = 'Falla de Colbún', failure_cause_text = 'Falla de Colbún' "
+                     "WHERE report_id = 'EAF-005'")
+        insert_incident(conn, "EAF-001", "Desconexión de Ralco", "2025-01-03", 120.0, "Falla", [],
+                        verb="INSERT OR REPLACE")
+        conn.execute("DELETE FROM incidents WHERE report_id = 'EAF-002'")
+        insert_incident(conn, "EAF-007", "Falla en línea Nehuenco-San Luis", "2025-01-10", 10.0, "Falla", [])
+    conn.close()
+
+    assert search("nehu") == ["EAF-007"]
+    assert search("ralco") == ["EAF-001"]
+    assert search("colbún") == ["EAF-005"]
+    assert search("charrúa") == []
+
+
+def test_unmigrated_database_is_read_as_is(db_uri):
+    store = IncidentStore(db_uri)
+    # The viewer never migrates: search falls back to LIKE, unit pages need the migration
+    items = store.collect(store.iter_incidents(search="huenco"))["items"]
+    assert {item["report_id"] for item in items} == {"EAF-001", "EAF-005"}
+    with pytest.raises(SchemaNotReady):
+        store.iter_generation_units()
+
+    conn = sqlite3.connect(db_uri, uri=True)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert "incident_generation_units" not in names
+    assert not any(name.startswith("trg_") for name in names)
+
+
+def test_next_page_links_keep_the_view(store, monkeypatch):
+    web_viewer = pytest.importorskip("shared_platform.web.web_viewer")
+    monkeypatch.setattr(web_viewer, "viewer", web_viewer.WebViewer(store.db_path))
+    client = web_viewer.app.test_client()
+
+    query = "/api/incidents?classification=Falla&sort=report_id&order=asc&limit=2"
+    page = client.get(query).get_json()
+    assert [item["report_id"] for item in page["items"]] == ["EAF-001", "EAF-002"]
+
+    with web_viewer.app.test_request_context(query):
+        link = web_viewer.next_page_url(page["next_cursor"])
+        assert web_viewer.next_page_url(None) is None
+
+    url = urlparse(link)
+    assert url.path == "/api/incidents"
+    assert parse_qs(url.query) == {"classification": ["Falla"], "sort": ["report_id"], "order": ["asc"],
+                                   "limit": ["2"], "cursor": [page["next_cursor"]]}
+    page = client.get(link).get_json()
+    assert [item["report_id"] for item in page["items"]] == ["EAF-004", "EAF-005"]
+    assert page["next_cursor"] is None
+
+    assert client.get("/api/incidents?cursor=garbage").status_code == 400
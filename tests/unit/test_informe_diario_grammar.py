@@ -0,0 +1,147 @@
+"""Tests for the INFORME DIARIO section grammar"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+processors_dir = project_root / "domains" / "operaciones" / "anexos_eaf" / "chapters" / "informe_diario" / "processors"
+sys.path.insert(0, str(processors_dir))
+
+from informe_diario_grammar import classify, parse_daily_report, tokenize  # noqa: E402
+
+PAGES = [
+    # Page 101: report preamble, then section 1
+    "COORDINADOR ELÉCTRICO NACIONAL\n"
+    "Informe Diario martes 25 de febrero de 2025\n"
+    "1DESVIACIONES DE LA PROGRAMACION\n"
+    "PE Parque Eólico Sarco\n"
+    "12.5*\n"
+    "(*) -3.2 %\n"
+    "PMGD PFV El Olivo\n"
+    "--\n",
+    # Page 102: abbreviations (still section 1), then section 2
+    "PE: Parque Eólico\n"
+    "PFV: Parque Fotovoltaico\n"
+    "Abreviaturas:\n"
+    "2JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)\n"
+    "HE Rapel\n"
+    "Menor afluente que el programado\n",
+    # Page 103: sections 3 and 4
+    "3ESTADO DE LAS CENTRALES\n"
+    "3.1. Centrales (MW)\n"
+    "TER Nehuenco II\n"
+    "85.0\n"
+    "4ANTECEDENTES DE LA OPERACIÓN DIARIA SEN\n"
+    "4.1. Observaciones\n"
+    "15:16\n"
+    "CDC\n",
+    # Page 104: section 4 continues, then section 5
+    "Se normaliza el suministro en la S/E Charrúa tras la falla\n"
+    "5INDISPONIBILIDAD SCADA SEN\n"
+    "Colbún S.A.\n"
+    "25/02/2025\n"
+    "08:30\n",
+]
+
+
+@pytest.mark.parametrize("line, state, kind", [
+    ("1DESVIACIONES DE LA PROGRAMACION", "preamble", "section_header"),
+    ("3.1. Centrales", "operations", "subsection_header"),
+    ("3.1. Centrales (MW)", "plant_status", "subsection_line"),
+    ("Abreviaturas:", "preamble", "abbreviations_header"),
+    ("PE Parque Eólico Sarco", "deviations", "plant_known"),
+    ("PMGD PFV El Olivo", "deviations", "plant_pmgd"),
+    ("pmgd pfv El Olivo", "deviations", "plant_pmgd"),
+    ("12.5*", "deviations", "number"),
+    ("(*) -3.2 %", "deviations", "percentage"),
+    ("†", "deviations", "marker"),
+    ("ER", "deviations", "estado"),
+    ("N/A", "deviations", "blank"),
+    ("PE: Parque Eólico", "deviations", "abbreviation"),
+    ("HE Rapel", "justifications", "plant"),
+    ("PMGD Las Palmas", "plant_status", "plant"),
+    ("85.0", "plant_status", "availability"),
+    ("15:16", "operations", "time"),
+    ("25/02/2025", "system_tables", "date"),
+    ("08:30", "system_tables", "time"),
+    ("Colbún S.A.", "system_tables", "text"),
+])
+def test_line_kinds(line, state, kind):
+    assert classify(line, state).kind == kind
+
+
+def test_rule_order_decides_ambiguous_lines():
+    # Section headers win over every section rule
+    assert classify("2JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)", "deviations").kind == "section_header"
+    # Same line, different grammar per section
+    assert classify("HE Rapel", "deviations").kind == "text"
+    assert classify("85.0", "deviations").kind == "number"
+    assert classify("PMGD Las Palmas", "justifications").kind == "text"
+
+
+def test_tokenize_reads_groups():
+    tokens = tokenize("  PE Parque Eólico Sarco \n\n12.5*\n(*) -3.2 %\n", "1")
+    assert [token.kind for token in tokens] == ["plant_known", "number", "percentage"]
+    assert tokens[0].group("known_type") == "PE"
+    assert tokens[0].group("known_name") == "Parque Eólico Sarco"
+    assert (tokens[1].group("number_value"), tokens[1].group("number_marker")) == ("12.5", "*")
+    assert tokens[2].group("percent_prefix") == "(*)"
+    assert tokens[2].group("percent_value") == "-3.2"
+
+
+def test_single_pass_sections():
+    report = parse_daily_report(PAGES, first_page=101)
+
+    assert [token.line for token in report.preamble] == [
+        "COORDINADOR ELÉCTRICO NACIONAL", "Informe Diario martes 25 de febrero de 2025"
+    ]
+    assert list(report.sections) == ["1", "2", "3", "4", "5"]
+
+    deviations = report.sections["1"]
+    assert deviations.state == "deviations"
+    assert deviations.title == "DESVIACIONES DE LA PROGRAMACION"
+    assert deviations.pages == [101, 102]
+    assert [token.kind for token in deviations.tokens] == [
+        "section_header", "plant_known", "number", "percentage", "plant_pmgd", "blank",
+        "abbreviation", "abbreviation", "abbreviations_header"
+    ]
+
+    justifications = report.sections["2"]
+    assert justifications.title == "JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)"
+    assert [(token.kind, token.page) for token in justifications.tokens[1:]] == [("plant", 102), ("text", 102)]
+
+    status = report.sections["3"]
+    assert status.subsections == ["3.1. Centrales (MW)"]
+    assert [token.kind for token in status.tokens] == ["section_header", "subsection_line", "plant", "availability"]
+
+    operations = report.sections["4"]
+    assert operations.pages == [103, 104]
+    assert operations.subsections == ["4.1. Observaciones"]
+    assert [token.kind for token in operations.tokens][-3:] == ["time", "text", "text"]
+
+    system = report.sections["5"]
+    assert system.state == "system_tables"
+    assert [token.kind for token in system.tokens] == ["section_header", "text", "date", "time"]
+
+
+def test_returning_to_a_section_appends_to_it():
+    pages = [
+        "1DESVIACIONES DE LA PROGRAMACION\nPE Sarco\n",
+        "2JUSTIFICACIÓN DE PRINCIPALES DESVIACIONES (*)\nHE Rapel\nSin agua\n",
+        "1DESVIACIONES DE LA PROGRAMACION\nPE: Parque Eólico\n",
+    ]
+    report = parse_daily_report(pages, first_page=10)
+    deviations = report.sections["1"]
+    assert deviations.pages == [10, 12]
+    assert deviations.title == "DESVIACIONES DE LA PROGRAMACION"
+    assert [token.kind for token in deviations.tokens] == [
+        "section_header", "plant_known", "section_header", "abbreviation"
+    ]
+    assert report.sections["2"].pages == [11]
+    # Unknown section numbers do not switch state
+    assert classify("9OTRA SECCION", "operations").kind == "section_header"
+    report = parse_daily_report(["4ANTECEDENTES\n9OTRA SECCION\n15:16\n"])
+    assert list(report.sections) == ["4"]
+    assert [token.kind for token in report.sections["4"].tokens] == ["section_header", "section_header", "time"]
@@ -0,0 +1,194 @@
+"""Tests for the SQLite job queue and the inbox watcher (no Redis needed)"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.ingestion import daemon  # noqa: E402
+from shared_platform.ingestion.job_queue import (  # noqa: E402
+    DONE, FAILED, QUEUED, RUNNING, JobQueue, LeaseLost, run_job, worker_loop
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), retry_backoff=0.0)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_is_idempotent(queue):
+    job_id, created = queue.enqueue("json", {"path": "a.json"}, idempotency_key="json:abc")
+    again_id, created_again = queue.enqueue("json", {"path": "copy.json"}, idempotency_key="json:abc")
+
+    assert created and not created_again
+    assert again_id == job_id
+    assert queue.stats()[QUEUED] == 1
+
+    # Still deduplicated once the job has finished
+    job = queue.claim("worker-1")
+    queue.complete(job.id, job.worker, {"ok": True})
+    assert queue.enqueue("json", {}, idempotency_key="json:abc") == (job_id, False)
+    assert queue.get(job_id).status == DONE
+
+
+def test_claim_order_follows_priority(queue):
+    low, _ = queue.enqueue("document", {}, priority=10)
+    high, _ = queue.enqueue("chapter", {}, priority=20)
+    assert queue.claim("w").id == high
+    assert queue.claim("w").id == low
+    assert queue.claim("w") is None
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), lease_seconds=0.2)
+    job_id, _ = queue.enqueue("document", {"path": "x.pdf"})
+
+    first = queue.claim("worker-1")
+    assert first.id == job_id and first.attempts == 1
+    # Leased: nobody else gets it
+    assert queue.claim("worker-2") is None
+
+    # worker-1 died without completing; the lease runs out
+    time.sleep(0.3)
+    second = queue.claim("worker-2")
+    assert second.id == job_id
+    assert second.attempts == 2
+    assert queue.get(job_id).status == RUNNING
+    queue.close()
+
+
+def test_expired_lease_without_attempts_left_fails(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), lease_seconds=0.1)
+    job_id, _ = queue.enqueue("document", {"path": "x.pdf"}, max_attempts=2)
+
+    # Each claimed worker dies (never reports back) before the lease runs out
+    for worker in ("worker-1", "worker-2"):
+        assert queue.claim(worker).id == job_id
+        time.sleep(0.15)
+
+    assert queue.claim("worker-3") is None
+    job = queue.get(job_id)
+    assert job.status == FAILED
+    assert job.attempts == 2
+    assert job.last_error == "Lease expired on worker-2 after 2 attempts"
+    queue.close()
+
+
+def test_stale_worker_cannot_overwrite_new_owner(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), lease_seconds=0.1)
+    job_id, _ = queue.enqueue("json", {})
+    stale = queue.claim("worker-1")
+    time.sleep(0.15)
+    current = queue.claim("worker-2")
+
+    with pytest.raises(LeaseLost):
+        queue.complete(job_id, stale.worker, {"from": "worker-1"})
+    with pytest.raises(LeaseLost):
+        queue.fail(job_id, stale.worker, "late failure")
+    # run_job drops the stale outcome and reports the job as it stands
+    assert run_job(queue, stale, {"json": lambda job, queue: {"from": job.worker}}) == RUNNING
+
+    assert run_job(queue, current, {"json": lambda job, queue: {"from": job.worker}}) == DONE
+    assert queue.get(job_id).result == {"from": "worker-2"}
+    queue.close()
+
+
+def test_worker_survives_a_locked_database(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    job_id, _ = queue.enqueue("json", {})
+    queue.close()
+
+    claim = JobQueue.claim
+    locked = []
+
+    def busy_once(self, worker, kinds=None, job_id=None):
+        if not locked:
+            locked.append(worker)
+            raise sqlite3.OperationalError("database is locked")
+        return claim(self, worker, kinds, job_id)
+
+    monkeypatch.setattr(JobQueue, "claim", busy_once)
+    handlers = {"json": lambda job, queue: {"ok": True}}
+    worker = threading.Thread(target=worker_loop, args=(str(tmp_path / "queue.db"), handlers),
+                              kwargs={"poll_interval": 0.01, "exit_when_idle": True})
+    worker.start()
+    worker.join(5)
+
+    assert not worker.is_alive()
+    assert locked
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    assert queue.get(job_id).status == DONE
+    queue.close()
+
+
+def test_failed_job_is_retried_then_marked_failed(queue):
+    calls = []
+
+    def flaky(job, queue):
+        calls.append(job.attempts)
+        raise ValueError("bad page")
+
+    job_id, _ = queue.enqueue("json", {}, max_attempts=3)
+    statuses = []
+    while True:
+        job = queue.claim("worker-1")
+        if job is None:
+            break
+        statuses.append(run_job(queue, job, {"json": flaky}))
+
+    assert calls == [1, 2, 3]
+    assert statuses == [QUEUED, QUEUED, FAILED]
+    job = queue.get(job_id)
+    assert job.status == FAILED
+    assert job.last_error == "ValueError: bad page"
+
+
+def test_watcher_queues_stable_files_once(tmp_path, queue):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "report.json").write_text("{}")
+    (inbox / "notes.txt").write_text("ignored")
+    watcher = daemon.InboxWatcher(str(inbox), queue)
+
+    assert watcher.scan() == 0  # First sighting
+    assert watcher.scan() == 1
+    assert watcher.scan() == 0
+
+    # The same content under another name is the same job
+    (inbox / "report copy.json").write_text("{}")
+    watcher.scan()
+    assert watcher.scan() == 0
+    assert queue.stats()[QUEUED] == 1
+
+
+def test_watcher_skips_vanished_files_and_forgets_them(tmp_path, queue, monkeypatch):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    gone = inbox / "gone.json"
+    gone.write_text('{"a": 1}')
+    (inbox / "kept.json").write_text('{"b": 2}')
+    watcher = daemon.InboxWatcher(str(inbox), queue)
+    watcher.scan()
+
+    digest = daemon.file_digest
+
+    def vanishing_digest(path, *args):
+        if path.name == "gone.json":
+            raise FileNotFoundError(2, "No such file or directory", str(path))
+        return digest(path, *args)
+
+    monkeypatch.setattr(daemon, "file_digest", vanishing_digest)
+    assert watcher.scan() == 1  # kept.json; gone.json is skipped, not fatal
+
+    gone.unlink()
+    watcher.scan()
+    assert list(watcher._seen) == [inbox / "kept.json"]
+    assert list(watcher._queued) == [inbox / "kept.json"]
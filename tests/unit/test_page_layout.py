@@ -0,0 +1,113 @@
+"""Tests for the shared page layout model"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.utils import page_layout  # noqa: E402
+from shared_platform.utils.page_layout import (  # noqa: E402
+    PageLayout, PageLayoutStore, get_page_layout, layout_store, release_layout_store
+)
+
+
+def make_pdf(path, pages=2):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Página {number + 1}: Central Nehuenco 120 MW")
+        page.draw_line((72, 100), (300, 100))
+        page.draw_rect(fitz.Rect(72, 120, 300, 160))
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    yield make_pdf(tmp_path / "eaf.pdf")
+    for key in list(page_layout._stores):
+        release_layout_store(*key)
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Counts of deferred part extractions"""
+    calls = []
+    for name, extract in list(page_layout.PART_EXTRACTORS.items()):
+        def counted(page, name=name, extract=extract):
+            calls.append(name)
+            return extract(page)
+        monkeypatch.setitem(page_layout.PART_EXTRACTORS, name, counted)
+    return calls
+
+
+def test_text_only_consumers_skip_drawings_and_tables(pdf, extractions):
+    layout = get_page_layout(pdf, 1)
+    assert any("Nehuenco" in item["text"] for item in layout.text_items())
+    assert extractions == []
+
+    assert layout.drawings
+    assert layout.drawings is get_page_layout(pdf, 1).drawings
+    assert extractions == ["drawings"]
+    layout.images, layout.table_candidates
+    assert sorted(extractions) == ["drawings", "images", "table_candidates"]
+
+
+def test_cached_layouts_round_trip_with_tuples(pdf, tmp_path, extractions):
+    cache_dir = tmp_path / "layouts"
+    store = PageLayoutStore(pdf, cache_dir)
+    fresh = store.page(1)
+    segments = fresh.drawings[0]["segments"]
+    store.close()
+
+    # A later run reads the cache: text and the drawings already extracted
+    store = PageLayoutStore(pdf, cache_dir)
+    cached = store.page(1)
+    assert cached.blocks == fresh.blocks
+    assert cached.drawings[0]["segments"] == segments
+    assert isinstance(cached.drawings[0]["bbox"], tuple)
+    assert isinstance(cached.drawings[0]["segments"][0], tuple)
+    assert isinstance(cached.blocks[0]["lines"][0]["spans"][0]["origin"], tuple)
+    assert cached.text_items() == fresh.text_items()
+    assert extractions == ["drawings"]
+
+    # Images were never read, so they are extracted now, from the PDF
+    assert cached.images == []
+    assert extractions == ["drawings", "images"]
+    store.close()
+
+    data = PageLayout.load(cache_dir / "eaf_p1.layout.json").to_dict()
+    assert data["images"] == [] and data["table_candidates"] is None
+
+
+def test_shared_stores_are_replaced_evicted_and_released(pdf, tmp_path, monkeypatch):
+    store = layout_store(pdf)
+    store.page(1)
+    assert store._doc is not None
+
+    # A changed PDF gets a new store; the old one is closed
+    make_pdf(pdf, pages=3)
+    replacement = layout_store(pdf)
+    assert replacement is not store
+    assert store._doc is None
+
+    # Least recently used stores are closed beyond MAX_SHARED_STORES
+    monkeypatch.setattr(page_layout, "MAX_SHARED_STORES", 2)
+    others = [layout_store(make_pdf(tmp_path / f"other_{i}.pdf", pages=1)) for i in range(2)]
+    for other in others:
+        other.page(1)
+    assert replacement._closed
+    assert not any(other._closed for other in others)
+
+    # A layout that outlived its store still reads its deferred parts
+    layout = others[0].page(1)
+    release_layout_store(tmp_path / "other_0.pdf")
+    assert others[0]._closed and others[0]._doc is None
+    assert layout.drawings
+    assert others[0]._doc is None
@@ -0,0 +1,103 @@
+"""Tests for the page-addressable raw text store and its .offsets sidecar"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.utils.raw_text_store import (  # noqa: E402
+    RawTextStore, open_raw_store, split_raw_pages, write_raw_text
+)
+
+RAW = (
+    "=== PÁGINA 1 ===\n"
+    "Descripción de la perturbación\n"
+    "Línea 2 con acentos: año, niño\n"
+    "\n"
+    "=== PÁGINA 2 ===\n"
+    "Segunda página\n"
+    "=== PAGE 3 ===   \n"
+    "Third page, last"
+)
+
+PAGES = {
+    1: "Descripción de la perturbación\nLínea 2 con acentos: año, niño\n",
+    2: "Segunda página",
+    3: "Third page, last",
+}
+
+
+def sidecar(path):
+    return path.with_name(path.name + ".offsets")
+
+
+def test_pages_and_byte_offsets(tmp_path):
+    path = write_raw_text(tmp_path / "capitulo_raw.txt", RAW)
+    index = json.loads(sidecar(path).read_text(encoding="utf-8"))
+
+    data = RAW.encode("utf-8")
+    assert index["size"] == len(data)
+    assert set(index["pages"]) == {"1", "2", "3"}
+    for page_num, (marker_start, body_start, body_end) in index["pages"].items():
+        # Offsets are bytes, so accented text before a page does not shift it
+        assert data[marker_start:body_start].decode("utf-8").startswith("=== ")
+        assert data[body_start:body_end].decode("utf-8") == PAGES[int(page_num)]
+
+    with RawTextStore(path) as store:
+        assert store.page_numbers() == [1, 2, 3]
+        assert store.pages() == PAGES
+        assert store.page_block(2) == "=== PÁGINA 2 ===\nSegunda página"
+        assert store.page(9, default=None) is None
+        assert store.text() == RAW
+    assert split_raw_pages(RAW) == PAGES
+
+
+def test_stale_or_missing_sidecar_is_rebuilt(tmp_path):
+    path = write_raw_text(tmp_path / "capitulo_raw.txt", RAW)
+
+    # Edited by hand: same sidecar, different file
+    path.write_text(RAW.replace("Segunda", "Otra segunda"), encoding="utf-8")
+    with RawTextStore(path) as store:
+        assert store.page(2) == "Otra segunda página"
+    assert json.loads(sidecar(path).read_text())["size"] == path.stat().st_size
+
+    # Written by other means: indexed on first open
+    other = tmp_path / "sin_indice.txt"
+    other.write_text(RAW, encoding="utf-8")
+    with RawTextStore(other) as store:
+        assert store.page(3) == PAGES[3]
+    assert sidecar(other).exists()
+
+    empty = tmp_path / "vacio.txt"
+    empty.write_text("")
+    with RawTextStore(empty) as store:
+        assert len(store) == 0 and store.text() == ""
+
+
+def test_shared_store_is_replaced_and_closed(tmp_path):
+    path = write_raw_text(tmp_path / "capitulo_raw.txt", RAW)
+    store = open_raw_store(path)
+    assert open_raw_store(str(path)) is store
+
+    # Rewritten through write_raw_text: the old store is closed at once
+    write_raw_text(path, RAW.replace("Third", "Tercera"))
+    assert store.closed
+    with pytest.raises(ValueError):
+        store.page(1)
+    current = open_raw_store(path)
+    assert current is not store
+    assert current.page(3) == "Tercera page, last"
+
+    # Rewritten by other means: replaced (and closed) on the next open
+    tmp = path.with_name("nuevo.txt")
+    tmp.write_text(RAW, encoding="utf-8")
+    os.replace(tmp, path)
+    latest = open_raw_store(path)
+    assert latest is not current and current.closed
+    assert latest.page(3) == PAGES[3]
+    latest.close()
@@ -0,0 +1,189 @@
+"""Tests for the incremental resource catalogue, with inotify and with stat polling"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from ai_platform.core import resource_catalog_index  # noqa: E402
+from ai_platform.core.resource_catalog_index import DirectoryWatcher, ResourceCatalogIndex  # noqa: E402
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    domains = root / "domains"
+    write_json(domains / "operaciones" / "eaf" / "outputs" / "capitulo_01.json", {"incident_info": {}, "pages": []})
+    write_json(domains / "operaciones" / "eaf" / "schemas" / "eaf_schema.json", {"properties": {}})
+    write_json(domains / "mercados" / "sources" / "precios.json", [1, 2, 3])
+    (domains / "mercados" / "sources" / "notas.txt").write_text("no es json")
+    write_json(domains / "operaciones" / "__pycache__" / "ignorado.json", {})
+    return root
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def catalog(request, tree, tmp_path):
+    if request.param == "inotify":
+        pytest.importorskip("inotify_simple")
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"), max_age=0.0,
+                                 use_inotify=request.param == "inotify")
+    index.refresh()
+    if request.param == "inotify":
+        assert index.watcher is not None
+    yield index
+    index.close()
+
+
+def paths(index, **filters):
+    return [entry["path"] for entry in index.search(**filters)]
+
+
+def test_initial_scan(catalog):
+    assert paths(catalog) == [
+        "domains/mercados/sources/precios.json",
+        "domains/operaciones/eaf/outputs/capitulo_01.json",
+        "domains/operaciones/eaf/schemas/eaf_schema.json",
+    ]
+    entry = catalog.get_file("domains/operaciones/eaf/outputs/capitulo_01.json")
+    assert (entry["domain"], entry["document_type"], entry["root_type"]) == ("operaciones", "extractions", "object")
+    assert entry["top_level_keys"] == ["incident_info", "pages"]
+    assert catalog.get_file("domains/mercados/sources/precios.json")["item_count"] == 3
+
+    # Every term is a prefix of a path component or top-level key
+    assert paths(catalog, query="incident capitulo") == ["domains/operaciones/eaf/outputs/capitulo_01.json"]
+    assert paths(catalog, document_type="schemas") == ["domains/operaciones/eaf/schemas/eaf_schema.json"]
+    assert [row["domain"] for row in catalog.domain_summary()] == ["mercados", "operaciones"]
+
+    stats = catalog.refresh()
+    assert stats["indexed"] == stats["removed"] == 0
+
+
+def test_modified_and_new_files(catalog, tree):
+    domains = tree / "domains"
+    write_json(domains / "operaciones" / "eaf" / "outputs" / "capitulo_01.json", {"incident_info": {}, "summary": "x"})
+    write_json(domains / "operaciones" / "eaf" / "outputs" / "capitulo_02.json", {"chapter": 2})
+    # A new directory with files already inside when it is first seen
+    write_json(domains / "transmision" / "outputs" / "lineas" / "lineas.json", {"lines": []})
+
+    stats = catalog.refresh()
+    assert stats["indexed"] == 3
+    assert stats["removed"] == 0
+    assert catalog.get_file("domains/operaciones/eaf/outputs/capitulo_01.json")["top_level_keys"] == [
+        "incident_info", "summary"
+    ]
+    assert paths(catalog, query="summary") == ["domains/operaciones/eaf/outputs/capitulo_01.json"]
+    assert paths(catalog, domains=["transmision"]) == ["domains/transmision/outputs/lineas/lineas.json"]
+
+    # Files created later inside the new directory are seen too
+    write_json(domains / "transmision" / "outputs" / "lineas" / "tramos.json", {})
+    catalog.refresh()
+    assert len(paths(catalog, domains=["transmision"])) == 2
+
+
+def test_directory_moves(catalog, tree):
+    eaf = tree / "domains" / "operaciones" / "eaf"
+    (eaf / "outputs").rename(eaf / "archivo")
+    catalog.refresh()
+    assert "domains/operaciones/eaf/archivo/capitulo_01.json" in paths(catalog)
+    assert catalog.get_file("domains/operaciones/eaf/outputs/capitulo_01.json") is None
+
+    # Files written in the moved directory land under its new path
+    write_json(eaf / "archivo" / "capitulo_03.json", {})
+    catalog.refresh()
+    assert "domains/operaciones/eaf/archivo/capitulo_03.json" in paths(catalog)
+
+    # Moved out of the tree and back in under another domain
+    outside = tree / "fuera"
+    (eaf / "archivo").rename(outside)
+    catalog.refresh()
+    assert paths(catalog, query="archivo") == []
+    outside.rename(tree / "domains" / "mercados" / "historico")
+    catalog.refresh()
+    assert paths(catalog, domains=["mercados"]) == [
+        "domains/mercados/historico/capitulo_01.json",
+        "domains/mercados/historico/capitulo_03.json",
+        "domains/mercados/sources/precios.json",
+    ]
+
+
+def test_removals_are_reconciled(catalog, tree):
+    domains = tree / "domains"
+    (domains / "mercados" / "sources" / "precios.json").unlink()
+    shutil.rmtree(domains / "operaciones" / "eaf" / "schemas")
+
+    stats = catalog.refresh()
+    assert stats["removed"] == 2
+    assert paths(catalog) == ["domains/operaciones/eaf/outputs/capitulo_01.json"]
+    assert paths(catalog, query="eaf schema") == []
+
+    shutil.rmtree(domains)
+    catalog.refresh()
+    assert paths(catalog) == []
+
+
+def test_polling_waits_for_max_age(tree, tmp_path):
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"), max_age=3600.0, use_inotify=False)
+    assert index.refresh()["indexed"] == 3
+
+    write_json(tree / "domains" / "mercados" / "sources" / "nuevo.json", {})
+    assert index.refresh()["scanned_dirs"] == 0  # Still fresh
+    assert index.refresh(force=True)["indexed"] == 1
+    index.close()
+
+    # A new instance keeps the catalogue and only parses what changed
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"), use_inotify=False)
+    stats = index.refresh()
+    assert (stats["indexed"], stats["unchanged"]) == (0, 4)
+    index.close()
+
+
+def test_lost_events_fall_back_to_a_full_scan(tree, tmp_path, monkeypatch):
+    pytest.importorskip("inotify_simple")
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"))
+    index.refresh()
+
+    (tree / "domains" / "mercados" / "sources" / "precios.json").unlink()
+    monkeypatch.setattr(DirectoryWatcher, "changes", lambda self: None)  # Queue overflow
+    stats = index.refresh()
+    assert stats["removed"] == 1
+    assert stats["scanned_dirs"] > 1
+    index.close()
+
+
+def test_out_of_watches_switches_to_polling(tree, tmp_path, monkeypatch):
+    pytest.importorskip("inotify_simple")
+
+    def no_more_watches(self, directory):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(DirectoryWatcher, "watch", no_more_watches)
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"), max_age=0.0)
+    assert index.refresh()["indexed"] == 3
+    assert index.watcher is None and not index.use_inotify
+
+    write_json(tree / "domains" / "mercados" / "sources" / "nuevo.json", {})
+    assert index.refresh()["indexed"] == 1
+    index.close()
+
+
+def test_without_inotify_simple(tree, tmp_path, monkeypatch):
+    def missing(self):
+        raise ImportError("No module named 'inotify_simple'")
+
+    monkeypatch.setattr(resource_catalog_index.DirectoryWatcher, "__init__", missing)
+    index = ResourceCatalogIndex(str(tree), db_path=str(tmp_path / "catalog.db"), max_age=0.0)
+    assert index.refresh()["indexed"] == 3
+    assert not index.use_inotify
+    (tree / "domains" / "mercados" / "sources" / "precios.json").unlink()
+    assert index.refresh()["removed"] == 1
+    index.close()
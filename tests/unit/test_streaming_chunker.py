@@ -0,0 +1,42 @@
+"""Tests for the streaming chunker"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from ai_platform.processors.streaming_chunker import StreamingChunker  # noqa: E402
+
+
+def offsets(chunks):
+    return [(chunk.start_offset, chunk.end_offset) for chunk in chunks]
+
+
+def test_no_trailing_chunk_made_of_overlap_only():
+    chunks = list(StreamingChunker(100, 20).chunk_pages([(1, 'x ' * 50)]))
+    assert offsets(chunks) == [(0, 100)]
+
+    chunks = list(StreamingChunker(100, 20).chunk_pages([(1, 'x ' * 60)]))
+    assert offsets(chunks) == [(0, 100), (82, 120)]
+
+
+def test_chunks_cover_the_stream_with_overlap_and_page_ranges():
+    pages = [(page, f"Página {page}. " + "palabra " * 40 + "\n\n") for page in range(1, 6)]
+    stream = "".join(text for _, text in pages)
+    chunks = list(StreamingChunker(300, 40).chunk_pages(iter(pages), stream_id="eaf"))
+
+    assert chunks[0].start_offset == 0
+    assert chunks[-1].end_offset == len(stream)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_offset < previous.end_offset < chunk.end_offset
+        assert previous.end_offset - chunk.start_offset <= 40
+    for chunk in chunks:
+        assert chunk.end_offset - chunk.start_offset <= 300
+        assert chunk.text == stream[chunk.start_offset:chunk.end_offset].strip()
+        assert chunk.start_page <= chunk.end_page
+    assert chunks[0].start_page == 1 and chunks[-1].end_page == 5
+
+    # Stable IDs across runs
+    again = list(StreamingChunker(300, 40).chunk_pages(iter(pages), stream_id="eaf"))
+    assert [chunk.chunk_id for chunk in again] == [chunk.chunk_id for chunk in chunks]
@@ -0,0 +1,122 @@
+"""Tests for the OCR vs native text agreement metrics"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.utils.text_agreement import (  # noqa: E402
+    AGREEMENT_GATE, agreement_batch, banded_edit_distance, edit_similarity,
+    ngram_cosine, text_agreement, token_jaccard
+)
+
+
+PARAGRAPH = (
+    "A las 14:32 horas se produjo la desconexión forzada de la unidad 2 de la central "
+    "Nehuenco, con una pérdida de 310 MW, por actuación de la protección diferencial "
+    "del transformador elevador; el sistema recuperó la frecuencia a las 14:35 horas."
+)
+
+
+def levenshtein(a, b):
+    """Reference DP"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("", "", 0),
+    ("", "abc", 3),
+    ("kitten", "sitting", 3),
+    ("flaw", "lawn", 2),
+    ("central", "central", 0),
+    ("desconexión", "desconexion", 1),
+    ("abc", "cba", 2),
+    ("a" * 70, "a" * 69 + "b", 1),  # Past one 64-bit word
+])
+def test_edit_distance(a, b, distance):
+    assert banded_edit_distance(a, b) == distance
+    assert banded_edit_distance(b, a) == distance
+
+
+def test_edit_distance_matches_reference_on_random_pairs():
+    rng = random.Random(7)
+    for _ in range(200):
+        a = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 90)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 90)))
+        assert banded_edit_distance(a, b) == levenshtein(a, b)
+
+
+@pytest.mark.parametrize("a, b, band, expected", [
+    ("kitten", "sitting", 3, 3),
+    ("kitten", "sitting", 2, 3),      # Over the band: band + 1
+    ("abcdefgh", "ab", 3, 4),         # Length difference alone exceeds the band
+    ("abcdefgh", "hgfedcba", 1, 2),
+])
+def test_edit_distance_band(a, b, band, expected):
+    assert banded_edit_distance(a, b, band) == expected
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 1.0),
+    ("hola", "hola", 1.0),
+    ("abcd", "abce", 0.75),
+    ("abcdefghij", "zzzzzzzzzz", 0.5),  # Beyond the default band: reported as 1 - band
+])
+def test_edit_similarity(a, b, expected):
+    assert edit_similarity(a, b) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 1.0),
+    ("a b c", "c b a", 1.0),          # Order does not matter
+    ("a a b", "a b", 2 / 3),          # Counts do
+    ("falla linea", "evento", 0.0),
+])
+def test_token_jaccard(a, b, expected):
+    assert token_jaccard(a, b) == pytest.approx(expected)
+
+
+def test_ngram_cosine():
+    assert ngram_cosine("", "") == 1.0
+    assert ngram_cosine("abc", "") == 0.0
+    assert ngram_cosine("desconexión", "desconexión") == pytest.approx(1.0)
+    assert ngram_cosine("xyz", "abc") == 0.0
+    one_error = ngram_cosine("desconexión de la unidad", "desconexion de la unidad")
+    assert 0.7 < one_error < 1.0
+
+
+@pytest.mark.parametrize("ocr, raw, good", [
+    ("Desconexión  de la\nUnidad 2", "desconexión de la unidad 2", True),   # Only case and spacing differ
+    (PARAGRAPH.replace("desconexión", "desconexi6n"), PARAGRAPH, True),          # One OCR error in a paragraph
+    ("Informe de falla EAF 089", "Tabla de generación horaria", False),
+    ("", "Desconexión de la Unidad 2", False),
+])
+def test_agreement_gate(ocr, raw, good):
+    result = text_agreement(ocr, raw)
+    assert 0.0 <= result.agreement <= 1.0 + 1e-9
+    assert (result.agreement > AGREEMENT_GATE) == good
+
+
+def test_agreement_blends_the_metrics():
+    result = text_agreement("Falla en la línea 220 kV", "falla en linea 220 kv")
+    assert result.agreement == pytest.approx(
+        0.2 * result.token_jaccard + 0.5 * result.ngram_cosine + 0.3 * result.edit_similarity
+    )
+    assert result.length_a == len("falla en la línea 220 kv")
+    assert set(result.to_dict()) >= {"token_jaccard", "ngram_cosine", "edit_similarity", "agreement"}
+
+
+def test_agreement_batch_keeps_shared_keys_in_order():
+    results = agreement_batch({3: "c", 1: "a", 2: "b"}, {1: "a", 3: "x"})
+    assert list(results) == [3, 1]
+    assert results[1].agreement == pytest.approx(1.0)
@@ -0,0 +1,61 @@
+"""Tests for the block-to-raw text alignment index"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from shared_platform.utils.text_alignment import TextAligner, lines_in_region  # noqa: E402
+
+RAW = (
+    "Informe en plazo\n"
+    "El informe de falla fue enviado por Nehuenco S.A.\n"
+    "La central Nehuenco II quedó fuera de servicio a las 15:16 horas.\n"
+    "Informe en plazo\n"
+    "Consumos desconectados: 120 MW"
+)
+
+
+def test_exact_matches_follow_reading_order():
+    aligner = TextAligner(RAW)
+    spans = aligner.align(["El informe de falla", "Informe  en\nplazo"])
+
+    assert [span.match_type for span in spans] == ["exact", "exact"]
+    # The repeated label maps to the occurrence after the previous block
+    assert spans[1].raw_start == RAW.rindex("Informe en plazo")
+    assert RAW[spans[0].raw_start:spans[0].raw_end] == "El informe de falla"
+
+    # Serialised positions are raw offsets, as before the index; normalised ones are named so
+    match = spans[1].to_dict()
+    assert (match["start_position"], match["end_position"]) == (spans[1].raw_start, spans[1].raw_end)
+    assert (match["normalized_start"], match["normalized_end"]) == (spans[1].start, spans[1].end)
+
+
+def test_approximate_match_scores_against_all_query_grams():
+    aligner = TextAligner(RAW)
+
+    near = aligner.locate("La central Nehuenko II quedo fuera de servicio")
+    assert near.match_type == "approximate"
+    assert 0.5 < near.score < 1.0
+    assert RAW[near.raw_start:near.raw_end].startswith("La central")
+
+    # One shared gram ("nehu") must not make an unrelated block a match
+    unrelated = aligner.locate("qqqqwwwweeeerrrrttttyyyy Nehu zzzzxxxxccccvvvvbbbb")
+    assert not unrelated.found
+
+
+def test_region_content_from_lines_in_region():
+    blocks = [{
+        "lines": [
+            {"text": "Consumos desconectados: 120 MW", "bbox": (50, 300, 250, 310)},
+            {"text": "Informe en plazo", "bbox": (50, 100, 150, 110)},
+            {"text": "   ", "bbox": (50, 305, 60, 310)},
+        ]
+    }]
+    assert lines_in_region(blocks, (0, 250, 400, 400)) == ["Consumos desconectados: 120 MW"]
+    assert lines_in_region(blocks, (0, 0, 400, 400)) == ["Informe en plazo", "Consumos desconectados: 120 MW"]
+
+    content = TextAligner(RAW).region_content(lines_in_region(blocks, (0, 250, 400, 400)))
+    assert content["text"] == "Consumos desconectados: 120 MW"
+    assert content["matched_units"] == 1